@@ -559,12 +559,8 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         results = [build_storage_cost_row(r, invoiced_entry_ids, billed_amounts) for r in cost_results]
 
-        # Calculate summary for ALL matching entries (not just paginated)
-        all_cost_results = cost_service.calculate_bulk_costs(entries) if total_count <= 500 else cost_results
-
-        total_usd = sum(r.total_usd for r in all_cost_results)
-        total_uzs = sum(r.total_uzs for r in all_cost_results)
-        total_billable_days = sum(r.billable_days for r in all_cost_results)
+        # Summary for ALL matching entries (not just the page)
+        summary = cost_service.summarize_costs(entries)
 
         return Response(
             {
@@ -572,33 +568,34 @@ class CompanyViewSet(viewsets.ModelViewSet):
                 "results": results,
                 "count": total_count,
                 "summary": {
-                    "total_containers": len(all_cost_results) if total_count <= 500 else total_count,
-                    "total_billable_days": total_billable_days,
-                    "total_usd": str(total_usd),
-                    "total_uzs": str(total_uzs),
+                    "total_containers": summary["total_containers"],
+                    "total_billable_days": summary["total_billable_days"],
+                    "total_usd": str(summary["total_usd"]),
+                    "total_uzs": str(summary["total_uzs"]),
                 },
             }
         )
 
     @extend_schema(
-        summary="Export storage costs to Excel",
+        summary="Export storage costs to Excel or CSV",
         parameters=[
             OpenApiParameter(name="status", type=str, description="Filter: active / exited"),
             OpenApiParameter(name="entry_date_from", type=str, description="YYYY-MM-DD"),
             OpenApiParameter(name="entry_date_to", type=str, description="YYYY-MM-DD"),
+            OpenApiParameter(name="export_format", type=str, description="xlsx (default) / csv"),
         ],
-        responses={200: OpenApiResponse(description="Excel file download")},
+        responses={200: OpenApiResponse(description="Excel or CSV file download")},
     )
     @action(detail=True, methods=["get"], url_path="storage-costs/export")
     def storage_costs_export(self, request, slug=None):
-        """Export storage costs for company containers to Excel."""
-        from django.http import HttpResponse
-
+        """Export storage costs for company containers to Excel or CSV."""
         from apps.billing.services.export_service import StatementExportService
         from apps.billing.services.storage_cost_service import StorageCostService
         from apps.billing.utils import filter_storage_cost_entries
+        from apps.core.services.streaming_export import parse_export_format
         from apps.terminal_operations.models import ContainerEntry
 
+        export_format = parse_export_format(request.query_params.get("export_format"))
         company = self.get_object()
 
         entries = ContainerEntry.objects.filter(
@@ -610,15 +607,12 @@ class CompanyViewSet(viewsets.ModelViewSet):
         cost_results = cost_service.calculate_bulk_costs(entries)
 
         export_service = StatementExportService()
-        excel_file = export_service.export_storage_costs_to_excel(cost_results, company.name)
-
-        response = HttpResponse(
-            excel_file.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        return export_service.storage_costs_response(
+            cost_results,
+            company.name,
+            f"storage_costs_{company.slug or 'company'}",
+            export_format,
         )
-        filename = f"storage_costs_{company.slug or 'company'}.xlsx"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
 
     @extend_schema(
         summary="List company billing statements",
@@ -802,7 +796,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
 
         Accepts optional `exchange_rate` in request body to freeze the
         CBU rate on the statement. If not provided, the service will
-        auto-fetch from cbu.uz or fall back to TerminalSettings default.
+        use the stored CBU rate or fall back to TerminalSettings default.
         """
         from decimal import Decimal, InvalidOperation
 
@@ -920,10 +914,11 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def billing_export_excel(self, request, slug=None, year=None, month=None):
         """Export a monthly statement to Excel."""
-        from django.http import HttpResponse
+        from django.http import FileResponse
 
         from apps.billing.services.export_service import StatementExportService
         from apps.billing.services.statement_service import MonthlyStatementService
+        from apps.core.services.streaming_export import XLSX_CONTENT_TYPE
 
         company = self.get_object()
         year, month = int(year), int(month)
@@ -940,15 +935,12 @@ class CompanyViewSet(viewsets.ModelViewSet):
         )
 
         export_service = StatementExportService()
-        excel_file = export_service.export_to_excel(statement)
-        filename = export_service.get_excel_filename(statement)
-
-        response = HttpResponse(
-            excel_file.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        return FileResponse(
+            export_service.export_to_excel(statement),
+            content_type=XLSX_CONTENT_TYPE,
+            as_attachment=True,
+            filename=export_service.get_excel_filename(statement),
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
 
     @extend_schema(
         summary="Export statement to PDF",
@@ -961,8 +953,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def billing_export_pdf(self, request, slug=None, year=None, month=None):
         """Export a monthly statement to PDF."""
-        from django.http import HttpResponse
+        from django.http import FileResponse
 
+        from apps.billing.services import document_cache
         from apps.billing.services.export_service import StatementExportService
         from apps.billing.services.statement_service import MonthlyStatementService
 
@@ -981,12 +974,12 @@ class CompanyViewSet(viewsets.ModelViewSet):
         )
 
         export_service = StatementExportService()
-        pdf_file = export_service.export_to_pdf(statement)
+        pdf_file = document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
         filename = export_service.get_pdf_filename(statement)
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        return FileResponse(
+            pdf_file, as_attachment=True, filename=filename, content_type="application/pdf"
+        )
 
     @extend_schema(
         summary="Export statement as Счёт-фактура (act)",
@@ -1044,10 +1037,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def billing_export_act_preview(self, request, slug=None, year=None, month=None):
         """Export a monthly statement Счёт-фактура as PDF for preview."""
-        from django.http import HttpResponse
+        from django.http import FileResponse
 
-        from apps.billing.models import TerminalSettings
-        from apps.billing.services.export_service import StatementExportService
+        from apps.billing.services import document_cache
         from apps.billing.services.statement_service import MonthlyStatementService
 
         company = self.get_object()
@@ -1064,16 +1056,11 @@ class CompanyViewSet(viewsets.ModelViewSet):
             company=company, year=year, month=month, user=request.user,
         )
 
-        settings = TerminalSettings.load()
-        export_service = StatementExportService()
-        pdf_file = export_service.export_to_schet_factura_pdf(
-            statement, settings, exchange_rate=statement.exchange_rate,
+        pdf_file = document_cache.get_rendered(document_cache.ACT_PDF, statement)
+        return FileResponse(
+            pdf_file, filename="act_preview.pdf", content_type="application/pdf"
         )
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = 'inline; filename="act_preview.pdf"'
-        return response
-
     @extend_schema(
         summary="Preview statement as HTML table",
         responses={200: OpenApiResponse(description="HTML page for preview")},
@@ -1526,8 +1513,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
     )
     def on_demand_invoice_export_pdf(self, request, slug=None, invoice_id=None):
         """Export an on-demand invoice to PDF."""
-        from django.http import HttpResponse
+        from django.http import FileResponse
 
+        from apps.billing.services import document_cache
         from apps.billing.services.export_service import StatementExportService
 
         invoice = self._get_on_demand_invoice(invoice_id)
@@ -1538,9 +1526,9 @@ class CompanyViewSet(viewsets.ModelViewSet):
             )
 
         export_service = StatementExportService()
-        pdf_file = export_service.export_on_demand_to_pdf(invoice)
+        pdf_file = document_cache.get_rendered(document_cache.ON_DEMAND_PDF, invoice)
         filename = export_service.get_on_demand_pdf_filename(invoice)
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        return FileResponse(
+            pdf_file, as_attachment=True, filename=filename, content_type="application/pdf"
+        )
@@ -0,0 +1,70 @@
+"""
+Load CBU exchange rates into the ExchangeRate table.
+
+Usage:
+    python manage.py backfill_exchange_rates                          # Last 7 days
+    python manage.py backfill_exchange_rates --start 2026-01-01 --end 2026-01-31
+    python manage.py backfill_exchange_rates --days 30 --refresh
+
+Designed for cron: 30 9 * * *
+Billing never calls cbu.uz itself, so finalization uses whatever this loaded.
+"""
+
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.billing.services import cbu_service
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError as exc:
+        raise CommandError(f"Invalid date {value!r}, expected YYYY-MM-DD") from exc
+
+
+class Command(BaseCommand):
+    help = "Fetch and store CBU exchange rates for a date range"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", type=_parse_date, help="First date (YYYY-MM-DD)")
+        parser.add_argument(
+            "--end", type=_parse_date, help="Last date (default: today)"
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=7,
+            help="Days back from --end when --start is omitted (default: 7)",
+        )
+        parser.add_argument(
+            "--currency", default="USD", help="Currency code (default: USD)"
+        )
+        parser.add_argument(
+            "--refresh",
+            action="store_true",
+            help="Re-fetch dates that are already stored",
+        )
+
+    def handle(self, *args, **options):
+        end = options["end"] or date.today()
+        start = options["start"] or end - timedelta(days=options["days"] - 1)
+        if start > end:
+            raise CommandError("--start must not be after --end")
+
+        source = cbu_service.get_rate_source()
+        self.stdout.write(
+            f"Loading {options['currency']} rates {start}..{end} from {source.name}..."
+        )
+        counts = cbu_service.backfill_rates(
+            start, end, currency=options["currency"], refresh=options["refresh"]
+        )
+
+        style = self.style.WARNING if counts["failed"] else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"Fetched {counts['fetched']}, already stored {counts['skipped']}, "
+                f"failed {counts['failed']}"
+            )
+        )
@@ -0,0 +1,26 @@
+"""
+Management command to rebuild the per-container billing ledger.
+
+Run after changes to statements or on-demand invoices that bypass the
+billing services (admin edits, raw SQL, restored dumps).
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.billing.services.billing_ledger import rebuild_all_ledgers
+
+
+class Command(BaseCommand):
+    help = "Recompute billed amounts per container entry from statements and on-demand invoices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of entries to recompute per batch (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_all_ledgers(chunk_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} ledger rows"))
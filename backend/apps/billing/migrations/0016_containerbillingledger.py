@@ -0,0 +1,47 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:20
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from apps.billing.services.billing_ledger import rebuild_all_ledgers
+
+
+def backfill_ledgers(apps, schema_editor):
+    """Compute ledger rows for containers in existing documents."""
+    rebuild_all_ledgers(registry=apps, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0015_audit_protect_financial_fks'),
+        ('terminal_operations', '0031_containerentry_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContainerBillingLedger',
+            fields=[
+                ('container_entry', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='billing_ledger', serialize=False, to='terminal_operations.containerentry', verbose_name='Запись контейнера')),
+                ('billed_usd', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Выставлено USD')),
+                ('billed_uzs', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15, verbose_name='Выставлено UZS')),
+                ('paid_usd', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Оплачено USD')),
+                ('paid_uzs', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15, verbose_name='Оплачено UZS')),
+                ('billed_through', models.DateField(blank=True, help_text='Last storage day covered by any non-cancelled document', null=True, verbose_name='Выставлено по')),
+                ('on_demand_invoiced', models.BooleanField(default=False, help_text='Included in a non-cancelled on-demand invoice', verbose_name='В разовом счёте')),
+                ('on_demand_through', models.DateField(blank=True, help_text='Last day covered by an on-demand invoice issued while on terminal; later days are billed as residual', null=True, verbose_name='Разовый счёт по')),
+                ('last_document_type', models.CharField(blank=True, choices=[('statement', 'Выписка'), ('on_demand_invoice', 'Разовый счёт')], default='', max_length=20, verbose_name='Тип последнего документа')),
+                ('last_document_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='ID последнего документа')),
+                ('last_document_number', models.CharField(blank=True, default='', max_length=30, verbose_name='Номер последнего документа')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Сводка по счетам контейнера',
+                'verbose_name_plural': 'Сводки по счетам контейнеров',
+                'indexes': [models.Index(condition=models.Q(('on_demand_through__isnull', False)), fields=['on_demand_through'], name='ledger_on_demand_through_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_ledgers, migrations.RunPython.noop),
+    ]
@@ -299,6 +299,17 @@ class Tariff(TimestampedModel):
         Returns:
             TariffRate instance or None if not found
         """
+        if "rates" in getattr(self, "_prefetched_objects_cache", {}):
+            # Served from prefetch_related("rates") without a query
+            return next(
+                (
+                    rate
+                    for rate in self.rates.all()
+                    if rate.container_size == container_size
+                    and rate.container_status == container_status
+                ),
+                None,
+            )
         return self.rates.filter(
             container_size=container_size,
             container_status=container_status,
@@ -1094,3 +1105,86 @@ class OnDemandInvoiceServiceItem(TimestampedModel):
 
     def __str__(self):
         return f"{self.container_number}: {self.description} ({self.invoice})"
+
+
+class ContainerBillingLedger(models.Model):
+    """
+    Precomputed billing totals for a container entry.
+
+    One row per entry included in a non-cancelled statement or on-demand
+    invoice. Maintained by the billing services (see services.billing_ledger)
+    so storage cost pages and residual billing read one row per container
+    instead of aggregating line items.
+    """
+
+    container_entry = models.OneToOneField(
+        "terminal_operations.ContainerEntry",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="billing_ledger",
+        verbose_name="Запись контейнера",
+    )
+
+    # Draft + finalized + paid documents
+    billed_usd = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), verbose_name="Выставлено USD"
+    )
+    billed_uzs = models.DecimalField(
+        max_digits=15, decimal_places=2, default=Decimal("0.00"), verbose_name="Выставлено UZS"
+    )
+    # Paid documents only
+    paid_usd = models.DecimalField(
+        max_digits=12, decimal_places=2, default=Decimal("0.00"), verbose_name="Оплачено USD"
+    )
+    paid_uzs = models.DecimalField(
+        max_digits=15, decimal_places=2, default=Decimal("0.00"), verbose_name="Оплачено UZS"
+    )
+
+    billed_through = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Выставлено по",
+        help_text="Last storage day covered by any non-cancelled document",
+    )
+    on_demand_invoiced = models.BooleanField(
+        default=False,
+        verbose_name="В разовом счёте",
+        help_text="Included in a non-cancelled on-demand invoice",
+    )
+    on_demand_through = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Разовый счёт по",
+        help_text="Last day covered by an on-demand invoice issued while on terminal; "
+        "later days are billed as residual",
+    )
+
+    last_document_type = models.CharField(
+        max_length=20,
+        blank=True,
+        default="",
+        choices=[("statement", "Выписка"), ("on_demand_invoice", "Разовый счёт")],
+        verbose_name="Тип последнего документа",
+    )
+    last_document_id = models.PositiveBigIntegerField(
+        null=True, blank=True, verbose_name="ID последнего документа"
+    )
+    last_document_number = models.CharField(
+        max_length=30, blank=True, default="", verbose_name="Номер последнего документа"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="дата изменения")
+
+    class Meta:
+        verbose_name = "Сводка по счетам контейнера"
+        verbose_name_plural = "Сводки по счетам контейнеров"
+        indexes = [
+            models.Index(
+                fields=["on_demand_through"],
+                condition=models.Q(on_demand_through__isnull=False),
+                name="ledger_on_demand_through_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Ledger {self.container_entry_id}: ${self.billed_usd}"
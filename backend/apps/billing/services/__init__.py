@@ -1,11 +1,16 @@
+from apps.core.utils import lazy_exports
+
 from .additional_charge_service import AdditionalChargeService
 from .expense_type_service import ExpenseTypeService
-from .export_service import StatementExportService
 from .statement_service import MonthlyStatementService
 from .storage_cost_service import StorageCostService
 from .tariff_service import TariffService
 
 
+# Excel/PDF export (openpyxl, weasyprint) loads on first use
+__getattr__ = lazy_exports(__name__, {"StatementExportService": ".export_service"})
+
+
 __all__ = [
     "AdditionalChargeService",
     "ExpenseTypeService",
@@ -0,0 +1,288 @@
+"""
+Billing Ledger - Precomputed billed amounts per container entry.
+
+Storage cost pages and residual billing used to aggregate StatementLineItem
+and OnDemandInvoiceItem rows for every container they show.
+ContainerBillingLedger keeps those totals in one row per billed entry:
+- billed/paid USD and UZS (draft, finalized and paid documents count as
+  billed; paid documents as paid)
+- billed_through: last storage day covered by any document
+- on_demand_invoiced / on_demand_through: the active on-demand invoice and
+  the last day it covers for containers invoiced while on terminal
+- last document type, id and number
+
+The statement and on-demand invoice services call refresh_ledgers() for a
+document's containers whenever it is generated, finalized, paid, credited,
+cancelled or deleted, inside the same transaction. Rows are recomputed from
+the documents, so a refresh is idempotent and `manage.py
+rebuild_billing_ledger` repairs any drift (e.g. after raw SQL edits).
+"""
+
+from collections.abc import Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.apps import apps as django_apps
+from django.db import DEFAULT_DB_ALIAS
+
+
+ACTIVE_DOCUMENT_STATUSES = ("draft", "finalized", "paid")
+PAID_STATUS = "paid"
+
+LEDGER_FIELDS = (
+    "billed_usd",
+    "billed_uzs",
+    "paid_usd",
+    "paid_uzs",
+    "billed_through",
+    "on_demand_invoiced",
+    "on_demand_through",
+    "last_document_type",
+    "last_document_id",
+    "last_document_number",
+    "updated_at",
+)
+
+DEFAULT_CHUNK_SIZE = 500
+
+ZERO = Decimal("0")
+
+
+def document_entry_ids(document) -> set[int]:
+    """Container entry ids billed by a MonthlyStatement or OnDemandInvoice."""
+    items = document.items if hasattr(document, "items") else document.line_items
+    return set(
+        items.exclude(container_entry_id=None).values_list(
+            "container_entry_id", flat=True
+        )
+    )
+
+
+class _LedgerRow:
+    """Accumulates one entry's totals while folding document items."""
+
+    def __init__(self, entry_id: int):
+        self.entry_id = entry_id
+        self.billed_usd = ZERO
+        self.billed_uzs = ZERO
+        self.paid_usd = ZERO
+        self.paid_uzs = ZERO
+        self.billed_through: date | None = None
+        self.on_demand_invoiced = False
+        self.on_demand_through: date | None = None
+        self.last_document = None  # (created_at, type, id, number)
+
+    def add(self, status, usd, uzs, through, document):
+        self.billed_usd += usd
+        self.billed_uzs += uzs
+        if status == PAID_STATUS:
+            self.paid_usd += usd
+            self.paid_uzs += uzs
+        if self.billed_through is None or through > self.billed_through:
+            self.billed_through = through
+        if self.last_document is None or document[0] > self.last_document[0]:
+            self.last_document = document
+
+    def as_model(self, model):
+        _, document_type, document_id, number = self.last_document
+        return model(
+            container_entry_id=self.entry_id,
+            billed_usd=self.billed_usd,
+            billed_uzs=self.billed_uzs,
+            paid_usd=self.paid_usd,
+            paid_uzs=self.paid_uzs,
+            billed_through=self.billed_through,
+            on_demand_invoiced=self.on_demand_invoiced,
+            on_demand_through=self.on_demand_through,
+            last_document_type=document_type,
+            last_document_id=document_id,
+            last_document_number=number,
+        )
+
+
+def _compute_rows(entry_ids, registry, using) -> dict[int, _LedgerRow]:
+    """Fold statement and on-demand items of the entries into ledger rows."""
+    StatementLineItem = registry.get_model("billing", "StatementLineItem")
+    OnDemandInvoiceItem = registry.get_model("billing", "OnDemandInvoiceItem")
+    rows: dict[int, _LedgerRow] = {}
+
+    def _row(entry_id: int) -> _LedgerRow:
+        if entry_id not in rows:
+            rows[entry_id] = _LedgerRow(entry_id)
+        return rows[entry_id]
+
+    line_items = (
+        StatementLineItem.objects.using(using)
+        .filter(
+            container_entry_id__in=entry_ids,
+            statement__status__in=ACTIVE_DOCUMENT_STATUSES,
+        )
+        .values_list(
+            "container_entry_id",
+            "statement__status",
+            "amount_usd",
+            "amount_uzs",
+            "period_end",
+            "statement__created_at",
+            "statement_id",
+            "statement__invoice_number",
+        )
+    )
+    for (
+        entry_id,
+        status,
+        usd,
+        uzs,
+        period_end,
+        created,
+        statement_id,
+        number,
+    ) in line_items:
+        _row(entry_id).add(
+            status,
+            usd,
+            uzs,
+            period_end,
+            (created, "statement", statement_id, number or f"DRAFT-{statement_id}"),
+        )
+
+    od_items = (
+        OnDemandInvoiceItem.objects.using(using)
+        .filter(
+            container_entry_id__in=entry_ids,
+            invoice__status__in=ACTIVE_DOCUMENT_STATUSES,
+        )
+        .values_list(
+            "container_entry_id",
+            "invoice__status",
+            "amount_usd",
+            "amount_uzs",
+            "entry_date",
+            "total_days",
+            "exit_date",
+            "invoice__created_at",
+            "invoice_id",
+            "invoice__invoice_number",
+        )
+    )
+    for (
+        entry_id,
+        status,
+        usd,
+        uzs,
+        entry_date,
+        total_days,
+        exit_date,
+        created,
+        invoice_id,
+        number,
+    ) in od_items:
+        # entry_date + total_days - 1 = last day covered by the invoice
+        invoiced_until = entry_date + timedelta(days=total_days - 1)
+        row = _row(entry_id)
+        row.add(
+            status,
+            usd,
+            uzs,
+            exit_date or invoiced_until,
+            (
+                created,
+                "on_demand_invoice",
+                invoice_id,
+                number or f"OD-DRAFT-{invoice_id}",
+            ),
+        )
+        row.on_demand_invoiced = True
+        if exit_date is None and (
+            row.on_demand_through is None or invoiced_until > row.on_demand_through
+        ):
+            row.on_demand_through = invoiced_until
+
+    return rows
+
+
+def refresh_ledgers(
+    entry_ids: Iterable[int],
+    registry=None,
+    using: str = DEFAULT_DB_ALIAS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Recompute ledger rows of the given container entries.
+
+    Entries no longer in any non-cancelled document lose their row.
+    `registry` is the app registry (historical apps inside migrations).
+
+    Returns: number of ledger rows written
+    """
+    registry = registry or django_apps
+    ContainerBillingLedger = registry.get_model("billing", "ContainerBillingLedger")
+    entry_ids = sorted({entry_id for entry_id in entry_ids if entry_id})
+    written = 0
+
+    for start in range(0, len(entry_ids), chunk_size):
+        chunk = entry_ids[start : start + chunk_size]
+        rows = _compute_rows(chunk, registry, using)
+
+        ContainerBillingLedger.objects.using(using).filter(
+            container_entry_id__in=set(chunk) - set(rows)
+        ).delete()
+        if rows:
+            ContainerBillingLedger.objects.using(using).bulk_create(
+                [row.as_model(ContainerBillingLedger) for row in rows.values()],
+                update_conflicts=True,
+                unique_fields=["container_entry"],
+                update_fields=LEDGER_FIELDS,
+            )
+        written += len(rows)
+
+    return written
+
+
+def rebuild_all_ledgers(
+    registry=None,
+    using: str = DEFAULT_DB_ALIAS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Recompute the ledger for every billed container entry and drop orphans."""
+    registry = registry or django_apps
+    StatementLineItem = registry.get_model("billing", "StatementLineItem")
+    OnDemandInvoiceItem = registry.get_model("billing", "OnDemandInvoiceItem")
+    ContainerBillingLedger = registry.get_model("billing", "ContainerBillingLedger")
+
+    entry_ids = set()
+    for model in (StatementLineItem, OnDemandInvoiceItem, ContainerBillingLedger):
+        entry_ids.update(
+            model.objects.using(using)
+            .exclude(container_entry_id=None)
+            .values_list("container_entry_id", flat=True)
+            .distinct()
+        )
+    return refresh_ledgers(
+        entry_ids, registry=registry, using=using, chunk_size=chunk_size
+    )
+
+
+def billed_amounts(entry_ids: Iterable[int]) -> dict[int, dict]:
+    """Billed and paid USD/UZS per entry id, for entries with a ledger row."""
+    from ..models import ContainerBillingLedger
+
+    return {
+        entry_id: {"usd": usd, "uzs": uzs, "paid_usd": paid_usd, "paid_uzs": paid_uzs}
+        for entry_id, usd, uzs, paid_usd, paid_uzs in ContainerBillingLedger.objects.filter(
+            container_entry_id__in=list(entry_ids)
+        ).values_list(
+            "container_entry_id", "billed_usd", "billed_uzs", "paid_usd", "paid_uzs"
+        )
+    }
+
+
+def on_demand_invoiced_ids(entry_ids: Iterable[int]) -> set[int]:
+    """Entry ids included in a non-cancelled on-demand invoice."""
+    from ..models import ContainerBillingLedger
+
+    return set(
+        ContainerBillingLedger.objects.filter(
+            container_entry_id__in=list(entry_ids), on_demand_invoiced=True
+        ).values_list("container_entry_id", flat=True)
+    )
@@ -3,14 +3,34 @@ Service for fetching and caching exchange rates from the Central Bank of Uzbekis
 
 API: https://cbu.uz/ru/arkhiv-kursov-valyut/json/{ccy}/{YYYY-MM-DD}/
 Public, free, no authentication required.
+
+Rates are looked up in three tiers:
+- an in-process LRU over (currency, date); published rates never change
+- the ExchangeRate table (prefetch_rates() loads a whole range in one query)
+- the configured rate source, only where fetching is explicitly allowed
+
+Billing code (statement finalization) uses get_cached_rate(), which never
+touches the network and falls back to the latest stored rate of the
+preceding days. Rates are kept current by `manage.py backfill_exchange_rates`
+(run daily from cron).
+
+The source is pluggable via settings:
+- EXCHANGE_RATE_SOURCE = "cbu" (default): the cbu.uz JSON API
+- EXCHANGE_RATE_SOURCE = "file": EXCHANGE_RATE_FILE, a JSON list in the
+  cbu.uz archive format ([{"Ccy": "USD", "Date": "31.01.2026",
+  "Rate": "12850.10"}, ...]), for tests and offline deployments
 """
 
 import calendar
+import json
 import logging
-from datetime import date
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
 
 import requests
+from django.conf import settings
 from django.utils import timezone
 
 from apps.billing.models import ExchangeRate
@@ -20,66 +40,246 @@ logger = logging.getLogger(__name__)
 CBU_API_URL = "https://cbu.uz/ru/arkhiv-kursov-valyut/json/{ccy}/{date}/"
 REQUEST_TIMEOUT = 10  # seconds
 
+RATE_CACHE_SIZE = 2048
+# How far back get_cached_rate() may look when the exact date is missing
+# (weekends and holidays have no new CBU rate)
+OFFLINE_FALLBACK_DAYS = 7
+
 
 class CBUServiceError(Exception):
     """Raised when CBU API call fails."""
 
 
-def get_rate(target_date: date, currency: str = "USD") -> Decimal:
+def _parse_rate(raw_rate, target_date: date) -> Decimal:
+    if raw_rate is None:
+        raise CBUServiceError(
+            f"В ответе ЦБ отсутствует поле Rate за {target_date}"
+        )
+    try:
+        return Decimal(str(raw_rate))
+    except (InvalidOperation, ValueError) as exc:
+        raise CBUServiceError(
+            f"Некорректное значение курса: {raw_rate}"
+        ) from exc
+
+
+# ── Rate sources ─────────────────────────────────────────────────
+
+
+class CBUApiSource:
+    """Rates from the cbu.uz JSON API (one request per date)."""
+
+    name = "cbu"
+
+    def fetch(self, target_date: date, currency: str) -> Decimal:
+        url = CBU_API_URL.format(
+            ccy=currency,
+            date=target_date.strftime("%Y-%m-%d"),
+        )
+
+        try:
+            response = requests.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            logger.error("CBU API request failed: %s", exc)
+            raise CBUServiceError(
+                f"Не удалось получить курс ЦБ за {target_date}"
+            ) from exc
+
+        data = response.json()
+        if not data or not isinstance(data, list):
+            raise CBUServiceError(
+                f"ЦБ не вернул данные за {target_date} ({currency})"
+            )
+        return _parse_rate(data[0].get("Rate"), target_date)
+
+
+class FileRateSource:
+    """Rates from a local JSON file in the cbu.uz archive format."""
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._rates: dict[tuple[str, date], Decimal] | None = None
+
+    def _load(self) -> dict[tuple[str, date], Decimal]:
+        if self._rates is None:
+            try:
+                with open(self.path, encoding="utf-8") as fh:
+                    records = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CBUServiceError(
+                    f"Не удалось прочитать файл курсов {self.path}"
+                ) from exc
+
+            rates = {}
+            for record in records:
+                record_date = datetime.strptime(record["Date"], "%d.%m.%Y").date()
+                rates[(record["Ccy"], record_date)] = _parse_rate(
+                    record.get("Rate"), record_date
+                )
+            self._rates = rates
+        return self._rates
+
+    def fetch(self, target_date: date, currency: str) -> Decimal:
+        rate = self._load().get((currency, target_date))
+        if rate is None:
+            raise CBUServiceError(
+                f"В файле курсов нет данных за {target_date} ({currency})"
+            )
+        return rate
+
+
+_source = None
+
+
+def get_rate_source():
+    """Rate source configured by EXCHANGE_RATE_SOURCE (built once)."""
+    global _source
+    if _source is None:
+        kind = getattr(settings, "EXCHANGE_RATE_SOURCE", "cbu")
+        if kind == "file":
+            _source = FileRateSource(settings.EXCHANGE_RATE_FILE)
+        else:
+            _source = CBUApiSource()
+    return _source
+
+
+def set_rate_source(source) -> None:
+    """Replace the rate source (None re-reads settings on next use)."""
+    global _source
+    _source = source
+
+
+# ── In-process cache ─────────────────────────────────────────────
+
+
+class _RateCache:
+    """Thread-safe LRU of (currency, date) -> rate."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple[str, date], Decimal] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, currency: str, target_date: date) -> Decimal | None:
+        key = (currency, target_date)
+        with self._lock:
+            rate = self._data.get(key)
+            if rate is not None:
+                self._data.move_to_end(key)
+            return rate
+
+    def put(self, currency: str, target_date: date, rate: Decimal) -> None:
+        key = (currency, target_date)
+        with self._lock:
+            self._data[key] = rate
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_cache = _RateCache(RATE_CACHE_SIZE)
+
+
+def clear_rate_cache() -> None:
+    """Drop all in-process rates (tests, manual corrections in admin)."""
+    _cache.clear()
+
+
+def prefetch_rates(start: date, end: date, currency: str = "USD") -> dict[date, Decimal]:
+    """Load stored rates for start..end into the cache with one query."""
+    rates = dict(
+        ExchangeRate.objects.filter(
+            currency=currency, date__gte=start, date__lte=end
+        ).values_list("date", "rate")
+    )
+    for rate_date, rate in rates.items():
+        _cache.put(currency, rate_date, rate)
+    return rates
+
+
+# ── Lookups ──────────────────────────────────────────────────────
+
+
+def get_rate(target_date: date, currency: str = "USD", fetch: bool = True) -> Decimal:
     """
     Get the exchange rate for a given date.
 
-    Checks the local cache first. If not found, fetches from cbu.uz and caches.
-    Returns the rate as Decimal.
+    Checks the in-process cache, then the ExchangeRate table. On a miss the
+    rate source is queried and the result stored, unless fetch=False, in
+    which case CBUServiceError is raised.
     """
+    rate = _cache.get(currency, target_date)
+    if rate is not None:
+        return rate
+
     cached = ExchangeRate.objects.filter(
         currency=currency, date=target_date
-    ).first()
+    ).values_list("rate", flat=True).first()
 
-    if cached:
-        return cached.rate
+    if cached is not None:
+        _cache.put(currency, target_date, cached)
+        return cached
 
+    if not fetch:
+        raise CBUServiceError(
+            f"Курс ЦБ за {target_date} ({currency}) не загружен"
+        )
     return fetch_and_cache(target_date, currency)
 
 
-def fetch_and_cache(target_date: date, currency: str = "USD") -> Decimal:
+def get_cached_rate(
+    target_date: date,
+    currency: str = "USD",
+    fallback_days: int = OFFLINE_FALLBACK_DAYS,
+) -> Decimal:
     """
-    Fetch rate from CBU API and store in cache.
+    Rate for a date without touching the network.
 
-    Raises CBUServiceError if the API is unreachable or returns unexpected data.
+    Uses the exact date when stored, otherwise the latest stored rate of
+    the preceding `fallback_days` days. Raises CBUServiceError if none.
     """
-    url = CBU_API_URL.format(
-        ccy=currency,
-        date=target_date.strftime("%Y-%m-%d"),
-    )
+    rate = _cache.get(currency, target_date)
+    if rate is not None:
+        return rate
 
-    try:
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        logger.error("CBU API request failed: %s", exc)
-        raise CBUServiceError(
-            f"Не удалось получить курс ЦБ за {target_date}"
-        ) from exc
-
-    data = response.json()
-    if not data or not isinstance(data, list):
+    latest = (
+        ExchangeRate.objects.filter(
+            currency=currency,
+            date__lte=target_date,
+            date__gte=target_date - timedelta(days=fallback_days),
+        )
+        .order_by("-date")
+        .values_list("date", "rate")
+        .first()
+    )
+    if latest is None:
         raise CBUServiceError(
-            f"ЦБ не вернул данные за {target_date} ({currency})"
+            f"Курс ЦБ за {target_date} ({currency}) не загружен"
         )
 
-    raw_rate = data[0].get("Rate")
-    if raw_rate is None:
-        raise CBUServiceError(
-            f"В ответе ЦБ отсутствует поле Rate за {target_date}"
+    rate_date, rate = latest
+    _cache.put(currency, rate_date, rate)
+    if rate_date != target_date:
+        logger.info(
+            "No stored CBU rate for %s %s, using %s", currency, target_date, rate_date
         )
+    return rate
 
-    try:
-        rate = Decimal(str(raw_rate))
-    except (InvalidOperation, ValueError) as exc:
-        raise CBUServiceError(
-            f"Некорректное значение курса: {raw_rate}"
-        ) from exc
+
+def fetch_and_cache(target_date: date, currency: str = "USD") -> Decimal:
+    """
+    Fetch rate from the rate source and store it.
+
+    Raises CBUServiceError if the source is unreachable or returns unexpected data.
+    """
+    rate = get_rate_source().fetch(target_date, currency)
 
     # Upsert into cache
     ExchangeRate.objects.update_or_create(
@@ -90,6 +290,7 @@ def fetch_and_cache(target_date: date, currency: str = "USD") -> Decimal:
             "fetched_at": timezone.now(),
         },
     )
+    _cache.put(currency, target_date, rate)
 
     logger.info(
         "Cached CBU rate: %s %s = %s UZS",
@@ -100,12 +301,41 @@ def fetch_and_cache(target_date: date, currency: str = "USD") -> Decimal:
     return rate
 
 
+def backfill_rates(
+    start: date, end: date, currency: str = "USD", refresh: bool = False
+) -> dict[str, int]:
+    """
+    Fetch and store rates for every date in start..end.
+
+    Dates already stored are skipped unless refresh=True. Failures are
+    logged and counted, not raised, so one bad day doesn't stop the run.
+    """
+    stored = {} if refresh else prefetch_rates(start, end, currency)
+    counts = {"fetched": 0, "skipped": 0, "failed": 0}
+
+    day = start
+    while day <= end:
+        if day in stored:
+            counts["skipped"] += 1
+        else:
+            try:
+                fetch_and_cache(day, currency)
+                counts["fetched"] += 1
+            except CBUServiceError as exc:
+                logger.warning("Backfill %s %s failed: %s", currency, day, exc)
+                counts["failed"] += 1
+        day += timedelta(days=1)
+
+    return counts
+
+
 def get_last_day_of_month_rate(year: int, month: int, currency: str = "USD") -> Decimal:
     """
     Convenience: get the rate for the last day of a given month.
 
     This is what accountants typically need for monthly billing documents.
+    Never calls the rate source (see get_cached_rate).
     """
     last_day = calendar.monthrange(year, month)[1]
     target = date(year, month, last_day)
-    return get_rate(target, currency)
+    return get_cached_rate(target, currency)
@@ -0,0 +1,177 @@
+"""
+Rendered Document Cache - PDFs and act previews of issued billing documents.
+
+WeasyPrint takes seconds for long statements, and an issued (non-draft)
+statement or on-demand invoice never changes. Rendered documents are stored
+through Django storage under
+
+    billing_documents/<statement|on-demand>-<id>/<version>-<kind>
+
+where the version hashes everything the output depends on (document
+number, finalization, exchange rate, company and, for acts, terminal
+settings) plus RENDER_VERSION. Downloads of issued documents are then plain
+file serving; drafts are always rendered fresh.
+
+Documents are pre-rendered in a background thread once finalization
+commits (schedule_prerender) or on first request. invalidate() drops a
+document's files on credit note, regeneration or deletion.
+"""
+
+import hashlib
+import logging
+import threading
+from collections.abc import Callable
+
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from ..models import MonthlyStatement, StatementStatus, TerminalSettings
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when a template or renderer changes so stale files are not served
+RENDER_VERSION = "1"
+
+STORAGE_DIR = "billing_documents"
+
+STATEMENT_PDF = "statement.pdf"
+ACT_PDF = "act.pdf"
+ACT_HTML = "act.html"
+ON_DEMAND_PDF = "invoice.pdf"
+
+STATEMENT_KINDS = (STATEMENT_PDF, ACT_PDF, ACT_HTML)
+ON_DEMAND_KINDS = (ON_DEMAND_PDF,)
+
+# Kinds whose output depends on TerminalSettings (requisites, VAT, default rate)
+SETTINGS_KINDS = {ACT_PDF, ACT_HTML}
+
+
+def _renderers() -> dict[str, Callable]:
+    from .export_service import StatementExportService
+
+    service = StatementExportService()
+    return {
+        STATEMENT_PDF: lambda document, settings: service.export_to_pdf(
+            document
+        ).getvalue(),
+        ACT_PDF: lambda document, settings: service.export_to_schet_factura_pdf(
+            document, settings, exchange_rate=document.exchange_rate
+        ).getvalue(),
+        ACT_HTML: lambda document, settings: service.render_act_html(
+            document, settings
+        ).encode("utf-8"),
+        ON_DEMAND_PDF: lambda document, settings: service.export_on_demand_to_pdf(
+            document
+        ).getvalue(),
+    }
+
+
+def document_dir(document) -> str:
+    """Storage directory holding a document's rendered files."""
+    prefix = "statement" if isinstance(document, MonthlyStatement) else "on-demand"
+    return f"{STORAGE_DIR}/{prefix}-{document.pk}"
+
+
+def content_version(
+    kind: str, document, settings: TerminalSettings | None = None
+) -> str:
+    """Hash of everything the rendered output of `kind` depends on."""
+    parts = [
+        RENDER_VERSION,
+        kind,
+        document.invoice_number or "",
+        document.finalized_at.isoformat() if document.finalized_at else "",
+        str(getattr(document, "exchange_rate", "") or ""),
+        document.company.updated_at.isoformat(),
+    ]
+    if kind in SETTINGS_KINDS:
+        parts.append(settings.updated_at.isoformat())
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def is_cacheable(document) -> bool:
+    """Only issued documents are immutable; drafts are regenerated at will."""
+    return document.status != StatementStatus.DRAFT
+
+
+def get_rendered(kind: str, document, settings: TerminalSettings | None = None) -> File:
+    """
+    Rendered document as an open file, from storage when already rendered.
+
+    Args:
+        kind: One of STATEMENT_PDF, ACT_PDF, ACT_HTML, ON_DEMAND_PDF
+        document: MonthlyStatement or OnDemandInvoice
+        settings: TerminalSettings (loaded if omitted and the kind needs it)
+    """
+    if settings is None and kind in SETTINGS_KINDS:
+        settings = TerminalSettings.load()
+    render = _renderers()[kind]
+
+    if not is_cacheable(document):
+        return ContentFile(render(document, settings))
+
+    path = (
+        f"{document_dir(document)}/{content_version(kind, document, settings)}-{kind}"
+    )
+    if default_storage.exists(path):
+        return default_storage.open(path)
+
+    content = render(document, settings)
+    saved = default_storage.save(path, ContentFile(content))
+    if saved != path:
+        # Rendered concurrently by another request; keep the first file
+        default_storage.delete(saved)
+    logger.info(f"Rendered {kind} for {document_dir(document)} ({len(content)} bytes)")
+    return ContentFile(content, name=path)
+
+
+def prerender(document) -> None:
+    """Render every kind of an issued document into storage."""
+    kinds = (
+        STATEMENT_KINDS if isinstance(document, MonthlyStatement) else ON_DEMAND_KINDS
+    )
+    settings = TerminalSettings.load()
+    for kind in kinds:
+        try:
+            get_rendered(kind, document, settings)
+        except Exception:
+            logger.exception(
+                f"Failed to pre-render {kind} for {document_dir(document)}"
+            )
+
+
+def schedule_prerender(document) -> None:
+    """Pre-render a document in a background thread once the transaction commits."""
+    model = type(document)
+    pk = document.pk
+
+    def _run():
+        try:
+            prerender(model.objects.select_related("company").get(pk=pk))
+        except Exception:
+            logger.exception(f"Pre-render of {model.__name__} {pk} failed")
+        finally:
+            connection.close()
+
+    def _start():
+        threading.Thread(
+            target=_run, daemon=True, name=f"prerender-{model.__name__}-{pk}"
+        ).start()
+
+    transaction.on_commit(_start)
+
+
+def invalidate(document) -> int:
+    """Delete all rendered files of a document. Returns number of files removed."""
+    directory = document_dir(document)
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for name in files:
+        default_storage.delete(f"{directory}/{name}")
+    if files:
+        logger.info(f"Invalidated {len(files)} rendered files of {directory}")
+    return len(files)
@@ -1,13 +1,18 @@
 """
 Statement export service for Excel and PDF generation.
+
+Statement and storage cost tables are written through StreamingTableExport
+(openpyxl write-only mode, named styles); the smaller on-demand invoice and
+act workbooks are still built in memory.
 """
 
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Iterator
 from decimal import Decimal
 from io import BytesIO
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING
 
 from django.template.loader import render_to_string
 from openpyxl import Workbook
@@ -15,6 +20,17 @@ from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 from openpyxl.utils import get_column_letter
 
 from apps.core.services.base_service import BaseService
+from apps.core.services.streaming_export import (
+    EXPORT_CHUNK_SIZE,
+    STYLE_NUMBER,
+    STYLE_SUBTITLE,
+    STYLE_TITLE,
+    STYLE_USD,
+    STYLE_UZS,
+    XLSX,
+    ExportColumn,
+    StreamingTableExport,
+)
 
 
 if TYPE_CHECKING:
@@ -22,75 +38,67 @@ if TYPE_CHECKING:
     from .storage_cost_service import ContainerCostResult
 
 
+STATEMENT_COLUMNS = [
+    ExportColumn(("Контейнер",), 15),
+    ExportColumn(("Размер",), 10),
+    ExportColumn(("Статус",), 12),
+    ExportColumn(("Начало",), 12),
+    ExportColumn(("Конец",), 14),
+    ExportColumn(("Всего дней",), 10, STYLE_NUMBER),
+    ExportColumn(("Льготных",), 10, STYLE_NUMBER),
+    ExportColumn(("Оплачиваемых",), 12, STYLE_NUMBER),
+    ExportColumn(("Ставка USD",), 12, STYLE_USD),
+    ExportColumn(("Сумма USD",), 12, STYLE_USD),
+    ExportColumn(("Сумма UZS",), 15, STYLE_UZS),
+]
+
+STORAGE_COST_COLUMNS = [
+    ExportColumn(("Контейнер",), 15),
+    ExportColumn(("Размер",), 10),
+    ExportColumn(("Статус",), 12),
+    ExportColumn(("Дата въезда",), 12),
+    ExportColumn(("Дата выезда",), 14),
+    ExportColumn(("Всего дней",), 10, STYLE_NUMBER),
+    ExportColumn(("Льготных",), 10, STYLE_NUMBER),
+    ExportColumn(("Оплачиваемых",), 12, STYLE_NUMBER),
+    ExportColumn(("Сумма USD",), 12, STYLE_USD),
+    ExportColumn(("Сумма UZS",), 15, STYLE_UZS),
+]
+
+
 class StatementExportService(BaseService):
     """Service for exporting statements to Excel and PDF formats."""
 
-    def export_to_excel(self, statement: "MonthlyStatement") -> BytesIO:
-        """Generate Excel file from statement."""
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Выписка {statement.month:02d}-{statement.year}"
-
-        # Styles
-        header_font = Font(bold=True, size=14)
-        subheader_font = Font(bold=True, size=11)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_text = Font(bold=True, color="FFFFFF")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
+    def export_to_excel(self, statement: "MonthlyStatement") -> IO[bytes]:
+        """Generate Excel file from statement (temporary file, rewound)."""
+        generated = statement.generated_at.strftime("%d.%m.%Y %H:%M")
+        export = StreamingTableExport(
+            sheet_title=f"Выписка {statement.month:02d}-{statement.year}",
+            columns=STATEMENT_COLUMNS,
+            preamble=[
+                [(f"Выписка за {statement.month_name} {statement.year}", STYLE_TITLE)],
+                [],
+                [f"Компания: {statement.company.name}"],
+                [f"Метод расчёта: {statement.billing_method_display}"],
+                [f"Дата формирования: {generated}"],
+                [],
+                [("ИТОГО:", STYLE_SUBTITLE)],
+                [f"Контейнеров: {statement.total_containers}"],
+                [f"Оплачиваемых дней: {statement.total_billable_days}"],
+                [f"Сумма USD: ${statement.total_usd:,.2f}"],
+                [f"Сумма UZS: {statement.total_uzs:,.0f} сум"],
+                [],
+            ],
+            freeze_header=False,
         )
+        return export.xlsx_file(self._statement_rows(statement))
 
-        # Title section
-        ws.merge_cells("A1:K1")
-        ws["A1"] = f"Выписка за {statement.month_name} {statement.year}"
-        ws["A1"].font = header_font
-        ws["A1"].alignment = Alignment(horizontal="center")
-
-        ws["A3"] = f"Компания: {statement.company.name}"
-        ws["A4"] = f"Метод расчёта: {statement.billing_method_display}"
-        ws["A5"] = f"Дата формирования: {statement.generated_at.strftime('%d.%m.%Y %H:%M')}"
-
-        # Summary section
-        ws["A7"] = "ИТОГО:"
-        ws["A7"].font = subheader_font
-        ws["A8"] = f"Контейнеров: {statement.total_containers}"
-        ws["A9"] = f"Оплачиваемых дней: {statement.total_billable_days}"
-        ws["A10"] = f"Сумма USD: ${statement.total_usd:,.2f}"
-        ws["A11"] = f"Сумма UZS: {statement.total_uzs:,.0f} сум"
-
-        # Table headers
-        headers = [
-            "Контейнер",
-            "Размер",
-            "Статус",
-            "Начало",
-            "Конец",
-            "Всего дней",
-            "Льготных",
-            "Оплачиваемых",
-            "Ставка USD",
-            "Сумма USD",
-            "Сумма UZS",
-        ]
-
-        row = 13
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = header_text
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
-
-        # Table data
-        for item in statement.line_items.all():
-            row += 1
+    def _statement_rows(self, statement: "MonthlyStatement") -> Iterator[list]:
+        for item in statement.line_items.all().iterator(chunk_size=EXPORT_CHUNK_SIZE):
             end_display = (
                 "На терминале" if item.is_still_on_terminal else item.period_end.strftime("%d.%m.%Y")
             )
-            data = [
+            yield [
                 item.container_number,
                 item.container_size_display,
                 item.container_status_display,
@@ -103,26 +111,6 @@ class StatementExportService(BaseService):
                 item.amount_usd,
                 item.amount_uzs,
             ]
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row, column=col, value=value)
-                cell.border = thin_border
-                if col >= 6:  # Numbers
-                    cell.alignment = Alignment(horizontal="right")
-                if col in (9, 10):  # USD amounts
-                    cell.number_format = "#,##0.00"
-                elif col == 11:  # UZS amounts
-                    cell.number_format = "#,##0"
-
-        # Adjust column widths
-        column_widths = [15, 10, 12, 12, 14, 10, 10, 12, 12, 12, 15]
-        for i, width in enumerate(column_widths, 1):
-            ws.column_dimensions[get_column_letter(i)].width = width
-
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output
 
     def export_to_pdf(self, statement: "MonthlyStatement") -> BytesIO:
         """Generate PDF from statement using HTML template."""
@@ -311,69 +299,41 @@ class StatementExportService(BaseService):
 
     # --- Storage costs export ---
 
-    def export_storage_costs_to_excel(
+    def build_storage_costs_export(
         self,
         cost_results: list[ContainerCostResult],
         company_name: str,
-    ) -> BytesIO:
-        """Generate Excel file from storage cost calculation results."""
+    ) -> StreamingTableExport:
+        """Layout of the storage cost export (title and totals above the table)."""
         from django.utils import timezone
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Текущие расходы"
-
-        # Styles
-        header_font = Font(bold=True, size=14)
-        subheader_font = Font(bold=True, size=11)
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        header_text = Font(bold=True, color="FFFFFF")
-        thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        # Title
-        ws.merge_cells("A1:K1")
-        ws["A1"] = f"Текущие расходы — {company_name}"
-        ws["A1"].font = header_font
-        ws["A1"].alignment = Alignment(horizontal="center")
-
-        ws["A3"] = f"Дата формирования: {timezone.now().strftime('%d.%m.%Y %H:%M')}"
-        ws["A4"] = f"Контейнеров: {len(cost_results)}"
-
-        # Summary
         total_usd = sum(r.total_usd for r in cost_results)
         total_uzs = sum(r.total_uzs for r in cost_results)
         total_billable = sum(r.billable_days for r in cost_results)
 
-        ws["A6"] = "ИТОГО:"
-        ws["A6"].font = subheader_font
-        ws["A7"] = f"Оплачиваемых дней: {total_billable}"
-        ws["A8"] = f"Сумма USD: ${total_usd:,.2f}"
-        ws["A9"] = f"Сумма UZS: {total_uzs:,.0f} сум"
-
-        # Table headers
-        headers = [
-            "Контейнер", "Размер", "Статус", "Дата въезда", "Дата выезда",
-            "Всего дней", "Льготных", "Оплачиваемых",
-            "Сумма USD", "Сумма UZS",
-        ]
-
-        row = 11
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = header_text
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal="center")
+        return StreamingTableExport(
+            sheet_title="Текущие расходы",
+            columns=STORAGE_COST_COLUMNS,
+            preamble=[
+                [(f"Текущие расходы — {company_name}", STYLE_TITLE)],
+                [],
+                [f"Дата формирования: {timezone.now().strftime('%d.%m.%Y %H:%M')}"],
+                [f"Контейнеров: {len(cost_results)}"],
+                [],
+                [("ИТОГО:", STYLE_SUBTITLE)],
+                [f"Оплачиваемых дней: {total_billable}"],
+                [f"Сумма USD: ${total_usd:,.2f}"],
+                [f"Сумма UZS: {total_uzs:,.0f} сум"],
+                [],
+            ],
+            freeze_header=False,
+        )
 
+    def storage_cost_rows(self, cost_results: list[ContainerCostResult]) -> Iterator[list]:
+        """Table rows of the storage cost export."""
         for result in cost_results:
-            row += 1
             end_display = "На терминале" if result.is_active else result.end_date.strftime("%d.%m.%Y")
-            data = [
+            yield [
                 result.container_number,
                 result.container_size,
                 result.container_status,
@@ -385,25 +345,26 @@ class StatementExportService(BaseService):
                 result.total_usd,
                 result.total_uzs,
             ]
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row, column=col, value=value)
-                cell.border = thin_border
-                if col >= 6:
-                    cell.alignment = Alignment(horizontal="right")
-                if col == 9:  # USD
-                    cell.number_format = "#,##0.00"
-                elif col == 10:  # UZS
-                    cell.number_format = "#,##0"
 
-        # Column widths
-        column_widths = [15, 10, 12, 12, 14, 10, 10, 12, 12, 15]
-        for i, width in enumerate(column_widths, 1):
-            ws.column_dimensions[get_column_letter(i)].width = width
+    def export_storage_costs_to_excel(
+        self,
+        cost_results: list[ContainerCostResult],
+        company_name: str,
+    ) -> IO[bytes]:
+        """Generate Excel file from storage cost calculation results (temporary file, rewound)."""
+        export = self.build_storage_costs_export(cost_results, company_name)
+        return export.xlsx_file(self.storage_cost_rows(cost_results))
 
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        return output
+    def storage_costs_response(
+        self,
+        cost_results: list[ContainerCostResult],
+        company_name: str,
+        filename: str,
+        export_format: str = XLSX,
+    ):
+        """Streaming XLSX or CSV download of storage cost results (filename without extension)."""
+        export = self.build_storage_costs_export(cost_results, company_name)
+        return export.response(self.storage_cost_rows(cost_results), filename, export_format)
 
     # --- Счёт-фактура (formal invoice) export ---
 
@@ -787,6 +748,93 @@ class StatementExportService(BaseService):
         output.seek(0)
         return output
 
+    def render_act_html(
+        self,
+        statement: "MonthlyStatement",
+        settings: "TerminalSettings",
+    ) -> str:
+        """Render Счёт-фактура as an HTML preview (no WeasyPrint needed)."""
+        import calendar
+
+        rate = statement.exchange_rate or settings.default_usd_uzs_rate or Decimal("0")
+
+        grouped = self._group_line_items(statement)
+        service_grouped = self._group_service_items(statement)
+        vat_rate = settings.vat_rate or Decimal("12")
+
+        # Act date = last day of the billing month
+        last_day = calendar.monthrange(statement.year, statement.month)[1]
+        act_date = f"{last_day:02d}.{statement.month:02d}.{statement.year} г."
+
+        item_no = 0
+        grand_total_usd = Decimal("0")
+        grand_total_uzs = Decimal("0")
+        grand_vat_usd = Decimal("0")
+        grand_vat_uzs = Decimal("0")
+
+        grouped_items = []
+        for label, total_usd, qty, unit, period_start, period_end in grouped:
+            item_no += 1
+            total_uzs = total_usd * rate
+            # НДС added on top of net amount
+            vat_usd = (total_usd * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
+            vat_uzs = (total_uzs * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
+            grand_total_usd += total_usd
+            grand_total_uzs += total_uzs
+            grand_vat_usd += vat_usd
+            grand_vat_uzs += vat_uzs
+            grouped_items.append({
+                "number": item_no, "label": label, "unit": unit, "qty": qty,
+                "unit_price_usd": f"{total_usd / qty if qty else 0:,.2f}",
+                "total_usd": f"{total_usd:,.2f}", "vat_usd": f"{vat_usd:,.2f}",
+                "total_with_vat_usd": f"{total_usd + vat_usd:,.2f}",
+                "unit_price_uzs": f"{total_uzs / qty if qty else 0:,.0f}",
+                "total_uzs": f"{total_uzs:,.0f}", "vat_uzs": f"{vat_uzs:,.0f}",
+                "total_with_vat_uzs": f"{total_uzs + vat_uzs:,.0f}",
+                "period_start": period_start, "period_end": period_end,
+            })
+
+        svc_items = []
+        for desc, svc_total_usd, svc_qty, svc_unit in service_grouped:
+            item_no += 1
+            svc_total_uzs = svc_total_usd * rate
+            svc_vat_usd = (svc_total_usd * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
+            svc_vat_uzs = (svc_total_uzs * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
+            grand_total_usd += svc_total_usd
+            grand_total_uzs += svc_total_uzs
+            grand_vat_usd += svc_vat_usd
+            grand_vat_uzs += svc_vat_uzs
+            svc_items.append({
+                "number": item_no, "label": desc, "unit": svc_unit, "qty": svc_qty,
+                "unit_price_usd": f"{svc_total_usd / svc_qty if svc_qty else 0:,.2f}",
+                "total_usd": f"{svc_total_usd:,.2f}", "vat_usd": f"{svc_vat_usd:,.2f}",
+                "total_with_vat_usd": f"{svc_total_usd + svc_vat_usd:,.2f}",
+                "unit_price_uzs": f"{svc_total_uzs / svc_qty if svc_qty else 0:,.0f}",
+                "total_uzs": f"{svc_total_uzs:,.0f}", "vat_uzs": f"{svc_vat_uzs:,.0f}",
+                "total_with_vat_uzs": f"{svc_total_uzs + svc_vat_uzs:,.0f}",
+            })
+
+        # Format contract date if available
+        contract_date_formatted = ""
+        if statement.company.contract_date:
+            contract_date_formatted = statement.company.contract_date.strftime("%d.%m.%Y г.")
+
+        return render_to_string("billing/schet_factura_html_preview.html", {
+            "statement": statement,
+            "settings": settings,
+            "act_date": act_date,
+            "contract_date_formatted": contract_date_formatted,
+            "exchange_rate": f"{rate:,.2f}",
+            "grouped_items": grouped_items,
+            "service_items": svc_items,
+            "grand_total_usd": f"{grand_total_usd:,.2f}",
+            "grand_total_uzs": f"{grand_total_uzs:,.0f}",
+            "grand_vat_usd": f"{grand_vat_usd:,.2f}",
+            "grand_vat_uzs": f"{grand_vat_uzs:,.0f}",
+            "grand_total_with_vat_usd": f"{grand_total_usd + grand_vat_usd:,.2f}",
+            "grand_total_with_vat_uzs": f"{grand_total_uzs + grand_vat_uzs:,.0f}",
+        })
+
     # ----- private helpers -----
 
     @staticmethod
@@ -23,6 +23,8 @@ from ..models import (
     OnDemandInvoiceServiceItem,
     StatementStatus,
 )
+from . import document_cache
+from .billing_ledger import document_entry_ids, refresh_ledgers
 from .storage_cost_service import StorageCostService
 
 if TYPE_CHECKING:
@@ -175,6 +177,7 @@ class OnDemandInvoiceService(BaseService):
         invoice.total_usd = total_usd + services_usd
         invoice.total_uzs = total_uzs + services_uzs
         invoice.save(update_fields=["total_containers", "total_usd", "total_uzs"])
+        refresh_ledgers(found_ids)
 
         self.logger.info(
             f"Created on-demand invoice {invoice.id} for {company.name}: "
@@ -210,6 +213,8 @@ class OnDemandInvoiceService(BaseService):
                     invoice.save(update_fields=[
                         "status", "invoice_number", "finalized_at", "finalized_by",
                     ])
+                    refresh_ledgers(document_entry_ids(invoice))
+                    document_cache.schedule_prerender(invoice)
 
                     self.logger.info(
                         f"Finalized on-demand invoice {invoice.id} as {invoice_number}"
@@ -266,6 +271,7 @@ class OnDemandInvoiceService(BaseService):
             "status", "paid_at", "paid_marked_by",
             "payment_reference", "payment_date",
         ])
+        refresh_ledgers(document_entry_ids(invoice))
         return invoice
 
     @transaction.atomic
@@ -283,7 +289,10 @@ class OnDemandInvoiceService(BaseService):
 
         invoice_id = invoice.id
         company_name = invoice.company.name
+        entry_ids = document_entry_ids(invoice)
+        document_cache.invalidate(invoice)
         invoice.delete()
+        refresh_ledgers(entry_ids)
 
         self.logger.info(
             f"Deleted draft on-demand invoice {invoice_id} for {company_name} by {user}"
@@ -324,6 +333,7 @@ class OnDemandInvoiceService(BaseService):
         invoice.save(update_fields=[
             "status", "cancelled_at", "cancelled_by", "cancellation_reason"
         ])
+        refresh_ledgers(document_entry_ids(invoice))
 
         # Collect affected container numbers for the log message
         affected_containers = list(
@@ -18,9 +18,11 @@ from django.db.models import Max, Q, QuerySet
 from django.utils import timezone
 
 from apps.core.exceptions import BusinessLogicError
+from apps.core.metrics import timed
 from apps.core.services.base_service import BaseService
 
 from ..models import (
+    ContainerBillingLedger,
     MonthlyStatement,
     StatementLineItem,
     StatementServiceItem,
@@ -28,6 +30,8 @@ from ..models import (
     StatementType,
     Tariff,
 )
+from . import document_cache
+from .billing_ledger import document_entry_ids, refresh_ledgers
 from .storage_cost_service import StorageCostService, TariffNotFoundError, TariffRateMissingError
 
 
@@ -62,6 +66,7 @@ class MonthlyStatementService(BaseService):
 
     # ── Statement generation ──────────────────────────────────────
 
+    @timed()
     def get_or_generate_statement(
         self,
         company: "Company",
@@ -117,7 +122,10 @@ class MonthlyStatementService(BaseService):
             entries = self._get_containers_for_exit_billing(company, month_start, month_end)
 
         # Delete existing items if regenerating
+        stale_entry_ids = set()
         if existing:
+            stale_entry_ids = document_entry_ids(existing)
+            document_cache.invalidate(existing)
             existing.line_items.all().delete()
             existing.service_items.all().delete()
             statement = existing
@@ -200,6 +208,8 @@ class MonthlyStatementService(BaseService):
         statement.pending_containers_data = pending_data
         statement.save()
 
+        refresh_ledgers(stale_entry_ids | document_entry_ids(statement))
+
         self.logger.info(
             f"Generated statement {statement.id}: {line_items_created} containers, "
             f"storage=${total_storage_usd}, services=${total_services_usd}"
@@ -371,6 +381,7 @@ class MonthlyStatementService(BaseService):
 
     # ── Lifecycle actions ─────────────────────────────────────────
 
+    @timed()
     def finalize_statement(
         self,
         statement: MonthlyStatement,
@@ -389,7 +400,8 @@ class MonthlyStatementService(BaseService):
                 error_code="INVALID_STATUS_TRANSITION",
             )
 
-        # Auto-fill exchange rate from CBU if not already set by admin
+        # Auto-fill exchange rate from stored CBU rates if not already set by admin
+        # (never calls cbu.uz; rates are loaded by backfill_exchange_rates)
         if not statement.exchange_rate:
             try:
                 from apps.billing.services import cbu_service
@@ -399,14 +411,14 @@ class MonthlyStatementService(BaseService):
                 )
                 statement.exchange_rate = rate
             except Exception:
-                # Fallback to TerminalSettings default if CBU is unreachable
+                # Fallback to TerminalSettings default if no CBU rate is stored
                 from apps.billing.models import TerminalSettings
 
                 settings = TerminalSettings.load()
                 if settings.default_usd_uzs_rate:
                     statement.exchange_rate = settings.default_usd_uzs_rate
                 self.logger.warning(
-                    "CBU rate fetch failed for statement %s, using settings default",
+                    "CBU rate lookup failed for statement %s, using settings default",
                     statement.id,
                 )
 
@@ -429,6 +441,8 @@ class MonthlyStatementService(BaseService):
                         update_fields.append("exchange_rate")
 
                     statement.save(update_fields=update_fields)
+                    refresh_ledgers(document_entry_ids(statement))
+                    document_cache.schedule_prerender(statement)
 
                     self.logger.info(
                         f"Finalized statement {statement.id} as {invoice_number} by {user}"
@@ -447,6 +461,7 @@ class MonthlyStatementService(BaseService):
             error_code="INVOICE_NUMBER_GENERATION_FAILED",
         )
 
+    @transaction.atomic
     def mark_paid(
         self,
         statement: MonthlyStatement,
@@ -468,6 +483,7 @@ class MonthlyStatementService(BaseService):
             )
 
         statement.save(update_fields=["status", "paid_at", "paid_marked_by"])
+        refresh_ledgers(document_entry_ids(statement))
         self.logger.info(
             f"Statement {statement.id} marked as {statement.status} by {user}"
         )
@@ -546,6 +562,8 @@ class MonthlyStatementService(BaseService):
         # Mark original as cancelled
         original.status = StatementStatus.CANCELLED
         original.save(update_fields=["status"])
+        refresh_ledgers(document_entry_ids(original))
+        document_cache.invalidate(original)
 
         self.logger.info(
             f"Created credit note {credit_note.id} for statement {original.id}"
@@ -595,6 +613,7 @@ class MonthlyStatementService(BaseService):
     # ── Bulk generation ───────────────────────────────────────────
 
     @transaction.atomic
+    @timed()
     def generate_all_drafts(
         self,
         year: int,
@@ -698,7 +717,10 @@ class MonthlyStatementService(BaseService):
                 error_code="STATEMENT_NOT_EDITABLE",
             )
         statement_id = statement.id
+        entry_ids = document_entry_ids(statement)
+        document_cache.invalidate(statement)
         statement.delete()
+        refresh_ledgers(entry_ids)
         self.logger.info(f"Deleted statement {statement_id}")
 
     # ── Helpers ────────────────────────────────────────────────────
@@ -772,40 +794,37 @@ class MonthlyStatementService(BaseService):
         and has since exited, any days beyond the invoiced period are "residual" and should
         be billed in the monthly statement.
 
+        One residual line per container, starting the day after the last day
+        covered by any of its active on-demand invoices, so overlapping
+        invoices do not bill the same residual days twice.
+
         Returns: (total_usd, total_uzs, total_billable_days, items_created)
         """
         from datetime import timedelta
 
-        from ..models import OnDemandInvoiceItem
-
         total_usd = Decimal("0.00")
         total_uzs = Decimal("0.00")
         total_billable_days = 0
         items_created = 0
 
-        # Find on-demand invoice items where:
-        # - Container was active when invoiced (exit_date IS NULL on item)
-        # - Container has now exited (container_entry.exit_date IS NOT NULL)
-        # - Invoice is non-cancelled
-        # - Container belongs to this company
-        residual_candidates = OnDemandInvoiceItem.objects.filter(
-            invoice__company=company,
-            invoice__status__in=[StatementStatus.DRAFT, StatementStatus.FINALIZED, StatementStatus.PAID],
-            exit_date__isnull=True,  # Was active when invoiced
-            container_entry__exit_date__isnull=False,  # Has now exited
+        # Ledger rows of this company's containers that:
+        # - Were invoiced on demand while active (on_demand_through is set,
+        #   only non-cancelled invoices count)
+        # - Have now exited (container_entry.exit_date IS NOT NULL)
+        residual_candidates = ContainerBillingLedger.objects.filter(
+            container_entry__company=company,
+            on_demand_through__isnull=False,
+            container_entry__exit_date__isnull=False,
         ).select_related(
-            "invoice", "container_entry", "container_entry__container", "container_entry__company"
+            "container_entry", "container_entry__container", "container_entry__company"
         )
 
-        for od_item in residual_candidates:
-            entry = od_item.container_entry
-            if not entry:
-                continue
+        for ledger in residual_candidates:
+            entry = ledger.container_entry
 
-            # Calculate invoiced_until date
-            # entry_date + total_days - 1 = last day covered by on-demand invoice
-            invoiced_until = od_item.entry_date + timedelta(days=od_item.total_days - 1)
-            actual_exit = entry.exit_date
+            # Last day covered by the on-demand invoice
+            invoiced_until = ledger.on_demand_through
+            actual_exit = entry.exit_date.date()
 
             # Check if there are residual days
             if actual_exit <= invoiced_until:
@@ -9,15 +9,22 @@ This service handles the calculation of container storage costs based on:
 - Free days (locked at container entry time)
 """
 
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterable
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from django.db.models import Q, QuerySet
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count, Max, Q, QuerySet
 from django.utils import timezone
 
 from apps.core.exceptions import BusinessLogicError
+from apps.core.metrics import timed
 from apps.core.services.base_service import BaseService
 
 from ..models import ContainerBillingStatus, ContainerSize, Tariff
@@ -27,6 +34,10 @@ if TYPE_CHECKING:
     from apps.terminal_operations.models import ContainerEntry
 
 
+# Full-set summaries are recomputed at most this often for unchanged data
+SUMMARY_CACHE_SECONDS = 300
+
+
 class TariffNotFoundError(BusinessLogicError):
     """Raised when no valid tariff is found for the given date and company."""
 
@@ -129,6 +140,54 @@ class StorageCostResult:
     calculated_at: datetime = field(default_factory=timezone.now)
 
 
+class TariffTimeline:
+    """
+    In-memory tariff schedule (general plus selected companies) with rates.
+
+    Loaded with two queries and answers the same lookups as the per-date
+    tariff queries, so bulk calculations cost O(1) queries instead of a few
+    per entry and tariff period.
+    """
+
+    def __init__(self, tariffs: Iterable[Tariff], company_ids: Iterable[int]):
+        self.company_ids = set(company_ids)
+        # company_id (None = general) -> tariffs, newest effective_from first
+        self.tariffs: dict[int | None, list[Tariff]] = defaultdict(list)
+        for tariff in tariffs:
+            self.tariffs[tariff.company_id].append(tariff)
+        for schedule in self.tariffs.values():
+            schedule.sort(key=lambda t: t.effective_from, reverse=True)
+
+    @classmethod
+    def load(cls, company_ids: Iterable[int]) -> "TariffTimeline":
+        company_ids = {company_id for company_id in company_ids if company_id}
+        tariffs = Tariff.objects.filter(
+            Q(company__isnull=True) | Q(company_id__in=company_ids)
+        ).prefetch_related("rates")
+        return cls(tariffs, company_ids)
+
+    def covers(self, company_id: int | None) -> bool:
+        return company_id is None or company_id in self.company_ids
+
+    def applicable(self, company_id: int | None, target_date: date) -> Tariff | None:
+        """Newest tariff of the schedule valid on target_date."""
+        for tariff in self.tariffs.get(company_id, ()):
+            if tariff.effective_from <= target_date and (
+                tariff.effective_to is None or tariff.effective_to >= target_date
+            ):
+                return tariff
+        return None
+
+    def next_start(self, company_id: int | None, after_date: date) -> date | None:
+        """Earliest effective_from after after_date in the schedule."""
+        starts = [
+            tariff.effective_from
+            for tariff in self.tariffs.get(company_id, ())
+            if tariff.effective_from > after_date
+        ]
+        return min(starts) if starts else None
+
+
 class StorageCostService(BaseService):
     """
     Service for calculating container storage costs.
@@ -139,8 +198,15 @@ class StorageCostService(BaseService):
     3. Tariff lookup with company-specific priority
     4. Period splitting when tariffs change mid-stay
     5. Free days locked at entry time
+
+    Bulk methods preload a TariffTimeline, so tariff lookups during them hit
+    memory instead of the database.
     """
 
+    def __init__(self):
+        super().__init__()
+        self._timeline: TariffTimeline | None = None
+
     def calculate_cost(
         self,
         container_entry: "ContainerEntry",
@@ -183,10 +249,14 @@ class StorageCostService(BaseService):
         container_status = self._map_entry_status(container_entry.status)
         company = container_entry.company
 
-        self.logger.info(
-            f"Calculating storage cost for {container_entry.container.container_number}: "
-            f"size={container_size}, status={container_status}, "
-            f"entry={entry_date}, end={end_date}, company={company}"
+        self.logger.debug(
+            "Calculating storage cost for %s: size=%s, status=%s, entry=%s, end=%s, company=%s",
+            container_entry.container.container_number,
+            container_size,
+            container_status,
+            entry_date,
+            end_date,
+            company,
         )
 
         # 3. Initialize tracking variables
@@ -244,7 +314,7 @@ class StorageCostService(BaseService):
                     free_days_used=free_days_used,
                     billable_days=billable_days,
                     tariff_id=tariff.id,
-                    tariff_type="special" if tariff.company else "general",
+                    tariff_type="special" if tariff.company_id else "general",
                     daily_rate_usd=rate.daily_rate_usd,
                     daily_rate_uzs=rate.daily_rate_uzs,
                     amount_usd=amount_usd,
@@ -279,13 +349,17 @@ class StorageCostService(BaseService):
             periods=periods,
         )
 
-        self.logger.info(
-            f"Calculated storage cost: {total_usd} USD / {total_uzs} UZS "
-            f"for {total_days} days ({free_days_applied} free)"
+        self.logger.debug(
+            "Calculated storage cost: %s USD / %s UZS for %s days (%s free)",
+            total_usd,
+            total_uzs,
+            total_days,
+            free_days_applied,
         )
 
         return result
 
+    @timed()
     def calculate_bulk_costs(
         self,
         container_entries: QuerySet["ContainerEntry"],
@@ -301,23 +375,129 @@ class StorageCostService(BaseService):
         Returns:
             List of StorageCostResult for each container
         """
-        results = []
-
         # Prefetch related data for efficiency
-        entries = container_entries.select_related("container", "company")
-
-        for entry in entries:
-            try:
-                result = self.calculate_cost(entry, as_of_date)
-                results.append(result)
-            except (TariffNotFoundError, TariffRateMissingError, InvalidContainerSizeError) as e:
-                self.logger.warning(
-                    f"Failed to calculate cost for entry {entry.id}: {e}"
-                )
-                # Skip entries with calculation errors
-                continue
+        entries = list(container_entries.select_related("container", "company"))
+        with self._preloaded_tariffs({entry.company_id for entry in entries}):
+            results = [self._calculate_or_skip(entry, as_of_date) for entry in entries]
+        return [result for result in results if result is not None]
+
+    @timed()
+    def summarize_costs(
+        self,
+        container_entries: QuerySet["ContainerEntry"],
+        as_of_date: date | None = None,
+        chunk_size: int = 2000,
+    ) -> dict:
+        """
+        Totals over every entry of a queryset (not just a page).
+
+        Entries are streamed in chunks against a preloaded tariff timeline, so
+        the cost is a handful of queries plus in-memory arithmetic per entry.
+        Summaries are cached for SUMMARY_CACHE_SECONDS, keyed on the filtered
+        query, the calculation date and the state of the matching entries and
+        of the tariffs (count and latest update), so edits show up at once.
+
+        Args:
+            container_entries: QuerySet of container entries (filters applied)
+            as_of_date: Calculate up to this date (default: today or each exit_date)
+            chunk_size: Entries fetched per database round trip
+
+        Returns:
+            dict with total_containers, total_billable_days, total_usd,
+            total_uzs and failed (entries skipped for missing tariffs/rates)
+        """
+        cache_key = self._summary_cache_key(container_entries, as_of_date)
+        if cache_key is not None:
+            summary = cache.get(cache_key)
+            if summary is not None:
+                return summary
+
+        summary = {
+            "total_containers": 0,
+            "total_billable_days": 0,
+            "total_usd": Decimal("0.00"),
+            "total_uzs": Decimal("0.00"),
+            "failed": 0,
+        }
+        company_ids = set(
+            container_entries.order_by().values_list("company_id", flat=True).distinct()
+        )
+        entries = container_entries.select_related("container", "company").only(
+            "id",
+            "entry_time",
+            "exit_date",
+            "status",
+            "container__container_number",
+            "container__iso_type",
+            "company__id",
+            "company__name",
+        )
 
-        return results
+        with self._preloaded_tariffs(company_ids):
+            for entry in entries.iterator(chunk_size=chunk_size):
+                summary["total_containers"] += 1
+                result = self._calculate_or_skip(entry, as_of_date)
+                if result is None:
+                    summary["failed"] += 1
+                    continue
+                summary["total_billable_days"] += result.billable_days
+                summary["total_usd"] += result.total_usd
+                summary["total_uzs"] += result.total_uzs
+
+        if cache_key is not None:
+            cache.set(cache_key, summary, timeout=SUMMARY_CACHE_SECONDS)
+        return summary
+
+    def _summary_cache_key(
+        self, container_entries: QuerySet["ContainerEntry"], as_of_date: date | None
+    ) -> str | None:
+        """Cache key of a summary, or None when the queryset matches nothing."""
+        try:
+            sql, params = container_entries.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        entries_state = container_entries.order_by().aggregate(
+            entry_count=Count("id"), entries_updated=Max("updated_at")
+        )
+        tariffs_state = Tariff.objects.aggregate(
+            # Aliases must not shadow fields: "rates" would hide the relation
+            tariff_count=Count("id", distinct=True),
+            tariffs_updated=Max("updated_at"),
+            rate_count=Count("rates"),
+            rates_updated=Max("rates__updated_at"),
+        )
+        state = (
+            sql,
+            params,
+            as_of_date or timezone.now().date(),
+            entries_state["entry_count"],
+            entries_state["entries_updated"],
+            tariffs_state["tariff_count"],
+            tariffs_state["tariffs_updated"],
+            tariffs_state["rate_count"],
+            tariffs_state["rates_updated"],
+        )
+        return "billing:cost-summary:" + hashlib.md5(repr(state).encode()).hexdigest()
+
+    def _calculate_or_skip(
+        self, entry: "ContainerEntry", as_of_date: date | None
+    ) -> StorageCostResult | None:
+        try:
+            return self.calculate_cost(entry, as_of_date)
+        except (TariffNotFoundError, TariffRateMissingError, InvalidContainerSizeError) as e:
+            self.logger.warning(f"Failed to calculate cost for entry {entry.id}: {e}")
+            # Skip entries with calculation errors
+            return None
+
+    @contextmanager
+    def _preloaded_tariffs(self, company_ids: Iterable[int | None]):
+        """Serve tariff lookups from memory for the given companies."""
+        previous = self._timeline
+        self._timeline = TariffTimeline.load(company_ids)
+        try:
+            yield self._timeline
+        finally:
+            self._timeline = previous
 
     def _get_applicable_tariff(
         self,
@@ -341,6 +521,15 @@ class StorageCostService(BaseService):
         Raises:
             TariffNotFoundError: If no valid tariff found
         """
+        company_id = company.id if company else None
+        if self._timeline is not None and self._timeline.covers(company_id):
+            tariff = (
+                company_id and self._timeline.applicable(company_id, target_date)
+            ) or self._timeline.applicable(None, target_date)
+            if tariff:
+                return tariff
+            raise TariffNotFoundError(target_date, company.name if company else None)
+
         # Build date filter: effective_from <= target_date AND (effective_to IS NULL OR effective_to >= target_date)
         date_filter = Q(effective_from__lte=target_date) & (
             Q(effective_to__isnull=True) | Q(effective_to__gte=target_date)
@@ -435,37 +624,34 @@ class StorageCostService(BaseService):
 
         # Check for next company-specific tariff
         if company:
-            next_special = (
-                Tariff.objects.filter(
-                    company=company,
-                    effective_from__gt=after_date,
-                )
-                .order_by("effective_from")
-                .first()
-            )
+            next_special = self._next_tariff_start(company.id, after_date)
             if next_special:
-                candidates.append(next_special.effective_from)
+                candidates.append(next_special)
 
             # If current is special and it expires, we need to switch to general
-            if current_tariff.company and current_tariff.effective_to:
+            if current_tariff.company_id and current_tariff.effective_to:
                 # The day after expiry, we switch to general
                 candidates.append(current_tariff.effective_to + timedelta(days=1))
 
         # Check for next general tariff (if we're using general)
-        if not current_tariff.company:
-            next_general = (
-                Tariff.objects.filter(
-                    company__isnull=True,
-                    effective_from__gt=after_date,
-                )
-                .order_by("effective_from")
-                .first()
-            )
+        if not current_tariff.company_id:
+            next_general = self._next_tariff_start(None, after_date)
             if next_general:
-                candidates.append(next_general.effective_from)
+                candidates.append(next_general)
 
         return min(candidates) if candidates else None
 
+    def _next_tariff_start(self, company_id: int | None, after_date: date) -> date | None:
+        """Earliest effective_from after after_date (company_id None = general)."""
+        if self._timeline is not None and self._timeline.covers(company_id):
+            return self._timeline.next_start(company_id, after_date)
+        return (
+            Tariff.objects.filter(company_id=company_id, effective_from__gt=after_date)
+            .order_by("effective_from")
+            .values_list("effective_from", flat=True)
+            .first()
+        )
+
     def _derive_size_from_iso_type(self, iso_type: str | None) -> str:
         """
         Derive container size from ISO type code.
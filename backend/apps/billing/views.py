@@ -4,7 +4,7 @@ API views for billing and storage cost functionality.
 
 from decimal import Decimal
 
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
@@ -13,6 +13,7 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.services.streaming_export import XLSX_CONTENT_TYPE, parse_export_format
 from apps.core.utils import safe_int_param
 from apps.customer_portal.permissions import IsCustomer
 from apps.terminal_operations.models import ContainerEntry
@@ -33,7 +34,8 @@ from .serializers import (
     TariffUpdateSerializer,
     TerminalSettingsSerializer,
 )
-from .services import AdditionalChargeService, ExpenseTypeService, StatementExportService, StorageCostService, TariffService
+from .services import AdditionalChargeService, ExpenseTypeService, StorageCostService, TariffService
+from .services import document_cache
 from .services.statement_service import MonthlyStatementService
 
 
@@ -85,78 +87,22 @@ def build_storage_cost_row(result, invoiced_entry_ids: set, billed_amounts: dict
 
 def get_invoiced_entry_ids(container_entry_ids: list[int]) -> set[int]:
     """Return set of container_entry_ids that are in active on-demand invoices."""
-    from .models import OnDemandInvoiceItem
+    from .services.billing_ledger import on_demand_invoiced_ids
 
-    return set(
-        OnDemandInvoiceItem.objects.filter(
-            container_entry_id__in=container_entry_ids,
-            invoice__status__in=["draft", "finalized", "paid"],
-        ).values_list("container_entry_id", flat=True)
-    )
+    return on_demand_invoiced_ids(container_entry_ids)
 
 
 def get_billed_amounts(container_entry_ids: list[int]) -> dict[int, dict]:
-    """Sum billed USD/UZS per container entry from non-cancelled statements and on-demand invoices.
+    """Billed USD/UZS per container entry from non-cancelled statements and on-demand invoices.
 
+    Read from the precomputed ContainerBillingLedger (one row per entry).
     Returns dict keyed by entry_id with:
       usd/uzs      – total billed (draft + finalized + paid)
       paid_usd/uzs – portion from paid statements/invoices only
     """
-    from django.db.models import Q, Sum
-
-    from .models import OnDemandInvoiceItem, StatementLineItem
-
-    result: dict[int, dict] = {}
-    zero = Decimal("0")
-
-    def _ensure(entry_id: int) -> dict:
-        if entry_id not in result:
-            result[entry_id] = {"usd": zero, "uzs": zero, "paid_usd": zero, "paid_uzs": zero}
-        return result[entry_id]
-
-    # Monthly statement line items – all non-cancelled
-    for row in (
-        StatementLineItem.objects.filter(
-            container_entry_id__in=container_entry_ids,
-            statement__status__in=["draft", "finalized", "paid"],
-        )
-        .values("container_entry_id", "statement__status")
-        .annotate(
-            billed_usd=Sum("amount_usd"),
-            billed_uzs=Sum("amount_uzs"),
-        )
-    ):
-        entry = _ensure(row["container_entry_id"])
-        usd = row["billed_usd"] or zero
-        uzs = row["billed_uzs"] or zero
-        entry["usd"] += usd
-        entry["uzs"] += uzs
-        if row["statement__status"] == "paid":
-            entry["paid_usd"] += usd
-            entry["paid_uzs"] += uzs
-
-    # On-demand invoice items – all non-cancelled
-    for row in (
-        OnDemandInvoiceItem.objects.filter(
-            container_entry_id__in=container_entry_ids,
-            invoice__status__in=["draft", "finalized", "paid"],
-        )
-        .values("container_entry_id", "invoice__status")
-        .annotate(
-            billed_usd=Sum("amount_usd"),
-            billed_uzs=Sum("amount_uzs"),
-        )
-    ):
-        entry = _ensure(row["container_entry_id"])
-        usd = row["billed_usd"] or zero
-        uzs = row["billed_uzs"] or zero
-        entry["usd"] += usd
-        entry["uzs"] += uzs
-        if row["invoice__status"] == "paid":
-            entry["paid_usd"] += usd
-            entry["paid_uzs"] += uzs
+    from .services.billing_ledger import billed_amounts
 
-    return result
+    return billed_amounts(container_entry_ids)
 
 
 NO_COMPANY_RESPONSE = {
@@ -606,10 +552,8 @@ class CustomerStorageCostView(APIView):
 
         results = [build_storage_cost_row(r, invoiced_entry_ids, billed_amounts) for r in cost_results]
 
-        # Summary from the current page only -- avoids O(N) recalculation
-        page_total_usd = sum(r.total_usd for r in cost_results)
-        page_total_uzs = sum(r.total_uzs for r in cost_results)
-        page_billable_days = sum(r.billable_days for r in cost_results)
+        # Summary for ALL matching entries (not just the page)
+        summary = service.summarize_costs(entries)
 
         return Response(
             {
@@ -617,11 +561,11 @@ class CustomerStorageCostView(APIView):
                 "results": results,
                 "count": total_count,
                 "summary": {
-                    "total_containers": total_count,
-                    "total_billable_days": page_billable_days,
-                    "total_usd": str(page_total_usd),
-                    "total_uzs": str(page_total_uzs),
-                    "is_page_summary": True,
+                    "total_containers": summary["total_containers"],
+                    "total_billable_days": summary["total_billable_days"],
+                    "total_usd": str(summary["total_usd"]),
+                    "total_uzs": str(summary["total_uzs"]),
+                    "is_page_summary": False,
                 },
             }
         )
@@ -629,7 +573,7 @@ class CustomerStorageCostView(APIView):
 
 class CustomerStorageCostExportView(APIView):
     """
-    Export storage costs to Excel for the authenticated customer's company.
+    Export storage costs to Excel or CSV for the authenticated customer's company.
 
     GET /api/customer/storage-costs/export/
     """
@@ -637,8 +581,8 @@ class CustomerStorageCostExportView(APIView):
     permission_classes = [IsAuthenticated, IsCustomer]
 
     def get(self, request):
-        """Export storage costs for customer's company containers."""
-        from django.http import HttpResponse
+        """Export storage costs for customer's company containers (?export_format=xlsx|csv)."""
+        export_format = parse_export_format(request.query_params.get("export_format"))
 
         company = _get_customer_company(request.user)
         if not company:
@@ -654,16 +598,15 @@ class CustomerStorageCostExportView(APIView):
         service = StorageCostService()
         cost_results = service.calculate_bulk_costs(entries)
 
-        export_service = StatementExportService()
-        excel_file = export_service.export_storage_costs_to_excel(cost_results, company.name)
+        from .services.export_service import StatementExportService
 
-        response = HttpResponse(
-            excel_file.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        export_service = StatementExportService()
+        return export_service.storage_costs_response(
+            cost_results,
+            company.name,
+            f"storage_costs_{company.slug or 'company'}",
+            export_format,
         )
-        filename = f"storage_costs_{company.slug or 'company'}.xlsx"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
 
 
 class CustomerStatementView(APIView):
@@ -798,16 +741,15 @@ class CustomerStatementExportExcelView(APIView):
         )
 
         # Export to Excel
-        export_service = StatementExportService()
-        excel_file = export_service.export_to_excel(statement)
-        filename = export_service.get_excel_filename(statement)
+        from .services.export_service import StatementExportService
 
-        response = HttpResponse(
-            excel_file.getvalue(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        export_service = StatementExportService()
+        return FileResponse(
+            export_service.export_to_excel(statement),
+            content_type=XLSX_CONTENT_TYPE,
+            as_attachment=True,
+            filename=export_service.get_excel_filename(statement),
         )
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
 
 
 class CustomerStatementExportPdfView(APIView):
@@ -843,14 +785,16 @@ class CustomerStatementExportPdfView(APIView):
             user=request.user,
         )
 
-        # Export to PDF
+        # Export to PDF (served from the rendered-document cache once issued)
+        from .services.export_service import StatementExportService
+
         export_service = StatementExportService()
-        pdf_file = export_service.export_to_pdf(statement)
+        pdf_file = document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
         filename = export_service.get_pdf_filename(statement)
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+        return FileResponse(
+            pdf_file, as_attachment=True, filename=filename, content_type="application/pdf"
+        )
 
 
 class CustomerStatementExportActView(APIView):
@@ -885,6 +829,8 @@ class CustomerStatementExportActView(APIView):
         )
 
         settings = TerminalSettings.load()
+        from .services.export_service import StatementExportService
+
         export_service = StatementExportService()
         excel_file = export_service.export_to_schet_factura(
             statement, settings, exchange_rate=statement.exchange_rate,
@@ -928,6 +874,8 @@ class CompanyStatementExportActView(APIView):
         )
 
         settings = TerminalSettings.load()
+        from .services.export_service import StatementExportService
+
         export_service = StatementExportService()
         excel_file = export_service.export_to_schet_factura(
             statement, settings, exchange_rate=statement.exchange_rate,
@@ -973,16 +921,11 @@ class CustomerStatementExportActPreviewView(APIView):
             user=request.user,
         )
 
-        settings = TerminalSettings.load()
-        export_service = StatementExportService()
-        pdf_file = export_service.export_to_schet_factura_pdf(
-            statement, settings, exchange_rate=statement.exchange_rate,
+        pdf_file = document_cache.get_rendered(document_cache.ACT_PDF, statement)
+        return FileResponse(
+            pdf_file, filename="act_preview.pdf", content_type="application/pdf"
         )
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = 'inline; filename="act_preview.pdf"'
-        return response
-
 
 class CompanyStatementExportActPreviewView(APIView):
     """
@@ -1012,16 +955,11 @@ class CompanyStatementExportActPreviewView(APIView):
             user=request.user,
         )
 
-        settings = TerminalSettings.load()
-        export_service = StatementExportService()
-        pdf_file = export_service.export_to_schet_factura_pdf(
-            statement, settings, exchange_rate=statement.exchange_rate,
+        pdf_file = document_cache.get_rendered(document_cache.ACT_PDF, statement)
+        return FileResponse(
+            pdf_file, filename="act_preview.pdf", content_type="application/pdf"
         )
 
-        response = HttpResponse(pdf_file.getvalue(), content_type="application/pdf")
-        response["Content-Disposition"] = 'inline; filename="act_preview.pdf"'
-        return response
-
 
 class CustomerStatementExportHtmlPreviewView(APIView):
     """
@@ -1122,91 +1060,11 @@ class CompanyStatementExportHtmlPreviewView(APIView):
 
 def _render_act_html_preview(statement, settings_obj):
     """Render Счёт-фактура as HTML preview (shared by customer and admin views)."""
-    import calendar
-
-    from django.template.loader import render_to_string
-
-    from .services.export_service import StatementExportService
-
-    rate = statement.exchange_rate or settings_obj.default_usd_uzs_rate or Decimal("0")
-    export_service = StatementExportService()
-
-    grouped = export_service._group_line_items(statement)
-    service_grouped = export_service._group_service_items(statement)
-    vat_rate = settings_obj.vat_rate or Decimal("12")
-
-    # Act date = last day of the billing month
-    last_day = calendar.monthrange(statement.year, statement.month)[1]
-    act_date = f"{last_day:02d}.{statement.month:02d}.{statement.year} г."
-
-    item_no = 0
-    grand_total_usd = Decimal("0")
-    grand_total_uzs = Decimal("0")
-    grand_vat_usd = Decimal("0")
-    grand_vat_uzs = Decimal("0")
-
-    grouped_items = []
-    for label, total_usd, qty, unit, period_start, period_end in grouped:
-        item_no += 1
-        total_uzs = total_usd * rate
-        # НДС added on top of net amount
-        vat_usd = (total_usd * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
-        vat_uzs = (total_uzs * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
-        grand_total_usd += total_usd
-        grand_total_uzs += total_uzs
-        grand_vat_usd += vat_usd
-        grand_vat_uzs += vat_uzs
-        grouped_items.append({
-            "number": item_no, "label": label, "unit": unit, "qty": qty,
-            "unit_price_usd": f"{total_usd / qty if qty else 0:,.2f}",
-            "total_usd": f"{total_usd:,.2f}", "vat_usd": f"{vat_usd:,.2f}",
-            "total_with_vat_usd": f"{total_usd + vat_usd:,.2f}",
-            "unit_price_uzs": f"{total_uzs / qty if qty else 0:,.0f}",
-            "total_uzs": f"{total_uzs:,.0f}", "vat_uzs": f"{vat_uzs:,.0f}",
-            "total_with_vat_uzs": f"{total_uzs + vat_uzs:,.0f}",
-            "period_start": period_start, "period_end": period_end,
-        })
-
-    svc_items = []
-    for desc, svc_total_usd, svc_qty, svc_unit in service_grouped:
-        item_no += 1
-        svc_total_uzs = svc_total_usd * rate
-        svc_vat_usd = (svc_total_usd * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
-        svc_vat_uzs = (svc_total_uzs * vat_rate / Decimal("100")).quantize(Decimal("0.01"))
-        grand_total_usd += svc_total_usd
-        grand_total_uzs += svc_total_uzs
-        grand_vat_usd += svc_vat_usd
-        grand_vat_uzs += svc_vat_uzs
-        svc_items.append({
-            "number": item_no, "label": desc, "unit": svc_unit, "qty": svc_qty,
-            "unit_price_usd": f"{svc_total_usd / svc_qty if svc_qty else 0:,.2f}",
-            "total_usd": f"{svc_total_usd:,.2f}", "vat_usd": f"{svc_vat_usd:,.2f}",
-            "total_with_vat_usd": f"{svc_total_usd + svc_vat_usd:,.2f}",
-            "unit_price_uzs": f"{svc_total_uzs / svc_qty if svc_qty else 0:,.0f}",
-            "total_uzs": f"{svc_total_uzs:,.0f}", "vat_uzs": f"{svc_vat_uzs:,.0f}",
-            "total_with_vat_uzs": f"{svc_total_uzs + svc_vat_uzs:,.0f}",
-        })
+    from .services import document_cache
 
-    # Format contract date if available
-    contract_date_formatted = ""
-    if statement.company.contract_date:
-        contract_date_formatted = statement.company.contract_date.strftime("%d.%m.%Y г.")
-
-    return render_to_string("billing/schet_factura_html_preview.html", {
-        "statement": statement,
-        "settings": settings_obj,
-        "act_date": act_date,
-        "contract_date_formatted": contract_date_formatted,
-        "exchange_rate": f"{rate:,.2f}",
-        "grouped_items": grouped_items,
-        "service_items": svc_items,
-        "grand_total_usd": f"{grand_total_usd:,.2f}",
-        "grand_total_uzs": f"{grand_total_uzs:,.0f}",
-        "grand_vat_usd": f"{grand_vat_usd:,.2f}",
-        "grand_vat_uzs": f"{grand_vat_uzs:,.0f}",
-        "grand_total_with_vat_usd": f"{grand_total_usd + grand_vat_usd:,.2f}",
-        "grand_total_with_vat_uzs": f"{grand_total_uzs + grand_vat_uzs:,.0f}",
-    })
+    return document_cache.get_rendered(
+        document_cache.ACT_HTML, statement, settings_obj
+    ).read().decode("utf-8")
 
 
 class CustomerStatementExportActHtmlPreviewView(APIView):
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .metrics import install_db_wrapper
+
+        connection_created.connect(install_db_wrapper)
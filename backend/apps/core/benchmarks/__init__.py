@@ -0,0 +1,33 @@
+"""
+Performance benchmarks of hot paths on realistic data volumes.
+
+Run with `manage.py run_benchmarks` (seeds a throwaway test database) or
+with pytest-benchmark through tests/benchmarks (BENCHMARK_ENTRIES=10000).
+"""
+
+from .dataset import BenchmarkDataset, seed_dataset
+from .runner import (
+    Regression,
+    ScenarioResult,
+    compare_results,
+    load_baseline,
+    run_once,
+    run_scenario,
+    save_baseline,
+)
+from .scenarios import SCENARIOS, Scenario
+
+
+__all__ = [
+    "SCENARIOS",
+    "BenchmarkDataset",
+    "Regression",
+    "Scenario",
+    "ScenarioResult",
+    "compare_results",
+    "load_baseline",
+    "run_once",
+    "run_scenario",
+    "save_baseline",
+    "seed_dataset",
+]
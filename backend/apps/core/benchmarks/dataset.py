@@ -0,0 +1,291 @@
+"""
+Deterministic synthetic dataset for benchmarks.
+
+seed_dataset(entries, seed) builds the same rows for the same arguments
+(times are relative to the start of the current day): companies with
+tariffs, one container per entry spread over two years, a yard with
+blocks in all zones, positions for the containers on the terminal and
+a few on-terminal containers left unplaced for placement suggestions.
+
+Rows are written with bulk_create, so model signals (notifications,
+events) don't fire; search documents are built in memory and indexed in
+one pass.
+"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import BillingMethod, Company, CustomUser
+from apps.billing.models import Tariff, TariffRate
+from apps.containers.models import Container
+from apps.terminal_operations.models import (
+    ContainerEntry,
+    ContainerOwner,
+    ContainerPosition,
+    YardBlock,
+)
+from apps.terminal_operations.services.entry_search import (
+    build_search_document,
+    index_entries,
+)
+
+
+BATCH_SIZE = 2000
+
+# Container numbers of benchmark rows: prefix + 7 digit sequence
+CONTAINER_PREFIX = "BMKU"
+IMPORT_PREFIX = "BMXU"
+
+ISO_TYPES = ["22G1", "42G1", "45G1", "L5G1", "22R1", "42R1", "45R1"]
+ISO_WEIGHTS = [30, 35, 20, 5, 3, 5, 2]
+
+# Share of entries still on the terminal, capped by what a yard holds
+ON_TERMINAL_SHARE = 0.15
+MAX_ON_TERMINAL = 2500
+UNPLACED = 50
+
+HISTORY_DAYS = 730
+
+CLIENT_NAMES = ["Uzbek Cotton", "Navoi Mining", "Tashkent Trade", "Silk Road Log"]
+CARGO_NAMES = ["Хлопок", "Медь", "Оборудование", "Текстиль", "Продукты", ""]
+
+
+@dataclass
+class BenchmarkDataset:
+    """Handles to the seeded rows used by benchmark scenarios."""
+
+    entries: int
+    seed: int
+    user: CustomUser
+    anchor: datetime
+    company_ids: list[int] = field(default_factory=list)
+    unplaced_entry_ids: list[int] = field(default_factory=list)
+    search_term: str = ""
+
+    @property
+    def statement_period(self) -> tuple[int, int]:
+        """Last complete month before the anchor (year, month)."""
+        last_month = self.anchor.date().replace(day=1) - timedelta(days=1)
+        return last_month.year, last_month.month
+
+
+def container_number(prefix: str, index: int) -> str:
+    return f"{prefix}{index:07d}"
+
+
+def container_size(iso_type: str) -> str:
+    return {"2": "20ft", "4": "40ft", "L": "45ft"}.get(iso_type[0], "20ft")
+
+
+def seed_dataset(entries: int, seed: int = 42) -> BenchmarkDataset:
+    """
+    Seed (or reuse) a dataset of `entries` container entries.
+
+    A database already holding exactly this many benchmark containers
+    (e.g. a kept test database) is reused instead of seeded again.
+    """
+    anchor = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    existing = Container.objects.filter(
+        container_number__startswith=CONTAINER_PREFIX
+    ).count()
+    if existing == entries:
+        return _load(entries, seed, anchor)
+    if existing:
+        raise ValueError(
+            f"Database holds {existing} benchmark containers, expected {entries}; "
+            f"use a fresh database"
+        )
+
+    rng = random.Random(seed)
+    with transaction.atomic():
+        user = CustomUser.objects.create_user(
+            username="benchmark",
+            password=None,
+            is_admin=True,
+            is_staff=True,
+        )
+        companies = _seed_companies(rng, entries)
+        _seed_tariffs(companies, user)
+        owners = ContainerOwner.objects.bulk_create(
+            ContainerOwner(
+                name=f"Benchmark Owner {i:02d}", slug=f"benchmark-owner-{i:02d}"
+            )
+            for i in range(20)
+        )
+        created = _seed_entries(rng, entries, anchor, user, companies, owners)
+        _seed_yard(created)
+
+    return _load(entries, seed, anchor)
+
+
+def _seed_companies(rng: random.Random, entries: int) -> list[Company]:
+    count = min(50, max(5, entries // 1000))
+    return Company.objects.bulk_create(
+        Company(
+            name=f"Benchmark Company {i:02d}",
+            slug=f"benchmark-company-{i:02d}",
+            billing_method=rng.choice(list(BillingMethod.values)),
+        )
+        for i in range(count)
+    )
+
+
+def _seed_tariffs(companies: list[Company], user: CustomUser) -> None:
+    """A general tariff plus special tariffs for every fifth company."""
+    tariffs = [Tariff(effective_from=date(2000, 1, 1), created_by=user)]
+    tariffs += [
+        Tariff(company=company, effective_from=date(2000, 1, 1), created_by=user)
+        for company in companies[::5]
+    ]
+    tariffs = Tariff.objects.bulk_create(tariffs)
+
+    rates = []
+    for index, tariff in enumerate(tariffs):
+        for size, base in (("20ft", 10), ("40ft", 15), ("45ft", 18)):
+            for status, factor in (("laden", 1), ("empty", Decimal("0.6"))):
+                usd = Decimal(base - index % 3) * factor
+                rates.append(
+                    TariffRate(
+                        tariff=tariff,
+                        container_size=size,
+                        container_status=status,
+                        daily_rate_usd=usd,
+                        daily_rate_uzs=usd * 12800,
+                        free_days=3 + index % 4,
+                    )
+                )
+    TariffRate.objects.bulk_create(rates)
+
+
+def _seed_entries(rng, entries, anchor, user, companies, owners):
+    on_terminal = min(int(entries * ON_TERMINAL_SHARE), MAX_ON_TERMINAL)
+    iso_types = rng.choices(ISO_TYPES, weights=ISO_WEIGHTS, k=entries)
+
+    containers = Container.objects.bulk_create(
+        (
+            Container(
+                container_number=container_number(CONTAINER_PREFIX, i),
+                iso_type=iso_types[i],
+            )
+            for i in range(entries)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    objects = []
+    for i, container in enumerate(containers):
+        still_on_terminal = i >= entries - on_terminal
+        if still_on_terminal:
+            entry_time = anchor - timedelta(minutes=rng.randint(60, 90 * 24 * 60))
+            exit_date = None
+        else:
+            entry_time = anchor - timedelta(
+                minutes=rng.randint(30 * 24 * 60, HISTORY_DAYS * 24 * 60)
+            )
+            exit_date = entry_time + timedelta(minutes=rng.randint(60, 40 * 24 * 60))
+        entry = ContainerEntry(
+            container=container,
+            status=rng.choice(["LADEN", "EMPTY"]),
+            transport_type=rng.choice(["TRUCK", "TRUCK", "WAGON"]),
+            transport_number=f"{rng.randint(1, 99):02d}A{rng.randint(100, 999)}BC",
+            entry_time=entry_time,
+            recorded_by=user,
+            client_name=rng.choice(CLIENT_NAMES),
+            container_owner=rng.choice(owners),
+            company=rng.choice(companies) if rng.random() < 0.9 else None,
+            cargo_name=rng.choice(CARGO_NAMES),
+            exit_date=exit_date,
+            exit_transport_type="TRUCK" if exit_date else None,
+        )
+        entry.search_document = build_search_document(entry)
+        objects.append(entry)
+
+    created = ContainerEntry.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    for start in range(0, len(created), BATCH_SIZE):
+        index_entries(created[start : start + BATCH_SIZE])
+    return created
+
+
+def _seed_yard(entries: list[ContainerEntry]) -> None:
+    """Blocks in every zone; place on-terminal containers tier by tier."""
+    zones = [zone for zone, _label in ContainerPosition.ZONE_CHOICES]
+    YardBlock.objects.bulk_create(
+        block
+        for zone in zones
+        for block in (
+            YardBlock(zone=zone, row_from=1, row_to=5, container_size="40ft"),
+            YardBlock(zone=zone, row_from=6, row_to=10, container_size="20ft"),
+        )
+    )
+
+    slots = {
+        "40ft": [
+            (zone, row, bay, tier, "A")
+            for tier in range(1, 5)
+            for zone in zones
+            for row in range(1, 6)
+            for bay in range(1, 11)
+        ],
+        "20ft": [
+            (zone, row, bay, tier, sub_slot)
+            for tier in range(1, 5)
+            for zone in zones
+            for row in range(6, 11)
+            for bay in range(1, 11)
+            for sub_slot in ("A", "B")
+        ],
+    }
+    free = {size: iter(size_slots) for size, size_slots in slots.items()}
+
+    on_terminal = [entry for entry in entries if entry.exit_date is None]
+    positions = []
+    for entry in on_terminal[:-UNPLACED]:
+        size = container_size(entry.container.iso_type)
+        slot = next(free["20ft" if size == "20ft" else "40ft"], None)
+        if slot is None:
+            continue
+        zone, row, bay, tier, sub_slot = slot
+        positions.append(
+            ContainerPosition(
+                container_entry=entry,
+                zone=zone,
+                row=row,
+                bay=bay,
+                tier=tier,
+                sub_slot=sub_slot,
+                container_size=size,
+            )
+        )
+    ContainerPosition.objects.bulk_create(positions, batch_size=BATCH_SIZE)
+
+
+def _load(entries: int, seed: int, anchor: datetime) -> BenchmarkDataset:
+    user = CustomUser.objects.get(username="benchmark")
+    company_ids = list(
+        Company.objects.filter(slug__startswith="benchmark-company-")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    unplaced = list(
+        ContainerEntry.objects.filter(
+            container__container_number__startswith=CONTAINER_PREFIX,
+            exit_date__isnull=True,
+            position__isnull=True,
+        )
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    return BenchmarkDataset(
+        entries=entries,
+        seed=seed,
+        user=user,
+        anchor=anchor,
+        company_ids=company_ids,
+        unplaced_entry_ids=unplaced,
+        search_term=container_number(CONTAINER_PREFIX, entries // 2)[2:9].lower(),
+    )
@@ -0,0 +1,129 @@
+"""
+Running scenarios, saving JSON baselines and comparing against them.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.metrics import timed
+
+from .dataset import BenchmarkDataset
+from .scenarios import Scenario
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    rounds: int
+    median_ms: float
+    min_ms: float
+    max_ms: float
+    db_ms: float
+    queries: int
+
+
+@dataclass
+class Regression:
+    name: str
+    reason: str
+
+
+def run_once(scenario: Scenario, dataset: BenchmarkDataset, prepared=None) -> timed:
+    """Run the scenario once in a rolled back transaction; return its timer."""
+    with transaction.atomic():
+        with timed(f"benchmark:{scenario.name}", kind="benchmark") as timer:
+            scenario.run(dataset, prepared)
+        transaction.set_rollback(True)
+    return timer
+
+
+def run_scenario(
+    scenario: Scenario, dataset: BenchmarkDataset, rounds: int = 5, warmup: int = 1
+) -> ScenarioResult:
+    prepared = scenario.prepare(dataset) if scenario.prepare else None
+    for _ in range(warmup):
+        run_once(scenario, dataset, prepared)
+
+    timers = [run_once(scenario, dataset, prepared) for _ in range(rounds)]
+    times = [timer.seconds * 1000 for timer in timers]
+    return ScenarioResult(
+        name=scenario.name,
+        rounds=rounds,
+        median_ms=round(statistics.median(times), 2),
+        min_ms=round(min(times), 2),
+        max_ms=round(max(times), 2),
+        db_ms=round(statistics.median(t.db_seconds for t in timers) * 1000, 2),
+        queries=max(timer.db_queries for timer in timers),
+    )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def save_baseline(
+    path: str | Path, dataset: BenchmarkDataset, results: list[ScenarioResult]
+) -> None:
+    data = {
+        "meta": {
+            "entries": dataset.entries,
+            "seed": dataset.seed,
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "created_at": timezone.now().isoformat(),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def load_baseline(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def compare_results(
+    results: list[ScenarioResult], baseline: dict, tolerance: float = 0.25
+) -> list[Regression]:
+    """
+    Regressions against a baseline: a median slower by more than
+    `tolerance` (a fraction) or any increase in the number of queries.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline["results"].get(result.name)
+        if previous is None:
+            continue
+        limit = previous["median_ms"] * (1 + tolerance)
+        if result.median_ms > limit:
+            regressions.append(
+                Regression(
+                    result.name,
+                    f"median {result.median_ms} ms > {previous['median_ms']} ms "
+                    f"+{tolerance:.0%}",
+                )
+            )
+        if result.queries > previous["queries"]:
+            regressions.append(
+                Regression(
+                    result.name,
+                    f"{result.queries} queries > {previous['queries']}",
+                )
+            )
+    return regressions
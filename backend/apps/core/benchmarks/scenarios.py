@@ -0,0 +1,160 @@
+"""
+Benchmarked hot paths.
+
+Each scenario runs one call of a hot path against a seeded dataset.
+prepare() builds inputs that don't touch the database (e.g. an Excel
+workbook) once, outside the timed runs; every run happens in a
+transaction that is rolled back, so runs see the same state.
+"""
+
+import io
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from django.db.models import Q
+from rest_framework.test import APIClient
+
+from apps.billing.services.statement_service import MonthlyStatementService
+from apps.billing.services.storage_cost_service import StorageCostService
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services.container_entry_import_service import (
+    ContainerEntryImportService,
+)
+from apps.terminal_operations.services.placement_service import PlacementService
+
+from .dataset import IMPORT_PREFIX, BenchmarkDataset, container_number
+
+
+IMPORT_ROWS = 200
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    run: Callable[[BenchmarkDataset, Any], Any]
+    prepare: Callable[[BenchmarkDataset], Any] | None = None
+
+
+def _api_get(dataset: BenchmarkDataset, path: str):
+    client = APIClient()
+    client.force_authenticate(dataset.user)
+    response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return response
+
+
+def _suggest_position(dataset, _prepared):
+    return PlacementService().suggest_position(dataset.unplaced_entry_ids[0])
+
+
+def _get_layout(dataset, _prepared):
+    return PlacementService().get_layout()
+
+
+def _calculate_bulk_costs(dataset, _prepared):
+    """Costs of everything billed in the statement month."""
+    year, month = dataset.statement_period
+    entries = ContainerEntry.objects.filter(
+        Q(exit_date__isnull=True) | Q(exit_date__year=year, exit_date__month=month),
+        company__isnull=False,
+    )
+    return StorageCostService().calculate_bulk_costs(entries)
+
+
+def _generate_all_drafts(dataset, _prepared):
+    year, month = dataset.statement_period
+    return MonthlyStatementService().generate_all_drafts(year, month, dataset.user)
+
+
+def _import_workbook(dataset):
+    """An Excel file of new entries in the format of the import service."""
+    import pandas as pd
+
+    # A real date cell: an all-text first row reads as a header translation row
+    day = (dataset.anchor - timedelta(days=10)).replace(tzinfo=None)
+    rows = [
+        {
+            "Номер контейнера": container_number(IMPORT_PREFIX, i),
+            "Тип": "42G1" if i % 2 else "22G1",
+            "Дата разгрузки на терминале": day,
+            "транспорт\nпри ЗАВОЗЕ": "TRUCK" if i % 3 else "WAGON",
+            "номер машины/ вагона \nпри ЗАВОЗЕ": f"01A{i % 1000:03d}BC",
+            "Клиент": "Benchmark Import",
+            "Собственник контейнера": f"Benchmark Owner {i % 20:02d}",
+        }
+        for i in range(IMPORT_ROWS)
+    ]
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _import_from_excel(dataset, workbook):
+    result = ContainerEntryImportService().import_from_excel(workbook, dataset.user)
+    if not result["success"] or result["statistics"]["failed"]:
+        raise RuntimeError(f"Import failed: {result['errors']}")
+    return result
+
+
+def _entry_list(dataset, _prepared):
+    return _api_get(dataset, "/api/terminal/entries/?page_size=50")
+
+
+def _entry_search(dataset, _prepared):
+    return _api_get(dataset, f"/api/terminal/entries/?search={dataset.search_term}")
+
+
+def _executive_dashboard(dataset, _prepared):
+    return _api_get(dataset, "/api/terminal/entries/executive-dashboard/")
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "placement.suggest_position",
+            "Suggest a yard slot for an unplaced container",
+            _suggest_position,
+        ),
+        Scenario(
+            "placement.get_layout",
+            "Full yard layout for the 3D view",
+            _get_layout,
+        ),
+        Scenario(
+            "billing.calculate_bulk_costs",
+            "Storage costs of all containers billed in a month",
+            _calculate_bulk_costs,
+        ),
+        Scenario(
+            "billing.generate_all_drafts",
+            "Draft monthly statements for every company",
+            _generate_all_drafts,
+        ),
+        Scenario(
+            "import.import_from_excel",
+            f"Import an Excel file of {IMPORT_ROWS} entries",
+            _import_from_excel,
+            prepare=_import_workbook,
+        ),
+        Scenario(
+            "api.entry_list",
+            "GET /api/terminal/entries/ (first page)",
+            _entry_list,
+        ),
+        Scenario(
+            "api.entry_search",
+            "GET /api/terminal/entries/?search=",
+            _entry_search,
+        ),
+        Scenario(
+            "api.executive_dashboard",
+            "GET /api/terminal/entries/executive-dashboard/",
+            _executive_dashboard,
+        ),
+    )
+}
@@ -0,0 +1,135 @@
+"""
+Startup import audit of the long-running processes.
+
+Each process type is started in a fresh interpreter under
+`python -X importtime` up to the point where it would begin serving, and
+the per-module timings are parsed into a report: total import time, the
+slowest modules and which heavy libraries got loaded.
+
+Heavy libraries belong behind the service entry points that need them:
+pandas/openpyxl/weasyprint/Pillow are loaded by the export, import and
+upload code paths, aiogram by the Telegram client when it first sends.
+Only the bot process loads aiogram on start.
+
+    python manage.py audit_imports --process web --top 20
+"""
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+
+HEAVY_MODULES = ("pandas", "openpyxl", "weasyprint", "PIL")
+
+
+@dataclass(frozen=True)
+class Process:
+    name: str
+    # Run after django.setup() to import what the process loads on start
+    entry_code: str
+    # Total import time, ms (a few times the measured time on an idle host).
+    # Only checked by audit_imports and STARTUP_IMPORT_BUDGET=1 test runs.
+    budget_ms: int
+    forbidden: tuple[str, ...] = HEAVY_MODULES
+
+
+PROCESSES = {
+    process.name: process
+    for process in (
+        # ASGI workers: the app plus every URLconf (views, serializers)
+        Process(
+            "web",
+            "import terminal_app.asgi\n"
+            "from django.urls import get_resolver\n"
+            "get_resolver().url_patterns\n",
+            budget_ms=2000,
+            forbidden=(*HEAVY_MODULES, "aiogram"),
+        ),
+        # run_telegram_webhook
+        Process("bot", "import telegram_bot.webhook\n", budget_ms=5000),
+        # listen_anpr
+        Process(
+            "anpr",
+            "import apps.gate.management.commands.listen_anpr\n",
+            budget_ms=2000,
+            forbidden=(*HEAVY_MODULES, "aiogram"),
+        ),
+    )
+}
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+@dataclass
+class ImportReport:
+    process: Process
+    modules: list[ModuleTiming] = field(default_factory=list)
+    total_us: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    @property
+    def forbidden_loaded(self) -> list[str]:
+        loaded = {timing.name.split(".", 1)[0] for timing in self.modules}
+        return [name for name in self.process.forbidden if name in loaded]
+
+    @property
+    def over_budget(self) -> bool:
+        return self.total_ms > self.process.budget_ms
+
+    def slowest(self, count: int = 20) -> list[ModuleTiming]:
+        return sorted(self.modules, key=lambda t: t.cumulative_us, reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> tuple[list[ModuleTiming], int]:
+    """
+    Module timings from `-X importtime` stderr and the total import time
+    (sum of cumulative times of top-level imports), in microseconds.
+    """
+    modules = []
+    total = 0
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "| imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        # Nested imports are indented by two spaces per level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        timing = ModuleTiming(name.strip(), int(self_us), int(cumulative_us))
+        modules.append(timing)
+        if depth == 0:
+            total += timing.cumulative_us
+    return modules, total
+
+
+def measure(name: str, timeout: int = 120) -> ImportReport:
+    """Import a process's startup path in a fresh interpreter and report timings."""
+    process = PROCESSES[name]
+    code = "import django\ndjango.setup()\n" + process.entry_code
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "terminal_app.settings"
+        ),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode:
+        raise RuntimeError(f"Starting {name} failed:\n{result.stderr[-2000:]}")
+    modules, total = parse_importtime(result.stderr)
+    return ImportReport(process=process, modules=modules, total_us=total)
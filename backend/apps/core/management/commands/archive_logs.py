@@ -0,0 +1,61 @@
+"""
+Move log rows past their retention period to compressed archive files.
+
+Run periodically (e.g. daily from cron). Archived rows stay readable
+through apps.core.services.log_retention.query_logs().
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.log_retention import (
+    LOG_TYPES,
+    LogRetentionService,
+    archive_cutoff,
+    get_log_type,
+    retention_days,
+)
+
+
+class Command(BaseCommand):
+    help = "Archive ANPR, Telegram activity and container event logs past retention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--type",
+            dest="log_types",
+            action="append",
+            choices=sorted(LOG_TYPES),
+            help="Log type to archive (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report which months would be archived",
+        )
+
+    def handle(self, *args, **options):
+        service = LogRetentionService()
+        names = options["log_types"] or sorted(LOG_TYPES)
+
+        total = 0
+        for name in names:
+            log_type = get_log_type(name)
+            months = service.pending_months(log_type)
+            self.stdout.write(
+                f"{name}: retention {retention_days(log_type)} days, "
+                f"archiving before {archive_cutoff(log_type):%Y-%m-%d}"
+            )
+            if not months:
+                self.stdout.write("  nothing to archive")
+                continue
+
+            for month in months:
+                if options["dry_run"]:
+                    self.stdout.write(f"  {month:%Y-%m}: would archive")
+                    continue
+                count = service.archive_month(log_type, month)
+                total += count
+                self.stdout.write(f"  {month:%Y-%m}: {count} rows")
+
+        if not options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"Archived {total} rows"))
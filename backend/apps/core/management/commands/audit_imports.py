@@ -0,0 +1,60 @@
+"""
+Report startup import time of the web, bot and ANPR processes:
+
+    python manage.py audit_imports
+    python manage.py audit_imports --process web --top 30
+
+Fails when a process is over its budget or loads a library it should
+only import on demand (see apps.core.import_audit).
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.import_audit import PROCESSES, measure
+
+
+class Command(BaseCommand):
+    help = "Measure startup imports per process type (python -X importtime)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--process",
+            dest="processes",
+            action="append",
+            choices=sorted(PROCESSES),
+            help="Process type (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Slowest modules to list"
+        )
+
+    def handle(self, *args, **options):
+        failed = []
+        for name in options["processes"] or list(PROCESSES):
+            report = measure(name)
+            ok = not (report.over_budget or report.forbidden_loaded)
+            if not ok:
+                failed.append(name)
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(
+                style(
+                    f"{name}: {report.total_ms:.0f} ms "
+                    f"(budget {report.process.budget_ms} ms), "
+                    f"{len(report.modules)} modules"
+                )
+            )
+            if report.forbidden_loaded:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"  loaded on start: {', '.join(report.forbidden_loaded)}"
+                    )
+                )
+            self.stdout.write(f"  {'cumulative ms':>13} {'self ms':>8}  module")
+            for timing in report.slowest(options["top"]):
+                self.stdout.write(
+                    f"  {timing.cumulative_us / 1000:>13.1f} "
+                    f"{timing.self_us / 1000:>8.1f}  {timing.name}"
+                )
+
+        if failed:
+            raise CommandError(f"Startup imports over budget: {', '.join(failed)}")
@@ -0,0 +1,76 @@
+"""
+Generate a large multi-year operational history for load testing.
+
+Uses the bulk seeding engine (apps.core.seeding): vectorized random draws,
+PKs assigned up front and bulk inserts in dependency order with model
+signals muted (no Telegram notifications). Like generate_realistic_data_v2
+it builds on foundation data:
+
+    python manage.py generate_foundation_data
+    python manage.py generate_bulk_data --entries 1M --days 730
+
+Chunks are committed one at a time; an interrupted run keeps the chunks
+already written.
+"""
+
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.seeding import TerminalHistorySeeder
+
+
+SIZE_SUFFIXES = {"": 1, "k": 1_000, "m": 1_000_000}
+
+
+def parse_count(value: str) -> int:
+    """'250000', '250k' or '1.5M' -> number of rows."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([kKmM]?)", value.strip())
+    if not match:
+        raise ValueError(f"Invalid count: {value}")
+    number, suffix = match.groups()
+    return int(float(number) * SIZE_SUFFIXES[suffix.lower()])
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate container entries, positions, work orders, events and gate entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entries",
+            type=parse_count,
+            default=100_000,
+            help="Container entries to generate, e.g. 100000, 250k, 1M (default: 100k)",
+        )
+        parser.add_argument(
+            "--days", type=int, default=730, help="Days of history (default: 730)"
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=20_000,
+            help="Entries built and committed per chunk (default: 20000)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            seeder = TerminalHistorySeeder(
+                options["entries"],
+                days=options["days"],
+                seed=options["seed"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            f"Generating {options['entries']} entries over {options['days']} days..."
+        )
+        result = seeder.run(
+            progress=lambda done, total: self.stdout.write(f"  {done}/{total} entries")
+        )
+
+        for model, count in result.counts.items():
+            self.stdout.write(f"  {model}: {count}")
+        self.stdout.write(self.style.SUCCESS(f"Done in {result.seconds:.1f}s"))
@@ -32,6 +32,7 @@ from django.utils import timezone
 from apps.accounts.models import Company, CustomerProfile, ManagerProfile
 from apps.billing.models import Tariff, TariffRate
 from apps.containers.models import Container
+from apps.core.seeding import muted_signals
 from apps.terminal_operations.models import (
     ContainerEntry,
     ContainerOwner,
@@ -40,6 +41,7 @@ from apps.terminal_operations.models import (
     TerminalVehicle,
     WorkOrder,
 )
+from apps.terminal_operations.services.typeahead_service import invalidate_typeahead_index
 
 User = get_user_model()
 
@@ -151,7 +153,11 @@ class Command(BaseCommand):
             self._log_phase(f"Phase 4: Generating {days} days of operations")
             if self.checkpoint_every > 0:
                 self.stdout.write(f"  💾 Checkpointing every {self.checkpoint_every} days")
-            self._generate_timeline_with_checkpoints(days, foundation, container_pool, state)
+            # Per-entry Telegram notifications and index hooks are skipped;
+            # the typeahead index is rebuilt on next use
+            with muted_signals():
+                self._generate_timeline_with_checkpoints(days, foundation, container_pool, state)
+            invalidate_typeahead_index()
 
             if self.dry_run:
                 self.stdout.write(self.style.WARNING("\n🔍 DRY RUN - No data saved\n"))
@@ -0,0 +1,113 @@
+"""
+Benchmark hot paths against a deterministic synthetic dataset.
+
+The dataset is seeded into a test database (never the configured one),
+so the command is safe to run against any settings:
+
+    python manage.py run_benchmarks --entries 100000 --output base.json
+    python manage.py run_benchmarks --entries 100000 --compare base.json
+
+With --keepdb a PostgreSQL test database survives between runs and the
+seeded dataset is reused.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from apps.core.benchmarks import (
+    SCENARIOS,
+    compare_results,
+    load_baseline,
+    run_scenario,
+    save_baseline,
+    seed_dataset,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark hot paths on a seeded dataset and compare with a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entries", type=int, default=10000, help="Container entries to seed"
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument(
+            "--rounds", type=int, default=5, help="Timed runs per scenario"
+        )
+        parser.add_argument(
+            "--scenario",
+            dest="scenarios",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run (repeatable, default: all)",
+        )
+        parser.add_argument("--output", help="Save results as a JSON baseline")
+        parser.add_argument("--compare", help="Baseline JSON to compare against")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed slowdown against the baseline (fraction, default 0.25)",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database (and the seeded dataset) between runs",
+        )
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or list(SCENARIOS)
+        baseline = load_baseline(options["compare"]) if options["compare"] else None
+        if baseline and baseline["meta"]["entries"] != options["entries"]:
+            self.stderr.write(
+                self.style.WARNING(
+                    f"Baseline was recorded with {baseline['meta']['entries']} entries"
+                )
+            )
+
+        setup_test_environment()
+        old_config = setup_databases(
+            verbosity=options["verbosity"], interactive=False, keepdb=options["keepdb"]
+        )
+        try:
+            self.stdout.write(f"Seeding {options['entries']} entries...")
+            dataset = seed_dataset(options["entries"], seed=options["seed"])
+
+            results = []
+            self.stdout.write(
+                f"{'scenario':<32} {'median ms':>10} {'min ms':>10} "
+                f"{'max ms':>10} {'db ms':>10} {'queries':>8}"
+            )
+            for name in names:
+                result = run_scenario(SCENARIOS[name], dataset, options["rounds"])
+                results.append(result)
+                self.stdout.write(
+                    f"{name:<32} {result.median_ms:>10.2f} {result.min_ms:>10.2f} "
+                    f"{result.max_ms:>10.2f} {result.db_ms:>10.2f} "
+                    f"{result.queries:>8}"
+                )
+
+            if options["output"]:
+                save_baseline(options["output"], dataset, results)
+                self.stdout.write(f"Saved baseline to {options['output']}")
+        finally:
+            teardown_databases(
+                old_config, verbosity=options["verbosity"], keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        if baseline:
+            regressions = compare_results(results, baseline, options["tolerance"])
+            for regression in regressions:
+                self.stderr.write(
+                    self.style.ERROR(f"{regression.name}: {regression.reason}")
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark regressions")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
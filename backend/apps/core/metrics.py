@@ -0,0 +1,417 @@
+"""
+Metrics - in-process latency histograms and DB time per operation.
+
+An operation is anything timed with `timed`:
+
+    @timed()                                  # service method, named by qualname
+    def calculate_cost(self, entry): ...
+
+    with timed("import_excel", kind="task"):  # any block
+        ...
+
+    async def handler(...): ...               # coroutines are timed too
+
+Each operation records its wall time in a histogram plus the time and
+number of SQL queries it ran (on any connection, including
+sync_to_async threads), and errors. HTTP requests are timed by
+MetricsMiddleware and bot handlers by
+telegram_bot.middleware.HandlerMetricsMiddleware.
+
+The registry is rendered in the Prometheus text format by render(),
+served at /metrics (web app), /bot/metrics (bot webhook server) and by
+start_metrics_server() (ANPR listener, bound to localhost by default). The
+endpoints require `Authorization: Bearer <METRICS_TOKEN>`; without a token
+configured they are only open when DEBUG is on.
+
+Slow path:
+- operations slower than METRICS_SLOW_MS are logged as warnings
+  (logger "apps.core.metrics")
+- METRICS_PROFILE_SAMPLE_RATE of HTTP requests run under cProfile; those
+  slower than METRICS_SLOW_MS are dumped to METRICS_PROFILE_DIR
+  (inspect with `python -m pstats <file>`)
+"""
+
+import cProfile
+import functools
+import hmac
+import inspect
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DEFAULT_SLOW_MS = 1000
+
+_LABEL_ESCAPE_RE = re.compile(r'[\\"\n]')
+
+
+@dataclass
+class _Series:
+    buckets: list[int] = field(default_factory=lambda: [0] * len(BUCKETS))
+    count: int = 0
+    total: float = 0.0
+    errors: int = 0
+    db_seconds: float = 0.0
+    db_queries: int = 0
+
+
+@dataclass
+class Sample:
+    """One value reported by a collector."""
+
+    name: str
+    value: float
+    type: str = "gauge"
+    help: str = ""
+    labels: dict = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-operation histograms and extra collectors."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def observe(
+        self,
+        kind: str,
+        operation: str,
+        seconds: float,
+        db_seconds: float = 0.0,
+        db_queries: int = 0,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            series = self._series.get((kind, operation))
+            if series is None:
+                series = self._series[(kind, operation)] = _Series()
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series.buckets[index] += 1
+                    break
+            series.count += 1
+            series.total += seconds
+            series.db_seconds += db_seconds
+            series.db_queries += db_queries
+            series.errors += error
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        """
+        Add a callable reporting extra samples (queue depths, counters...).
+        Returns it, so it can be used as a decorator.
+        """
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+        return collector
+
+    def snapshot(self) -> dict[tuple[str, str], dict]:
+        """Count, total, errors and DB time per (kind, operation)."""
+        with self._lock:
+            return {
+                key: {
+                    "count": series.count,
+                    "total": series.total,
+                    "errors": series.errors,
+                    "db_seconds": series.db_seconds,
+                    "db_queries": series.db_queries,
+                }
+                for key, series in self._series.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            series = sorted(
+                (key, replace(s, buckets=list(s.buckets)))
+                for key, s in self._series.items()
+            )
+
+        lines = [
+            "# HELP app_operation_duration_seconds Operation latency",
+            "# TYPE app_operation_duration_seconds histogram",
+        ]
+        for (kind, operation), s in series:
+            labels = {"kind": kind, "operation": operation}
+            cumulative = 0
+            for bound, count in zip(BUCKETS, s.buckets, strict=True):
+                cumulative += count
+                lines.append(
+                    _line(
+                        "app_operation_duration_seconds_bucket",
+                        {**labels, "le": repr(bound)},
+                        cumulative,
+                    )
+                )
+            lines.append(
+                _line(
+                    "app_operation_duration_seconds_bucket",
+                    {**labels, "le": "+Inf"},
+                    s.count,
+                )
+            )
+            lines.append(_line("app_operation_duration_seconds_sum", labels, s.total))
+            lines.append(_line("app_operation_duration_seconds_count", labels, s.count))
+
+        for name, help_text, attribute in (
+            ("app_operation_db_seconds_total", "Time spent in SQL", "db_seconds"),
+            ("app_operation_db_queries_total", "SQL queries run", "db_queries"),
+            ("app_operation_errors_total", "Failed operations", "errors"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (kind, operation), s in series:
+                labels = {"kind": kind, "operation": operation}
+                lines.append(_line(name, labels, getattr(s, attribute)))
+
+        described = set()
+        for collector in list(self._collectors):
+            try:
+                samples = list(collector())
+            except Exception:
+                logger.exception(f"Metrics collector {collector!r} failed")
+                continue
+            for sample in samples:
+                if sample.name not in described:
+                    described.add(sample.name)
+                    if sample.help:
+                        lines.append(f"# HELP {sample.name} {sample.help}")
+                    lines.append(f"# TYPE {sample.name} {sample.type}")
+                lines.append(_line(sample.name, sample.labels, sample.value))
+
+        return "\n".join(lines) + "\n"
+
+
+def _line(name: str, labels: dict, value: float) -> str:
+    if labels:
+        rendered = ",".join(
+            f'{key}="{_LABEL_ESCAPE_RE.sub(_escape, str(val))}"'
+            for key, val in labels.items()
+        )
+        name = f"{name}{{{rendered}}}"
+    return f"{name} {value}"
+
+
+def _escape(match: re.Match) -> str:
+    return {"\\": "\\\\", '"': '\\"', "\n": "\\n"}[match.group(0)]
+
+
+registry = MetricsRegistry()
+
+
+# DB time: a wrapper on every connection adds each query's duration to the
+# accumulators of the operations active in the current context.
+# sync_to_async copies the context, so queries run in its threads count too.
+_active_db_timers: ContextVar[tuple[list, ...]] = ContextVar(
+    "metrics_db_timers", default=()
+)
+
+
+def _db_wrapper(execute, sql, params, many, context):
+    timers = _active_db_timers.get()
+    if not timers:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        for timer in timers:
+            timer[0] += elapsed
+            timer[1] += 1
+
+
+def install_db_wrapper(connection, **kwargs) -> None:
+    """
+    Hook a connection for DB time accounting (connection_created receiver).
+
+    Inserted first: execute_wrapper() context managers elsewhere append and
+    pop their own wrappers at the end of the list.
+    """
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _db_wrapper)
+
+
+class timed:
+    """
+    Time an operation; usable as a decorator (sync or async) or a context
+    manager. `operation` defaults to the decorated function's qualname and
+    may be changed on the instance before the block exits.
+    """
+
+    def __init__(self, operation: str | None = None, kind: str = "service"):
+        self.operation = operation
+        self.kind = kind
+        self.seconds = 0.0
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.error = False
+
+    def __call__(self, func):
+        operation = self.operation or func.__qualname__
+        kind = self.kind
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(operation, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(operation, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        for connection in connections.all(initialized_only=True):
+            install_db_wrapper(connection)
+        self._db = [0.0, 0]
+        self._token = _active_db_timers.set((*_active_db_timers.get(), self._db))
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._started
+        _active_db_timers.reset(self._token)
+        self.db_seconds, self.db_queries = self._db
+        self.error = self.error or exc_type is not None
+        registry.observe(
+            self.kind,
+            self.operation or "unknown",
+            self.seconds,
+            self.db_seconds,
+            self.db_queries,
+            self.error,
+        )
+        if self.seconds * 1000 >= slow_threshold_ms():
+            logger.warning(
+                f"Slow {self.kind} operation={self.operation} "
+                f"time_ms={self.seconds * 1000:.1f} "
+                f"db_ms={self.db_seconds * 1000:.1f} queries={self.db_queries}"
+            )
+        return False
+
+
+def slow_threshold_ms() -> float:
+    return getattr(settings, "METRICS_SLOW_MS", DEFAULT_SLOW_MS)
+
+
+def is_authorized(authorization: str | None) -> bool:
+    """Check an Authorization header against METRICS_TOKEN (no token: DEBUG only)."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        return settings.DEBUG
+    return hmac.compare_digest(authorization or "", f"Bearer {token}")
+
+
+def metrics_view(request):
+    """GET /metrics - Prometheus scrape endpoint of the web app."""
+    if not is_authorized(request.headers.get("Authorization")):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Time every request as operation "<METHOD> <view name>"; sample profiles."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profiler = _start_profiler()
+        with timed(kind="http") as timer:
+            response = self.get_response(request)
+            resolver_match = getattr(request, "resolver_match", None)
+            view_name = resolver_match.view_name if resolver_match else "unmatched"
+            timer.operation = f"{request.method} {view_name}"
+            timer.error = response.status_code >= 500
+
+        if profiler is not None:
+            profiler.disable()
+            if timer.seconds * 1000 >= slow_threshold_ms():
+                _dump_profile(profiler, timer)
+        return response
+
+
+def _start_profiler() -> cProfile.Profile | None:
+    rate = getattr(settings, "METRICS_PROFILE_SAMPLE_RATE", 0)
+    if not rate or random.random() >= rate:
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is active in this process
+        return None
+    return profiler
+
+
+def _dump_profile(profiler: cProfile.Profile, timer: timed) -> None:
+    directory = settings.METRICS_PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", timer.operation or "unknown")
+    path = os.path.join(
+        directory,
+        f"{timezone.now():%Y%m%d-%H%M%S}-{name}-{timer.seconds * 1000:.0f}ms.prof",
+    )
+    profiler.dump_stats(path)
+    logger.warning(f"Profile of slow {timer.operation} written to {path}")
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        if not is_authorized(self.headers.get("Authorization")):
+            self.send_error(401)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (processes without a web server)."""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    logger.info(f"Metrics served on http://{host}:{server.server_port}/metrics")
+    return server
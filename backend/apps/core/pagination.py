@@ -2,9 +2,14 @@
 Centralized pagination classes for consistent API responses.
 """
 
+import hashlib
+import json
 from collections import OrderedDict
 
-from rest_framework.pagination import PageNumberPagination
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -42,3 +47,116 @@ class StandardResultsSetPagination(PageNumberPagination):
                 ]
             )
         )
+
+
+class CursorResultsSetPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for large, time-ordered lists.
+
+    Pages are fetched with WHERE <ordering field> < <cursor position> on an
+    indexed column instead of OFFSET, and no COUNT(*) is issued by default,
+    so deep pages cost the same as the first one.
+
+    - Default page size: 20 items (?page_size=X, max 100)
+    - Ordering: the view's OrderingFilter / `ordering`, else -created_at
+    - Count: null unless requested with ?count=exact (cached for
+      COUNT_CACHE_SECONDS) or ?count=estimate (PostgreSQL planner estimate)
+
+    Response format (same envelope as StandardResultsSetPagination):
+    {
+        "success": true,
+        "count": null,
+        "next": "http://api.example.com/entries/?cursor=cD0yMDI2...",
+        "previous": null,
+        "results": [...]
+    }
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
+
+    count_query_param = "count"
+    COUNT_CACHE_SECONDS = 60
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = self.get_count(queryset, request.query_params.get(self.count_query_param))
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset, mode):
+        """Row count for the requested mode ("exact", "estimate"), or None."""
+        if mode not in ("exact", "estimate"):
+            return None
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            # .none() or an empty __in filter: there is no query to run
+            return 0
+
+        if mode == "estimate":
+            estimate = self._estimate_count(queryset.db, sql, params)
+            if estimate is not None:
+                return estimate
+
+        cache_key = "pagination:count:" + hashlib.md5(f"{sql}{params!r}".encode()).hexdigest()
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, timeout=self.COUNT_CACHE_SECONDS)
+        return count
+
+    def _estimate_count(self, using, sql, params):
+        """Planner row estimate (PostgreSQL only) - no table scan."""
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("success", True),
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class StandardOrCursorPagination(StandardResultsSetPagination):
+    """
+    Page-number pagination with opt-in keyset pagination per request.
+
+    Views that list large, growing tables use this class so existing clients
+    keep ?page=N, while clients sending ?pagination=cursor (and then following
+    `next`, which carries ?cursor=) get CursorResultsSetPagination.
+    """
+
+    cursor_class = CursorResultsSetPagination
+    mode_query_param = "pagination"
+
+    def use_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = self.cursor_class() if self.use_cursor(request) else None
+        if self.cursor_paginator:
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,213 @@
+"""
+Query Budget - SQL accounting per request and N+1 detection.
+
+QueryRecorder hooks every database connection with an execute wrapper and
+records each statement's SQL and duration; fingerprints (literals and IN
+lists collapsed) are only computed for the duplicate report, once per
+distinct statement. QueryBudgetMiddleware records every request and:
+- logs one structured line (logger "apps.core.query_budget"); a warning
+  when the view's budget is exceeded or a statement repeats
+  QUERY_BUDGET_DUPLICATE_THRESHOLD times (likely N+1)
+- adds X-Query-Count / X-Query-Time-Ms / X-Query-Duplicates headers when
+  QUERY_BUDGET_HEADERS is on (defaults to DEBUG)
+- raises QueryBudgetExceeded instead of warning when QUERY_BUDGET_STRICT
+  is on (the test suite)
+
+Budgets are declared on the view class:
+
+    class ExampleViewSet(viewsets.ModelViewSet):
+        query_budget = {"list": 6, "retrieve": 4, "default": 10}
+
+An int applies to every action; dict keys are DRF action names (or HTTP
+methods for plain APIViews) with an optional "default".
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DUPLICATE_THRESHOLD = 3
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its view's budget (strict mode)."""
+
+
+@lru_cache(maxsize=2048)
+def fingerprint_sql(sql: str) -> str:
+    """SQL with literals replaced by "?" and IN lists collapsed, for grouping."""
+    sql = _STRING_LITERAL_RE.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+@dataclass
+class RecordedQuery:
+    alias: str
+    sql: str
+    duration: float
+
+
+class QueryRecorder:
+    """
+    Context manager recording every query on all database connections.
+
+    Usage:
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.total_time, recorder.duplicates()
+    """
+
+    def __init__(self):
+        self.queries: list[RecordedQuery] = []
+        self._stack: ExitStack | None = None
+
+    def __enter__(self) -> "QueryRecorder":
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                RecordedQuery(
+                    alias=context["connection"].alias,
+                    sql=sql,
+                    duration=time.perf_counter() - started,
+                )
+            )
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def duplicates(self, threshold: int = 2) -> dict[str, int]:
+        """Fingerprints executed at least `threshold` times, most frequent first."""
+        counts = Counter()
+        for sql, count in Counter(query.sql for query in self.queries).items():
+            counts[fingerprint_sql(sql)] += count
+        return {
+            fingerprint: count
+            for fingerprint, count in counts.most_common()
+            if count >= threshold
+        }
+
+
+def resolve_budget(view_func, method: str) -> int | None:
+    """Query budget declared on a view for the action serving `method`."""
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    budget = getattr(view_class, "query_budget", None)
+    if budget is None:
+        budget = getattr(view_func, "query_budget", None)
+    if budget is None or isinstance(budget, int):
+        return budget
+
+    method = method.lower()
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method, method)
+    return budget.get(action, budget.get("default"))
+
+
+class QueryBudgetMiddleware:
+    """Record SQL per request and enforce view query budgets."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.query_budget = None
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        budget = request.query_budget
+        over_budget = budget is not None and recorder.count > budget
+        headers = getattr(settings, "QUERY_BUDGET_HEADERS", settings.DEBUG)
+        strict = over_budget and getattr(settings, "QUERY_BUDGET_STRICT", False)
+
+        # The duplicate report is only built when something will show it
+        duplicates = {}
+        if headers or strict or logger.isEnabledFor(logging.WARNING):
+            threshold = getattr(
+                settings,
+                "QUERY_BUDGET_DUPLICATE_THRESHOLD",
+                DEFAULT_DUPLICATE_THRESHOLD,
+            )
+            duplicates = recorder.duplicates(threshold)
+
+        self._log(request, response, recorder, budget, duplicates, over_budget)
+
+        if headers:
+            response["X-Query-Count"] = str(recorder.count)
+            response["X-Query-Time-Ms"] = f"{recorder.total_time * 1000:.1f}"
+            response["X-Query-Duplicates"] = str(len(duplicates))
+            if budget is not None:
+                response["X-Query-Budget"] = str(budget)
+
+        if strict:
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path}: {recorder.count} queries, "
+                f"budget {budget}. Repeated: {duplicates or 'none'}"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = resolve_budget(view_func, request.method)
+
+    def _log(self, request, response, recorder, budget, duplicates, over_budget):
+        level = logging.WARNING if over_budget or duplicates else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else ""
+        logger.log(
+            level,
+            f"method={request.method} path={request.path} view={view_name} "
+            f"status={response.status_code} queries={recorder.count} "
+            f"time_ms={recorder.total_time * 1000:.1f} budget={budget} "
+            f"repeated={len(duplicates)}",
+            extra={
+                "query_budget": {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": view_name,
+                    "status": response.status_code,
+                    "queries": recorder.count,
+                    "time_ms": round(recorder.total_time * 1000, 1),
+                    "budget": budget,
+                    "over_budget": over_budget,
+                    "repeated": duplicates,
+                }
+            },
+        )
@@ -0,0 +1,28 @@
+"""
+Bulk seeding of large synthetic datasets for load testing.
+
+Run with `manage.py generate_bulk_data --entries 1M`.
+"""
+
+from .engine import (
+    BulkWriter,
+    backdate,
+    dependency_order,
+    muted_signals,
+    reserve_pks,
+    reset_sequences,
+)
+from .terminal import Foundation, SeedResult, TerminalHistorySeeder
+
+
+__all__ = [
+    "BulkWriter",
+    "Foundation",
+    "SeedResult",
+    "TerminalHistorySeeder",
+    "backdate",
+    "dependency_order",
+    "muted_signals",
+    "reserve_pks",
+    "reset_sequences",
+]
@@ -0,0 +1,164 @@
+"""
+Generic pieces of bulk seeding: muted model signals, primary keys reserved
+up front and a writer that bulk-inserts buffered rows in FK dependency
+order.
+
+Reserving PKs lets generators wire foreign keys (entry -> container,
+position -> entry) in memory, so rows of all models for a chunk are built
+before anything is written and no insert has to return its ids. Reserve
+on a quiet database: concurrent inserts into the same tables would take
+the same ids.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+from django.core.management.color import no_style
+from django.db import connections, models
+from django.db.models import F, Max
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+
+BATCH_SIZE = 2000
+
+MODEL_SIGNALS = (pre_save, post_save, pre_delete, post_delete, m2m_changed)
+
+
+@contextmanager
+def muted_signals(*signals) -> Iterator[None]:
+    """
+    Disconnect all receivers of model signals for the duration of the block.
+
+    Notifications, search/typeahead sync and event hooks don't run; callers
+    rebuild whatever those receivers maintain (search index, caches)
+    themselves. Receivers connected inside the block are dropped.
+    """
+    signals = signals or MODEL_SIGNALS
+    saved = [(signal, signal.receivers) for signal in signals]
+    for signal in signals:
+        with signal.lock:
+            signal.receivers = []
+            signal.sender_receivers_cache.clear()
+    try:
+        yield
+    finally:
+        for signal, receivers in saved:
+            with signal.lock:
+                signal.receivers = receivers
+                signal.sender_receivers_cache.clear()
+
+
+def reserve_pks(
+    model: type[models.Model], count: int, using: str = "default"
+) -> np.ndarray:
+    """Next `count` primary keys of a model (above the current maximum)."""
+    current = model._default_manager.using(using).aggregate(top=Max("pk"))["top"]
+    start = (current or 0) + 1
+    return np.arange(start, start + count, dtype=np.int64)
+
+
+def reset_sequences(
+    model_list: Iterable[type[models.Model]], using: str = "default"
+) -> None:
+    """Move PK sequences past explicitly inserted ids (no-op on SQLite)."""
+    connection = connections[using]
+    statements = connection.ops.sequence_reset_sql(no_style(), list(model_list))
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def dependency_order(
+    model_list: Iterable[type[models.Model]],
+) -> list[type[models.Model]]:
+    """Models sorted so that every model comes after the models it references."""
+    model_list = list(model_list)
+    ordered: list[type[models.Model]] = []
+    visiting: set[type[models.Model]] = set()
+
+    def visit(model):
+        if model in ordered:
+            return
+        if model in visiting:
+            raise ValueError(f"Circular foreign keys around {model.__name__}")
+        visiting.add(model)
+        for field in model._meta.concrete_fields:
+            target = field.related_model if field.is_relation else None
+            if target in model_list and target is not model:
+                visit(target)
+        visiting.discard(model)
+        ordered.append(model)
+
+    for model in model_list:
+        visit(model)
+    return ordered
+
+
+def backdate(
+    model: type[models.Model],
+    pks: np.ndarray,
+    source_field: str,
+    using: str = "default",
+) -> int:
+    """
+    Set created_at/updated_at of a PK range from another datetime field.
+
+    bulk_create stamps auto_now(_add) fields with the insert time; seeded
+    history should look created when it happened.
+    """
+    if not len(pks):
+        return 0
+    return (
+        model._default_manager.using(using)
+        .filter(pk__range=(int(pks.min()), int(pks.max())))
+        .update(created_at=F(source_field), updated_at=F(source_field))
+    )
+
+
+class BulkWriter:
+    """
+    Buffer of unsaved rows, written per model in dependency order.
+
+    Rows that other rows refer to must carry their PKs (see reserve_pks),
+    so nothing has to be read back after inserting.
+    """
+
+    def __init__(
+        self,
+        model_list: Iterable[type[models.Model]],
+        batch_size: int = BATCH_SIZE,
+        using: str = "default",
+    ):
+        self.models = dependency_order(model_list)
+        self.batch_size = batch_size
+        self.using = using
+        self.pending: dict[type[models.Model], list[models.Model]] = defaultdict(list)
+        self.written: dict[str, int] = defaultdict(int)
+
+    def add(self, objects: Iterable[models.Model]) -> None:
+        for obj in objects:
+            self.pending[type(obj)].append(obj)
+
+    def flush(self) -> int:
+        total = 0
+        for model in self.models:
+            objects = self.pending.pop(model, [])
+            if not objects:
+                continue
+            model._default_manager.using(self.using).bulk_create(
+                objects, batch_size=self.batch_size
+            )
+            self.written[model.__name__] += len(objects)
+            total += len(objects)
+        if self.pending:
+            unknown = ", ".join(model.__name__ for model in self.pending)
+            raise ValueError(f"BulkWriter got rows of unregistered models: {unknown}")
+        return total
@@ -0,0 +1,532 @@
+"""
+Synthetic multi-year terminal history for load testing.
+
+All attributes of all entries are drawn up front with NumPy: arrival days
+with a weekly pattern and growth trend, lognormal dwell times, containers
+reused across visits without overlapping, sizes, statuses and transport.
+Rows are then built and bulk-inserted chunk by chunk with signals muted:
+containers, entries, yard positions for containers still on the terminal
+(tier by tier, as far as the yard holds them), one placement work order
+per entry, entry/position/exit events and gate entries of the trucks.
+
+Builds on foundation data (companies, container owners, operators and
+terminal vehicles; see generate_foundation_data).
+"""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Company, CustomUser
+from apps.containers.models import Container
+from apps.terminal_operations.models import (
+    ContainerEntry,
+    ContainerEvent,
+    ContainerOwner,
+    ContainerPosition,
+    TerminalVehicle,
+    WorkOrder,
+)
+from apps.terminal_operations.services.entry_search import (
+    build_search_document,
+    index_entries,
+)
+from apps.terminal_operations.services.typeahead_service import (
+    _LETTER_VALUES,
+    invalidate_typeahead_index,
+)
+from apps.terminal_operations.services.yard_geometry import YardGeometry
+from apps.vehicles.models import VehicleEntry
+
+from .engine import (
+    BATCH_SIZE,
+    BulkWriter,
+    backdate,
+    muted_signals,
+    reserve_pks,
+    reset_sequences,
+)
+
+
+CHUNK_SIZE = 20000
+
+OWNER_CODES = ["MSKU", "MSCU", "CMAU", "HLXU", "TGHU", "TCLU", "OOLU", "EGHU"]
+SERIALS_PER_CODE = 1_000_000
+
+ISO_TYPES = np.array(["22G1", "42G1", "45G1", "L5G1", "22R1", "42R1", "45R1"])
+ISO_WEIGHTS = np.array([30, 35, 20, 5, 3, 5, 2]) / 100
+
+# Visits per container on average (a container comes back every ~1.5 pool)
+CONTAINERS_PER_ENTRY = 2 / 3
+
+LADEN_SHARE = 0.4
+WAGON_SHARE = 0.3
+NO_COMPANY_SHARE = 0.1
+DWELL_MEDIAN_DAYS = 7
+MAX_DWELL_DAYS = 120
+
+CLIENT_NAMES = ["Uzbek Cotton", "Navoi Mining", "Tashkent Trade", "Silk Road Log"]
+CARGO_NAMES = ["Хлопок", "Медь", "Оборудование", "Текстиль", "Продукты"]
+DESTINATIONS = ["Ташкент", "Алматы", "Бишкек", "Москва", "Актау"]
+
+SEEDED_MODELS = [
+    Container,
+    ContainerEntry,
+    ContainerPosition,
+    WorkOrder,
+    ContainerEvent,
+    VehicleEntry,
+]
+
+
+@dataclass
+class Foundation:
+    """Existing rows the generated history refers to."""
+
+    companies: list[Company]
+    owners: list[ContainerOwner]
+    operators: list[CustomUser]
+    vehicles: list[TerminalVehicle]
+
+    @classmethod
+    def load(cls) -> "Foundation":
+        foundation = cls(
+            companies=list(Company.objects.filter(is_active=True).order_by("pk")),
+            owners=list(ContainerOwner.objects.order_by("pk")),
+            operators=list(
+                CustomUser.objects.filter(
+                    user_type__in=["admin", "manager"], is_active=True
+                ).order_by("pk")
+            ),
+            vehicles=list(
+                TerminalVehicle.objects.filter(is_active=True).order_by("pk")
+            ),
+        )
+        missing = [
+            name
+            for name in ("companies", "owners", "operators")
+            if not getattr(foundation, name)
+        ]
+        if missing:
+            raise ValueError(
+                f"No {', '.join(missing)} found; run generate_foundation_data first"
+            )
+        return foundation
+
+
+@dataclass
+class SeedResult:
+    counts: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+def check_digits(codes: np.ndarray, serials: np.ndarray) -> np.ndarray:
+    """ISO 6346 check digits of owner codes (4 letters) + 6 digit serials."""
+    code_sums = {
+        code: sum(_LETTER_VALUES[char] * 2**i for i, char in enumerate(code))
+        for code in OWNER_CODES
+    }
+    total = np.array([code_sums[code] for code in codes], dtype=np.int64)
+    for position in range(6):
+        digit = serials // 10 ** (5 - position) % 10
+        total += digit * 2 ** (4 + position)
+    return total % 11 % 10
+
+
+def _yard_slots(geometry: YardGeometry, occupied: set) -> dict[str, list[tuple]]:
+    """Free slots per size class, lower tiers first."""
+    slots = {"40ft": [], "20ft": []}
+    for size, sub_slots in (("40ft", ("A",)), ("20ft", ("A", "B"))):
+        bays = list(geometry.iter_bays(container_size=size))
+        for tier in range(1, geometry.max_tiers + 1):
+            for zone, row, bay in bays:
+                if tier > geometry.row_config(zone, row).max_tiers:
+                    continue
+                for sub_slot in sub_slots:
+                    slot = (zone, row, bay, tier, sub_slot)
+                    if slot not in occupied:
+                        slots[size].append(slot)
+    return slots
+
+
+def _size(iso_type: str) -> str:
+    return {"2": "20ft", "4": "40ft", "L": "45ft"}.get(iso_type[0], "20ft")
+
+
+class TerminalHistorySeeder:
+    """Generate and write `entries` container visits over the last `days` days."""
+
+    def __init__(
+        self,
+        entries: int,
+        days: int = 730,
+        seed: int = 42,
+        chunk_size: int = CHUNK_SIZE,
+        batch_size: int = BATCH_SIZE,
+        foundation: Foundation | None = None,
+    ):
+        if entries < 1 or days < 1:
+            raise ValueError("entries and days must be positive")
+        self.entries = entries
+        self.days = days
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.foundation = foundation or Foundation.load()
+        self.now = int(timezone.now().timestamp())
+
+    def run(self, progress: Callable[[int, int], None] | None = None) -> SeedResult:
+        started = time.perf_counter()
+        self._draw_entries()
+        self._draw_containers()
+        self._plan_yard()
+        self._reserve()
+
+        writer = BulkWriter(SEEDED_MODELS, batch_size=self.batch_size)
+        with muted_signals():
+            for start in range(0, self.entries, self.chunk_size):
+                stop = min(start + self.chunk_size, self.entries)
+                with transaction.atomic():
+                    entries = self._build_chunk(writer, start, stop)
+                    writer.flush()
+                    self._backdate(start, stop)
+                    index_entries(entries)
+                if progress:
+                    progress(stop, self.entries)
+            reset_sequences(SEEDED_MODELS)
+        invalidate_typeahead_index()
+
+        return SeedResult(
+            counts=dict(writer.written), seconds=time.perf_counter() - started
+        )
+
+    # ------------------------------------------------------------------
+    # Vectorized draws
+    # ------------------------------------------------------------------
+
+    def _draw_entries(self) -> None:
+        n, rng = self.entries, self.rng
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        first_day = today - timedelta(days=self.days - 1)
+        self.first_day = first_day
+
+        weekdays = (first_day.weekday() + np.arange(self.days)) % 7
+        weights = np.where(weekdays == 6, 0.4, 1.0) * np.linspace(0.8, 1.2, self.days)
+        day = rng.choice(self.days, size=n, p=weights / weights.sum())
+        minute = np.clip(rng.normal(13 * 60, 180, n), 6 * 60, 22 * 60 - 1)
+        entry = (
+            int(first_day.timestamp())
+            + day * 86400
+            + minute.astype(np.int64) * 60
+            + rng.integers(0, 60, n)
+        )
+        self.entry_time = np.sort(np.minimum(entry, self.now - 60))
+
+        dwell = np.clip(
+            rng.lognormal(np.log(DWELL_MEDIAN_DAYS), 0.8, n), 0.05, MAX_DWELL_DAYS
+        )
+        exit_time = self.entry_time + (dwell * 86400).astype(np.int64)
+
+        # Entry k and k + pool are visits of the same container
+        self.pool = max(1, int(n * CONTAINERS_PER_ENTRY))
+        self.container_index = np.arange(n) % self.pool
+        returning = self.entry_time[self.pool :] - 60
+        exit_time[: n - self.pool] = np.minimum(exit_time[: n - self.pool], returning)
+        exit_time = np.maximum(exit_time, self.entry_time + 60)
+        self.on_terminal = exit_time >= self.now
+        self.exit_time = np.where(self.on_terminal, -1, exit_time)
+
+        self.laden = rng.random(n) < LADEN_SHARE
+        self.wagon = rng.random(n) < WAGON_SHARE
+        self.exit_wagon = rng.random(n) < WAGON_SHARE
+        companies = len(self.foundation.companies)
+        self.company = np.where(
+            rng.random(n) < NO_COMPANY_SHARE, -1, rng.integers(0, companies, n)
+        )
+        self.owner = rng.integers(0, len(self.foundation.owners), n)
+        self.operator = rng.integers(0, len(self.foundation.operators), n)
+        self.client = rng.integers(0, len(CLIENT_NAMES), n)
+        self.cargo = rng.integers(0, len(CARGO_NAMES), n)
+        self.destination = rng.integers(0, len(DESTINATIONS), n)
+        self.weight = np.round(rng.uniform(5, 28, n), 2)
+        self.plate = rng.integers(0, 10**8, n)
+        self.exit_plate = rng.integers(0, 10**8, n)
+        self.train = rng.integers(1000, 9999, n)
+        self.placement_minutes = rng.integers(30, 240, n)
+        self.vehicle = (
+            rng.integers(0, len(self.foundation.vehicles), n)
+            if self.foundation.vehicles
+            else np.full(n, -1)
+        )
+
+    def _draw_containers(self) -> None:
+        rng = self.rng
+        existing = set(Container.objects.values_list("container_number", flat=True))
+        wanted = self.pool + len(existing)
+        drawn = rng.choice(len(OWNER_CODES) * SERIALS_PER_CODE, wanted, replace=False)
+        codes = np.array(OWNER_CODES)[drawn // SERIALS_PER_CODE]
+        serials = drawn % SERIALS_PER_CODE
+        digits = check_digits(codes, serials)
+        numbers = [
+            f"{code}{serial:06d}{digit}"
+            for code, serial, digit in zip(codes, serials, digits, strict=True)
+        ]
+        self.container_numbers = [n for n in numbers if n not in existing][: self.pool]
+        self.iso_type = ISO_TYPES[
+            rng.choice(len(ISO_TYPES), size=self.pool, p=ISO_WEIGHTS)
+        ]
+
+    def _plan_yard(self) -> None:
+        """Slots for on-terminal entries, oldest first, while the yard has room."""
+        occupied = set(
+            ContainerPosition.objects.values_list(
+                "zone", "row", "bay", "tier", "sub_slot"
+            )
+        )
+        self.slots = _yard_slots(YardGeometry.load(), occupied)
+        free = {size: iter(slots) for size, slots in self.slots.items()}
+        self.slot = {}
+        for index in np.flatnonzero(self.on_terminal):
+            iso_type = self.iso_type[self.container_index[index]]
+            slot = next(free["20ft" if _size(iso_type) == "20ft" else "40ft"], None)
+            if slot is not None:
+                self.slot[int(index)] = slot
+
+    def _reserve(self) -> None:
+        n = self.entries
+        exited = int((~self.on_terminal).sum())
+        self.container_pks = reserve_pks(Container, self.pool)
+        self.entry_pks = reserve_pks(ContainerEntry, n)
+        self.work_order_pks = reserve_pks(WorkOrder, n)
+        self.event_pks = iter(reserve_pks(ContainerEvent, n + len(self.slot) + exited))
+        self.vehicle_pks = iter(reserve_pks(VehicleEntry, int((~self.wagon).sum())))
+        self.order_sequence = self._order_sequences()
+
+    def _order_sequences(self) -> dict[str, int]:
+        """Last used work order sequence per day in the seeded period."""
+        sequences = {}
+        numbers = WorkOrder.objects.filter(
+            order_number__gte=f"WO-{self.first_day:%Y%m%d}"
+        ).values_list("order_number", flat=True)
+        for number in numbers:
+            _prefix, day, sequence = number.split("-")
+            sequences[day] = max(sequences.get(day, 0), int(sequence))
+        return sequences
+
+    # ------------------------------------------------------------------
+    # Row building
+    # ------------------------------------------------------------------
+
+    def _datetime(self, timestamp) -> datetime:
+        return datetime.fromtimestamp(int(timestamp), tz=UTC)
+
+    def _build_chunk(self, writer: BulkWriter, start: int, stop: int) -> list:
+        self.chunk_pks = {ContainerEvent: [], VehicleEntry: []}
+        entries = []
+        for i in range(start, stop):
+            container_index = int(self.container_index[i])
+            container = Container(
+                pk=int(self.container_pks[container_index]),
+                container_number=self.container_numbers[container_index],
+                iso_type=str(self.iso_type[container_index]),
+            )
+            if container_index == i:
+                writer.add([container])
+
+            entry = self._entry(i, container)
+            entry.search_document = build_search_document(entry)
+            entries.append(entry)
+            writer.add([entry])
+            work_order, placed_at = self._work_order(i, entry)
+            writer.add([work_order])
+            if i in self.slot:
+                writer.add([self._position(i, entry)])
+            writer.add(self._events(i, entry, placed_at))
+            if not self.wagon[i]:
+                writer.add([self._gate_entry(entry)])
+        return entries
+
+    def _entry(self, i: int, container: Container) -> ContainerEntry:
+        foundation = self.foundation
+        company = (
+            foundation.companies[self.company[i]] if self.company[i] >= 0 else None
+        )
+        exited = not self.on_terminal[i]
+        exit_wagon = bool(self.exit_wagon[i])
+        return ContainerEntry(
+            pk=int(self.entry_pks[i]),
+            container=container,
+            status="LADEN" if self.laden[i] else "EMPTY",
+            transport_type="WAGON" if self.wagon[i] else "TRUCK",
+            transport_number=self._transport_number(self.plate[i], self.wagon[i]),
+            entry_train_number=f"{self.train[i]}" if self.wagon[i] else "",
+            entry_time=self._datetime(self.entry_time[i]),
+            recorded_by=foundation.operators[self.operator[i]],
+            client_name=company.name if company else CLIENT_NAMES[self.client[i]],
+            container_owner=foundation.owners[self.owner[i]],
+            company=company,
+            cargo_name=CARGO_NAMES[self.cargo[i]] if self.laden[i] else "",
+            cargo_weight=Decimal(f"{self.weight[i]:.2f}") if self.laden[i] else None,
+            exit_date=self._datetime(self.exit_time[i]) if exited else None,
+            exit_transport_type=(
+                ("WAGON" if exit_wagon else "TRUCK") if exited else None
+            ),
+            exit_transport_number=(
+                self._transport_number(self.exit_plate[i], exit_wagon) if exited else ""
+            ),
+            destination_station=DESTINATIONS[self.destination[i]] if exited else "",
+        )
+
+    def _transport_number(self, value, wagon) -> str:
+        value = int(value)
+        if wagon:
+            return f"{value:08d}"
+        letters = "ABCDEFHKMNOPTXY"
+        return (
+            f"{value % 95 + 1:02d}{letters[value // 100 % 15]}{value // 1000 % 1000:03d}"
+            f"{letters[value // 10**6 % 15]}{letters[value % 15]}"
+        )
+
+    def _work_order(self, i: int, entry: ContainerEntry):
+        """Placement work order; completed unless the entry still waits for a slot."""
+        slot = self.slot.get(i)
+        placed = slot is not None or not self.on_terminal[i]
+        if slot is None:
+            size = _size(entry.container.iso_type)
+            slots = self.slots["20ft" if size == "20ft" else "40ft"]
+            slot = slots[i % len(slots)] if slots else ("A", 1, 1, 1, "A")
+        zone, row, bay, tier, sub_slot = slot
+
+        completed_at = None
+        if placed:
+            completed = self.entry_time[i] + int(self.placement_minutes[i]) * 60
+            if not self.on_terminal[i]:
+                completed = min(completed, self.exit_time[i])
+            completed_at = self._datetime(min(completed, self.now))
+
+        local_day = f"{timezone.localtime(entry.entry_time):%Y%m%d}"
+        sequence = self.order_sequence.get(local_day, 0) + 1
+        self.order_sequence[local_day] = sequence
+
+        vehicle = self.vehicle[i]
+        work_order = WorkOrder(
+            pk=int(self.work_order_pks[i]),
+            operation_type="PLACEMENT",
+            order_number=f"WO-{local_day}-{sequence:04d}",
+            container_entry_id=entry.pk,
+            status="COMPLETED" if placed else "PENDING",
+            target_zone=zone,
+            target_row=row,
+            target_bay=bay,
+            target_tier=tier,
+            target_sub_slot=sub_slot,
+            assigned_to_vehicle=(
+                self.foundation.vehicles[vehicle] if vehicle >= 0 else None
+            ),
+            created_by=entry.recorded_by,
+            completed_at=completed_at,
+        )
+        return work_order, completed_at
+
+    def _position(self, i: int, entry: ContainerEntry) -> ContainerPosition:
+        zone, row, bay, tier, sub_slot = self.slot[i]
+        return ContainerPosition(
+            container_entry_id=entry.pk,
+            zone=zone,
+            row=row,
+            bay=bay,
+            tier=tier,
+            sub_slot=sub_slot,
+            container_size=_size(entry.container.iso_type),
+            auto_assigned=True,
+        )
+
+    def _events(self, i: int, entry: ContainerEntry, placed_at) -> list[ContainerEvent]:
+        events = [
+            ContainerEvent(
+                pk=int(next(self.event_pks)),
+                container_entry_id=entry.pk,
+                event_type="ENTRY_CREATED",
+                event_time=entry.entry_time,
+                performed_by=entry.recorded_by,
+                details={
+                    "status": entry.status,
+                    "transport_type": entry.transport_type,
+                    "transport_number": entry.transport_number,
+                    "entry_train_number": entry.entry_train_number,
+                },
+            )
+        ]
+        if i in self.slot:
+            zone, row, bay, tier, sub_slot = self.slot[i]
+            events.append(
+                ContainerEvent(
+                    pk=int(next(self.event_pks)),
+                    container_entry_id=entry.pk,
+                    event_type="POSITION_ASSIGNED",
+                    event_time=placed_at,
+                    performed_by=entry.recorded_by,
+                    details={
+                        "zone": zone,
+                        "row": row,
+                        "bay": bay,
+                        "tier": tier,
+                        "sub_slot": sub_slot,
+                        "coordinate": f"{zone}-R{row:02d}-B{bay:02d}-T{tier}-{sub_slot}",
+                        "auto_assigned": True,
+                    },
+                )
+            )
+        if entry.exit_date:
+            events.append(
+                ContainerEvent(
+                    pk=int(next(self.event_pks)),
+                    container_entry_id=entry.pk,
+                    event_type="EXIT_RECORDED",
+                    event_time=entry.exit_date,
+                    performed_by=entry.recorded_by,
+                    details={
+                        "exit_transport_type": entry.exit_transport_type,
+                        "exit_transport_number": entry.exit_transport_number,
+                        "exit_train_number": "",
+                        "destination_station": entry.destination_station,
+                        "dwell_time_days": entry.dwell_time_days,
+                    },
+                )
+            )
+        self.chunk_pks[ContainerEvent] += [event.pk for event in events]
+        return events
+
+    def _gate_entry(self, entry: ContainerEntry) -> VehicleEntry:
+        """The truck that delivered the container through the gate."""
+        size = _size(entry.container.iso_type)
+        load = "LOADED" if entry.status == "LADEN" else "EMPTY"
+        pk = int(next(self.vehicle_pks))
+        self.chunk_pks[VehicleEntry].append(pk)
+        return VehicleEntry(
+            pk=pk,
+            status="EXITED",
+            license_plate=entry.transport_number,
+            entry_time=entry.entry_time - timedelta(minutes=20),
+            exit_time=entry.entry_time + timedelta(minutes=40),
+            recorded_by=entry.recorded_by,
+            vehicle_type="CARGO",
+            transport_type="TRUCK",
+            entry_load_status="LOADED",
+            cargo_type="CONTAINER",
+            container_size="1x20F" if size == "20ft" else "40F",
+            container_load_status=load,
+            exit_load_status="EMPTY",
+        )
+
+    def _backdate(self, start: int, stop: int) -> None:
+        """History rows look created when they happened."""
+        backdate(ContainerEntry, self.entry_pks[start:stop], "entry_time")
+        backdate(ContainerEvent, np.array(self.chunk_pks[ContainerEvent]), "event_time")
+        backdate(VehicleEntry, np.array(self.chunk_pks[VehicleEntry]), "entry_time")
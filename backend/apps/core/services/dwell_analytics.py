@@ -0,0 +1,234 @@
+"""
+Dwell Analytics - Database-side dwell time statistics.
+
+Dwell is the time between an entry timestamp and an exit timestamp (or "now"
+while the object is still on the terminal). It is computed as a duration
+expression in SQL, so averages, top-N lists, histograms and per-group
+averages cost one aggregate query regardless of how many rows are involved.
+
+Percentiles use PERCENTILE_CONT on PostgreSQL. Other backends (SQLite in
+development and tests) fall back to interpolating over a single ordered
+duration column in Python.
+
+Works for any model with two datetime fields:
+- ContainerEntry: entry_time / exit_date
+- VehicleEntry: entry_time / exit_time
+"""
+
+import math
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+from django.db import connections
+from django.db.models import (
+    Aggregate,
+    Avg,
+    Count,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Q,
+    QuerySet,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .base_service import BaseService
+
+
+DWELL_ANNOTATION = "dwell"
+
+DEFAULT_PERCENTILES = (0.5, 0.9, 0.95)
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL PERCENTILE_CONT(fraction) WITHIN GROUP (ORDER BY expression)."""
+
+    function = "PERCENTILE_CONT"
+    name = "PercentileCont"
+    template = "%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, fraction: float, **extra):
+        super().__init__(
+            expression, fraction=float(fraction), output_field=DurationField(), **extra
+        )
+
+
+def dwell_days(dwell: timedelta | None) -> int | None:
+    """Whole days of a dwell duration."""
+    return dwell.days if dwell is not None else None
+
+
+def dwell_hours(dwell: timedelta | None) -> float | None:
+    """Dwell duration in hours, rounded to 0.1."""
+    return round(dwell.total_seconds() / 3600, 1) if dwell is not None else None
+
+
+def _interpolate(values: list[timedelta], fraction: float) -> timedelta:
+    """Linear interpolation between closest ranks (same as PERCENTILE_CONT)."""
+    position = (len(values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class DwellAnalyticsService(BaseService):
+    """
+    Dwell statistics over a queryset, evaluated in the database.
+
+    Rows without a start timestamp are ignored. Rows without an end
+    timestamp dwell until `now`.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        start_field: str = "entry_time",
+        end_field: str = "exit_date",
+        now: datetime | None = None,
+    ):
+        super().__init__()
+        self.start_field = start_field
+        self.end_field = end_field
+        self.now = now or timezone.now()
+        self.queryset = queryset.filter(**{f"{start_field}__isnull": False})
+
+    def dwell_expression(self) -> ExpressionWrapper:
+        """Duration expression: coalesce(end, now) - start."""
+        return ExpressionWrapper(
+            Coalesce(F(self.end_field), Value(self.now, output_field=DateTimeField()))
+            - F(self.start_field),
+            output_field=DurationField(),
+        )
+
+    def annotate(self) -> QuerySet:
+        """Queryset annotated with the dwell duration."""
+        return self.queryset.annotate(**{DWELL_ANNOTATION: self.dwell_expression()})
+
+    def filter_days(self, min_days=None, max_days=None) -> QuerySet:
+        """
+        Filter by whole dwell days, matching ContainerEntry.dwell_time_days
+        (floored, at least 1 day).
+
+        Args:
+            min_days: Inclusive lower bound (optional)
+            max_days: Inclusive upper bound (optional)
+        """
+        queryset = self.annotate()
+        if min_days is not None and math.ceil(min_days) > 1:
+            queryset = queryset.filter(dwell__gte=timedelta(days=math.ceil(min_days)))
+        if max_days is not None:
+            if max_days < 1:
+                return queryset.none()
+            queryset = queryset.filter(
+                dwell__lt=timedelta(days=math.floor(max_days) + 1)
+            )
+        return queryset
+
+    def summary(self, min_dwell: timedelta | None = None) -> dict:
+        """
+        Count, average and maximum dwell in one query.
+
+        Args:
+            min_dwell: If given, also count rows dwelling at least this long
+                (returned as "over_threshold")
+        """
+        aggregates = {
+            "count": Count("pk"),
+            "average": Avg(DWELL_ANNOTATION),
+            "maximum": Max(DWELL_ANNOTATION),
+        }
+        if min_dwell is not None:
+            aggregates["over_threshold"] = Count("pk", filter=Q(dwell__gte=min_dwell))
+        return self.annotate().aggregate(**aggregates)
+
+    def percentiles(self, fractions: Iterable[float] = DEFAULT_PERCENTILES) -> dict:
+        """
+        Dwell percentiles keyed by fraction, None for empty querysets.
+
+        Args:
+            fractions: Percentile fractions between 0 and 1
+        """
+        fractions = list(fractions)
+        queryset = self.annotate()
+
+        if connections[queryset.db].vendor == "postgresql":
+            result = queryset.aggregate(
+                **{
+                    f"p{i}": PercentileCont(DWELL_ANNOTATION, fraction)
+                    for i, fraction in enumerate(fractions)
+                }
+            )
+            return {fraction: result[f"p{i}"] for i, fraction in enumerate(fractions)}
+
+        values = list(
+            queryset.order_by(DWELL_ANNOTATION).values_list(DWELL_ANNOTATION, flat=True)
+        )
+        if not values:
+            return dict.fromkeys(fractions)
+        return {fraction: _interpolate(values, fraction) for fraction in fractions}
+
+    def histogram(self, edges: list[timedelta]) -> list[dict]:
+        """
+        Row counts per dwell bucket in one query.
+
+        Args:
+            edges: Ascending bucket boundaries. Buckets are [0, e1), [e1, e2),
+                ..., [last, open end).
+
+        Returns:
+            List of {"from", "to", "count"} (to is None for the last bucket)
+        """
+        bounds = [timedelta(0), *edges]
+        aggregates = {}
+        for i, lower in enumerate(bounds):
+            condition = Q(dwell__gte=lower) if i else Q()
+            if i + 1 < len(bounds):
+                condition &= Q(dwell__lt=bounds[i + 1])
+            aggregates[f"b{i}"] = Count("pk", filter=condition or None)
+
+        result = self.annotate().aggregate(**aggregates)
+        return [
+            {
+                "from": lower,
+                "to": bounds[i + 1] if i + 1 < len(bounds) else None,
+                "count": result[f"b{i}"],
+            }
+            for i, lower in enumerate(bounds)
+        ]
+
+    def top(
+        self,
+        limit: int = 5,
+        fields: Iterable[str] = ("id",),
+        min_dwell: timedelta | None = None,
+    ) -> list[dict]:
+        """
+        Longest-dwelling rows, longest first.
+
+        Args:
+            limit: Maximum rows returned
+            fields: Model fields to include (values() lookups)
+            min_dwell: Only rows dwelling at least this long (optional)
+        """
+        queryset = self.annotate()
+        if min_dwell is not None:
+            queryset = queryset.filter(dwell__gte=min_dwell)
+        return list(
+            queryset.order_by(f"-{DWELL_ANNOTATION}", "pk").values(
+                *fields, DWELL_ANNOTATION
+            )[:limit]
+        )
+
+    def averages_by(self, field: str) -> dict:
+        """Average dwell per distinct value of a field (one GROUP BY query)."""
+        rows = (
+            self.annotate()
+            .order_by()
+            .values(field)
+            .annotate(average=Avg(DWELL_ANNOTATION), count=Count("pk"))
+        )
+        return {row[field]: row["average"] for row in rows}
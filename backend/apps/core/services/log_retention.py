@@ -0,0 +1,312 @@
+"""
+Retention for append-only logs: ANPR detections, Telegram activity and
+container events.
+
+Rows older than the retention period of their log type
+(settings.LOG_RETENTION_DAYS) are rolled up month by month into gzip
+compressed JSONL files under settings.LOG_ARCHIVE_DIR:
+
+    <LOG_ARCHIVE_DIR>/<log type>/<YYYY-MM>.<archived at>.jsonl.gz
+
+and deleted from the database, so the hot tables and their indexes only
+hold recent rows. Only whole months are archived; a month archived again
+later (late rows) gets another part file.
+
+query_logs() reads a time range across both: rows still in the database
+plus rows from the archive files of the months the range covers, newest
+month first, stopping once a limited query has enough newer rows.
+"""
+
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.core.exceptions import BusinessLogicError
+from apps.core.services.base_service import BaseService
+
+
+ARCHIVE_CHUNK_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class LogType:
+    """
+    An archivable log table.
+
+    time_field: Timestamp rows are partitioned and retained by
+    archivable: Extra condition for rows that may leave the database
+        (e.g. events of containers still on the terminal stay)
+    """
+
+    name: str
+    model_label: str
+    time_field: str
+    default_retention_days: int
+    archivable: Q | None = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+
+LOG_TYPES = {
+    log_type.name: log_type
+    for log_type in (
+        LogType("anpr", "gate.ANPRDetection", "created_at", 90),
+        LogType("telegram_activity", "core.TelegramActivityLog", "created_at", 180),
+        LogType(
+            "container_events",
+            "terminal_operations.ContainerEvent",
+            "event_time",
+            730,
+            archivable=Q(container_entry__exit_date__isnull=False),
+        ),
+    )
+}
+
+
+def get_log_type(name: str) -> LogType:
+    try:
+        return LOG_TYPES[name]
+    except KeyError:
+        raise BusinessLogicError(
+            message=f"Неизвестный тип журнала: {name}",
+            error_code="UNKNOWN_LOG_TYPE",
+            details={"available": sorted(LOG_TYPES)},
+        ) from None
+
+
+def retention_days(log_type: LogType) -> int:
+    configured = getattr(settings, "LOG_RETENTION_DAYS", {})
+    return configured.get(log_type.name, log_type.default_retention_days)
+
+
+def archive_dir(log_type: LogType) -> Path:
+    return Path(settings.LOG_ARCHIVE_DIR) / log_type.name
+
+
+def month_start(value: datetime) -> datetime:
+    """First moment of the value's month in the current time zone."""
+    local = timezone.localtime(value)
+    return local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    return month_start(start + timedelta(days=32))
+
+
+def archive_cutoff(log_type: LogType, now: datetime | None = None) -> datetime:
+    """Months starting before this are archived (whole months only)."""
+    now = now or timezone.now()
+    return month_start(now - timedelta(days=retention_days(log_type)))
+
+
+def _month_files(log_type: LogType, month: datetime) -> list[Path]:
+    return sorted(archive_dir(log_type).glob(f"{month:%Y-%m}.*.jsonl.gz"))
+
+
+class LogRetentionService(BaseService):
+    """Moves log rows past retention to monthly archive files."""
+
+    def archivable_rows(self, log_type: LogType) -> QuerySet:
+        queryset = log_type.model.objects.order_by()
+        if log_type.archivable is not None:
+            queryset = queryset.filter(log_type.archivable)
+        return queryset
+
+    def pending_months(
+        self, log_type: LogType, now: datetime | None = None
+    ) -> list[datetime]:
+        """Starts of months that have rows past retention."""
+        cutoff = archive_cutoff(log_type, now)
+        rows = self.archivable_rows(log_type).filter(
+            **{f"{log_type.time_field}__lt": cutoff}
+        )
+        oldest = rows.order_by(log_type.time_field).values_list(
+            log_type.time_field, flat=True
+        )[:1]
+        if not oldest:
+            return []
+
+        months = []
+        month = month_start(oldest[0])
+        while month < cutoff:
+            months.append(month)
+            month = next_month(month)
+        return months
+
+    def archive_month(self, log_type: LogType, month: datetime) -> int:
+        """
+        Write one month of rows to a new archive file, then delete them.
+
+        The file is complete (written under a temporary name and renamed)
+        before any row is deleted. Returns number of rows archived.
+        """
+        month = month_start(month)
+        rows = self.archivable_rows(log_type).filter(
+            **{
+                f"{log_type.time_field}__gte": month,
+                f"{log_type.time_field}__lt": next_month(month),
+            }
+        )
+        directory = archive_dir(log_type)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{month:%Y-%m}.{timezone.now():%Y%m%d%H%M%S%f}.jsonl.gz"
+        tmp_path = path.with_suffix(".tmp")
+
+        ids = []
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as fileobj:
+            for row in (
+                rows.order_by(log_type.time_field, "pk")
+                .values()
+                .iterator(chunk_size=ARCHIVE_CHUNK_SIZE)
+            ):
+                fileobj.write(
+                    json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+                )
+                fileobj.write("\n")
+                ids.append(row["id"])
+
+        if not ids:
+            tmp_path.unlink()
+            return 0
+        os.replace(tmp_path, path)
+
+        model = log_type.model
+        with transaction.atomic():
+            for start in range(0, len(ids), ARCHIVE_CHUNK_SIZE):
+                model.objects.filter(
+                    pk__in=ids[start : start + ARCHIVE_CHUNK_SIZE]
+                ).delete()
+
+        self.logger.info(
+            f"Archived {len(ids)} {log_type.name} rows for {month:%Y-%m} to {path}"
+        )
+        return len(ids)
+
+    def archive(self, log_type: LogType, now: datetime | None = None) -> dict[str, int]:
+        """Archive every month past retention. Returns rows per month."""
+        return {
+            f"{month:%Y-%m}": self.archive_month(log_type, month)
+            for month in self.pending_months(log_type, now)
+        }
+
+
+def iter_archived(
+    log_type: LogType, start: datetime | None = None, end: datetime | None = None
+) -> Iterator[dict]:
+    """
+    Archived rows with start <= time < end, month by month in file order.
+
+    Rows are dicts as produced by QuerySet.values() (foreign keys as
+    `<field>_id`); datetime fields are parsed back, other values are JSON.
+    """
+    for month in _archived_months(log_type, start, end):
+        yield from _read_month(log_type, month, start, end)
+
+
+def _archived_months(
+    log_type: LogType,
+    start: datetime | None,
+    end: datetime | None,
+    newest_first: bool = False,
+) -> Iterator[datetime]:
+    """Start of each archived month overlapping [start, end)."""
+    directory = archive_dir(log_type)
+    if not directory.exists():
+        return
+
+    months = sorted(
+        {path.name.split(".", 1)[0] for path in directory.glob("*.jsonl.gz")},
+        reverse=newest_first,
+    )
+    for month_name in months:
+        month = timezone.make_aware(datetime.strptime(month_name, "%Y-%m"))
+        if (start and next_month(month) <= start) or (end and month >= end):
+            continue
+        yield month
+
+
+def _read_month(
+    log_type: LogType, month: datetime, start: datetime | None, end: datetime | None
+) -> Iterator[dict]:
+    seen = set()  # a row archived twice (interrupted delete) is read once
+    for path in _month_files(log_type, month):
+        with gzip.open(path, "rt", encoding="utf-8") as fileobj:
+            for line in fileobj:
+                row = _decode_row(json.loads(line))
+                if row["id"] in seen:
+                    continue
+                seen.add(row["id"])
+                value = row[log_type.time_field]
+                if (start and value < start) or (end and value >= end):
+                    continue
+                yield row
+
+
+def _decode_row(row: dict) -> dict:
+    for key in ("created_at", "updated_at", "event_time", "camera_timestamp"):
+        if isinstance(row.get(key), str):
+            row[key] = parse_datetime(row[key])
+    return row
+
+
+def query_logs(
+    log_type: LogType | str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    filters: dict | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """
+    Rows of a log in [start, end), newest first, from the database and the
+    archive together.
+
+    filters: Exact matches on values() column names, e.g.
+        `{"plate_number": "01A123BC"}` or `{"user_id": 5}`, applied to
+        both sources. Only archive files of months in the range are read.
+    """
+    if isinstance(log_type, str):
+        log_type = get_log_type(log_type)
+    filters = filters or {}
+    time_field = log_type.time_field
+
+    hot = log_type.model.objects.filter(**filters)
+    if start:
+        hot = hot.filter(**{f"{time_field}__gte": start})
+    if end:
+        hot = hot.filter(**{f"{time_field}__lt": end})
+    hot = hot.order_by(f"-{time_field}", "-pk")
+    rows = list(hot.values()[:limit] if limit else hot.values())
+
+    hot_ids = {row["id"] for row in rows}
+    # Newest month first: once `limit` rows are newer than a month, neither
+    # it nor any older month is read
+    for month in _archived_months(log_type, start, end, newest_first=True):
+        if limit and len(rows) >= limit and rows[-1][time_field] >= next_month(month):
+            break
+        archived = [
+            row
+            for row in _read_month(log_type, month, start, end)
+            if row["id"] not in hot_ids
+            and all(row.get(key) == value for key, value in filters.items())
+        ]
+        if archived:
+            rows.extend(archived)
+            rows.sort(key=lambda row: (row[time_field], row["id"]), reverse=True)
+            if limit:
+                del rows[limit:]
+
+    return rows[:limit] if limit else rows
@@ -0,0 +1,297 @@
+"""
+Streaming table export - XLSX and CSV without building the sheet in memory.
+
+Exports used to collect all rows (pandas DataFrame or a regular openpyxl
+Workbook), then loop over every cell to style it. StreamingTableExport writes
+rows as they are produced instead:
+- XLSX through an openpyxl write-only workbook into a temporary file. Cell
+  styles come from named styles registered once per workbook; each column
+  resolves its style a single time and data cells copy it.
+- CSV row by row into the response (no file at all), for ranges too large
+  for a spreadsheet to be useful.
+
+Callers pass rows as an iterable, typically a generator over
+`queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)`, so only one chunk of
+model instances is alive at a time.
+
+openpyxl is imported when a workbook is written, so importing this module
+for parse_export_format() or the content types stays cheap.
+"""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from copy import copy
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any
+
+from django.http import FileResponse, StreamingHttpResponse
+
+from apps.core.exceptions import BusinessLogicError
+
+
+if TYPE_CHECKING:
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Border, NamedStyle
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+XLSX = "xlsx"
+CSV = "csv"
+EXPORT_FORMATS = (XLSX, CSV)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_CONTENT_TYPE = "text/csv; charset=utf-8"
+
+# Temporary files stay in memory up to this size, then spill to disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Named styles available in every export workbook
+STYLE_TITLE = "export_title"
+STYLE_SUBTITLE = "export_subtitle"
+STYLE_HEADER = "export_header"
+STYLE_TEXT = "export_text"
+STYLE_NUMBER = "export_number"
+STYLE_USD = "export_usd"
+STYLE_UZS = "export_uzs"
+
+
+def parse_export_format(value: str | None) -> str:
+    """Validate an `export_format` query parameter (default: xlsx)."""
+    export_format = (value or XLSX).lower()
+    if export_format not in EXPORT_FORMATS:
+        raise BusinessLogicError(
+            message="Неподдерживаемый формат экспорта (допустимо: xlsx, csv)",
+            error_code="INVALID_EXPORT_FORMAT",
+        )
+    return export_format
+
+
+def thin_border() -> Border:
+    from openpyxl.styles import Border, Side
+
+    side = Side(style="thin", color="000000")
+    return Border(left=side, right=side, top=side, bottom=side)
+
+
+def base_styles() -> list[NamedStyle]:
+    """Fresh named styles for one workbook (NamedStyle binds to a workbook)."""
+    from openpyxl.styles import Alignment, Font, NamedStyle
+
+    border = thin_border()
+    return [
+        NamedStyle(
+            name=STYLE_TITLE,
+            font=Font(bold=True, size=14),
+            alignment=Alignment(horizontal="center"),
+        ),
+        NamedStyle(name=STYLE_SUBTITLE, font=Font(bold=True, size=11)),
+        header_style(STYLE_HEADER, fill_color="4472C4", font_color="FFFFFF"),
+        NamedStyle(name=STYLE_TEXT, border=border),
+        NamedStyle(
+            name=STYLE_NUMBER,
+            border=border,
+            alignment=Alignment(horizontal="right"),
+        ),
+        NamedStyle(
+            name=STYLE_USD,
+            border=border,
+            alignment=Alignment(horizontal="right"),
+            number_format="#,##0.00",
+        ),
+        NamedStyle(
+            name=STYLE_UZS,
+            border=border,
+            alignment=Alignment(horizontal="right"),
+            number_format="#,##0",
+        ),
+    ]
+
+
+def header_style(name: str, fill_color: str, font_color: str = "000000") -> NamedStyle:
+    """Bold, centered, bordered header style on a solid fill."""
+    from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+
+    return NamedStyle(
+        name=name,
+        font=Font(bold=True, color=font_color),
+        fill=PatternFill(
+            start_color=fill_color, end_color=fill_color, fill_type="solid"
+        ),
+        border=thin_border(),
+        alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+    )
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """
+    One output column.
+
+    headers: One caption per header row (e.g. English and Russian)
+    width: Column width in characters (write-only sheets cannot auto-fit)
+    style: Named style of data cells
+    header_style: Named style of header cells
+    """
+
+    headers: tuple[str, ...]
+    width: float = 12
+    style: str = STYLE_TEXT
+    header_style: str = STYLE_HEADER
+
+
+@dataclass
+class StreamingTableExport:
+    """
+    Writes rows of values under ExportColumn headers as XLSX or CSV.
+
+    preamble: Rows written above the header in XLSX only, each a list of
+        values or (value, named style) pairs. The first preamble row is
+        merged across all columns (report title).
+    styles: Factory of extra named styles (base_styles() are always added)
+    """
+
+    sheet_title: str
+    columns: Sequence[ExportColumn]
+    preamble: Sequence[Sequence[Any]] = ()
+    styles: Callable[[], Iterable[NamedStyle]] | None = None
+    freeze_header: bool = True
+    row_heights: dict[int, float] = field(default_factory=dict)
+
+    # ── XLSX ─────────────────────────────────────────────────────
+
+    def write_xlsx(self, rows: Iterable[Sequence[Any]], fileobj: IO[bytes]) -> int:
+        """Write the workbook to a binary file object. Returns number of data rows."""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        wb = Workbook(write_only=True)
+        for style in base_styles() + list(self.styles() if self.styles else []):
+            wb.add_named_style(style)
+        ws = wb.create_sheet(self.sheet_title[:31])
+
+        # Dimensions and panes must be set before the first row is written
+        for idx, column in enumerate(self.columns, start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = column.width
+        for row_idx, height in self.row_heights.items():
+            ws.row_dimensions[row_idx].height = height
+
+        header_count = max(len(column.headers) for column in self.columns)
+        first_header_row = len(self.preamble) + 1
+        if self.freeze_header:
+            ws.freeze_panes = f"A{first_header_row + header_count}"
+        if self.preamble:
+            ws.merged_cells.add(f"A1:{get_column_letter(len(self.columns))}1")
+
+        for preamble_row in self.preamble:
+            ws.append([self._preamble_cell(ws, value) for value in preamble_row])
+
+        for level in range(header_count):
+            ws.append(
+                [
+                    self._styled_cell(
+                        ws,
+                        column.headers[level] if level < len(column.headers) else "",
+                        column.header_style,
+                    )
+                    for column in self.columns
+                ]
+            )
+
+        # Resolve each column's named style once; data cells copy the array
+        templates = [
+            self._styled_cell(ws, None, column.style)._style for column in self.columns
+        ]
+        count = 0
+        for row in rows:
+            cells = []
+            for value, template in zip(row, templates, strict=True):
+                cell = WriteOnlyCell(ws, value)
+                cell._style = copy(template)
+                cells.append(cell)
+            ws.append(cells)
+            count += 1
+
+        wb.save(fileobj)
+        return count
+
+    def xlsx_file(self, rows: Iterable[Sequence[Any]]) -> IO[bytes]:
+        """Write the workbook to a temporary file, rewound for reading."""
+        # Handed to the response, which closes it after sending
+        fileobj = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)  # noqa: SIM115
+        try:
+            self.write_xlsx(rows, fileobj)
+        except Exception:
+            fileobj.close()
+            raise
+        fileobj.seek(0)
+        return fileobj
+
+    @staticmethod
+    def _styled_cell(ws, value, style: str) -> WriteOnlyCell:
+        from openpyxl.cell import WriteOnlyCell
+
+        cell = WriteOnlyCell(ws, value)
+        cell.style = style
+        return cell
+
+    def _preamble_cell(self, ws, value):
+        if isinstance(value, tuple):
+            return self._styled_cell(ws, value[0], value[1])
+        return value
+
+    # ── CSV ──────────────────────────────────────────────────────
+
+    def iter_csv(self, rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+        """Yield CSV lines (header rows first), prefixed with a UTF-8 BOM for Excel."""
+        writer = csv.writer(_Echo())
+        header_count = max(len(column.headers) for column in self.columns)
+
+        yield "\ufeff"
+        for level in range(header_count):
+            yield writer.writerow(
+                [
+                    column.headers[level] if level < len(column.headers) else ""
+                    for column in self.columns
+                ]
+            )
+        for row in rows:
+            yield writer.writerow(["" if value is None else value for value in row])
+
+    # ── Responses ────────────────────────────────────────────────
+
+    def response(
+        self, rows: Iterable[Sequence[Any]], filename: str, export_format: str = XLSX
+    ):
+        """
+        Download response for the rows.
+
+        XLSX is written to a temporary file first (the zip directory is only
+        known at the end) and then streamed from it. CSV is generated while
+        the response is sent, so rows are read lazily from the database.
+        `filename` is given without extension.
+        """
+        if export_format == CSV:
+            response = StreamingHttpResponse(
+                self.iter_csv(rows), content_type=CSV_CONTENT_TYPE
+            )
+            response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+            return response
+
+        return FileResponse(
+            self.xlsx_file(rows),
+            content_type=XLSX_CONTENT_TYPE,
+            as_attachment=True,
+            filename=f"{filename}.xlsx",
+        )
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
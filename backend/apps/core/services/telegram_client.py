@@ -0,0 +1,393 @@
+"""
+Process-wide Telegram client for server-side notifications.
+
+Notifications used to create a Bot (and an aiohttp session) per message and
+run it in a fresh event loop, often via async_to_sync from request threads.
+TelegramClient keeps one Bot per process on a background event loop thread:
+
+- submit() queues a send from any thread and returns a
+  concurrent.futures.Future (fire-and-forget for sync Django code)
+- run() does the same and waits for the result (with a timeout)
+- call() awaits a send from async code on any event loop
+- schedule() runs a whole async notification flow on the client loop
+
+Each send is a callable taking the Bot, e.g.
+`lambda bot: bot.send_message(chat_id=..., text=...)`, and is throttled
+before it runs: a global rate across all chats plus a per-chat rate (lower
+for groups), as Telegram limits both. Albums pass weight=len(media) since
+every photo counts as a message. A RetryAfter response is retried once
+after the delay Telegram asks for.
+
+stats() reports queue depth, counters and recent send latency; the
+process-wide client's stats are also exported to apps.core.metrics.
+
+aiogram is imported when the first Bot is created: web workers and the
+ANPR listener import this module but most never send anything.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from apps.core.metrics import Sample, registry
+
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Send = Callable[["Bot"], Awaitable[T]]
+
+DEFAULT_TIMEOUT = 30  # seconds, for run()
+LATENCY_WINDOW = 500  # sends kept for latency stats
+MAX_TRACKED_CHATS = 1000
+
+
+class TelegramClientError(Exception):
+    """Raised when the client cannot send (no token configured, closed)."""
+
+
+def _is_group(chat_id) -> bool:
+    """Group and channel ids are negative (or @usernames)."""
+    if isinstance(chat_id, str):
+        chat_id = chat_id.strip()
+        return chat_id.startswith(("@", "-"))
+    return chat_id is not None and chat_id < 0
+
+
+class _RateLimiter:
+    """
+    Schedules sends no faster than the per-chat and global rates.
+
+    Each send reserves the next free slot of its chat and sleeps until it,
+    then does the same for the global slot, so concurrent senders queue up
+    instead of bursting and a slow group does not hold up other chats.
+    """
+
+    def __init__(self, global_rate: float, chat_rate: float, group_rate: float):
+        self.global_interval = 1 / global_rate if global_rate > 0 else 0
+        self.chat_interval = 1 / chat_rate if chat_rate > 0 else 0
+        self.group_interval = 1 / group_rate if group_rate > 0 else 0
+        self._global_next = 0.0
+        self._chat_next: dict[Any, float] = {}
+
+    def reserve_chat(self, chat_id, weight: int, now: float) -> float:
+        """Reserve the chat's next slot; returns the delay until it."""
+        if chat_id is None:
+            return 0.0
+        start = max(now, self._chat_next.get(chat_id, 0.0))
+        interval = self.group_interval if _is_group(chat_id) else self.chat_interval
+        self._chat_next[chat_id] = start + interval * weight
+        if len(self._chat_next) > MAX_TRACKED_CHATS:
+            self._chat_next = {
+                chat: slot for chat, slot in self._chat_next.items() if slot > now
+            }
+        return start - now
+
+    def reserve_global(self, weight: int, now: float) -> float:
+        """Reserve the next slot across all chats; returns the delay until it."""
+        start = max(now, self._global_next)
+        self._global_next = start + self.global_interval * weight
+        return start - now
+
+
+class TelegramClient:
+    """One Bot and event loop thread shared by all notification senders."""
+
+    def __init__(
+        self,
+        token: str | None,
+        bot: Bot | None = None,
+        global_rate: float | None = None,
+        chat_rate: float | None = None,
+        group_rate: float | None = None,
+    ):
+        self.token = token
+        self._bot = bot
+        self._limiter = _RateLimiter(
+            global_rate or getattr(settings, "TELEGRAM_GLOBAL_RATE_LIMIT", 25),
+            chat_rate or getattr(settings, "TELEGRAM_CHAT_RATE_LIMIT", 1),
+            group_rate or getattr(settings, "TELEGRAM_GROUP_RATE_LIMIT", 0.33),
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        self._pending = 0
+        self._sent = 0
+        self._failed = 0
+        self._retried = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def is_configured(self) -> bool:
+        return bool(self.token or self._bot)
+
+    # ── Event loop thread ────────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._closed:
+            raise TelegramClientError("Telegram client is closed")
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    thread = threading.Thread(
+                        target=self._run_loop,
+                        args=(loop,),
+                        daemon=True,
+                        name="telegram-client",
+                    )
+                    thread.start()
+                    self._thread = thread
+                    self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def _get_bot(self) -> Bot:
+        # Created on the loop thread so its session belongs to this loop
+        if self._bot is None:
+            if not self.token:
+                raise TelegramClientError("TELEGRAM_BOT_TOKEN not configured")
+            from aiogram import Bot
+
+            self._bot = Bot(token=self.token)
+        return self._bot
+
+    # ── Sending ──────────────────────────────────────────────────
+
+    async def _execute(self, chat_id, send: Send, weight: int):
+        from aiogram.exceptions import TelegramRetryAfter
+
+        delay = self._limiter.reserve_chat(chat_id, weight, time.monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+        delay = self._limiter.reserve_global(weight, time.monotonic())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        bot = self._get_bot()
+        started = time.monotonic()
+        try:
+            try:
+                result = await send(bot)
+            except TelegramRetryAfter as e:
+                with self._stats_lock:
+                    self._retried += 1
+                logger.warning(
+                    f"Telegram rate limit for chat {chat_id}, retrying in {e.retry_after}s"
+                )
+                await asyncio.sleep(e.retry_after)
+                result = await send(bot)
+        except Exception:
+            with self._stats_lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self._latencies.append(time.monotonic() - started)
+
+        with self._stats_lock:
+            self._sent += 1
+        return result
+
+    def _on_done(self, future: concurrent.futures.Future) -> None:
+        with self._stats_lock:
+            self._pending -= 1
+
+    def _enqueue(self, chat_id, send: Send, weight: int) -> concurrent.futures.Future:
+        loop = self._ensure_loop()
+        with self._stats_lock:
+            self._pending += 1
+        future = asyncio.run_coroutine_threadsafe(
+            self._execute(chat_id, send, weight), loop
+        )
+        future.add_done_callback(self._on_done)
+        return future
+
+    def submit(
+        self, chat_id, send: Send, weight: int = 1, log_errors: bool = True
+    ) -> concurrent.futures.Future:
+        """
+        Queue a send from any thread. Returns immediately.
+
+        chat_id selects the per-chat rate limit; None applies only the
+        global one (e.g. for deleting messages). Failures are logged unless
+        log_errors is False, for callers that collect results themselves.
+        """
+        future = self._enqueue(chat_id, send, weight)
+        if log_errors:
+            future.add_done_callback(_log_failure)
+        return future
+
+    def run(
+        self, chat_id, send: Send, weight: int = 1, timeout: float = DEFAULT_TIMEOUT
+    ):
+        """Send from sync code and wait for the result (raises on failure)."""
+        return self._enqueue(chat_id, send, weight).result(timeout=timeout)
+
+    async def call(self, chat_id, send: Send, weight: int = 1):
+        """Send from async code running on any event loop."""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            with self._stats_lock:
+                self._pending += 1
+            try:
+                return await self._execute(chat_id, send, weight)
+            finally:
+                self._on_done(None)
+        return await asyncio.wrap_future(self._enqueue(chat_id, send, weight))
+
+    def schedule(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future:
+        """
+        Run a whole notification flow (DB lookups plus sends) on the client
+        loop from sync code, instead of a thread with its own event loop.
+
+        Sends inside it should go through call(). Database connections used
+        by its sync_to_async calls are released once it finishes.
+        """
+
+        async def _run():
+            try:
+                return await coro
+            finally:
+                await sync_to_async(close_old_connections)()
+
+        future = asyncio.run_coroutine_threadsafe(_run(), self._ensure_loop())
+        future.add_done_callback(_log_failure)
+        return future
+
+    # ── Metrics and lifecycle ────────────────────────────────────
+
+    def stats(self) -> dict:
+        """Queue depth, counters and send latency (ms) over recent sends."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "queue_depth": self._pending,
+                "sent": self._sent,
+                "failed": self._failed,
+                "retried": self._retried,
+            }
+        if latencies:
+            stats["latency_ms"] = {
+                "avg": round(sum(latencies) / len(latencies) * 1000, 1),
+                "p95": round(latencies[int((len(latencies) - 1) * 0.95)] * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1),
+            }
+        return stats
+
+    def close(self, timeout: float = 5) -> None:
+        """Close the Bot session and stop the loop thread."""
+        if self._closed:
+            return
+        self._closed = True
+        loop = self._loop
+        if loop is None:
+            return
+
+        async def _shutdown():
+            if self._bot is not None:
+                await self._bot.session.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_shutdown(), loop).result(timeout=timeout)
+        except Exception as e:
+            logger.debug(f"Error closing Telegram client session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+
+def _log_failure(future: concurrent.futures.Future) -> None:
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Telegram send failed: {error}")
+
+
+_client: TelegramClient | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+
+
+def get_telegram_client() -> TelegramClient:
+    """The process-wide client (re-created in forked worker processes)."""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = TelegramClient(getattr(settings, "TELEGRAM_BOT_TOKEN", None))
+                _client_pid = os.getpid()
+    return _client
+
+
+def set_telegram_client(client: TelegramClient | None) -> None:
+    """Replace the process-wide client (None builds a new one on next use)."""
+    global _client, _client_pid
+    with _client_lock:
+        previous = _client
+        _client = client
+        _client_pid = os.getpid() if client else None
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+@atexit.register
+def _close_client() -> None:
+    if _client is not None and _client_pid == os.getpid():
+        _client.close(timeout=2)
+
+
+@registry.register_collector
+def _client_metrics() -> list[Sample]:
+    """Stats of the process-wide client, if one was created."""
+    if _client is None or _client_pid != os.getpid():
+        return []
+    stats = _client.stats()
+    samples = [
+        Sample(
+            "telegram_client_queue_depth",
+            stats["queue_depth"],
+            help="Sends waiting in the Telegram client queue",
+        ),
+        Sample("telegram_client_sent_total", stats["sent"], type="counter"),
+        Sample("telegram_client_failed_total", stats["failed"], type="counter"),
+        Sample("telegram_client_retried_total", stats["retried"], type="counter"),
+    ]
+    for stat, value in stats.get("latency_ms", {}).items():
+        samples.append(
+            Sample(
+                "telegram_client_send_latency_ms",
+                value,
+                help="Send latency over recent sends",
+                labels={"stat": stat},
+            )
+        )
+    return samples
@@ -1,5 +1,7 @@
 """Shared utility helpers for the MTT backend."""
 
+import importlib
+
 
 def safe_int_param(value, default, *, min_val=None, max_val=None):
     """
@@ -17,3 +19,21 @@ def safe_int_param(value, default, *, min_val=None, max_val=None):
     if max_val is not None:
         result = min(result, max_val)
     return result
+
+
+def lazy_exports(package: str, exports: dict[str, str]):
+    """
+    Module-level __getattr__ that imports names from submodules on first use.
+
+    Keeps `from package import Name` working for services whose modules pull
+    in heavy libraries, without importing those with the package:
+
+        __getattr__ = lazy_exports(__name__, {"ExportService": ".export_service"})
+    """
+
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(importlib.import_module(exports[name], package), name)
+
+    return __getattr__
@@ -11,13 +11,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.models import TelegramActivityLog
-from apps.core.utils import safe_int_param
-from apps.core.pagination import StandardResultsSetPagination
+from apps.core.pagination import StandardOrCursorPagination
 from apps.core.serializers import (
     TelegramActivityLogSerializer,
     TelegramActivityLogSummarySerializer,
 )
-from apps.core.services.telegram_group_test_service import TelegramGroupTestService
+from apps.core.utils import safe_int_param
 
 
 class TelegramActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -44,7 +43,8 @@ class TelegramActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = TelegramActivityLog.objects.select_related("user").all()
     serializer_class = TelegramActivityLogSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
-    pagination_class = StandardResultsSetPagination
+    # ?pagination=cursor switches to keyset pagination on the -created_at index
+    pagination_class = StandardOrCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ["action", "user_type", "success", "user"]
     search_fields = [
@@ -133,8 +133,9 @@ class TelegramActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
         Delete group notification message(s) for this activity log.
         Removes the message from the Telegram group and marks the log as cancelled.
         """
-        import asyncio
-        import threading
+        import concurrent.futures
+
+        from apps.core.services.telegram_client import get_telegram_client
 
         log = self.get_object()
 
@@ -154,50 +155,44 @@ class TelegramActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
             (log.group_chat_id, msg_id) for msg_id in log.group_message_ids
         ]
 
+        client = get_telegram_client()
         deleted_count = 0
         errors: list[str] = []
 
-        def delete_messages():
-            nonlocal deleted_count
-
-            from django.conf import settings
-
-            from aiogram import Bot
-
-            bot_token = getattr(settings, "TELEGRAM_BOT_TOKEN", None)
-            if not bot_token:
-                errors.append("TELEGRAM_BOT_TOKEN not configured")
-                return
-
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                bot = Bot(token=bot_token)
-                try:
-                    for chat_id, msg_id in messages_to_delete:
-                        try:
-                            loop.run_until_complete(
-                                bot.delete_message(chat_id=chat_id, message_id=msg_id)
-                            )
-                            deleted_count += 1
-                        except Exception as e:
-                            errors.append(f"Message {msg_id}: {e}")
-                finally:
-                    loop.run_until_complete(bot.session.close())
-            finally:
-                loop.close()
-
-        thread = threading.Thread(target=delete_messages)
-        thread.start()
-        thread.join(timeout=10)
-
-        if thread.is_alive():
+        if not client.is_configured:
+            errors.append("TELEGRAM_BOT_TOKEN not configured")
+            futures = []
+        else:
+            # Deletes are queued on the shared client together, then awaited
+            futures = [
+                (
+                    msg_id,
+                    client.submit(
+                        None,
+                        lambda bot, chat_id=chat_id, msg_id=msg_id: bot.delete_message(
+                            chat_id=chat_id, message_id=msg_id
+                        ),
+                        log_errors=False,
+                    ),
+                )
+                for chat_id, msg_id in messages_to_delete
+            ]
+
+        _, not_done = concurrent.futures.wait(
+            [future for _, future in futures], timeout=10
+        )
+        if not_done:
             return Response(
                 {"success": False, "message": "Превышено время ожидания удаления сообщений"},
                 status=status.HTTP_504_GATEWAY_TIMEOUT,
             )
 
+        for msg_id, future in futures:
+            if future.exception() is None:
+                deleted_count += 1
+            else:
+                errors.append(f"Message {msg_id}: {future.exception()}")
+
         if deleted_count > 0:
             log.group_notification_status = "cancelled"
             log.save(update_fields=["group_notification_status"])
@@ -242,6 +237,11 @@ class TestTelegramGroupView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        # aiogram is only loaded when a group is actually tested
+        from apps.core.services.telegram_group_test_service import (
+            TelegramGroupTestService,
+        )
+
         service = TelegramGroupTestService()
         result = service.test_group(group_id)
 
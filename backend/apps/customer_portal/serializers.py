@@ -5,11 +5,16 @@ These serializers provide customer-facing representations of data,
 hiding admin-only fields and enforcing customer-specific business rules.
 """
 
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from apps.accounts.models import Company, CustomerProfile, CustomUser
 from apps.containers.models import Container
 from apps.terminal_operations.models import ContainerEntry, ContainerOwner, PreOrder
+from apps.terminal_operations.services.entry_projection import (
+    entry_attachments,
+    entry_dwell_days,
+)
 
 
 # ============ Nested Serializers ============
@@ -186,7 +191,7 @@ class CustomerContainerEntrySerializer(serializers.ModelSerializer):
     container = ContainerNestedSerializer(read_only=True)
     container_owner = ContainerOwnerNestedSerializer(read_only=True)
     company = CustomerCompanySerializer(read_only=True)
-    dwell_time_days = serializers.IntegerField(read_only=True)
+    dwell_time_days = serializers.SerializerMethodField()
     images = serializers.SerializerMethodField()
     image_count = serializers.SerializerMethodField()
 
@@ -214,24 +219,14 @@ class CustomerContainerEntrySerializer(serializers.ModelSerializer):
         )
         read_only_fields = fields
 
+    @extend_schema_field({"type": "integer", "nullable": True})
+    def get_dwell_time_days(self, obj):
+        """Dwell days (DB-computed by with_list_projection)."""
+        return entry_dwell_days(obj)
+
     def _get_attachments(self, obj):
-        """Cache attachments to avoid multiple queries."""
-        if not hasattr(obj, "_cached_attachments"):
-            from django.contrib.contenttypes.models import ContentType
-
-            from apps.files.models import FileAttachment
-
-            content_type = ContentType.objects.get_for_model(obj)
-            obj._cached_attachments = list(
-                FileAttachment.objects.filter(
-                    content_type=content_type,
-                    object_id=obj.id,
-                    file__is_active=True,
-                )
-                .select_related("file")
-                .order_by("display_order", "created_at")
-            )
-        return obj._cached_attachments
+        """Active attachments (prefetched by with_list_projection)."""
+        return entry_attachments(obj)
 
     def get_images(self, obj):
         """Get all image attachments for this container entry."""
@@ -4,14 +4,20 @@ Service for calculating customer container statistics.
 Follows MTT's service layer pattern - all business logic here, views are thin.
 """
 
-from django.db.models import Avg, Count, ExpressionWrapper, F, Sum, fields
-from django.db.models.functions import Coalesce, Now
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Sum
 from django.utils import timezone
 
 from apps.core.services.base_service import BaseService
+from apps.core.services.dwell_analytics import DwellAnalyticsService, dwell_days
 from apps.terminal_operations.models import ContainerEntry
 
 
+# Dwell histogram buckets: 0-3, 3-7, 7-14, 14-30, 30+ days
+DWELL_HISTOGRAM_EDGES = [timedelta(days=days) for days in (3, 7, 14, 30)]
+
+
 class CustomerStatisticsService(BaseService):
     """Service for calculating customer container statistics."""
 
@@ -23,15 +29,6 @@ class CustomerStatisticsService(BaseService):
         """Get entries currently on terminal (no exit_date)."""
         return ContainerEntry.objects.filter(company=self.company, exit_date__isnull=True)
 
-    def _annotate_dwell_days(self, queryset):
-        """Annotate queryset with calculated dwell_days field."""
-        return queryset.annotate(
-            dwell_days=ExpressionWrapper(
-                (Coalesce(F("exit_date"), Now()) - F("entry_time")),
-                output_field=fields.DurationField(),
-            )
-        )
-
     def get_status_summary(self) -> dict:
         """Get current container status breakdown."""
         active = self._get_active_entries()
@@ -47,56 +44,53 @@ class CustomerStatisticsService(BaseService):
         }
 
     def get_dwell_metrics(self, overstayer_days: int = 7) -> dict:
-        """Get dwell time statistics."""
-        active = self._get_active_entries().select_related("container")
-        now = timezone.now()
-
-        # Calculate dwell time in Python for each entry
-        entries_with_dwell = []
-        for entry in active:
-            dwell = (now - entry.entry_time).days
-            entries_with_dwell.append(
-                {
-                    "entry": entry,
-                    "dwell_days": dwell,
-                }
-            )
-
-        # Calculate average
-        if entries_with_dwell:
-            avg_dwell = sum(e["dwell_days"] for e in entries_with_dwell) / len(entries_with_dwell)
-        else:
-            avg_dwell = 0
-
-        # Filter overstayers
-        overstayers = [e for e in entries_with_dwell if e["dwell_days"] > overstayer_days]
-        overstayers.sort(key=lambda x: x["dwell_days"], reverse=True)
-
-        overstayer_list = [
-            {
-                "id": e["entry"].id,
-                "container__container_number": e["entry"].container.container_number,
-                "dwell_time_days": e["dwell_days"],
-            }
-            for e in overstayers[:5]
-        ]
-
-        # Longest stay
-        longest = max(entries_with_dwell, key=lambda x: x["dwell_days"]) if entries_with_dwell else None
+        """Get dwell time statistics (computed in the database)."""
+        analytics = DwellAnalyticsService(self._get_active_entries())
+
+        # More than overstayer_days whole days means at least overstayer_days + 1
+        min_dwell = timedelta(days=overstayer_days + 1)
+        summary = analytics.summary(min_dwell=min_dwell)
+        overstayers = analytics.top(
+            limit=5, fields=("id", "container__container_number"), min_dwell=min_dwell
+        )
+        longest = analytics.top(limit=1, fields=("container__container_number",))
+        percentiles = analytics.percentiles()
 
+        average = summary["average"]
         return {
-            "average_dwell_days": round(avg_dwell, 1),
-            "overstayer_count": len(overstayers),
+            "average_dwell_days": round(average.total_seconds() / 86400, 1)
+            if average
+            else 0,
+            "overstayer_count": summary["over_threshold"],
             "overstayer_threshold_days": overstayer_days,
-            "overstayers": overstayer_list,
+            "overstayers": [
+                {
+                    "id": row["id"],
+                    "container__container_number": row["container__container_number"],
+                    "dwell_time_days": dwell_days(row["dwell"]),
+                }
+                for row in overstayers
+            ],
             "longest_stay": (
                 {
-                    "container_number": longest["entry"].container.container_number,
-                    "days": longest["dwell_days"],
+                    "container_number": longest[0]["container__container_number"],
+                    "days": dwell_days(longest[0]["dwell"]),
                 }
                 if longest
                 else None
             ),
+            "percentiles_days": {
+                f"p{round(fraction * 100)}": dwell_days(value)
+                for fraction, value in percentiles.items()
+            },
+            "histogram": [
+                {
+                    "from_days": bucket["from"].days,
+                    "to_days": bucket["to"].days if bucket["to"] else None,
+                    "count": bucket["count"],
+                }
+                for bucket in analytics.histogram(DWELL_HISTOGRAM_EDGES)
+            ],
         }
 
     def get_cargo_summary(self) -> dict:
@@ -16,6 +16,7 @@ from apps.accounts.models import CustomerProfile
 from apps.core.exceptions import BusinessLogicError
 from apps.terminal_operations.filters import ContainerEntryFilter
 from apps.terminal_operations.models import ContainerEntry, PreOrder
+from apps.terminal_operations.services.entry_projection import with_list_projection
 from apps.terminal_operations.services.preorder_service import PreOrderService
 
 from .permissions import IsCustomer, IsCustomerOwner
@@ -181,6 +182,8 @@ class CustomerContainerEntryViewSet(viewsets.ReadOnlyModelViewSet):
 
     permission_classes = [IsCustomer]
     serializer_class = CustomerContainerEntrySerializer
+    # Constant per page thanks to with_list_projection (plus the JWT user lookup)
+    query_budget = {"list": 6, "retrieve": 5}
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = ContainerEntryFilter
     ordering_fields = ["entry_time", "exit_date", "dwell_time_days"]
@@ -202,13 +205,10 @@ class CustomerContainerEntryViewSet(viewsets.ReadOnlyModelViewSet):
         if not customer_company:
             return ContainerEntry.objects.none()
 
-        # Filter by company and optimize query
-        return (
+        # Filter by company; dwell and attachments are batched into the list query
+        return with_list_projection(
             ContainerEntry.objects.filter(company=customer_company)
-            .select_related("container", "recorded_by", "company", "container_owner")
-            .prefetch_related("crane_operations")
-            .order_by("-entry_time")
-        )
+        ).order_by("-entry_time")
 
 
 @extend_schema_view(
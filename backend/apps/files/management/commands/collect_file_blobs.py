@@ -0,0 +1,71 @@
+"""
+Management command to delete stored blobs no File row references.
+
+Uploads are stored once per content digest under blobs/ and shared by
+every File row with the same bytes. When rows are deleted, their blob
+stays until this command finds it unreferenced.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.files.models import File
+from apps.files.utils import BLOB_PREFIX
+
+
+class Command(BaseCommand):
+    help = "Delete content-addressed file blobs that no File references"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report unreferenced blobs, don't delete them",
+        )
+        parser.add_argument(
+            "--min-age-hours",
+            type=int,
+            default=24,
+            help="Skip blobs newer than this (uploads still being saved)",
+        )
+
+    def handle(self, *args, **options):
+        storage = File._meta.get_field("file").storage
+        referenced = File.objects.referenced_paths()
+        cutoff = timezone.now() - timedelta(hours=options["min_age_hours"])
+
+        deleted = kept = freed = 0
+        for path in self._iter_blobs(storage, BLOB_PREFIX):
+            if path in referenced:
+                kept += 1
+                continue
+            if storage.get_modified_time(path) > cutoff:
+                continue
+
+            size = storage.size(path)
+            if options["dry_run"]:
+                self.stdout.write(f"Would delete {path} ({size} bytes)")
+            else:
+                storage.delete(path)
+            deleted += 1
+            freed += size
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {deleted} unreferenced blobs ({freed / (1024 * 1024):.1f} MB), "
+                f"{kept} in use"
+            )
+        )
+
+    def _iter_blobs(self, storage, directory):
+        """Yield storage names of all files below a directory."""
+        if not storage.exists(directory):
+            return
+        subdirectories, files = storage.listdir(directory)
+        for name in files:
+            yield f"{directory}/{name}"
+        for subdirectory in subdirectories:
+            yield from self._iter_blobs(storage, f"{directory}/{subdirectory}")
@@ -12,6 +12,12 @@ class FileManager(models.Manager):
         """
         Create File instance from uploaded file with validation.
 
+        Content is stored by SHA-256 digest (see utils.blob_path): uploading
+        bytes that are already stored adds a File row pointing at the
+        existing blob instead of writing another copy. The upload is read
+        once (see pipeline.process_upload); the result stays available as
+        `uploaded_file.upload_info`.
+
         Args:
             uploaded_file: Django UploadedFile instance
             category_code: FileCategory code (e.g., 'container_image')
@@ -22,8 +28,7 @@ class FileManager(models.Manager):
             File instance
         """
         from .models import FileCategory
-        from .utils import get_file_dimensions
-        from .validators import validate_file_category, validate_file_security
+        from .pipeline import process_upload
 
         # Get category
         try:
@@ -31,30 +36,45 @@ class FileManager(models.Manager):
         except FileCategory.DoesNotExist:
             raise ValueError(f"FileCategory '{category_code}' does not exist")
 
-        # Security validation
-        validate_file_security(uploaded_file)
-
-        # Category validation (returns detected mime type)
-        mime_type = validate_file_category(uploaded_file, category)
+        # One read of the upload: security, size and MIME validation,
+        # digest, image header, and the blob write. Reuses the result when
+        # a serializer already processed this upload.
+        storage = self.model._meta.get_field("file").storage
+        info = process_upload(uploaded_file, storage, category=category)
 
-        # Get dimensions if image
-        width, height = get_file_dimensions(uploaded_file)
+        # Photos downloaded from Telegram carry their ids (see
+        # download_photos_from_telegram) so they can be re-sent by reference
+        for field in ("telegram_file_id", "telegram_file_unique_id"):
+            if getattr(uploaded_file, field, None):
+                kwargs.setdefault(field, getattr(uploaded_file, field))
 
-        # Create file instance
+        # Identical bytes are stored once; this row references the blob
         file_instance = self.create(
-            file=uploaded_file,
+            file=info.stored_name,
+            sha256=info.sha256,
             original_filename=uploaded_file.name,
             file_category=category,
-            mime_type=mime_type,
-            size=uploaded_file.size,
+            mime_type=info.mime_type,
+            size=info.size,
             uploaded_by=user,
-            width=width,
-            height=height,
+            width=info.width,
+            height=info.height,
+            exif_orientation=info.orientation,
             **kwargs,
         )
 
         return file_instance
 
+    def referenced_paths(self):
+        """Storage names referenced by any File row (active or not)."""
+        return set(
+            self.values_list("file", flat=True).distinct().iterator(chunk_size=5000)
+        )
+
+    def blob_references(self, sha256):
+        """Number of File rows sharing the blob with this digest."""
+        return self.filter(sha256=sha256).count()
+
     def by_category(self, category_code):
         """Filter files by category code."""
         return self.filter(file_category__code=category_code, is_active=True)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0003_alter_file_created_at_alter_file_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='telegram_file_id',
+            field=models.CharField(blank=True, default='', help_text='Telegram file_id для повторной отправки без загрузки', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='telegram_file_unique_id',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Telegram file_unique_id (одинаков для всех ботов)', max_length=64),
+        ),
+    ]
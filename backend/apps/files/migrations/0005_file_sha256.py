@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0004_file_telegram_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='SHA-256 содержимого (общий blob для одинаковых файлов)', max_length=64),
+        ),
+    ]
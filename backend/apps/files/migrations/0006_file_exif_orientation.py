@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0005_file_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='exif_orientation',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='EXIF ориентация снимка (1-8), если указана камерой', null=True),
+        ),
+    ]
@@ -54,6 +54,9 @@ class File(TimestampedModel):
     """
     Centralized file storage with metadata.
     Each file is identified by UUID for security and portability.
+    Uploaded content is stored once per SHA-256 digest and shared between
+    rows (see FileManager.create_from_upload); unreferenced blobs are
+    removed by the collect_file_blobs command.
     """
 
     # Identity
@@ -90,9 +93,40 @@ class File(TimestampedModel):
         default=True, db_index=True, help_text="Флаг мягкого удаления"
     )
 
+    # SHA-256 of the content; rows with the same digest share one stored
+    # blob (empty for files stored before content addressing)
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="SHA-256 содержимого (общий blob для одинаковых файлов)",
+    )
+
     # Image dimensions (optional, for images only)
     width = models.PositiveIntegerField(null=True, blank=True)
     height = models.PositiveIntegerField(null=True, blank=True)
+    exif_orientation = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="EXIF ориентация снимка (1-8), если указана камерой",
+    )
+
+    # Telegram identifiers of the same photo, so it can be re-sent by
+    # reference instead of uploading the bytes again
+    telegram_file_id = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="Telegram file_id для повторной отправки без загрузки",
+    )
+    telegram_file_unique_id = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="Telegram file_unique_id (одинаков для всех ботов)",
+    )
 
     # Custom manager
     objects = FileManager()
@@ -0,0 +1,252 @@
+"""
+Single-pass processing of uploaded files.
+
+An upload is read exactly once: every chunk is hashed, written to its
+destination and, until enough is known, used to sniff the MIME type and
+parse the image header (dimensions and EXIF orientation). Uploads that
+fail validation are rejected as soon as the offending bytes arrive and
+their partial copy is removed.
+
+The result is attached to the uploaded file as `upload_info`, so later
+consumers of the same upload (serializer validation, then
+FileManager.create_from_upload) reuse it instead of reading the file
+again.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+
+import magic
+from django.core.exceptions import ValidationError
+from django.core.files import File as DjangoFile
+
+from .utils import BLOB_PREFIX, SNIFF_SIZE, blob_path
+from .validators import validate_file_security, validate_file_size, validate_mime_type
+
+
+# Image headers larger than this are not parsed (EXIF lives in the first
+# APP1 segment, which is at most 64 KB)
+IMAGE_HEADER_LIMIT = 256 * 1024
+
+# Partially received uploads, renamed into place once complete
+INCOMING_DIR = f"{BLOB_PREFIX}/incoming"
+
+# EXIF tag holding the camera orientation (1-8)
+EXIF_ORIENTATION = 0x0112
+
+
+@dataclass
+class UploadInfo:
+    """What one pass over an upload found out about it."""
+
+    name: str
+    size: int
+    sha256: str
+    mime_type: str
+    stored_name: str
+    width: int | None = None
+    height: int | None = None
+    orientation: int | None = None
+
+    @property
+    def is_image(self):
+        return self.mime_type.startswith("image/")
+
+
+class _ImageHeader:
+    """Parses image size and orientation from the first bytes of a stream."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.done = False
+        self.width = self.height = self.orientation = None
+
+    def feed(self, chunk):
+        if self.done:
+            return
+        from PIL import Image
+
+        self.buffer += chunk
+        try:
+            # Image.open only reads the header; pixel data is never decoded
+            with Image.open(io.BytesIO(self.buffer)) as image:
+                self.width, self.height = image.size
+                self.orientation = image.getexif().get(EXIF_ORIENTATION)
+        except Image.DecompressionBombError as e:
+            raise ValidationError(f"Invalid image file: {e!s}")
+        except Exception:
+            # Header not complete yet, or not an image PIL can read
+            if len(self.buffer) >= IMAGE_HEADER_LIMIT:
+                self._finish()
+            return
+        self._finish()
+
+    def _finish(self):
+        self.done = True
+        self.buffer = bytearray()
+
+
+class _Destination:
+    """
+    Where the chunks go while they are received.
+
+    Filesystem storage: a temporary file next to the blobs, renamed to the
+    blob path when complete. Other storages: a spooled temporary file that
+    is handed to storage.save().
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.tmp_path = None
+        try:
+            directory = storage.path(INCOMING_DIR)
+        except NotImplementedError:
+            self.fileobj = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)  # noqa: SIM115
+            return
+        os.makedirs(directory, exist_ok=True)
+        self.tmp_path = os.path.join(directory, f"{uuid.uuid4().hex}.part")
+        self.fileobj = open(self.tmp_path, "xb")  # noqa: SIM115
+
+    def write(self, chunk):
+        self.fileobj.write(chunk)
+
+    def commit(self, name):
+        """Move the received bytes to `name` unless a blob is already there."""
+        if self.tmp_path is None:
+            try:
+                if self.storage.exists(name):
+                    return name
+                self.fileobj.seek(0)
+                return self.storage.save(name, DjangoFile(self.fileobj, name=name))
+            finally:
+                self.fileobj.close()
+
+        self.fileobj.close()
+        target = self.storage.path(name)
+        if os.path.exists(target):
+            os.unlink(self.tmp_path)
+            return name
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if self.storage.file_permissions_mode is not None:
+            os.chmod(self.tmp_path, self.storage.file_permissions_mode)
+        # Atomic: concurrent uploads of the same bytes both end up at the
+        # same complete file
+        os.replace(self.tmp_path, target)
+        return name
+
+    def discard(self):
+        self.fileobj.close()
+        if self.tmp_path and os.path.exists(self.tmp_path):
+            os.unlink(self.tmp_path)
+
+
+def process_upload(uploaded_file, storage, category=None, require_image=False):
+    """
+    Validate, hash, inspect and store an upload in one read.
+
+    Args:
+        uploaded_file: Django UploadedFile instance
+        storage: Storage the blob is written to
+        category: FileCategory whose size and MIME rules are enforced while
+            reading (optional; the rules can be checked later on the result
+            with validate_upload_info)
+        require_image: Reject anything PIL can't read an image header from
+
+    Returns:
+        UploadInfo, also set as `uploaded_file.upload_info`
+
+    Raises:
+        ValidationError: As soon as the upload is known to be invalid
+    """
+    existing = getattr(uploaded_file, "upload_info", None)
+    if existing is not None:
+        if category is not None:
+            validate_upload_info(existing, category)
+        if require_image:
+            _check_image(existing)
+        return existing
+
+    validate_file_security(uploaded_file)
+    if category is not None and uploaded_file.size is not None:
+        validate_file_size(uploaded_file.size, category)
+
+    digest = hashlib.sha256()
+    size = 0
+    received = bytearray()  # bytes seen before the MIME type is known
+    mime_type = header = None
+    destination = _Destination(storage)
+    try:
+        uploaded_file.seek(0)
+        for chunk in uploaded_file.chunks():
+            size += len(chunk)
+            if category is not None:
+                validate_file_size(size, category)
+            digest.update(chunk)
+            destination.write(chunk)
+
+            if mime_type is None:
+                received += chunk
+                if len(received) >= SNIFF_SIZE:
+                    mime_type, header = _inspect(received, uploaded_file, category)
+            elif header is not None:
+                header.feed(chunk)
+
+        if mime_type is None:
+            mime_type, header = _inspect(received, uploaded_file, category)
+
+        info = UploadInfo(
+            name=uploaded_file.name,
+            size=size,
+            sha256=digest.hexdigest(),
+            mime_type=mime_type,
+            stored_name="",
+        )
+        if header is not None:
+            info.width, info.height = header.width, header.height
+            info.orientation = header.orientation
+        if require_image:
+            _check_image(info)
+        info.stored_name = destination.commit(blob_path(info.sha256, info.name))
+    except BaseException:
+        destination.discard()
+        raise
+    finally:
+        uploaded_file.seek(0)
+
+    uploaded_file.upload_info = info
+    return info
+
+
+def validate_upload_info(info, category):
+    """Check an already processed upload against a category's rules."""
+    validate_file_size(info.size, category)
+    validate_mime_type(info.mime_type, category)
+
+
+def _inspect(received, uploaded_file, category):
+    """Sniff the MIME type; start parsing the image header for images."""
+    try:
+        mime_type = magic.from_buffer(bytes(received[:SNIFF_SIZE]), mime=True)
+    except Exception:
+        # Fallback to content_type from upload
+        mime_type = uploaded_file.content_type or "application/octet-stream"
+    if category is not None:
+        validate_mime_type(mime_type, category)
+
+    header = None
+    if mime_type.startswith("image/"):
+        header = _ImageHeader()
+        header.feed(received)
+    return mime_type, header
+
+
+def _check_image(info):
+    if not info.is_image or info.width is None:
+        raise ValidationError(
+            "Upload a valid image. The file you uploaded was either not an "
+            "image or a corrupted image."
+        )
@@ -2,10 +2,41 @@
 Serializers for file management API.
 """
 
+from django.core.exceptions import ValidationError as DjangoValidationError
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import File, FileAttachment, FileCategory
+from .pipeline import process_upload
+
+
+def _process(uploaded_file, **options):
+    """Run the upload pipeline, reporting failures as DRF validation errors."""
+    try:
+        return process_upload(
+            uploaded_file, File._meta.get_field("file").storage, **options
+        )
+    except DjangoValidationError as e:
+        raise serializers.ValidationError(e.messages)
+
+
+class UploadedImageField(serializers.ImageField):
+    """
+    Image upload validated by the single-pass upload pipeline.
+
+    Replaces DRF's ImageField, which opens and verifies every image with
+    PIL on top of the reads done when the file is stored: here the file is
+    read once, stored as a blob, and its UploadInfo is reused by
+    File.objects.create_from_upload. Blobs of requests that fail later are
+    removed by collect_file_blobs.
+    """
+
+    def to_internal_value(self, data):
+        uploaded_file = serializers.FileField.to_internal_value(self, data)
+        info = _process(uploaded_file)
+        if not info.is_image or info.width is None:
+            self.fail("invalid_image")
+        return uploaded_file
 
 
 class FileCategorySerializer(serializers.ModelSerializer):
@@ -51,6 +82,7 @@ class FileSerializer(serializers.ModelSerializer):
             "is_active",
             "width",
             "height",
+            "exif_orientation",
             "created_at",
             "updated_at",
         ]
@@ -60,6 +92,7 @@ class FileSerializer(serializers.ModelSerializer):
             "mime_type",
             "width",
             "height",
+            "exif_orientation",
             "uploaded_by",
             "created_at",
             "updated_at",
@@ -87,17 +120,24 @@ class FileUploadSerializer(serializers.Serializer):
     def validate_category(self, value):
         """Validate category exists."""
         try:
-            FileCategory.objects.get(code=value)
-            return value
+            return FileCategory.objects.get(code=value)
         except FileCategory.DoesNotExist:
             raise serializers.ValidationError(
                 f"Категория файла '{value}' не существует."
             )
 
+    def validate(self, attrs):
+        """Validate and store the upload against its category in one read."""
+        try:
+            _process(attrs["file"], category=attrs["category"])
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({"file": e.detail})
+        return attrs
+
     def create(self, validated_data):
         """Create file using FileManager."""
         uploaded_file = validated_data.pop("file")
-        category_code = validated_data.pop("category")
+        category_code = validated_data.pop("category").code
         validated_data.pop("description", None)  # Remove description, not a File field
         user = self.context["request"].user
 
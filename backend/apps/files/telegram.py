@@ -0,0 +1,116 @@
+"""
+Sending stored photos to Telegram by file_id.
+
+Photos taken in the bot already live on Telegram's servers. File rows keep
+their telegram_file_id, so albums are sent by reference instead of uploading
+the bytes from disk again. Files without an id are uploaded once and the id
+from the response is stored for next time. If Telegram rejects an id
+(stale or issued to another bot), the album is re-sent from disk.
+"""
+
+import logging
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, InputMediaPhoto, Message
+from asgiref.sync import sync_to_async
+
+from .models import File
+
+
+logger = logging.getLogger(__name__)
+
+# Telegram limit for one media group
+MAX_ALBUM_SIZE = 10
+
+
+def _input_media(
+    file: File, use_file_id: bool, caption: str | None, parse_mode: str | None
+) -> InputMediaPhoto:
+    if use_file_id and file.telegram_file_id:
+        media = file.telegram_file_id
+    else:
+        media = FSInputFile(file.file.path)
+    if caption:
+        return InputMediaPhoto(media=media, caption=caption, parse_mode=parse_mode)
+    return InputMediaPhoto(media=media)
+
+
+def _build_album(
+    files: list[File], use_file_id: bool, caption: str, parse_mode: str | None
+) -> tuple[list[File], list[InputMediaPhoto]]:
+    """Media group for the files; files that cannot be prepared are skipped."""
+    sendable, media = [], []
+    for file in files[:MAX_ALBUM_SIZE]:
+        try:
+            item = _input_media(
+                file, use_file_id, caption if not media else None, parse_mode
+            )
+        except Exception as e:
+            logger.warning(f"Failed to prepare photo {file.id}: {e}")
+            continue
+        sendable.append(file)
+        media.append(item)
+    return sendable, media
+
+
+def remember_file_ids(files: list[File], sent: list[Message]) -> int:
+    """
+    Store the Telegram ids of uploaded photos on their File rows.
+
+    `sent` are the album messages in the same order as `files`.
+    Returns number of rows updated.
+    """
+    updated = 0
+    for file, message in zip(files, sent, strict=False):
+        if not message.photo:
+            continue
+        photo = message.photo[-1]  # largest size
+        if file.telegram_file_id == photo.file_id:
+            continue
+        file.telegram_file_id = photo.file_id
+        file.telegram_file_unique_id = photo.file_unique_id
+        updated += File.objects.filter(pk=file.pk).update(
+            telegram_file_id=photo.file_id,
+            telegram_file_unique_id=photo.file_unique_id,
+        )
+    return updated
+
+
+async def send_photo_album(
+    bot: Bot,
+    chat_id: int | str,
+    files: list[File],
+    caption: str = "",
+    parse_mode: str | None = None,
+) -> list[Message]:
+    """
+    Send up to 10 stored photos as one album, caption on the first photo.
+
+    Prefers telegram_file_id; falls back to uploading from disk when
+    Telegram rejects an id. Raises if nothing can be sent.
+    """
+    use_file_id = True
+    sendable, media = _build_album(files, use_file_id, caption, parse_mode)
+    if not media:
+        raise ValueError("No photos to send")
+
+    try:
+        sent = await bot.send_media_group(chat_id=chat_id, media=media)
+    except TelegramBadRequest as e:
+        if not any(file.telegram_file_id for file in sendable):
+            raise
+        logger.warning(f"Telegram rejected stored file_id, uploading from disk: {e}")
+        use_file_id = False
+        sendable, media = _build_album(sendable, use_file_id, caption, parse_mode)
+        sent = await bot.send_media_group(chat_id=chat_id, media=media)
+
+    # Photos sent from disk: keep the ids Telegram assigned to them
+    uploaded_files, uploaded_messages = [], []
+    for file, message in zip(sendable, sent, strict=False):
+        if not (use_file_id and file.telegram_file_id):
+            uploaded_files.append(file)
+            uploaded_messages.append(message)
+    if uploaded_files:
+        await sync_to_async(remember_file_ids)(uploaded_files, uploaded_messages)
+    return sent
@@ -6,6 +6,13 @@ from datetime import datetime
 from pathlib import Path
 
 
+# Content-addressed uploads live under this prefix (see blob_path)
+BLOB_PREFIX = "blobs"
+
+# Bytes from the start of an upload used for MIME sniffing
+SNIFF_SIZE = 2048
+
+
 def generate_file_path(instance, filename):
     """
     Generate organized file storage path.
@@ -22,6 +29,18 @@ def generate_file_path(instance, filename):
     return f"files/{category_code}/{now.year}/{now.month:02d}/{instance.id}{ext}"
 
 
+def blob_path(digest, filename):
+    """
+    Storage path of a blob, derived from its SHA-256 digest.
+
+    Pattern: blobs/{aa}/{bb}/{digest}.{ext}
+    Identical bytes uploaded under the same extension map to the same path,
+    so they are stored once and shared by every File row that has them.
+    """
+    ext = Path(filename).suffix.lower()
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
 def get_file_dimensions(file):
     """
     Get image dimensions if file is an image.
@@ -58,37 +58,50 @@ def validate_file_security(file):
                 )
 
 
-def validate_file_category(file, category):
+def validate_file_size(size, category):
+    """Validate a size in bytes against the category limit."""
+    max_size_bytes = category.max_file_size_mb * 1024 * 1024
+    if size > max_size_bytes:
+        raise ValidationError(
+            f"File size {size / (1024 * 1024):.2f}MB exceeds maximum "
+            f"{category.max_file_size_mb}MB for {category.name}."
+        )
+
+
+def validate_mime_type(mime, category):
+    """Validate a detected MIME type against the category's allowed types."""
+    allowed_types = category.allowed_mime_types
+    if allowed_types and mime not in allowed_types:
+        raise ValidationError(
+            f"File type {mime} is not allowed for {category.name}. "
+            f"Allowed types: {', '.join(allowed_types)}"
+        )
+
+
+def validate_file_category(file, category, head=None):
     """
     Validate that file matches category requirements.
 
     Args:
         file: UploadedFile instance
         category: FileCategory instance
+        head: First bytes of the file if already read (skips re-reading)
     """
     # Check file size
-    max_size_bytes = category.max_file_size_mb * 1024 * 1024
-    if file.size > max_size_bytes:
-        raise ValidationError(
-            f"File size {file.size / (1024 * 1024):.2f}MB exceeds maximum "
-            f"{category.max_file_size_mb}MB for {category.name}."
-        )
+    validate_file_size(file.size, category)
 
     # Detect actual mime type using python-magic
     try:
-        mime = magic.from_buffer(file.read(2048), mime=True)
-        file.seek(0)  # Reset file pointer
+        if head is None:
+            head = file.read(2048)
+            file.seek(0)  # Reset file pointer
+        mime = magic.from_buffer(head, mime=True)
     except Exception:
         # Fallback to content_type from upload
         mime = file.content_type
 
     # Check if mime type is allowed
-    allowed_types = category.allowed_mime_types
-    if allowed_types and mime not in allowed_types:
-        raise ValidationError(
-            f"File type {mime} is not allowed for {category.name}. "
-            f"Allowed types: {', '.join(allowed_types)}"
-        )
+    validate_mime_type(mime, category)
 
     return mime
 
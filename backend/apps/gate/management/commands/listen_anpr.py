@@ -3,6 +3,7 @@ import signal
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from apps.core.metrics import start_metrics_server
 from apps.gate.services import HikvisionANPRService
 
 
@@ -30,6 +31,12 @@ class Command(BaseCommand):
             default=None,
             help="Camera password (overrides GATE_CAMERA_PASS env var)",
         )
+        parser.add_argument(
+            "--metrics-port",
+            type=int,
+            default=None,
+            help="Serve Prometheus /metrics on this port (overrides ANPR_METRICS_PORT, 0 = off)",
+        )
 
     def handle(self, *args, **options):
         camera_ip = options["camera_ip"] or getattr(
@@ -66,6 +73,17 @@ class Command(BaseCommand):
             camera_port=camera_port,
         )
 
+        metrics_port = options["metrics_port"]
+        if metrics_port is None:
+            metrics_port = getattr(settings, "ANPR_METRICS_PORT", 0)
+        metrics_server = (
+            start_metrics_server(
+                metrics_port, host=getattr(settings, "ANPR_METRICS_HOST", "127.0.0.1")
+            )
+            if metrics_port
+            else None
+        )
+
         # Graceful shutdown on SIGINT/SIGTERM
         def shutdown_handler(signum, frame):
             self.stdout.write("\nShutting down ANPR listener...")
@@ -76,4 +94,7 @@ class Command(BaseCommand):
 
         service.listen()
 
+        if metrics_server is not None:
+            metrics_server.shutdown()
+
         self.stdout.write(self.style.SUCCESS("ANPR listener stopped."))
@@ -14,6 +14,7 @@ from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 
 from apps.core.exceptions import BusinessLogicError
+from apps.core.metrics import timed
 from apps.core.services import BaseService
 from apps.gate.models import ANPRDetection
 from apps.gate.services.broadcast import broadcast_anpr_detection
@@ -201,6 +202,7 @@ class HikvisionANPRService(BaseService):
 
         return result
 
+    @timed()
     def _capture_and_recognize(self) -> dict | None:
         """Capture an RTSP frame via ffmpeg and send it to PlateRecognizer API.
 
@@ -332,6 +334,7 @@ class HikvisionANPRService(BaseService):
                 except OSError:
                     pass
 
+    @timed()
     def _process_detection(self, event_data: dict) -> ANPRDetection | None:
         """Process a single ANPR detection: deduplicate, save, match, broadcast.
 
@@ -1,12 +1,17 @@
 import logging
+from datetime import datetime, time, timedelta
 
 from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.pagination import CursorResultsSetPagination, StandardOrCursorPagination
+from apps.core.services.log_retention import query_logs
 from apps.core.utils import safe_int_param
 from apps.gate.models import ANPRDetection
 from apps.gate.serializers import ANPRDetectionSerializer, ANPREventSerializer, PTZCommandSerializer
@@ -17,6 +22,10 @@ from apps.gate.services.camera_control_service import CameraControlService
 logger = logging.getLogger(__name__)
 
 
+def _day_start(day) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
 def _get_client_ip(request) -> str:
     """Extract client IP from REMOTE_ADDR.
 
@@ -86,7 +95,15 @@ class ANPREventWebhookView(APIView):
 
 
 class ANPRDetectionListView(APIView):
-    """List recent ANPR detections for a gate."""
+    """
+    List recent ANPR detections for a gate.
+
+    ?pagination=cursor returns keyset pages over the (gate_id, -created_at)
+    index in the standard paginated envelope instead of the latest ?limit rows.
+
+    ?date_from / ?date_to (YYYY-MM-DD, inclusive) select a day range that
+    may reach into archived months (see apps.core.services.log_retention).
+    """
 
     permission_classes = [IsAuthenticated]
 
@@ -96,9 +113,29 @@ class ANPRDetectionListView(APIView):
     )
     def get(self, request):
         gate_id = request.query_params.get("gate_id", "main")
+
+        if StandardOrCursorPagination().use_cursor(request):
+            paginator = CursorResultsSetPagination()
+            page = paginator.paginate_queryset(
+                ANPRDetection.objects.filter(gate_id=gate_id), request, view=self
+            )
+            return paginator.get_paginated_response(ANPRDetectionSerializer(page, many=True).data)
+
         limit = safe_int_param(request.query_params.get("limit"), default=50, min_val=1, max_val=200)
 
-        detections = ANPRDetection.objects.filter(gate_id=gate_id)[:limit]
+        date_from = parse_date(request.query_params.get("date_from") or "")
+        date_to = parse_date(request.query_params.get("date_to") or "")
+        if date_from or date_to:
+            rows = query_logs(
+                "anpr",
+                start=_day_start(date_from) if date_from else None,
+                end=_day_start(date_to + timedelta(days=1)) if date_to else None,
+                filters={"gate_id": gate_id},
+                limit=limit,
+            )
+            detections = [ANPRDetection(**row) for row in rows]
+        else:
+            detections = ANPRDetection.objects.filter(gate_id=gate_id)[:limit]
         serializer = ANPRDetectionSerializer(detections, many=True)
 
         return Response({"success": True, "data": serializer.data})
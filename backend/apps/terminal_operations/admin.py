@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import ContainerEntry, ContainerOwner, CraneOperation, PreOrder
+from .models import ContainerEntry, ContainerOwner, CraneOperation, PreOrder, YardBlock
 
 
 class CraneOperationInline(admin.TabularInline):
@@ -227,3 +227,33 @@ class PreOrderAdmin(admin.ModelAdmin):
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
+
+
+@admin.register(YardBlock)
+class YardBlockAdmin(admin.ModelAdmin):
+    """
+    Admin interface for YardBlock model (yard geometry configuration)
+    """
+
+    list_display = [
+        "zone",
+        "row_from",
+        "row_to",
+        "bays",
+        "max_tiers",
+        "container_size",
+        "reefer_plugs",
+        "is_active",
+    ]
+    list_filter = ["zone", "container_size", "is_active"]
+    readonly_fields = ["created_at", "updated_at"]
+    ordering = ["zone", "row_from"]
+
+    fieldsets = (
+        ("Расположение", {"fields": ("zone", "row_from", "row_to", "bays", "max_tiers")}),
+        ("Правила", {"fields": ("container_size", "reefer_plugs", "is_active")}),
+        (
+            "Системная информация",
+            {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
+        ),
+    )
@@ -0,0 +1,90 @@
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.contrib.auth.models import AnonymousUser
+
+from apps.terminal_operations.services.yard_broadcast import (
+    RING_BUFFER_SIZE,
+    YARD_GROUP_NAME,
+    get_diffs_since,
+    get_yard_version,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class YardConsumer(AsyncJsonWebsocketConsumer):
+    """
+    WebSocket consumer for incremental yard layout updates.
+
+    On connect the client gets the current yard version. Passing ?since=<version>
+    (or sending {"action": "replay", "since": <version>}) replays missed diffs
+    from the ring buffer, or answers "resync_required" if they are gone.
+    Live updates arrive as "diff" messages, or as one "diffs" message for
+    the diffs of a bulk operation.
+    """
+
+    joined_group = False
+
+    async def connect(self) -> None:
+        """Handle WebSocket connection. Requires JWT authentication via query string."""
+        user = self.scope.get("user", AnonymousUser())
+        if not user or isinstance(user, AnonymousUser) or not user.is_authenticated:
+            logger.warning("Yard WebSocket connection rejected: unauthenticated")
+            await self.close()
+            return
+
+        await self.channel_layer.group_add(YARD_GROUP_NAME, self.channel_name)
+        self.joined_group = True
+        await self.accept()
+
+        await self.send_json(
+            {
+                "type": "hello",
+                "version": await sync_to_async(get_yard_version)(),
+                "buffer_size": RING_BUFFER_SIZE,
+            }
+        )
+
+        query = parse_qs(self.scope.get("query_string", b"").decode())
+        since = query.get("since", [None])[0]
+        if since is not None:
+            await self._replay(since)
+
+        logger.info(f"Yard WebSocket connected: user={user.username}")
+
+    async def disconnect(self, close_code: int) -> None:
+        """Handle WebSocket disconnection."""
+        if self.joined_group:
+            await self.channel_layer.group_discard(YARD_GROUP_NAME, self.channel_name)
+            logger.info(f"Yard WebSocket disconnected: code={close_code}")
+
+    async def receive_json(self, content: dict, **kwargs) -> None:
+        """Handle client requests ({"action": "replay", "since": <version>})."""
+        if content.get("action") == "replay":
+            await self._replay(content.get("since"))
+
+    async def _replay(self, since) -> None:
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            await self.send_json({"type": "error", "message": "since must be an integer version"})
+            return
+
+        diffs = await sync_to_async(get_diffs_since)(since)
+        version = await sync_to_async(get_yard_version)()
+        if diffs is None:
+            await self.send_json({"type": "resync_required", "version": version})
+        else:
+            await self.send_json({"type": "replay", "version": version, "diffs": diffs})
+
+    async def yard_diff(self, event: dict) -> None:
+        """Send a layout diff to WebSocket clients."""
+        await self.send_json({"type": "diff", **event["data"]})
+
+    async def yard_diffs(self, event: dict) -> None:
+        """Send the diffs of a bulk operation to WebSocket clients in one message."""
+        await self.send_json({"type": "diffs", **event["data"]})
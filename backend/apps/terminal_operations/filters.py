@@ -1,9 +1,12 @@
 from datetime import datetime
 
 import django_filters
-from django.db.models import Q
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from apps.core.services.dwell_analytics import DwellAnalyticsService
 
 from .models import ContainerEntry
+from .services.entry_search import SEARCH_ORDERING, search_entries
 
 
 def _parse_date_flexible(value):
@@ -66,12 +69,8 @@ class ContainerEntryFilter(django_filters.FilterSet):
     )
     cargo_weight_range = django_filters.CharFilter(method="filter_cargo_weight_range")
 
-    dwell_time_min = django_filters.NumberFilter(
-        field_name="dwell_time_days", lookup_expr="gte"
-    )
-    dwell_time_max = django_filters.NumberFilter(
-        field_name="dwell_time_days", lookup_expr="lte"
-    )
+    dwell_time_min = django_filters.NumberFilter(method="filter_dwell_time_min")
+    dwell_time_max = django_filters.NumberFilter(method="filter_dwell_time_max")
     dwell_time_range = django_filters.CharFilter(method="filter_dwell_time_range")
 
     # Combined datetime filters
@@ -301,26 +300,10 @@ class ContainerEntryFilter(django_filters.FilterSet):
     def filter_search_text(self, queryset, name, value):
         """
         Comprehensive search across all relevant text fields
-        Searches: container number, client, owner, cargo, location, notes, train numbers, stations
+        Searches: container number, client, owner, company, cargo, location, notes,
+        plates, train numbers, stations, recorded_by (via the entry search document)
         """
-        return queryset.filter(
-            Q(container__container_number__icontains=value)
-            | Q(client_name__icontains=value)
-            | Q(company__name__icontains=value)
-            | Q(container_owner__name__icontains=value)
-            | Q(cargo_name__icontains=value)
-            | Q(location__icontains=value)
-            | Q(note__icontains=value)
-            | Q(transport_number__icontains=value)
-            | Q(entry_train_number__icontains=value)
-            | Q(exit_train_number__icontains=value)
-            | Q(exit_transport_number__icontains=value)
-            | Q(destination_station__icontains=value)
-            | Q(recorded_by__username__icontains=value)
-            | Q(recorded_by__email__icontains=value)
-            | Q(recorded_by__first_name__icontains=value)
-            | Q(recorded_by__last_name__icontains=value)
-        )
+        return search_entries(queryset, value)
 
     def filter_cargo_weight_range(self, queryset, name, value):
         """
@@ -341,6 +324,18 @@ class ContainerEntryFilter(django_filters.FilterSet):
             pass
         return queryset
 
+    def filter_dwell_time_min(self, queryset, name, value):
+        """Filter by minimum dwell time (days), computed in the database"""
+        if value is None:
+            return queryset
+        return DwellAnalyticsService(queryset).filter_days(min_days=value)
+
+    def filter_dwell_time_max(self, queryset, name, value):
+        """Filter by maximum dwell time (days), computed in the database"""
+        if value is None:
+            return queryset
+        return DwellAnalyticsService(queryset).filter_days(max_days=value)
+
     def filter_dwell_time_range(self, queryset, name, value):
         """
         Filter by dwell time range (days). Accepts format: 'min-max'
@@ -353,8 +348,8 @@ class ContainerEntryFilter(django_filters.FilterSet):
             if len(parts) == 2:
                 min_days = int(parts[0])
                 max_days = int(parts[1])
-                return queryset.filter(
-                    dwell_time_days__gte=min_days, dwell_time_days__lte=max_days
+                return DwellAnalyticsService(queryset).filter_days(
+                    min_days=min_days, max_days=max_days
                 )
         except (ValueError, IndexError):
             pass
@@ -364,3 +359,28 @@ class ContainerEntryFilter(django_filters.FilterSet):
         model = ContainerEntry
         # All filters are explicitly defined above for better control and frontend compatibility
         fields = []
+
+
+class ContainerEntrySearchFilter(SearchFilter):
+    """
+    DRF ?search= backed by the entry search document.
+
+    Every term must match (as with SearchFilter), but instead of ORing
+    icontains over joined tables the indexed document is queried once.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return search_entries(queryset, " ".join(terms), split_terms=True)
+
+
+class SearchRankOrderingFilter(OrderingFilter):
+    """OrderingFilter that puts the best search matches first unless ?ordering= is given."""
+
+    def filter_queryset(self, request, queryset, view):
+        explicit = request.query_params.get(self.ordering_param)
+        if not explicit and "search_rank" in queryset.query.annotations:
+            return queryset.order_by(*SEARCH_ORDERING)
+        return super().filter_queryset(request, queryset, view)
@@ -40,7 +40,7 @@ class Command(BaseCommand):
         # Get entries without any events
         entries_without_events = ContainerEntry.objects.exclude(
             id__in=ContainerEvent.objects.values_list("container_entry_id", flat=True)
-        ).select_related("container", "recorded_by").prefetch_related("crane_operations")
+        ).select_related("container", "recorded_by", "position").prefetch_related("crane_operations")
 
         total_entries = entries_without_events.count()
         self.stdout.write(f"Found {total_entries} container entries without events")
@@ -55,51 +55,19 @@ class Command(BaseCommand):
         exit_recorded_count = 0
         crane_operation_count = 0
 
-        # Process in batches
+        # Process in batches: one transaction and one bulk insert per batch
         processed = 0
+        batch = []
         for entry in entries_without_events.iterator(chunk_size=batch_size):
             if not dry_run:
-                with transaction.atomic():
-                    # 1. Create ENTRY_CREATED event
-                    event_service.create_entry_created_event(
-                        container_entry=entry,
-                        performed_by=entry.recorded_by,
-                        source="SYSTEM",
-                    )
-                    entry_created_count += 1
-
-                    # 2. Create POSITION_ASSIGNED event if has position
-                    if hasattr(entry, "position") and entry.position:
-                        pos = entry.position
-                        event_service.create_position_assigned_event(
-                            container_entry=entry,
-                            zone=pos.zone,
-                            row=pos.row,
-                            bay=pos.bay,
-                            tier=pos.tier,
-                            sub_slot=pos.sub_slot,
-                            auto_assigned=pos.auto_assigned,
-                            source="SYSTEM",
-                        )
-                        position_assigned_count += 1
-
-                    # 3. Create EXIT_RECORDED event if has exit_date
-                    if entry.exit_date:
-                        event_service.create_exit_recorded_event(
-                            container_entry=entry,
-                            source="SYSTEM",
-                        )
-                        exit_recorded_count += 1
-
-                    # 4. Create CRANE_OPERATION events for each crane operation
-                    for crane_op in entry.crane_operations.all():
-                        event_service.create_crane_operation_event(
-                            container_entry=entry,
-                            operation_date=crane_op.operation_date,
-                            crane_operation_id=crane_op.id,
-                            source="SYSTEM",
-                        )
-                        crane_operation_count += 1
+                batch.append(entry)
+                if len(batch) == batch_size:
+                    counts = self._create_events(event_service, batch)
+                    entry_created_count += counts[0]
+                    position_assigned_count += counts[1]
+                    exit_recorded_count += counts[2]
+                    crane_operation_count += counts[3]
+                    batch = []
             else:
                 # Dry run - just count
                 entry_created_count += 1
@@ -107,12 +75,19 @@ class Command(BaseCommand):
                     position_assigned_count += 1
                 if entry.exit_date:
                     exit_recorded_count += 1
-                crane_operation_count += entry.crane_operations.count()
+                crane_operation_count += len(entry.crane_operations.all())
 
             processed += 1
             if processed % batch_size == 0:
                 self.stdout.write(f"Processed {processed}/{total_entries} entries...")
 
+        if batch:
+            counts = self._create_events(event_service, batch)
+            entry_created_count += counts[0]
+            position_assigned_count += counts[1]
+            exit_recorded_count += counts[2]
+            crane_operation_count += counts[3]
+
         # Summary
         total_events = entry_created_count + position_assigned_count + exit_recorded_count + crane_operation_count
 
@@ -123,3 +98,57 @@ class Command(BaseCommand):
         self.stdout.write(f"{'Would create' if dry_run else 'Created'} {exit_recorded_count} EXIT_RECORDED events")
         self.stdout.write(f"{'Would create' if dry_run else 'Created'} {crane_operation_count} CRANE_OPERATION events")
         self.stdout.write(self.style.SUCCESS(f"Total: {total_events} events for {total_entries} containers"))
+
+    def _create_events(self, event_service, entries) -> tuple[int, int, int, int]:
+        """
+        Create the events of a batch of entries in a single bulk insert.
+
+        Returns counts of ENTRY_CREATED, POSITION_ASSIGNED, EXIT_RECORDED and
+        CRANE_OPERATION events.
+        """
+        entry_created = position_assigned = exit_recorded = crane_operations = 0
+
+        with transaction.atomic(), event_service.batch():
+            for entry in entries:
+                # 1. Create ENTRY_CREATED event
+                event_service.create_entry_created_event(
+                    container_entry=entry,
+                    performed_by=entry.recorded_by,
+                    source="SYSTEM",
+                )
+                entry_created += 1
+
+                # 2. Create POSITION_ASSIGNED event if has position
+                if hasattr(entry, "position") and entry.position:
+                    pos = entry.position
+                    event_service.create_position_assigned_event(
+                        container_entry=entry,
+                        zone=pos.zone,
+                        row=pos.row,
+                        bay=pos.bay,
+                        tier=pos.tier,
+                        sub_slot=pos.sub_slot,
+                        auto_assigned=pos.auto_assigned,
+                        source="SYSTEM",
+                    )
+                    position_assigned += 1
+
+                # 3. Create EXIT_RECORDED event if has exit_date
+                if entry.exit_date:
+                    event_service.create_exit_recorded_event(
+                        container_entry=entry,
+                        source="SYSTEM",
+                    )
+                    exit_recorded += 1
+
+                # 4. Create CRANE_OPERATION events for each crane operation
+                for crane_op in entry.crane_operations.all():
+                    event_service.create_crane_operation_event(
+                        container_entry=entry,
+                        operation_date=crane_op.operation_date,
+                        crane_operation_id=crane_op.id,
+                        source="SYSTEM",
+                    )
+                    crane_operations += 1
+
+        return entry_created, position_assigned, exit_recorded, crane_operations
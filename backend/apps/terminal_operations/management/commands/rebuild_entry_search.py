@@ -0,0 +1,29 @@
+"""
+Management command to rebuild container entry search documents.
+
+Run after bulk changes that bypass ContainerEntry.save() (queryset.update(),
+raw SQL, restored dumps) so search stays in sync.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services.entry_search import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild search documents (and the SQLite FTS index) for container entries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of entries to write per batch (default: 500)",
+        )
+
+    def handle(self, *args, **options):
+        updated = refresh_search_documents(
+            ContainerEntry.objects.all(), batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} search documents"))
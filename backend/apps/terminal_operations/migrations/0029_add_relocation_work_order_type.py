@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminal_operations', '0027_audit_protect_financial_fks'),
+        ('terminal_operations', '0028_update_laden_42g1_to_dash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='workorder',
+            name='operation_type',
+            field=models.CharField(choices=[('PLACEMENT', 'Размещение'), ('RETRIEVAL', 'Извлечение'), ('RELOCATION', 'Перемещение')], db_index=True, default='PLACEMENT', help_text='Тип операции: размещение, извлечение или перемещение контейнера внутри терминала', max_length=10),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:06
+"""
+Yard geometry configuration (YardBlock).
+
+Seeds the layout that used to be hard-coded in placement_service.py:
+Zone A, rows 1-5 for 40ft/45ft and rows 6-10 for 20ft, 10 bays, 4 tiers.
+"""
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def seed_default_blocks(apps, schema_editor):
+    """Create the default Zone A blocks."""
+    YardBlock = apps.get_model("terminal_operations", "YardBlock")
+    YardBlock.objects.bulk_create(
+        [
+            YardBlock(zone="A", row_from=1, row_to=5, bays=10, max_tiers=4, container_size="40ft"),
+            YardBlock(zone="A", row_from=6, row_to=10, bays=10, max_tiers=4, container_size="20ft"),
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminal_operations', '0029_add_relocation_work_order_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='YardBlock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='дата изменения')),
+                ('zone', models.CharField(choices=[('A', 'Zone A'), ('B', 'Zone B'), ('C', 'Zone C'), ('D', 'Zone D'), ('E', 'Zone E')], db_index=True, help_text='Зона терминала (A-E)', max_length=1)),
+                ('row_from', models.PositiveSmallIntegerField(help_text='Первый ряд блока', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('row_to', models.PositiveSmallIntegerField(help_text='Последний ряд блока (включительно)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('bays', models.PositiveSmallIntegerField(default=10, help_text='Количество отсеков в каждом ряду блока', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('max_tiers', models.PositiveSmallIntegerField(default=4, help_text='Максимальная высота штабеля в блоке', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(4)])),
+                ('container_size', models.CharField(choices=[('20ft', '20ft'), ('40ft', '40ft / 45ft')], help_text='Размер контейнеров, допустимый в рядах блока (сегрегация по размеру)', max_length=4)),
+                ('reefer_plugs', models.PositiveSmallIntegerField(default=0, help_text='Количество розеток для рефконтейнеров в каждом ряду блока')),
+                ('is_active', models.BooleanField(db_index=True, default=True, help_text='Неактивные блоки не используются при размещении')),
+            ],
+            options={
+                'verbose_name': 'Блок терминала',
+                'verbose_name_plural': 'Блоки терминала',
+                'ordering': ['zone', 'row_from'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('row_from__lte', models.F('row_to'))), name='yard_block_row_range_valid', violation_error_message='Первый ряд блока не может быть больше последнего')],
+            },
+        ),
+        migrations.RunPython(seed_default_blocks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.6 on 2026-10-18 21:38
+"""
+Denormalized search document for container entries.
+
+Backfills search_document and creates the backend-specific index:
+- PostgreSQL: pg_trgm extension + GIN trigram index
+- SQLite: FTS5 table with the trigram tokenizer
+"""
+
+from django.db import migrations, models
+
+# Frozen copies of services.entry_search: migrations must not track app code.
+FTS_TABLE = "terminal_operations_containerentry_fts"
+TRIGRAM_INDEX = "containerentry_search_trgm_idx"
+
+
+def build_search_document(entry) -> str:
+    """Lowercase search text of a (historical) entry, one field per line."""
+    parts = [
+        entry.container.container_number if entry.container_id else "",
+        entry.transport_number,
+        entry.exit_transport_number,
+        entry.entry_train_number,
+        entry.exit_train_number,
+        entry.client_name,
+        entry.container_owner.name if entry.container_owner_id else "",
+        entry.company.name if entry.company_id else "",
+        entry.cargo_name,
+        entry.destination_station,
+        entry.location,
+        entry.note,
+    ]
+    if entry.recorded_by_id:
+        user = entry.recorded_by
+        parts += [user.username, user.email, user.first_name, user.last_name]
+    return "\n".join(part.strip() for part in parts if part and part.strip()).lower()
+
+
+def backfill_search_documents(apps, schema_editor):
+    """Build documents for existing entries."""
+    ContainerEntry = apps.get_model("terminal_operations", "ContainerEntry")
+    batch = []
+    entries = ContainerEntry.objects.using(schema_editor.connection.alias).select_related(
+        "container", "container_owner", "company", "recorded_by"
+    )
+    for entry in entries.iterator(chunk_size=1000):
+        entry.search_document = build_search_document(entry)
+        batch.append(entry)
+        if len(batch) >= 1000:
+            ContainerEntry.objects.bulk_update(batch, ["search_document"])
+            batch = []
+    if batch:
+        ContainerEntry.objects.bulk_update(batch, ["search_document"])
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} "
+            "ON terminal_operations_containerentry USING gin (search_document gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+            "USING fts5(search_document, tokenize='trigram')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_document) "
+            "SELECT id, search_document FROM terminal_operations_containerentry"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('terminal_operations', '0030_yard_block'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='containerentry',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Поисковый документ (формируется автоматически)'),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
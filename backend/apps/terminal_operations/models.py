@@ -1,3 +1,4 @@
+from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
@@ -232,6 +233,19 @@ class ContainerEntry(TimestampedModel):
         help_text="Номер букинга/заказа",
     )
 
+    # Denormalized lowercase search text (see services/entry_search.py)
+    search_document = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Поисковый документ (формируется автоматически)",
+    )
+
+    # Reverse side of FileAttachment's generic FK (prefetched by list views)
+    file_attachments = GenericRelation(
+        "files.FileAttachment", related_query_name="container_entry"
+    )
+
     class Meta:
         ordering = ["-entry_time"]
         verbose_name = "Въезд контейнера"
@@ -251,6 +265,26 @@ class ContainerEntry(TimestampedModel):
             models.Index(fields=["company"], name="company_idx"),
         ]
 
+    def save(self, *args, **kwargs):
+        """Rebuild the search document when a searchable field may have changed."""
+        from .services.entry_search import (
+            SEARCH_SOURCE_FIELDS,
+            build_search_document,
+            index_entries,
+        )
+
+        update_fields = kwargs.get("update_fields")
+        reindex = update_fields is None or not SEARCH_SOURCE_FIELDS.isdisjoint(update_fields)
+        if reindex:
+            self.search_document = build_search_document(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+
+        super().save(*args, **kwargs)
+
+        if reindex:
+            index_entries([self], using=kwargs.get("using") or self._state.db)
+
     @property
     def dwell_time_days(self):
         """
@@ -583,6 +617,92 @@ class ContainerPosition(TimestampedModel):
         return f"{self.coordinate_string} ({self.container_entry.container.container_number})"
 
 
+class YardBlock(TimestampedModel):
+    """
+    Yard geometry configuration: a contiguous range of rows in one zone.
+
+    Every placement, layout and statistics routine reads the yard shape from
+    active blocks (see services/yard_geometry.py), so opening a new zone or
+    re-segregating rows is a configuration change, not a code change.
+
+    Limits follow ContainerPosition validators (rows/bays 1-10, tiers 1-4).
+    """
+
+    from django.core.validators import MaxValueValidator, MinValueValidator
+
+    # Size segregation: a 40ft block also takes 45ft containers
+    CONTAINER_SIZE_CHOICES = [
+        ("20ft", "20ft"),
+        ("40ft", "40ft / 45ft"),
+    ]
+
+    zone = models.CharField(
+        max_length=1,
+        choices=ContainerPosition.ZONE_CHOICES,
+        db_index=True,
+        help_text="Зона терминала (A-E)",
+    )
+    row_from = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)],
+        help_text="Первый ряд блока",
+    )
+    row_to = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)],
+        help_text="Последний ряд блока (включительно)",
+    )
+    bays = models.PositiveSmallIntegerField(
+        default=10,
+        validators=[MinValueValidator(1), MaxValueValidator(10)],
+        help_text="Количество отсеков в каждом ряду блока",
+    )
+    max_tiers = models.PositiveSmallIntegerField(
+        default=4,
+        validators=[MinValueValidator(1), MaxValueValidator(4)],
+        help_text="Максимальная высота штабеля в блоке",
+    )
+    container_size = models.CharField(
+        max_length=4,
+        choices=CONTAINER_SIZE_CHOICES,
+        help_text="Размер контейнеров, допустимый в рядах блока (сегрегация по размеру)",
+    )
+    reefer_plugs = models.PositiveSmallIntegerField(
+        default=0,
+        help_text="Количество розеток для рефконтейнеров в каждом ряду блока",
+    )
+    is_active = models.BooleanField(
+        default=True,
+        db_index=True,
+        help_text="Неактивные блоки не используются при размещении",
+    )
+
+    class Meta:
+        ordering = ["zone", "row_from"]
+        verbose_name = "Блок терминала"
+        verbose_name_plural = "Блоки терминала"
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(row_from__lte=models.F("row_to")),
+                name="yard_block_row_range_valid",
+                violation_error_message="Первый ряд блока не может быть больше последнего",
+            )
+        ]
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+
+        overlapping = YardBlock.objects.filter(
+            zone=self.zone,
+            is_active=True,
+            row_from__lte=self.row_to,
+            row_to__gte=self.row_from,
+        ).exclude(pk=self.pk)
+        if self.is_active and overlapping.exists():
+            raise ValidationError("Ряды блока пересекаются с другим активным блоком этой зоны")
+
+    def __str__(self):
+        return f"Зона {self.zone}, ряды {self.row_from}-{self.row_to} ({self.container_size})"
+
+
 class TerminalVehicle(TimestampedModel):
     """
     Terminal yard equipment for container handling operations.
@@ -647,7 +767,7 @@ class TerminalVehicle(TimestampedModel):
 
 class WorkOrder(TimestampedModel):
     """
-    Work order for container operations (placement or retrieval).
+    Work order for container operations (placement, retrieval or relocation).
 
     Simplified workflow:
     PENDING → COMPLETED
@@ -662,6 +782,7 @@ class WorkOrder(TimestampedModel):
     OPERATION_CHOICES = [
         ("PLACEMENT", "Размещение"),
         ("RETRIEVAL", "Извлечение"),
+        ("RELOCATION", "Перемещение"),
     ]
 
     # Status workflow (simplified)
@@ -699,7 +820,7 @@ class WorkOrder(TimestampedModel):
         choices=OPERATION_CHOICES,
         default="PLACEMENT",
         db_index=True,
-        help_text="Тип операции: размещение контейнера на терминал или извлечение с терминала",
+        help_text="Тип операции: размещение, извлечение или перемещение контейнера внутри терминала",
     )
 
     # Unique order number for display
@@ -31,6 +31,7 @@ from .placement import (
     ContainerPositionSerializer,
     PlacementAssignRequestSerializer,
     PlacementAvailableRequestSerializer,
+    PlacementConsolidationRequestSerializer,
     PlacementLayoutSerializer,
     PlacementMoveRequestSerializer,
     PlacementSuggestRequestSerializer,
@@ -116,6 +117,7 @@ __all__ = [
     "PlacementAssignRequestSerializer",
     "PlacementMoveRequestSerializer",
     "PlacementAvailableRequestSerializer",
+    "PlacementConsolidationRequestSerializer",
     "UnplacedContainerSerializer",
     "YardSlotContainerEntrySerializer",
     "YardSlotSerializer",
@@ -4,7 +4,6 @@ Container entry serializers.
 Handles ContainerEntry CRUD operations, file attachments, and Excel import.
 """
 
-from django.contrib.contenttypes.models import ContentType
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
@@ -13,6 +12,11 @@ from apps.accounts.models import Company
 from apps.containers.models import Container
 
 from ..models import ContainerEntry, ContainerOwner, CraneOperation
+from ..services.entry_projection import (
+    entry_attachments,
+    entry_dwell_days,
+    entry_has_pending_invoice,
+)
 from .base import (
     ContainerNestedSerializer,
     ContainerOwnerSerializer,
@@ -119,18 +123,12 @@ class ContainerEntrySerializer(serializers.ModelSerializer):
     @extend_schema_field({"type": "integer", "nullable": True})
     def get_dwell_time_days(self, obj):
         """Return calculated dwell time in days"""
-        return obj.dwell_time_days
+        return entry_dwell_days(obj)
 
     @extend_schema_field({"type": "boolean"})
     def get_has_pending_invoice(self, obj) -> bool:
         """Check if container is invoiced but still on terminal (expecting exit)."""
-        # Only relevant for containers still on terminal
-        if obj.exit_date is not None:
-            return False
-        # Check if in any active on-demand invoice
-        return obj.on_demand_items.filter(
-            invoice__status__in=["draft", "finalized", "paid"]
-        ).exists()
+        return entry_has_pending_invoice(obj)
 
     def to_representation(self, instance):
         """Return Russian display values for choice fields and full nested objects for FKs"""
@@ -360,19 +358,8 @@ class ContainerEntryWithImagesSerializer(ContainerEntrySerializer):
         ]
 
     def _get_attachments(self, obj):
-        """Cache attachments to avoid multiple queries"""
-        if not hasattr(obj, "_cached_attachments"):
-            from apps.files.models import FileAttachment
-
-            content_type = ContentType.objects.get_for_model(obj)
-            obj._cached_attachments = list(
-                FileAttachment.objects.filter(
-                    content_type=content_type, object_id=obj.id, file__is_active=True
-                )
-                .select_related("file")
-                .order_by("display_order", "created_at")
-            )
-        return obj._cached_attachments
+        """Active attachments (prefetched by with_list_projection)"""
+        return entry_attachments(obj)
 
     @extend_schema_field({"type": "array", "items": {"type": "object"}})
     def get_files(self, obj):
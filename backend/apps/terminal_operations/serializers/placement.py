@@ -114,6 +114,12 @@ class PlacementSuggestRequestSerializer(serializers.Serializer):
         allow_null=True,
         help_text="Preferred zone (optional)",
     )
+    strategy = serializers.ChoiceField(
+        choices=[("sequential", "sequential"), ("rehandle", "rehandle")],
+        required=False,
+        default="sequential",
+        help_text="sequential (row by row) or rehandle (minimize shuffles by expected departure)",
+    )
 
 
 class PlacementSuggestResponseSerializer(serializers.Serializer):
@@ -152,6 +158,37 @@ class PlacementMoveRequestSerializer(serializers.Serializer):
     )
 
 
+class PlacementConsolidationRequestSerializer(serializers.Serializer):
+    """
+    Request serializer for yard consolidation plan.
+    """
+
+    unit = serializers.ChoiceField(
+        choices=[("bay", "bay"), ("row", "row")],
+        required=False,
+        default="bay",
+        help_text="What to free: whole bays or whole rows",
+    )
+    zone = serializers.ChoiceField(
+        choices=[("A", "A"), ("B", "B"), ("C", "C"), ("D", "D"), ("E", "E")],
+        required=False,
+        allow_null=True,
+        help_text="Only free bays/rows in this zone (optional)",
+    )
+    max_moves = serializers.IntegerField(
+        min_value=1,
+        max_value=200,
+        required=False,
+        default=20,
+        help_text="Maximum number of relocations (default 20)",
+    )
+    create_work_orders = serializers.BooleanField(
+        required=False,
+        default=False,
+        help_text="Create RELOCATION work orders for the planned moves",
+    )
+
+
 class PlacementAvailableRequestSerializer(serializers.Serializer):
     """
     Query params serializer for available positions.
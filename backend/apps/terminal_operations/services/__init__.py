@@ -1,5 +1,5 @@
-from .container_entry_export_service import ContainerEntryExportService
-from .container_entry_import_service import ContainerEntryImportService
+from apps.core.utils import lazy_exports
+
 from .container_entry_service import ContainerEntryService
 from .container_event_service import ContainerEventService
 from .crane_operation_service import CraneOperationService
@@ -8,9 +8,20 @@ from .gate_matching_service import GateMatchingService
 from .placement_service import PlacementService
 from .preorder_service import PreOrderService
 from .terminal_vehicle_service import TerminalVehicleService
+from .typeahead_service import TypeaheadService
 from .work_order_service import WorkOrderService
 
 
+# Excel import/export (pandas, openpyxl) load on first use
+__getattr__ = lazy_exports(
+    __name__,
+    {
+        "ContainerEntryExportService": ".container_entry_export_service",
+        "ContainerEntryImportService": ".container_entry_import_service",
+    },
+)
+
+
 __all__ = [
     "ContainerEntryExportService",
     "ContainerEntryImportService",
@@ -22,5 +33,6 @@ __all__ = [
     "PlacementService",
     "PreOrderService",
     "TerminalVehicleService",
+    "TypeaheadService",
     "WorkOrderService",
 ]
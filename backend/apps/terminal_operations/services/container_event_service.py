@@ -2,8 +2,15 @@
 Container Event Service - Business logic for container lifecycle event tracking.
 
 Provides event creation, timeline queries, and initial event generation for existing data.
+
+Bulk operations wrap their loop in `ContainerEventService().batch()`: events
+created inside are buffered and written with bulk_create when the block
+exits, in the order they were created, instead of one INSERT per event.
 """
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Optional
 
@@ -15,6 +22,54 @@ from apps.accounts.models import CustomUser
 from apps.core.services.base_service import BaseService
 
 from ..models import ContainerEntry, ContainerEvent
+from .yard_broadcast import build_yard_diff, schedule_yard_diff, schedule_yard_diffs
+
+
+EVENT_BATCH_SIZE = 500
+
+
+class EventBatch:
+    """
+    Events buffered by ContainerEventService.batch().
+
+    Buffered events are unsaved until flush(); they get their primary keys
+    when written. Insertion order is creation order, so events of one
+    container keep their sequence (ties in event_time are broken by id).
+    """
+
+    def __init__(self, batch_size: int = EVENT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.events: list[ContainerEvent] = []
+        self.flushed = 0
+
+    def add(self, event: ContainerEvent) -> None:
+        self.events.append(event)
+        if len(self.events) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered events. Returns number of events written."""
+        if not self.events:
+            return 0
+        events, self.events = self.events, []
+        ContainerEvent.objects.bulk_create(events, batch_size=self.batch_size)
+        # One broadcast for the whole flush instead of one per event
+        yard_diffs = []
+        for event in events:
+            yard_diff = build_yard_diff(
+                event.container_entry, event.event_type, event.details
+            )
+            if yard_diff:
+                yard_diffs.append(yard_diff)
+        schedule_yard_diffs(yard_diffs)
+        self.flushed += len(events)
+        return len(events)
+
+
+# Batch of the current unit of work (shared by all service instances)
+_current_batch: ContextVar[EventBatch | None] = ContextVar(
+    "container_event_batch", default=None
+)
 
 
 class ContainerEventService(BaseService):
@@ -23,6 +78,7 @@ class ContainerEventService(BaseService):
 
     Handles:
     - Event creation with validation
+    - Yard layout diffs for WebSocket clients (see yard_broadcast.py)
     - Timeline queries for containers
     - Initial event generation for existing data
     """
@@ -42,6 +98,38 @@ class ContainerEventService(BaseService):
     # Valid sources
     VALID_SOURCES = ["API", "TELEGRAM_BOT", "EXCEL_IMPORT", "SYSTEM"]
 
+    @contextmanager
+    def batch(self, batch_size: int = EVENT_BATCH_SIZE) -> Iterator[EventBatch]:
+        """
+        Buffer events created inside the block and bulk insert them on exit.
+
+        Use inside the transaction of the unit of work, so events are
+        committed or rolled back together with the rows they describe. If
+        the block raises, buffered events are discarded. Nested blocks join
+        the outer batch. create_event() returns unsaved events while a
+        batch is open; every batch_size events are flushed early.
+
+        Example:
+            with transaction.atomic(), event_service.batch():
+                for entry in entries:
+                    event_service.create_entry_created_event(entry)
+        """
+        current = _current_batch.get()
+        if current is not None:
+            yield current
+            return
+
+        batch = EventBatch(batch_size)
+        token = _current_batch.set(batch)
+        try:
+            yield batch
+            batch.flush()
+        finally:
+            _current_batch.reset(token)
+
+        if batch.flushed:
+            self.logger.info(f"Created {batch.flushed} container events in bulk")
+
     def create_event(
         self,
         container_entry: ContainerEntry,
@@ -63,7 +151,7 @@ class ContainerEventService(BaseService):
             event_time: When the event occurred (defaults to now)
 
         Returns:
-            Created ContainerEvent instance
+            Created ContainerEvent instance (unsaved while a batch() is open)
 
         Raises:
             ValueError: If event_type or source is invalid
@@ -77,7 +165,7 @@ class ContainerEventService(BaseService):
         if event_time is None:
             event_time = timezone.now()
 
-        event = ContainerEvent.objects.create(
+        event = ContainerEvent(
             container_entry=container_entry,
             event_type=event_type,
             event_time=event_time,
@@ -86,6 +174,17 @@ class ContainerEventService(BaseService):
             details=details or {},
         )
 
+        batch = _current_batch.get()
+        if batch is not None:
+            batch.add(event)
+            return event
+
+        event.save()
+
+        yard_diff = build_yard_diff(container_entry, event_type, event.details)
+        if yard_diff:
+            schedule_yard_diff(yard_diff)
+
         self.logger.info(
             f"Created {event_type} event for container "
             f"{container_entry.container.container_number} (entry_id={container_entry.id})"
@@ -109,7 +208,7 @@ class ContainerEventService(BaseService):
         return (
             ContainerEvent.objects.filter(container_entry=container_entry)
             .select_related("performed_by")
-            .order_by("event_time", "created_at")
+            .order_by("event_time", "created_at", "id")
         )
 
     def create_entry_created_event(
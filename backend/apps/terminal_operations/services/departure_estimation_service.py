@@ -0,0 +1,170 @@
+"""
+Departure Estimation Service - Predicts when containers will leave the terminal.
+
+Used by rehandle-aware placement: a container that is expected to leave soon
+should not end up underneath one that stays for weeks.
+
+Estimation order (first match wins):
+1. PreOrder data: entries created from a customer pre-order follow the
+   dwell history of other pre-order entries with the same operation type
+2. Company history: median dwell of the company's recently exited containers
+3. Dwell statistics: median dwell by container status and size
+4. Terminal-wide median dwell, then DEFAULT_DWELL_DAYS
+"""
+
+import statistics
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from apps.core.services.base_service import BaseService
+from apps.terminal_operations.models import ContainerEntry, PreOrder
+
+from .yard_snapshot import container_size_from_iso
+
+
+# How far back exited containers are used for statistics
+HISTORY_WINDOW_DAYS = 180
+
+# Minimum exited containers before a company's own history is trusted
+MIN_COMPANY_SAMPLES = 5
+
+# Fallbacks when there is no history at all
+DEFAULT_DWELL_DAYS = 14.0
+PREORDER_DEFAULT_DWELL_DAYS = 2.0
+
+
+def _dwell_days(entry_time: datetime, exit_date: datetime) -> float:
+    return max((exit_date - entry_time).total_seconds() / 86400, 0.0)
+
+
+class DepartureEstimationService(BaseService):
+    """
+    Estimates expected departure time for containers on the terminal.
+
+    Statistics are loaded lazily with two queries and cached on the instance,
+    so one service object can estimate a whole yard cheaply.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._stats: dict | None = None
+
+    def _load_stats(self) -> dict:
+        """Build median dwell tables from recently exited containers."""
+        if self._stats is not None:
+            return self._stats
+
+        since = timezone.now() - timedelta(days=HISTORY_WINDOW_DAYS)
+
+        by_company = defaultdict(list)
+        by_profile = defaultdict(list)
+        all_dwells = []
+
+        exited = ContainerEntry.objects.filter(
+            exit_date__isnull=False, exit_date__gte=since
+        ).values_list("company_id", "status", "container__iso_type", "entry_time", "exit_date")
+
+        for company_id, status, iso_type, entry_time, exit_date in exited.iterator():
+            days = _dwell_days(entry_time, exit_date)
+            all_dwells.append(days)
+            by_profile[(status, container_size_from_iso(iso_type))].append(days)
+            if company_id:
+                by_company[company_id].append(days)
+
+        by_preorder = defaultdict(list)
+        preorder_exited = PreOrder.objects.filter(
+            matched_entry__exit_date__isnull=False,
+            matched_entry__exit_date__gte=since,
+        ).values_list("operation_type", "matched_entry__entry_time", "matched_entry__exit_date")
+
+        for operation_type, entry_time, exit_date in preorder_exited.iterator():
+            by_preorder[operation_type].append(_dwell_days(entry_time, exit_date))
+
+        self._stats = {
+            "company": {
+                company_id: statistics.median(values)
+                for company_id, values in by_company.items()
+                if len(values) >= MIN_COMPANY_SAMPLES
+            },
+            "profile": {key: statistics.median(values) for key, values in by_profile.items()},
+            "preorder": {key: statistics.median(values) for key, values in by_preorder.items()},
+            "overall": statistics.median(all_dwells) if all_dwells else DEFAULT_DWELL_DAYS,
+        }
+        return self._stats
+
+    def estimate_dwell_days(
+        self,
+        company_id: int | None,
+        status: str,
+        iso_type: str,
+        preorder_operation: str | None = None,
+    ) -> tuple[float, str]:
+        """
+        Estimate total dwell in days for a container.
+
+        Returns:
+            Tuple of (dwell_days, source) where source is one of
+            "preorder", "company", "profile", "overall"
+        """
+        stats = self._load_stats()
+
+        if preorder_operation:
+            return (
+                stats["preorder"].get(preorder_operation, PREORDER_DEFAULT_DWELL_DAYS),
+                "preorder",
+            )
+
+        if company_id in stats["company"]:
+            return stats["company"][company_id], "company"
+
+        profile_key = (status, container_size_from_iso(iso_type))
+        if profile_key in stats["profile"]:
+            return stats["profile"][profile_key], "profile"
+
+        return stats["overall"], "overall"
+
+    def estimate_departure(
+        self,
+        entry_time: datetime,
+        company_id: int | None,
+        status: str,
+        iso_type: str,
+        preorder_operation: str | None = None,
+    ) -> datetime:
+        """
+        Estimate departure time. Containers that already stayed longer than
+        expected are treated as leaving now.
+        """
+        days, _source = self.estimate_dwell_days(
+            company_id, status, iso_type, preorder_operation
+        )
+        return max(entry_time + timedelta(days=days), timezone.now())
+
+    def estimate_for_entry(self, entry: ContainerEntry) -> dict:
+        """Estimate departure for a single entry, with the estimate source."""
+        preorder_operation = (
+            PreOrder.objects.filter(matched_entry=entry)
+            .values_list("operation_type", flat=True)
+            .first()
+        )
+        days, source = self.estimate_dwell_days(
+            entry.company_id, entry.status, entry.container.iso_type, preorder_operation
+        )
+        return {
+            "expected_departure": max(
+                entry.entry_time + timedelta(days=days), timezone.now()
+            ),
+            "expected_dwell_days": round(days, 1),
+            "source": source,
+        }
+
+    def get_active_preorder_operations(self) -> dict:
+        """Map entry_id -> pre-order operation type for entries still on terminal."""
+        return dict(
+            PreOrder.objects.filter(
+                matched_entry__isnull=False,
+                matched_entry__exit_date__isnull=True,
+            ).values_list("matched_entry_id", "operation_type")
+        )
@@ -0,0 +1,125 @@
+"""
+Entry Projection - Batched per-row fields for container entry lists.
+
+List serializers used to compute dwell days and the pending-invoice flag
+per object (a query per row) and to fetch attachments entry by entry.
+with_list_projection() moves all of it into the list query:
+- dwell: DB-computed duration annotation (see DwellAnalyticsService)
+- has_pending_invoice: EXISTS subquery over active on-demand invoice items
+- active_attachments: one prefetch of active FileAttachments with their
+  File, category and uploader
+- crane_operations: one prefetch
+
+A page therefore costs a constant number of queries. The entry_* helpers
+read the projection and fall back to per-object queries for instances that
+were not loaded through it (e.g. right after create/update).
+"""
+
+from datetime import datetime
+
+from django.db.models import (
+    BooleanField,
+    Case,
+    Exists,
+    OuterRef,
+    Prefetch,
+    Q,
+    QuerySet,
+    Value,
+    When,
+)
+
+from apps.core.services.dwell_analytics import DWELL_ANNOTATION, DwellAnalyticsService
+
+
+ENTRY_LIST_SELECT_RELATED = ("container", "recorded_by", "container_owner", "company")
+
+# Invoice statuses meaning the container is billed and expected to leave
+PENDING_INVOICE_STATUSES = ("draft", "finalized", "paid")
+
+ATTACHMENTS_ATTR = "active_attachments"
+PENDING_INVOICE_ANNOTATION = "has_pending_invoice"
+
+
+def active_attachments_queryset() -> QuerySet:
+    """Active attachments in display order, with everything FileSerializer reads."""
+    from apps.files.models import FileAttachment
+
+    return (
+        FileAttachment.objects.filter(file__is_active=True)
+        .select_related("file", "file__file_category", "file__uploaded_by")
+        .order_by("display_order", "created_at")
+    )
+
+
+def with_list_projection(
+    queryset: QuerySet, now: datetime | None = None
+) -> QuerySet:
+    """
+    Add the list projection to a ContainerEntry queryset.
+
+    Args:
+        queryset: ContainerEntry queryset
+        now: Reference time for entries still on terminal (default: now)
+    """
+    from apps.billing.models import OnDemandInvoiceItem
+
+    pending_items = OnDemandInvoiceItem.objects.filter(
+        container_entry=OuterRef("pk"),
+        invoice__status__in=PENDING_INVOICE_STATUSES,
+    )
+    dwell = DwellAnalyticsService(queryset, now=now).dwell_expression()
+
+    return (
+        queryset.select_related(*ENTRY_LIST_SELECT_RELATED)
+        .prefetch_related(
+            "crane_operations",
+            Prefetch(
+                "file_attachments",
+                queryset=active_attachments_queryset(),
+                to_attr=ATTACHMENTS_ATTR,
+            ),
+        )
+        .annotate(
+            **{
+                DWELL_ANNOTATION: dwell,
+                PENDING_INVOICE_ANNOTATION: Case(
+                    When(Q(exit_date__isnull=True) & Exists(pending_items), then=True),
+                    default=Value(False),
+                    output_field=BooleanField(),
+                ),
+            }
+        )
+    )
+
+
+def entry_dwell_days(entry) -> int | None:
+    """Dwell days (floored, at least 1), same as ContainerEntry.dwell_time_days."""
+    if not hasattr(entry, DWELL_ANNOTATION):
+        return entry.dwell_time_days
+    dwell = getattr(entry, DWELL_ANNOTATION)
+    if dwell is None:
+        return None
+    return max(1, dwell.days)
+
+
+def entry_has_pending_invoice(entry) -> bool:
+    """Entry is on terminal and included in an active on-demand invoice."""
+    if hasattr(entry, PENDING_INVOICE_ANNOTATION):
+        return bool(getattr(entry, PENDING_INVOICE_ANNOTATION))
+    if entry.exit_date is not None:
+        return False
+    return entry.on_demand_items.filter(
+        invoice__status__in=PENDING_INVOICE_STATUSES
+    ).exists()
+
+
+def entry_attachments(entry) -> list:
+    """Active attachments of an entry (prefetched, or fetched once and cached)."""
+    if not hasattr(entry, ATTACHMENTS_ATTR):
+        setattr(
+            entry,
+            ATTACHMENTS_ATTR,
+            list(active_attachments_queryset().filter(container_entry=entry)),
+        )
+    return getattr(entry, ATTACHMENTS_ATTR)
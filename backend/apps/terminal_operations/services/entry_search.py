@@ -0,0 +1,209 @@
+"""
+Entry Search - Denormalized search document for container entries.
+
+Every ContainerEntry stores a lowercase `search_document` with all
+searchable text (container number first, then plates, train numbers,
+client, owner, company, cargo, station, location, note and the recording
+user), so a search is a single-column lookup instead of 16 ORed icontains
+predicates over four joins.
+
+Index per backend:
+- PostgreSQL: GIN trigram index (pg_trgm) on search_document, used by
+  ILIKE; matches are ranked by word similarity
+- SQLite: FTS5 table with the trigram tokenizer, kept in sync from Python;
+  matches are ranked by bm25
+Terms shorter than a trigram fall back to icontains on the document.
+
+The document is rebuilt in ContainerEntry.save(). Bulk paths and renames
+of related objects use refresh_search_documents().
+"""
+
+from collections.abc import Iterable
+
+from django.db import connections
+from django.db.models import Case, FloatField, IntegerField, Q, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = "terminal_operations_containerentry_fts"
+
+# Trigram indexes can only serve terms of at least 3 characters
+MIN_INDEXED_TERM_LENGTH = 3
+
+# Local fields feeding the document (save(update_fields=...) outside this set
+# keeps the stored document)
+SEARCH_SOURCE_FIELDS = frozenset(
+    {
+        "container",
+        "transport_number",
+        "exit_transport_number",
+        "entry_train_number",
+        "exit_train_number",
+        "client_name",
+        "container_owner",
+        "company",
+        "cargo_name",
+        "destination_station",
+        "location",
+        "note",
+        "recorded_by",
+    }
+)
+
+SEARCH_SELECT_RELATED = ("container", "container_owner", "company", "recorded_by")
+
+# Best matches first: container number prefix, then relevance, then newest
+SEARCH_ORDERING = ("-search_prefix", "-search_rank", "-entry_time")
+
+
+def build_search_document(entry) -> str:
+    """Lowercase search text of an entry, one field per line."""
+    parts = [
+        entry.container.container_number if entry.container_id else "",
+        entry.transport_number,
+        entry.exit_transport_number,
+        entry.entry_train_number,
+        entry.exit_train_number,
+        entry.client_name,
+        entry.container_owner.name if entry.container_owner_id else "",
+        entry.company.name if entry.company_id else "",
+        entry.cargo_name,
+        entry.destination_station,
+        entry.location,
+        entry.note,
+    ]
+    if entry.recorded_by_id:
+        user = entry.recorded_by
+        parts += [user.username, user.email, user.first_name, user.last_name]
+    return "\n".join(part.strip() for part in parts if part and part.strip()).lower()
+
+
+def _uses_fts(using: str) -> bool:
+    return connections[using].vendor == "sqlite"
+
+
+def _fts_phrase(term: str) -> str:
+    """Quote a term as an FTS5 phrase (substring match with the trigram tokenizer)."""
+    return '"{}"'.format(term.replace('"', '""'))
+
+
+def index_entries(entries: Iterable, using: str = "default") -> None:
+    """Write entries' documents into the FTS table (SQLite only)."""
+    if not _uses_fts(using):
+        return
+    rows = [(entry.pk, entry.search_document) for entry in entries]
+    if not rows:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk, _doc in rows]
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, search_document) VALUES (%s, %s)", rows
+        )
+
+
+def unindex_entry(entry_id: int, using: str = "default") -> None:
+    """Drop an entry from the FTS table (SQLite only)."""
+    if not _uses_fts(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [entry_id])
+
+
+def refresh_search_documents(queryset: QuerySet, batch_size: int = 500) -> int:
+    """
+    Rebuild search documents for a queryset of entries.
+
+    Only entries whose document changed are written (bulk_update + FTS sync).
+
+    Returns:
+        Number of entries updated
+    """
+    model = queryset.model
+    changed_total = 0
+    batch = []
+
+    def flush():
+        model.objects.using(queryset.db).bulk_update(batch, ["search_document"])
+        index_entries(batch, using=queryset.db)
+
+    for entry in queryset.select_related(*SEARCH_SELECT_RELATED).iterator(
+        chunk_size=batch_size
+    ):
+        document = build_search_document(entry)
+        if document == entry.search_document:
+            continue
+        entry.search_document = document
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            flush()
+            changed_total += len(batch)
+            batch = []
+
+    if batch:
+        flush()
+        changed_total += len(batch)
+    return changed_total
+
+
+def search_entries(
+    queryset: QuerySet, text: str, split_terms: bool = False
+) -> QuerySet:
+    """
+    Filter entries by search text and annotate match quality.
+
+    Args:
+        queryset: ContainerEntry queryset
+        text: Search text
+        split_terms: Match every whitespace-separated term anywhere (DRF
+            SearchFilter semantics) instead of the text as one phrase
+
+    Returns:
+        Filtered queryset annotated with search_prefix (1 if the container
+        number starts with the first term) and search_rank (relevance, higher
+        is better); order with SEARCH_ORDERING
+    """
+    text = " ".join(text.split()).lower()
+    terms = text.split(" ") if split_terms else [text]
+    terms = [term for term in terms if term]
+    if not terms:
+        return queryset
+
+    indexed = [term for term in terms if len(term) >= MIN_INDEXED_TERM_LENGTH]
+    short = [term for term in terms if len(term) < MIN_INDEXED_TERM_LENGTH]
+
+    for term in short:
+        queryset = queryset.filter(search_document__contains=term)
+
+    table = queryset.model._meta.db_table
+    rank = Value(0.0, output_field=FloatField())
+    if indexed and _uses_fts(queryset.db):
+        match = " AND ".join(_fts_phrase(term) for term in indexed)
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+            [match],
+            output_field=FloatField(),
+        )
+    elif indexed:
+        for term in indexed:
+            queryset = queryset.filter(search_document__contains=term)
+        if connections[queryset.db].vendor == "postgresql":
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            rank = TrigramWordSimilarity(indexed[0], "search_document")
+
+    return queryset.annotate(
+        search_prefix=Case(
+            When(Q(search_document__startswith=terms[0]), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        search_rank=rank,
+    )
@@ -13,6 +13,11 @@ from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from apps.core.services import BaseService
+from apps.core.services.dwell_analytics import (
+    DwellAnalyticsService,
+    dwell_days,
+    dwell_hours,
+)
 from apps.vehicles.models import VehicleEntry
 
 from ..models import ContainerEntry, PreOrder
@@ -34,6 +39,7 @@ class ExecutiveDashboardService(BaseService):
     - Top customers by revenue and container count
     - Throughput metrics (entries/exits)
     - Vehicle metrics
+    - Container dwell time
     - Pre-order statistics
     """
 
@@ -56,6 +62,7 @@ class ExecutiveDashboardService(BaseService):
         top_customers = self._get_top_customers(limit=10)
         throughput = self._get_throughput_metrics(days)
         vehicle_metrics = self._get_vehicle_metrics()
+        container_dwell = self._get_container_dwell()
         preorder_stats = self._get_preorder_stats()
 
         self.logger.info("Generated executive dashboard metrics")
@@ -67,6 +74,7 @@ class ExecutiveDashboardService(BaseService):
             "top_customers": top_customers,
             "throughput": throughput,
             "vehicle_metrics": vehicle_metrics,
+            "container_dwell": container_dwell,
             "preorder_stats": preorder_stats,
             "generated_at": now.isoformat(),
         }
@@ -372,23 +380,12 @@ class ExecutiveDashboardService(BaseService):
 
         # Average dwell time (last 30 days)
         thirty_days_ago = now - timedelta(days=30)
-        exited_vehicles = VehicleEntry.objects.filter(
-            exit_time__isnull=False,
-            entry_time__isnull=False,
-            exit_time__gte=thirty_days_ago,
-        )
-
-        total_dwell_seconds = 0
-        count = 0
-        for entry in exited_vehicles:
-            if entry.entry_time:
-                dwell = (entry.exit_time - entry.entry_time).total_seconds()
-                total_dwell_seconds += dwell
-                count += 1
-
-        avg_dwell_hours = (
-            round(total_dwell_seconds / count / 3600, 1) if count > 0 else 0
+        analytics = DwellAnalyticsService(
+            VehicleEntry.objects.filter(exit_time__gte=thirty_days_ago),
+            end_field="exit_time",
+            now=now,
         )
+        avg_dwell_hours = dwell_hours(analytics.summary()["average"]) or 0
 
         return {
             "total_on_terminal": total_on_terminal,
@@ -396,6 +393,22 @@ class ExecutiveDashboardService(BaseService):
             "by_type": by_type,
         }
 
+    def _get_container_dwell(self) -> dict:
+        """Dwell statistics of containers currently on terminal (in the database)."""
+        analytics = DwellAnalyticsService(
+            ContainerEntry.objects.filter(exit_date__isnull=True)
+        )
+        summary = analytics.summary()
+        percentiles = analytics.percentiles((0.5, 0.9))
+        average = summary["average"]
+
+        return {
+            "average_days": round(average.total_seconds() / 86400, 1) if average else 0,
+            "median_days": dwell_days(percentiles[0.5]),
+            "p90_days": dwell_days(percentiles[0.9]),
+            "longest_days": dwell_days(summary["maximum"]),
+        }
+
     def _get_preorder_stats(self) -> dict:
         """Get pre-order statistics."""
         today = timezone.now().date()
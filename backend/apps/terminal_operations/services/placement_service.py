@@ -10,10 +10,13 @@ from django.db import IntegrityError, transaction
 from django.db.models import Count
 
 from apps.core.exceptions import BusinessLogicError
+from apps.core.metrics import timed
 from apps.core.services.base_service import BaseService
 from apps.terminal_operations.models import ContainerEntry, ContainerPosition, WorkOrder
 
 from .container_event_service import ContainerEventService
+from .yard_broadcast import get_yard_version
+from .yard_geometry import YardGeometry, get_yard_geometry
 
 
 class PositionOccupiedError(BusinessLogicError):
@@ -105,36 +108,35 @@ class RowSegregationError(BusinessLogicError):
     """Raised when container is placed in wrong row for its size."""
 
     def __init__(self, coordinate: str, container_size: str, allowed_rows: list):
+        if allowed_rows:
+            rows_text = f"рядах {allowed_rows[0]}-{allowed_rows[-1]}"
+        else:
+            rows_text = "другой зоне (в этой зоне нет рядов для такого размера)"
         super().__init__(
-            message=f"Контейнер {container_size} должен быть размещён в рядах {allowed_rows[0]}-{allowed_rows[-1]}. "
+            message=f"Контейнер {container_size} должен быть размещён в {rows_text}. "
             f"Правило TOS: разные размеры контейнеров в разных рядах.",
             error_code="ROW_SEGREGATION_VIOLATION",
             details={
                 "coordinate": coordinate,
                 "container_size": container_size,
                 "allowed_rows": allowed_rows,
-                "rule": "40ft containers in rows 1-5, 20ft containers in rows 6-10",
+                "rule": "Container sizes are segregated by row (see yard blocks configuration)",
             },
         )
 
 
-# Terminal configuration constants
-# Currently only Zone A for testing
-ZONES = ["A"]
-ALL_ZONES = ["A", "B", "C", "D", "E"]  # For future expansion
-MAX_ROWS = 10
-MAX_BAYS = 10
-MAX_TIERS = 4
-
-# Row segregation by container size (TOS best practice)
-# Separating sizes prevents corner post misalignment issues
-ROWS_40FT = [1, 2, 3, 4, 5]  # Rows 1-5 for 40ft containers
-ROWS_20FT = [6, 7, 8, 9, 10]  # Rows 6-10 for 20ft containers
+# Yard geometry (zones, rows, bays, tiers, row segregation by size) is
+# configured with YardBlock records - see yard_geometry.py
 
 # Optimal stack height before spreading to next bay
 # Industry standard: stack to 3 tiers for stability, then spread
 PREFERRED_STACK_HEIGHT = 3
 
+# Placement strategies for suggest_position
+# - sequential: fill row by row, bay by bay (consolidation-first)
+# - rehandle: score stacks by expected departures to minimize shuffles at exit
+PLACEMENT_STRATEGIES = ["sequential", "rehandle"]
+
 
 def format_coordinate(
     zone: str, row: int, bay: int, tier: int, sub_slot: str = "A"
@@ -160,13 +162,25 @@ class PlacementService(BaseService):
             self._event_service = ContainerEventService()
         return self._event_service
 
+    @property
+    def geometry(self) -> YardGeometry:
+        if not hasattr(self, '_geometry'):
+            self._geometry = get_yard_geometry()
+        return self._geometry
+
+    @timed()
     def get_layout(self) -> dict:
         """
         Get complete terminal layout data for 3D visualization.
 
         Returns:
-            dict with zones, dimensions, containers (placed + pending), and statistics
+            dict with zones, dimensions, containers (placed + pending), statistics
+            and the yard version to resume WebSocket diffs from (ws/yard/?since=)
         """
+        # Read version first: diffs published while building the layout are
+        # replayed by the client (diffs are idempotent)
+        version = get_yard_version()
+
         # Get all containers currently on terminal with positions
         entries_with_positions = (
             ContainerEntry.objects.filter(exit_date__isnull=True)
@@ -249,19 +263,22 @@ class PlacementService(BaseService):
         stats = self._calculate_stats()
 
         return {
-            "zones": ZONES,
+            "zones": self.geometry.zones,
             "dimensions": {
-                "max_rows": MAX_ROWS,
-                "max_bays": MAX_BAYS,
-                "max_tiers": MAX_TIERS,
+                "max_rows": self.geometry.max_rows,
+                "max_bays": self.geometry.max_bays,
+                "max_tiers": self.geometry.max_tiers,
             },
+            "blocks": self.geometry.to_dict()["blocks"],
             "containers": containers,
             "stats": stats,
+            "version": version,
         }
 
     def _calculate_stats(self) -> dict:
-        """Calculate terminal occupancy statistics."""
-        total_capacity = len(ZONES) * MAX_ROWS * MAX_BAYS * MAX_TIERS
+        """Calculate terminal occupancy statistics (capacity from geometry tables)."""
+        geometry = self.geometry
+        total_capacity = geometry.total_capacity
 
         # Count positions by zone
         zone_counts = (
@@ -271,15 +288,16 @@ class PlacementService(BaseService):
         )
         zone_occupied = {item["zone"]: item["count"] for item in zone_counts}
 
-        total_occupied = ContainerPosition.objects.count()
-        zone_capacity = MAX_ROWS * MAX_BAYS * MAX_TIERS
+        total_occupied = sum(zone_occupied.values())
 
         by_zone = {}
-        for zone in ZONES:
+        for zone in geometry.zones:
             occupied = zone_occupied.get(zone, 0)
             by_zone[zone] = {
+                "capacity": geometry.zone_capacity[zone],
                 "occupied": occupied,
-                "available": zone_capacity - occupied,
+                "available": geometry.zone_capacity[zone] - occupied,
+                "reefer_plugs": geometry.zone_reefer_plugs[zone],
             }
 
         return {
@@ -289,23 +307,29 @@ class PlacementService(BaseService):
             "by_zone": by_zone,
         }
 
+    @timed()
     def suggest_position(
         self,
         container_entry_id: int,
         zone_preference: Optional[str] = None,
+        strategy: str = "sequential",
     ) -> dict:
         """
         Auto-suggest optimal position for a container.
 
-        Algorithm (simple greedy):
+        Algorithm (simple greedy, strategy="sequential"):
         1. If zone preference given, prioritize that zone
         2. Otherwise, find zone with most available ground-level slots
         3. Prefer tier 1 (ground level) for stability
         4. Fill sequentially (row by row, bay by bay)
 
+        With strategy="rehandle" every legal slot is scored by expected
+        departures instead (see YardRehandleService).
+
         Args:
             container_entry_id: ContainerEntry to place
             zone_preference: Optional preferred zone (A-E)
+            strategy: "sequential" (default) or "rehandle"
 
         Returns:
             dict with suggested_position, reason, and alternatives
@@ -332,6 +356,15 @@ class PlacementService(BaseService):
                 entry.position.coordinate_string,
             )
 
+        if strategy not in PLACEMENT_STRATEGIES:
+            raise BusinessLogicError(
+                message=f"Недопустимая стратегия: {strategy}. Допустимые: {', '.join(PLACEMENT_STRATEGIES)}",
+                error_code="INVALID_PLACEMENT_STRATEGY",
+            )
+
+        if strategy == "rehandle":
+            return self._suggest_by_rehandle_score(entry, zone_preference)
+
         # Get container size for size-aware placement
         container_size = self._get_container_size(entry.container.iso_type)
 
@@ -371,11 +404,57 @@ class PlacementService(BaseService):
             ],
         }
 
-    def _get_rows_for_size(self, container_size: str) -> list:
-        """Get allowed rows for a container size based on row segregation rules."""
-        if container_size in ("40ft", "45ft"):
-            return ROWS_40FT
-        return ROWS_20FT
+    def _suggest_by_rehandle_score(
+        self,
+        entry: ContainerEntry,
+        zone_preference: str | None = None,
+    ) -> dict:
+        """
+        Suggest position by rehandle score against an in-memory yard snapshot.
+
+        Prefers stacks where the newcomer is expected to leave before every
+        container below it. Response also carries the departure estimate and
+        expected rehandles for each candidate.
+        """
+        from .yard_rehandle_service import YardRehandleService
+
+        rehandle_service = YardRehandleService()
+        snapshot = rehandle_service.load_snapshot()
+        ranked, estimate = rehandle_service.score_positions(
+            entry, snapshot, zone_preference=zone_preference, limit=4
+        )
+        if not ranked:
+            raise NoAvailablePositionsError(zone_preference)
+
+        best = ranked[0]
+        if best.expected_rehandles:
+            reason = (
+                f"Ряд {best.row}, ярус {best.tier}: ожидается перестановок — "
+                f"{best.expected_rehandles} (безопасных стеков нет)"
+            )
+        elif best.tier == 1:
+            reason = f"Ряд {best.row}, ярус 1: новый стек без перестановок"
+        else:
+            reason = (
+                f"Ряд {best.row}, ярус {best.tier}: контейнер уедет раньше "
+                f"нижних, перестановки не ожидаются"
+            )
+
+        return {
+            "suggested_position": best.to_dict(),
+            "reason": reason,
+            "alternatives": [candidate.to_dict() for candidate in ranked[1:]],
+            "strategy": "rehandle",
+            "departure_estimate": {
+                "expected_departure": estimate["expected_departure"].isoformat(),
+                "expected_dwell_days": estimate["expected_dwell_days"],
+                "source": estimate["source"],
+            },
+        }
+
+    def _get_rows_for_size(self, zone: str, container_size: str) -> list:
+        """Get allowed rows of a zone for a container size (row segregation)."""
+        return self.geometry.rows_for_size(zone, container_size)
 
     def _get_sub_slots_for_size(self, container_size: str) -> list:
         """Get allowed sub-slots for a container size.
@@ -403,6 +482,7 @@ class PlacementService(BaseService):
         5. Within a row, fill bay by bay with stacking
 
         This prevents random spreading and ensures efficient space usage.
+        Occupancy is loaded once, so the scan costs one query for any yard size.
 
         Args:
             zone_preference: Optional preferred zone (A-E)
@@ -414,43 +494,42 @@ class PlacementService(BaseService):
         zones = (
             [zone_preference] if zone_preference else self._get_zones_by_availability()
         )
-        allowed_rows = self._get_rows_for_size(container_size)
         allowed_slots = self._get_sub_slots_for_size(container_size)
+        occupied = self._get_occupied_coordinates()
 
         for zone in zones:
             # Strategy: Fill bay-by-bay, row-by-row with stacking
             # This consolidates containers instead of spreading them
-
-            for row in allowed_rows:
-                for bay in range(1, MAX_BAYS + 1):
-                    for sub_slot in allowed_slots:
-                        # Try to stack on existing containers first (up to PREFERRED_STACK_HEIGHT)
-                        for tier in range(1, PREFERRED_STACK_HEIGHT + 1):
-                            if self._is_position_available(
-                                zone, row, bay, tier, sub_slot
-                            ):
-                                if tier == 1 or self._has_support_below(
-                                    zone, row, bay, tier, sub_slot
-                                ):
-                                    return (zone, row, bay, tier, sub_slot)
-                                # If tier > 1 and no support, break to next bay/slot
-                                break
+            bays = list(self.geometry.iter_bays(zone, container_size))
+
+            for _zone, row, bay in bays:
+                max_tiers = self.geometry.row_config(zone, row).max_tiers
+                for sub_slot in allowed_slots:
+                    # Try to stack on existing containers first (up to PREFERRED_STACK_HEIGHT)
+                    for tier in range(1, min(PREFERRED_STACK_HEIGHT, max_tiers) + 1):
+                        if (zone, row, bay, tier, sub_slot) not in occupied:
+                            if tier == 1 or (zone, row, bay, tier - 1, sub_slot) in occupied:
+                                return (zone, row, bay, tier, sub_slot)
+                            # If tier > 1 and no support, break to next bay/slot
+                            break
 
             # Second pass: fill remaining tiers (above PREFERRED_STACK_HEIGHT) if needed
-            for row in allowed_rows:
-                for bay in range(1, MAX_BAYS + 1):
-                    for sub_slot in allowed_slots:
-                        for tier in range(PREFERRED_STACK_HEIGHT + 1, MAX_TIERS + 1):
-                            if self._is_position_available(
-                                zone, row, bay, tier, sub_slot
-                            ):
-                                if self._has_support_below(
-                                    zone, row, bay, tier, sub_slot
-                                ):
-                                    return (zone, row, bay, tier, sub_slot)
+            for _zone, row, bay in bays:
+                max_tiers = self.geometry.row_config(zone, row).max_tiers
+                for sub_slot in allowed_slots:
+                    for tier in range(PREFERRED_STACK_HEIGHT + 1, max_tiers + 1):
+                        if (zone, row, bay, tier, sub_slot) not in occupied:
+                            if (zone, row, bay, tier - 1, sub_slot) in occupied:
+                                return (zone, row, bay, tier, sub_slot)
 
         return None
 
+    def _get_occupied_coordinates(self) -> set:
+        """All occupied (zone, row, bay, tier, sub_slot) tuples in one query."""
+        return set(
+            ContainerPosition.objects.values_list("zone", "row", "bay", "tier", "sub_slot")
+        )
+
     def _get_zones_by_availability(self) -> list:
         """Get zones ordered by available ground-level slots (most available first)."""
         zone_usage = (
@@ -460,10 +539,10 @@ class PlacementService(BaseService):
         )
         usage_map = {item["zone"]: item["used"] for item in zone_usage}
 
-        # Sort zones by available ground slots
+        # Sort zones by available ground slots (precomputed per zone)
         return sorted(
-            ZONES,
-            key=lambda z: usage_map.get(z, 0),
+            self.geometry.zones,
+            key=lambda z: -(self.geometry.zone_ground_slots[z] - usage_map.get(z, 0)),
         )
 
     def _find_alternatives(
@@ -478,31 +557,25 @@ class PlacementService(BaseService):
         Uses same size-aware row segregation and sub-slot logic as main algorithm.
         """
         alternatives = []
-        primary_zone, primary_row, primary_bay, primary_tier, primary_slot = primary
-        allowed_rows = self._get_rows_for_size(container_size)
+        primary_zone = primary[0]
         allowed_slots = self._get_sub_slots_for_size(container_size)
+        occupied = self._get_occupied_coordinates()
 
         # Look for positions in same zone first, then other zones
-        zones = [primary_zone] + [z for z in ZONES if z != primary_zone]
+        zones = [primary_zone] + [z for z in self.geometry.zones if z != primary_zone]
 
         for zone in zones:
-            for row in allowed_rows:
-                for bay in range(1, MAX_BAYS + 1):
-                    for sub_slot in allowed_slots:
-                        for tier in range(1, MAX_TIERS + 1):
-                            if (zone, row, bay, tier, sub_slot) == primary:
-                                continue
-                            if self._is_position_available(
-                                zone, row, bay, tier, sub_slot
-                            ):
-                                if tier == 1 or self._has_support_below(
-                                    zone, row, bay, tier, sub_slot
-                                ):
-                                    alternatives.append(
-                                        (zone, row, bay, tier, sub_slot)
-                                    )
-                                    if len(alternatives) >= limit:
-                                        return alternatives
+            for _zone, row, bay in self.geometry.iter_bays(zone, container_size):
+                max_tiers = self.geometry.row_config(zone, row).max_tiers
+                for sub_slot in allowed_slots:
+                    for tier in range(1, max_tiers + 1):
+                        if (zone, row, bay, tier, sub_slot) == primary:
+                            continue
+                        if (zone, row, bay, tier, sub_slot) not in occupied:
+                            if tier == 1 or (zone, row, bay, tier - 1, sub_slot) in occupied:
+                                alternatives.append((zone, row, bay, tier, sub_slot))
+                                if len(alternatives) >= limit:
+                                    return alternatives
 
         return alternatives
 
@@ -516,10 +589,9 @@ class PlacementService(BaseService):
     ) -> str:
         """Build human-readable reason for suggestion."""
         # Determine row area name
-        if container_size in ("40ft", "45ft"):
-            area_name = "зона 40ft (ряды 1-5)"
-        else:
-            area_name = "зона 20ft (ряды 6-10)"
+        rows = self._get_rows_for_size(zone, container_size)
+        size_label = "40ft" if container_size in ("40ft", "45ft") else "20ft"
+        area_name = f"зона {size_label} (ряды {rows[0]}-{rows[-1]})"
 
         if zone_preference:
             if tier == 1:
@@ -619,14 +691,14 @@ class PlacementService(BaseService):
         """
         Validate that container is placed in the correct row area for its size.
 
-        TOS Rule: Row segregation prevents mixing 20ft and 40ft containers
-        - Rows 1-5: 40ft containers only
-        - Rows 6-10: 20ft containers only
+        TOS Rule: Row segregation prevents mixing 20ft and 40ft containers.
+        Each yard block is configured for one size class (default Zone A:
+        rows 1-5 for 40ft/45ft, rows 6-10 for 20ft).
 
         This prevents corner post misalignment issues when stacking.
         """
         container_size = self._get_container_size(iso_type)
-        allowed_rows = self._get_rows_for_size(container_size)
+        allowed_rows = self._get_rows_for_size(zone, container_size)
         coordinate = format_coordinate(zone, row, bay, tier)
 
         if row not in allowed_rows:
@@ -696,6 +768,7 @@ class PlacementService(BaseService):
             raise WeightDistributionError(coordinate)
 
     @transaction.atomic
+    @timed()
     def assign_position(
         self,
         container_entry_id: int,
@@ -761,7 +834,7 @@ class PlacementService(BaseService):
             raise NoSupportError(coordinate)
 
         # TOS Standard Rules
-        # Rule 0: Row segregation (40ft in rows 1-5, 20ft in rows 6-10)
+        # Rule 0: Row segregation (size class of the yard block)
         self._validate_row_segregation(entry.container.iso_type, zone, row, bay, tier)
 
         # Rule 1: Size compatibility (40ft cannot be placed on 20ft)
@@ -823,28 +896,32 @@ class PlacementService(BaseService):
                 message=f"Недопустимый слот: {sub_slot}. Допустимые: A, B",
                 error_code="INVALID_SUB_SLOT",
             )
-        if zone not in ZONES:
+        geometry = self.geometry
+        if zone not in geometry.zones:
             raise BusinessLogicError(
-                message=f"Недопустимая зона: {zone}. Допустимые: {', '.join(ZONES)}",
+                message=f"Недопустимая зона: {zone}. Допустимые: {', '.join(geometry.zones)}",
                 error_code="INVALID_ZONE",
             )
-        if not 1 <= row <= MAX_ROWS:
+        row_config = geometry.row_config(zone, row)
+        if row_config is None:
+            rows = geometry.rows(zone)
             raise BusinessLogicError(
-                message=f"Недопустимый ряд: {row}. Допустимые: 1-{MAX_ROWS}",
+                message=f"Недопустимый ряд: {row}. Допустимые: {rows[0]}-{rows[-1]}",
                 error_code="INVALID_ROW",
             )
-        if not 1 <= bay <= MAX_BAYS:
+        if not 1 <= bay <= row_config.bays:
             raise BusinessLogicError(
-                message=f"Недопустимый отсек: {bay}. Допустимые: 1-{MAX_BAYS}",
+                message=f"Недопустимый отсек: {bay}. Допустимые: 1-{row_config.bays}",
                 error_code="INVALID_BAY",
             )
-        if not 1 <= tier <= MAX_TIERS:
+        if not 1 <= tier <= row_config.max_tiers:
             raise BusinessLogicError(
-                message=f"Недопустимый ярус: {tier}. Допустимые: 1-{MAX_TIERS}",
+                message=f"Недопустимый ярус: {tier}. Допустимые: 1-{row_config.max_tiers}",
                 error_code="INVALID_TIER",
             )
 
     @transaction.atomic
+    @timed()
     def move_container(
         self,
         position_id: int,
@@ -852,6 +929,7 @@ class PlacementService(BaseService):
         new_row: int,
         new_bay: int,
         new_tier: int,
+        new_sub_slot: str | None = None,
     ) -> ContainerPosition:
         """
         Move a container to a new position.
@@ -862,11 +940,11 @@ class PlacementService(BaseService):
             new_row: New row number
             new_bay: New bay number
             new_tier: New tier level
+            new_sub_slot: New sub-slot (defaults to the current sub-slot)
 
         Returns:
             Updated ContainerPosition
         """
-        self._validate_coordinates(new_zone, new_row, new_bay, new_tier)
 
         try:
             position = ContainerPosition.objects.select_related(
@@ -878,14 +956,30 @@ class PlacementService(BaseService):
                 error_code="POSITION_NOT_FOUND",
             )
 
+        if new_sub_slot is None:
+            new_sub_slot = position.sub_slot
+        self._validate_coordinates(new_zone, new_row, new_bay, new_tier, new_sub_slot)
+
+        container_size = self._get_container_size(
+            position.container_entry.container.iso_type
+        )
+        if container_size in ("40ft", "45ft") and new_sub_slot != "A":
+            raise BusinessLogicError(
+                message="40ft/45ft контейнеры должны использовать слот A (занимают весь отсек)",
+                error_code="INVALID_SUB_SLOT_FOR_SIZE",
+            )
+
         # Check if new position is available (ignore current position)
-        new_coordinate = format_coordinate(new_zone, new_row, new_bay, new_tier)
+        new_coordinate = format_coordinate(
+            new_zone, new_row, new_bay, new_tier, new_sub_slot
+        )
         if (
             ContainerPosition.objects.filter(
                 zone=new_zone,
                 row=new_row,
                 bay=new_bay,
                 tier=new_tier,
+                sub_slot=new_sub_slot,
             )
             .exclude(id=position_id)
             .exists()
@@ -894,12 +988,12 @@ class PlacementService(BaseService):
 
         # Check stacking rules
         if new_tier > 1 and not self._has_support_below(
-            new_zone, new_row, new_bay, new_tier
+            new_zone, new_row, new_bay, new_tier, new_sub_slot
         ):
             raise NoSupportError(new_coordinate)
 
         # TOS Standard Rules
-        # Rule 0: Row segregation (40ft in rows 1-5, 20ft in rows 6-10)
+        # Rule 0: Row segregation (size class of the yard block)
         self._validate_row_segregation(
             position.container_entry.container.iso_type,
             new_zone,
@@ -938,6 +1032,7 @@ class PlacementService(BaseService):
         position.row = new_row
         position.bay = new_bay
         position.tier = new_tier
+        position.sub_slot = new_sub_slot
         position.save()
 
         # Update ContainerEntry.location
@@ -961,7 +1056,7 @@ class PlacementService(BaseService):
             row=new_row,
             bay=new_bay,
             tier=new_tier,
-            sub_slot=old_sub_slot,  # sub_slot doesn't change in move
+            sub_slot=new_sub_slot,
             auto_assigned=False,
         )
 
@@ -1037,53 +1132,46 @@ class PlacementService(BaseService):
             tier: Filter by tier (optional)
             limit: Max results to return
             container_size: Filter by container size ("20ft", "40ft", "45ft")
-                           - 40ft/45ft: Only rows 1-5, sub_slot A only
-                           - 20ft: Only rows 6-10, sub_slots A and B
+                           - 40ft/45ft: Only 40ft rows, sub_slot A only
+                           - 20ft: Only 20ft rows, sub_slots A and B
 
         Returns:
             List of available positions
         """
         # Get all occupied coordinates (including sub_slot)
-        occupied = set(
-            ContainerPosition.objects.values_list("zone", "row", "bay", "tier", "sub_slot")
-        )
+        occupied = self._get_occupied_coordinates()
 
+        geometry = self.geometry
         available = []
-        zones_to_check = [zone] if zone else ZONES
-        tiers_to_check = [tier] if tier else range(1, MAX_TIERS + 1)
+        zones_to_check = [zone] if zone else geometry.zones
+        tiers_to_check = [tier] if tier else range(1, geometry.max_tiers + 1)
 
-        # Determine allowed rows and sub-slots based on container size
-        if container_size in ("40ft", "45ft"):
-            allowed_rows = ROWS_40FT  # rows 1-5
-            allowed_slots = ["A"]  # 40ft uses full bay
-        elif container_size == "20ft":
-            allowed_rows = ROWS_20FT  # rows 6-10
-            allowed_slots = ["A", "B"]  # 20ft can share bay
-        else:
-            # No size filter - return all rows but only slot A for simplicity
-            allowed_rows = list(range(1, MAX_ROWS + 1))
-            allowed_slots = ["A"]
+        # Determine allowed sub-slots based on container size
+        # (no size filter - all rows but only slot A for simplicity)
+        # (20ft containers can share a bay, 40ft uses the full bay)
+        allowed_slots = ["A", "B"] if container_size == "20ft" else ["A"]
 
         for z in zones_to_check:
             for t in tiers_to_check:
-                for r in allowed_rows:
-                    for b in range(1, MAX_BAYS + 1):
-                        for sub_slot in allowed_slots:
-                            if (z, r, b, t, sub_slot) not in occupied:
-                                # Check stacking rules (with sub_slot)
-                                if t == 1 or (z, r, b, t - 1, sub_slot) in occupied:
-                                    available.append(
-                                        {
-                                            "zone": z,
-                                            "row": r,
-                                            "bay": b,
-                                            "tier": t,
-                                            "sub_slot": sub_slot,
-                                            "coordinate": format_coordinate(z, r, b, t, sub_slot),
-                                        }
-                                    )
-                                    if len(available) >= limit:
-                                        return available
+                for _z, r, b in geometry.iter_bays(z, container_size):
+                    if t > geometry.row_config(z, r).max_tiers:
+                        continue
+                    for sub_slot in allowed_slots:
+                        if (z, r, b, t, sub_slot) not in occupied:
+                            # Check stacking rules (with sub_slot)
+                            if t == 1 or (z, r, b, t - 1, sub_slot) in occupied:
+                                available.append(
+                                    {
+                                        "zone": z,
+                                        "row": r,
+                                        "bay": b,
+                                        "tier": t,
+                                        "sub_slot": sub_slot,
+                                        "coordinate": format_coordinate(z, r, b, t, sub_slot),
+                                    }
+                                )
+                                if len(available) >= limit:
+                                    return available
 
         return available
 
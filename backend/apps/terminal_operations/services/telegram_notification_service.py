@@ -3,14 +3,14 @@ Service for sending Telegram notifications about container entries to groups.
 Uses best-effort approach: logs errors but never raises exceptions.
 """
 
-from aiogram import Bot
-from aiogram.types import FSInputFile, InputMediaPhoto
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 
 from apps.core.services.base_service import BaseService
+from apps.core.services.telegram_client import get_telegram_client
 from apps.files.models import FileAttachment
+from apps.files.telegram import send_photo_album
 from apps.terminal_operations.models import ContainerEntry
 
 
@@ -29,6 +29,13 @@ class TelegramNotificationService(BaseService):
         super().__init__()
         self.bot_token = getattr(settings, "TELEGRAM_BOT_TOKEN", None)
 
+    async def _send_text(self, chat_id, text: str) -> None:
+        """Send an HTML message through the process-wide Telegram client."""
+        await get_telegram_client().call(
+            chat_id,
+            lambda bot: bot.send_message(chat_id=chat_id, text=text, parse_mode="HTML"),
+        )
+
     async def notify_group_about_entry(self, entry: ContainerEntry) -> bool:
         """
         Send notification to appropriate Telegram group about new container entry.
@@ -213,6 +220,8 @@ class TelegramNotificationService(BaseService):
     ) -> tuple[bool, list[int]]:
         """
         Send photos as media album to Telegram group.
+        Uses stored Telegram file_ids, uploading from disk only when missing
+        or rejected (see apps.files.telegram).
 
         Args:
             chat_id: Telegram group chat ID
@@ -222,45 +231,20 @@ class TelegramNotificationService(BaseService):
         Returns:
             tuple[bool, list[int]]: (success, list of sent message IDs)
         """
-        bot = None
         try:
             # Check bot token
             if not self.bot_token:
                 self.logger.error("TELEGRAM_BOT_TOKEN not configured in settings")
                 return False, []
 
-            # Create bot instance
-            bot = Bot(token=self.bot_token)
-
-            # Prepare media group
-            media_group = []
-            for idx, attachment in enumerate(photos):
-                try:
-                    # Get file path
-                    file_path = attachment.file.file.path
-
-                    # Create input file
-                    input_file = FSInputFile(file_path)
-
-                    # First photo gets caption, others don't
-                    if idx == 0:
-                        media_group.append(
-                            InputMediaPhoto(media=input_file, caption=caption)
-                        )
-                    else:
-                        media_group.append(InputMediaPhoto(media=input_file))
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to prepare photo {attachment.id}: {e}")
-                    continue
-
-            # Check if we have any photos to send
-            if not media_group:
-                self.logger.error("No valid photos to send after preparation")
-                return False, []
-
-            # Send media group
-            sent_messages = await bot.send_media_group(chat_id=chat_id, media=media_group)
+            # Photos are sent by Telegram file_id when known (no re-upload);
+            # each photo counts towards the group's rate limit
+            files = [attachment.file for attachment in photos]
+            sent_messages = await get_telegram_client().call(
+                chat_id,
+                lambda bot: send_photo_album(bot, chat_id, files, caption),
+                weight=len(files),
+            )
 
             return True, [msg.message_id for msg in sent_messages]
 
@@ -270,14 +254,6 @@ class TelegramNotificationService(BaseService):
             )
             return False, []
 
-        finally:
-            # Clean up bot session
-            if bot:
-                try:
-                    await bot.session.close()
-                except Exception as e:
-                    self.logger.debug(f"Error closing bot session: {e}")
-
     async def _store_notification_log(
         self, entry: ContainerEntry, chat_id: str, message_ids: list[int]
     ) -> None:
@@ -332,7 +308,6 @@ class TelegramNotificationService(BaseService):
         Returns:
             bool: True if notification sent successfully, False otherwise
         """
-        bot = None
         try:
             # Check if customer exists and has telegram_user_id
             customer = await sync_to_async(lambda: vehicle_entry.customer)()
@@ -370,11 +345,8 @@ class TelegramNotificationService(BaseService):
                 plate=vehicle_entry.license_plate, time=entry_time_str
             )
 
-            # Create bot and send message
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(
-                chat_id=telegram_user_id, text=message, parse_mode="HTML"
-            )
+            # Send through the shared client
+            await self._send_text(telegram_user_id, message)
 
             self.logger.info(
                 f"VehicleEntry {vehicle_entry.id}: Sent entry notification to customer "
@@ -389,13 +361,6 @@ class TelegramNotificationService(BaseService):
             )
             return False
 
-        finally:
-            if bot:
-                try:
-                    await bot.session.close()
-                except Exception:
-                    pass
-
     async def notify_customer_vehicle_exited(self, vehicle_entry) -> bool:
         """
         Send notification to customer when their vehicle exits the terminal.
@@ -407,7 +372,6 @@ class TelegramNotificationService(BaseService):
         Returns:
             bool: True if notification sent successfully, False otherwise
         """
-        bot = None
         try:
             # Check if customer exists and has telegram_user_id
             customer = await sync_to_async(lambda: vehicle_entry.customer)()
@@ -434,10 +398,7 @@ class TelegramNotificationService(BaseService):
                 plate=vehicle_entry.license_plate, time=exit_time_str
             )
 
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(
-                chat_id=telegram_user_id, text=message, parse_mode="HTML"
-            )
+            await self._send_text(telegram_user_id, message)
 
             self.logger.info(
                 f"VehicleEntry {vehicle_entry.id}: Sent exit notification to customer "
@@ -453,13 +414,6 @@ class TelegramNotificationService(BaseService):
             )
             return False
 
-        finally:
-            if bot:
-                try:
-                    await bot.session.close()
-                except Exception:
-                    pass
-
     async def _get_customer_language(self, telegram_user_id: int) -> str:
         """
         Get customer's language preference from Redis FSM storage.
@@ -511,7 +465,6 @@ class TelegramNotificationService(BaseService):
         Returns:
             bool: True if notification sent successfully, False otherwise
         """
-        bot = None
         try:
             # Check if manager exists and has telegram_user_id
             manager = await sync_to_async(lambda: work_order.assigned_to)()
@@ -538,11 +491,8 @@ class TelegramNotificationService(BaseService):
                 work_order, language
             )
 
-            # Create bot and send message
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(
-                chat_id=telegram_user_id, text=message, parse_mode="HTML"
-            )
+            # Send through the shared client
+            await self._send_text(telegram_user_id, message)
 
             self.logger.info(
                 f"WorkOrder {work_order.id}: Sent assignment notification to manager "
@@ -558,13 +508,6 @@ class TelegramNotificationService(BaseService):
             )
             return False
 
-        finally:
-            if bot:
-                try:
-                    await bot.session.close()
-                except Exception:
-                    pass
-
     def _format_work_order_assigned_message(
         self, work_order, language: str = "ru"
     ) -> str:
@@ -633,7 +576,6 @@ class TelegramNotificationService(BaseService):
         Returns:
             bool: True if notification sent successfully, False otherwise
         """
-        bot = None
         try:
             manager = await sync_to_async(lambda: work_order.assigned_to)()
             if not manager:
@@ -668,10 +610,7 @@ class TelegramNotificationService(BaseService):
                     f"📍 Позиция: <code>{work_order.target_coordinate_string}</code>"
                 )
 
-            bot = Bot(token=self.bot_token)
-            await bot.send_message(
-                chat_id=telegram_user_id, text=message, parse_mode="HTML"
-            )
+            await self._send_text(telegram_user_id, message)
 
             self.logger.info(
                 f"WorkOrder {work_order.id}: Sent urgent reminder to manager"
@@ -683,10 +622,3 @@ class TelegramNotificationService(BaseService):
                 f"WorkOrder {work_order.id}: Failed to send urgent reminder: {e}"
             )
             return False
-
-        finally:
-            if bot:
-                try:
-                    await bot.session.close()
-                except Exception:
-                    pass
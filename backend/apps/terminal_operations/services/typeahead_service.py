@@ -0,0 +1,447 @@
+"""
+Typeahead Service - In-memory prefix/fuzzy lookup of container numbers and plates.
+
+Container numbers (every known Container) and plates (vehicle entries and
+pre-orders) are normalized and kept in sorted arrays, so a prefix query is
+two binary searches. Fuzzy queries allow one substituted character (typing
+and OCR slips such as O/0 or B/8), restricted to letters or digits where
+the ISO 6346 format fixes the character class; full container numbers with
+a valid check digit rank first.
+
+Each suggestion carries its live status (active ContainerEntry, vehicle on
+terminal, pending pre-order), kept in process memory:
+- built in the background when a worker starts (warm_typeahead_index), or
+  on first use, then updated by signals after commit
+- rebuilt after TYPEAHEAD_REBUILD_SECONDS so other worker processes pick
+  up changes they did not see; one request rebuilds while the others keep
+  using the previous index, and updates applied during the rebuild are
+  replayed onto the new one
+"""
+
+import bisect
+import logging
+import re
+import string
+import threading
+import time
+from collections.abc import Callable
+
+from django.db import connection, transaction
+
+from apps.core.services import BaseService
+
+
+logger = logging.getLogger(__name__)
+
+TYPEAHEAD_REBUILD_SECONDS = 120
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+# Shorter queries match too much to be useful
+MIN_QUERY_LENGTH = 2
+
+KIND_CONTAINER = "container"
+KIND_PLATE = "plate"
+KINDS = (KIND_CONTAINER, KIND_PLATE)
+
+CONTAINER_NUMBER_RE = re.compile(r"^[A-Z]{4}[0-9]{7}$")
+
+# ISO 6346 letter values: A=10 ... Z=38, skipping multiples of 11
+_LETTER_VALUES = {}
+_value = 10
+for _letter in string.ascii_uppercase:
+    if _value % 11 == 0:
+        _value += 1
+    _LETTER_VALUES[_letter] = _value
+    _value += 1
+
+_NON_ALNUM_RE = re.compile(r"[^A-Za-z0-9]")
+
+
+def normalize_container_number(value: str) -> str:
+    """Uppercase container number without spaces or separators ("msku 123-4567" -> "MSKU1234567")."""
+    return _NON_ALNUM_RE.sub("", value or "").upper()
+
+
+def normalize_plate(value: str) -> str:
+    """Uppercase plate without spaces or separators ("01 a 123 bc" -> "01A123BC")."""
+    return _NON_ALNUM_RE.sub("", value or "").upper()
+
+
+def iso6346_check_digit(container_number: str) -> int | None:
+    """
+    ISO 6346 check digit computed from the first 10 characters.
+
+    Returns:
+        Check digit (0-9), or None if the owner code/serial are malformed
+    """
+    number = normalize_container_number(container_number)
+    if len(number) < 10 or not CONTAINER_NUMBER_RE.match(number[:10] + "0"):
+        return None
+    total = sum(
+        (_LETTER_VALUES[char] if char.isalpha() else int(char)) * (2**position)
+        for position, char in enumerate(number[:10])
+    )
+    return total % 11 % 10
+
+
+def is_valid_container_number(container_number: str) -> bool:
+    """Format (4 letters + 7 digits) and ISO 6346 check digit are both valid."""
+    number = normalize_container_number(container_number)
+    return bool(CONTAINER_NUMBER_RE.match(number)) and iso6346_check_digit(
+        number
+    ) == int(number[10])
+
+
+def _container_alphabet(position: int) -> str:
+    return string.ascii_uppercase if position < 4 else string.digits
+
+
+def _plate_alphabet(position: int) -> str:
+    return string.ascii_uppercase + string.digits
+
+
+class SortedKeyIndex:
+    """Sorted array of unique keys with prefix and one-substitution fuzzy search."""
+
+    def __init__(self, keys=()):
+        self.keys: list[str] = sorted(set(keys))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key: str) -> None:
+        position = bisect.bisect_left(self.keys, key)
+        if position == len(self.keys) or self.keys[position] != key:
+            self.keys.insert(position, key)
+
+    def prefix(self, prefix: str, limit: int) -> list[str]:
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_left(self.keys, prefix + "\uffff", lo=start)
+        return self.keys[start : min(end, start + limit)]
+
+    def fuzzy(
+        self, query: str, limit: int, alphabet: Callable[[int], str]
+    ) -> list[str]:
+        """Keys starting with the query after substituting exactly one character."""
+        found = []
+        seen = set()
+        for position, original in enumerate(query):
+            for char in alphabet(position):
+                if char == original:
+                    continue
+                variant = query[:position] + char + query[position + 1 :]
+                for key in self.prefix(variant, limit):
+                    if key not in seen:
+                        seen.add(key)
+                        found.append(key)
+            if len(found) >= limit:
+                break
+        return found
+
+
+class TypeaheadIndex:
+    """Container number and plate indexes plus their live status."""
+
+    def __init__(self):
+        self.containers = SortedKeyIndex()
+        self.plates = SortedKeyIndex()
+        # container number -> active entry {"id", "status", "entry_time"}
+        self.active_entries: dict[str, dict] = {}
+        # plate -> vehicle on terminal {"id", "vehicle_type", "entry_time"}
+        self.vehicles_on_terminal: dict[str, dict] = {}
+        # plate -> pending pre-order {"id", "operation_type"}
+        self.pending_preorders: dict[str, dict] = {}
+
+    @classmethod
+    def load(cls) -> "TypeaheadIndex":
+        """Build from the database (five value queries)."""
+        from apps.containers.models import Container
+        from apps.terminal_operations.models import ContainerEntry, PreOrder
+        from apps.vehicles.models import VehicleEntry
+
+        index = cls()
+        index.containers = SortedKeyIndex(
+            normalize_container_number(number)
+            for number in Container.objects.values_list("container_number", flat=True)
+        )
+        for number, entry_id, entry_status, entry_time in ContainerEntry.objects.filter(
+            exit_date__isnull=True
+        ).values_list("container__container_number", "id", "status", "entry_time"):
+            index.active_entries[normalize_container_number(number)] = {
+                "id": entry_id,
+                "status": entry_status,
+                "entry_time": entry_time,
+            }
+
+        plates = {
+            normalize_plate(plate)
+            for plate in VehicleEntry.objects.values_list(
+                "license_plate", flat=True
+            ).distinct()
+        }
+        plates |= {
+            normalize_plate(plate)
+            for plate in PreOrder.objects.values_list(
+                "plate_number", flat=True
+            ).distinct()
+        }
+        plates.discard("")
+        index.plates = SortedKeyIndex(plates)
+
+        for plate, entry_id, vehicle_type, entry_time in VehicleEntry.objects.filter(
+            status="ON_TERMINAL"
+        ).values_list("license_plate", "id", "vehicle_type", "entry_time"):
+            index.vehicles_on_terminal[normalize_plate(plate)] = {
+                "id": entry_id,
+                "vehicle_type": vehicle_type,
+                "entry_time": entry_time,
+            }
+        for plate, preorder_id, operation_type in PreOrder.objects.filter(
+            status="PENDING"
+        ).values_list("plate_number", "id", "operation_type"):
+            index.pending_preorders[normalize_plate(plate)] = {
+                "id": preorder_id,
+                "operation_type": operation_type,
+            }
+        return index
+
+    # Incremental updates (called from signals)
+
+    def update_container_entry(
+        self, number: str, entry_id: int, entry_status, entry_time, active: bool
+    ):
+        number = normalize_container_number(number)
+        self.containers.add(number)
+        if active:
+            self.active_entries[number] = {
+                "id": entry_id,
+                "status": entry_status,
+                "entry_time": entry_time,
+            }
+        elif self.active_entries.get(number, {}).get("id") == entry_id:
+            del self.active_entries[number]
+
+    def update_vehicle_entry(
+        self, plate: str, entry_id: int, vehicle_type, entry_time, on_terminal: bool
+    ):
+        plate = normalize_plate(plate)
+        if not plate:
+            return
+        self.plates.add(plate)
+        if on_terminal:
+            self.vehicles_on_terminal[plate] = {
+                "id": entry_id,
+                "vehicle_type": vehicle_type,
+                "entry_time": entry_time,
+            }
+        elif self.vehicles_on_terminal.get(plate, {}).get("id") == entry_id:
+            del self.vehicles_on_terminal[plate]
+
+    def update_preorder(
+        self, plate: str, preorder_id: int, operation_type, pending: bool
+    ):
+        plate = normalize_plate(plate)
+        if not plate:
+            return
+        self.plates.add(plate)
+        if pending:
+            self.pending_preorders[plate] = {
+                "id": preorder_id,
+                "operation_type": operation_type,
+            }
+        elif self.pending_preorders.get(plate, {}).get("id") == preorder_id:
+            del self.pending_preorders[plate]
+
+    # Suggestions
+
+    def container_suggestion(self, number: str, match: str) -> dict:
+        entry = self.active_entries.get(number)
+        return {
+            "value": number,
+            "match": match,
+            "check_digit_valid": is_valid_container_number(number),
+            "on_terminal": entry is not None,
+            "entry": entry,
+        }
+
+    def plate_suggestion(self, plate: str, match: str) -> dict:
+        vehicle = self.vehicles_on_terminal.get(plate)
+        return {
+            "value": plate,
+            "match": match,
+            "on_terminal": vehicle is not None,
+            "vehicle_entry": vehicle,
+            "pending_preorder": self.pending_preorders.get(plate),
+        }
+
+
+# Guards the index and the updates queued during a rebuild
+_index_lock = threading.Lock()
+# Held by the one thread rebuilding the index
+_build_lock = threading.Lock()
+_cached_index: TypeaheadIndex | None = None
+_built_at = 0.0
+# Updates applied while a rebuild runs (None when not rebuilding)
+_pending_updates: list[Callable[[TypeaheadIndex], None]] | None = None
+# Bumped by invalidate_typeahead_index so in-flight builds are treated as stale
+_generation = 0
+
+
+def _rebuild() -> TypeaheadIndex:
+    """Build a fresh index and swap it in (caller holds _build_lock)."""
+    global _cached_index, _built_at, _pending_updates
+
+    with _index_lock:
+        _pending_updates = []
+        generation = _generation
+    started = time.monotonic()
+    try:
+        index = TypeaheadIndex.load()
+    except BaseException:
+        with _index_lock:
+            _pending_updates = None
+        raise
+    with _index_lock:
+        for update in _pending_updates:
+            update(index)
+        _pending_updates = None
+        _cached_index = index
+        # Invalidated mid-build: serve it, but rebuild on next use
+        _built_at = started if generation == _generation else float("-inf")
+    return index
+
+
+def get_typeahead_index() -> TypeaheadIndex:
+    """
+    Process-wide typeahead index.
+
+    Only one thread rebuilds an expired index; the others keep using the
+    previous one meanwhile. Without any index, callers wait for the build.
+    """
+    index = _cached_index
+    if index is not None and time.monotonic() - _built_at < TYPEAHEAD_REBUILD_SECONDS:
+        return index
+
+    if index is not None:
+        if not _build_lock.acquire(blocking=False):
+            return index
+    else:
+        _build_lock.acquire()
+    try:
+        # Another thread may have finished a build while this one waited
+        index = _cached_index
+        if index is not None and time.monotonic() - _built_at < TYPEAHEAD_REBUILD_SECONDS:
+            return index
+        return _rebuild()
+    finally:
+        _build_lock.release()
+
+
+def warm_typeahead_index() -> None:
+    """Build the index in a background thread (call once at worker start)."""
+
+    def build():
+        try:
+            get_typeahead_index()
+        except Exception:
+            logger.warning("Typeahead index warm-up failed", exc_info=True)
+        finally:
+            connection.close()
+
+    threading.Thread(target=build, name="typeahead-warmup", daemon=True).start()
+
+
+def update_typeahead_index(update: Callable[[TypeaheadIndex], None]) -> None:
+    """
+    Apply an incremental update to the built index (otherwise the next build
+    sees it); during a rebuild it is also replayed onto the new index.
+    """
+    with _index_lock:
+        if _cached_index is not None:
+            update(_cached_index)
+        if _pending_updates is not None:
+            _pending_updates.append(update)
+
+
+def invalidate_typeahead_index() -> None:
+    """Drop the index (next query rebuilds it)."""
+    global _cached_index, _generation
+    with _index_lock:
+        _cached_index = None
+        _generation += 1
+
+
+class TypeaheadService(BaseService):
+    """Prefix and fuzzy suggestions for container numbers and plates."""
+
+    def suggest(
+        self,
+        query: str,
+        kind: str = KIND_CONTAINER,
+        limit: int = DEFAULT_LIMIT,
+        fuzzy: bool = True,
+    ) -> dict:
+        """
+        Suggest container numbers or plates for a partial input.
+
+        Args:
+            query: Partial container number or plate (separators ignored)
+            kind: "container" or "plate"
+            limit: Maximum suggestions
+            fuzzy: Fill remaining slots with one-substitution matches
+
+        Returns:
+            dict with normalized query, check digit info (containers) and
+            suggestions (prefix matches first)
+        """
+        normalize = (
+            normalize_container_number if kind == KIND_CONTAINER else normalize_plate
+        )
+        normalized = normalize(query)
+        result = {"query": normalized, "kind": kind, "suggestions": []}
+        if kind == KIND_CONTAINER:
+            result["check_digit"] = iso6346_check_digit(normalized)
+            result["check_digit_valid"] = is_valid_container_number(normalized)
+        if len(normalized) < MIN_QUERY_LENGTH:
+            return result
+
+        started = time.perf_counter()
+        index = get_typeahead_index()
+        if kind == KIND_CONTAINER:
+            keys, alphabet, describe = (
+                index.containers,
+                _container_alphabet,
+                index.container_suggestion,
+            )
+        else:
+            keys, alphabet, describe = (
+                index.plates,
+                _plate_alphabet,
+                index.plate_suggestion,
+            )
+
+        suggestions = [
+            describe(key, "prefix") for key in keys.prefix(normalized, limit)
+        ]
+        if fuzzy and len(suggestions) < limit:
+            fuzzy_keys = keys.fuzzy(normalized, limit - len(suggestions), alphabet)
+            fuzzy_suggestions = [describe(key, "fuzzy") for key in fuzzy_keys]
+            if kind == KIND_CONTAINER:
+                fuzzy_suggestions.sort(key=lambda s: not s["check_digit_valid"])
+            suggestions += fuzzy_suggestions
+
+        result["suggestions"] = suggestions[:limit]
+        self.logger.debug(
+            f"Typeahead {kind} '{normalized}': {len(result['suggestions'])} in "
+            f"{(time.perf_counter() - started) * 1e6:.0f}us"
+        )
+        return result
+
+
+def schedule_index_update(update: Callable[[TypeaheadIndex], None]) -> None:
+    """Apply an index update after the current transaction commits (no-op until built)."""
+    if _cached_index is None and _pending_updates is None:
+        return
+    transaction.on_commit(lambda: update_typeahead_index(update))
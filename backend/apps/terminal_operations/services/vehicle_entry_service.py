@@ -1,6 +1,3 @@
-import asyncio
-import threading
-
 from django.db import transaction
 from django.db.models import Count, Q
 from django.utils import timezone
@@ -18,62 +15,31 @@ class VehicleEntryService(BaseService):
 
     def _notify_customer_async(self, vehicle_entry, notification_type: str):
         """
-        Send customer notification in background thread.
+        Send customer notification on the shared Telegram client loop.
         Best-effort: errors are logged but don't affect the main flow.
 
         Args:
             vehicle_entry: VehicleEntry instance
             notification_type: 'entered' or 'exited'
         """
-        # Capture ID and data before spawning thread (Django ORM objects aren't thread-safe)
-        vehicle_entry_id = vehicle_entry.id
-
-        def run_notification():
-            try:
-                # Import inside thread to get fresh Django setup
-                import django
-
-                django.setup()
-
-                from apps.terminal_operations.services.telegram_notification_service import (
-                    TelegramNotificationService,
-                )
-                from apps.vehicles.models import VehicleEntry as VE
-
-                # Reload object in this thread's DB connection
-                try:
-                    entry = VE.objects.select_related("customer").get(
-                        id=vehicle_entry_id
-                    )
-                except VE.DoesNotExist:
-                    return
-
-                notification_service = TelegramNotificationService()
-
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    if notification_type == "entered":
-                        loop.run_until_complete(
-                            notification_service.notify_customer_vehicle_entered(entry)
-                        )
-                    elif notification_type == "exited":
-                        loop.run_until_complete(
-                            notification_service.notify_customer_vehicle_exited(entry)
-                        )
-                finally:
-                    loop.close()
-            except Exception as e:
-                # Can't use self.logger here (might not be thread-safe)
-                import logging
-
-                logging.getLogger(__name__).error(
-                    f"Background notification failed: {e}"
-                )
-
-        # Run in background thread to not block the main flow
-        thread = threading.Thread(target=run_notification, daemon=True)
-        thread.start()
+        from apps.core.services.telegram_client import get_telegram_client
+        from apps.terminal_operations.services.telegram_notification_service import (
+            TelegramNotificationService,
+        )
+
+        notification_service = TelegramNotificationService()
+        if notification_type == "entered":
+            notify = notification_service.notify_customer_vehicle_entered
+        elif notification_type == "exited":
+            notify = notification_service.notify_customer_vehicle_exited
+        else:
+            return
+
+        try:
+            # The service reads related objects through sync_to_async
+            get_telegram_client().schedule(notify(vehicle_entry))
+        except Exception as e:
+            self.logger.error(f"Background notification failed: {e}")
 
     def _normalize_plate(self, plate_number):
         """
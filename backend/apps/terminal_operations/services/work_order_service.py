@@ -237,16 +237,33 @@ class WorkOrderService(BaseService):
                 error_code="NOT_ASSIGNED_TO_VEHICLE",
             )
 
-        # Create actual container position via PlacementService
-        self.placement_service.assign_position(
-            container_entry_id=work_order.container_entry_id,
-            zone=work_order.target_zone,
-            row=work_order.target_row,
-            bay=work_order.target_bay,
-            tier=work_order.target_tier,
-            sub_slot=work_order.target_sub_slot,
-            auto_assigned=False,
-        )
+        if work_order.operation_type == "RELOCATION":
+            # Move existing position (yard consolidation)
+            position = getattr(work_order.container_entry, "position", None)
+            if position is None:
+                raise BusinessLogicError(
+                    message="Контейнер не размещён — перемещение невозможно",
+                    error_code="CONTAINER_NOT_PLACED",
+                )
+            self.placement_service.move_container(
+                position_id=position.id,
+                new_zone=work_order.target_zone,
+                new_row=work_order.target_row,
+                new_bay=work_order.target_bay,
+                new_tier=work_order.target_tier,
+                new_sub_slot=work_order.target_sub_slot,
+            )
+        else:
+            # Create actual container position via PlacementService
+            self.placement_service.assign_position(
+                container_entry_id=work_order.container_entry_id,
+                zone=work_order.target_zone,
+                row=work_order.target_row,
+                bay=work_order.target_bay,
+                tier=work_order.target_tier,
+                sub_slot=work_order.target_sub_slot,
+                auto_assigned=False,
+            )
 
         # Update work order
         work_order.status = "COMPLETED"
@@ -300,6 +317,7 @@ class WorkOrderService(BaseService):
         try:
             return WorkOrder.objects.select_related(
                 "container_entry__container",
+                "container_entry__position",
                 "assigned_to_vehicle",
             ).get(id=work_order_id)
         except WorkOrder.DoesNotExist:
@@ -0,0 +1,183 @@
+"""
+Yard Broadcast - Versioned layout diffs for the yard 3D screen.
+
+Every yard-relevant container event (placement, removal, move, work order,
+exit, status change) becomes a compact diff that is:
+1. stamped with the next yard version (shared counter in the Django cache)
+2. written into a bounded ring buffer (RING_BUFFER_SIZE slots in the cache)
+3. pushed to the "yard" Channels group after the transaction commits
+
+Diffs of a bulk operation (ContainerEventService.batch()) are published
+together: one version range, one cache write and one "diffs" message.
+
+Clients load the full layout once (PlacementService.get_layout returns the
+version it corresponds to) and then apply diffs. A reconnecting client sends
+the last version it saw and replays missed diffs from the ring buffer; if
+they have already been overwritten it is told to reload the layout.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+YARD_GROUP_NAME = "yard"
+
+RING_BUFFER_SIZE = 500
+# Diffs older than this are useless anyway - clients reload the layout
+RING_BUFFER_TTL_SECONDS = 24 * 60 * 60
+
+VERSION_CACHE_KEY = "yard:version"
+DIFF_CACHE_KEY = "yard:diff:{slot}"
+
+
+def get_yard_version() -> int:
+    """Current yard version (0 if nothing was published yet)."""
+    return cache.get(VERSION_CACHE_KEY, 0)
+
+
+def _next_version(count: int = 1) -> int:
+    """Reserve `count` consecutive versions and return the last one."""
+    cache.add(VERSION_CACHE_KEY, 0, timeout=None)
+    return cache.incr(VERSION_CACHE_KEY, count)
+
+
+def get_diffs_since(version: int) -> list[dict] | None:
+    """
+    Diffs published after a version, oldest first.
+
+    Returns:
+        List of diffs (empty if the client is up to date), or None when
+        some diffs are no longer in the ring buffer and the client must
+        reload the full layout
+    """
+    current = get_yard_version()
+    if version >= current:
+        return [] if version == current else None
+    if current - version > RING_BUFFER_SIZE:
+        return None
+
+    wanted = range(version + 1, current + 1)
+    keys = {v: DIFF_CACHE_KEY.format(slot=v % RING_BUFFER_SIZE) for v in wanted}
+    stored = cache.get_many(keys.values())
+
+    diffs = []
+    for v in wanted:
+        diff = stored.get(keys[v])
+        if diff is None or diff["version"] != v:
+            return None
+        diffs.append(diff)
+    return diffs
+
+
+def publish_yard_diff(diff: dict) -> dict:
+    """Stamp, buffer and broadcast one diff immediately."""
+    diff = {**diff, "version": _next_version()}
+    cache.set(
+        DIFF_CACHE_KEY.format(slot=diff["version"] % RING_BUFFER_SIZE),
+        diff,
+        timeout=RING_BUFFER_TTL_SECONDS,
+    )
+
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(
+            YARD_GROUP_NAME,
+            {"type": "yard_diff", "data": diff},
+        )
+    logger.debug(f"Broadcast yard diff v{diff['version']}: {diff['op']} #{diff['container_id']}")
+    return diff
+
+
+def publish_yard_diffs(diffs: list[dict]) -> list[dict]:
+    """Stamp, buffer and broadcast several diffs as one message."""
+    if not diffs:
+        return []
+    first_version = _next_version(len(diffs)) - len(diffs) + 1
+    diffs = [
+        {**diff, "version": first_version + offset} for offset, diff in enumerate(diffs)
+    ]
+    cache.set_many(
+        {DIFF_CACHE_KEY.format(slot=diff["version"] % RING_BUFFER_SIZE): diff for diff in diffs},
+        timeout=RING_BUFFER_TTL_SECONDS,
+    )
+
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(
+            YARD_GROUP_NAME,
+            {"type": "yard_diffs", "data": {"version": diffs[-1]["version"], "diffs": diffs}},
+        )
+    logger.debug(
+        f"Broadcast {len(diffs)} yard diffs v{diffs[0]['version']}-v{diffs[-1]['version']}"
+    )
+    return diffs
+
+
+def schedule_yard_diff(diff: dict) -> None:
+    """Publish a diff once the current transaction commits (never raises)."""
+
+    def _publish():
+        try:
+            publish_yard_diff(diff)
+        except Exception as e:
+            logger.error(f"Failed to broadcast yard diff {diff.get('op')}: {e}", exc_info=True)
+
+    transaction.on_commit(_publish)
+
+
+def schedule_yard_diffs(diffs: list[dict]) -> None:
+    """Publish diffs of a bulk operation once the transaction commits (never raises)."""
+    if len(diffs) == 1:
+        schedule_yard_diff(diffs[0])
+        return
+
+    def _publish():
+        try:
+            publish_yard_diffs(diffs)
+        except Exception as e:
+            logger.error(f"Failed to broadcast {len(diffs)} yard diffs: {e}", exc_info=True)
+
+    if diffs:
+        transaction.on_commit(_publish)
+
+
+def build_yard_diff(container_entry, event_type: str, details: dict) -> dict | None:
+    """
+    Compact layout diff for a container event, or None if the event does not
+    change the yard view (or carries no coordinates, e.g. manual events).
+    """
+    diff = {"container_id": container_entry.id}
+    if event_type == "POSITION_ASSIGNED" and details.get("coordinate"):
+        diff.update(
+            op="placed",
+            coordinate=details["coordinate"],
+            position={key: details.get(key) for key in ("zone", "row", "bay", "tier", "sub_slot")},
+            state=container_entry.status,
+        )
+    elif event_type == "POSITION_REMOVED" and details.get("previous_coordinate"):
+        diff.update(op="removed", coordinate=details["previous_coordinate"])
+    elif event_type == "WORK_ORDER_CREATED" and details.get("work_order_id"):
+        diff.update(
+            op="work_order_created",
+            coordinate=details.get("target_coordinate"),
+            work_order={
+                "id": details["work_order_id"],
+                "order_number": details.get("order_number"),
+                "priority": details.get("priority"),
+            },
+        )
+    elif event_type == "WORK_ORDER_COMPLETED" and details.get("work_order_id"):
+        diff.update(op="work_order_completed", work_order={"id": details["work_order_id"]})
+    elif event_type == "EXIT_RECORDED":
+        diff.update(op="exited")
+    elif event_type == "STATUS_CHANGED":
+        diff.update(op="status_changed", state=details.get("new_status", container_entry.status))
+    else:
+        return None
+    return diff
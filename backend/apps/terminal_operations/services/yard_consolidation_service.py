@@ -0,0 +1,342 @@
+"""
+Yard Consolidation Service - Plans relocations that free whole bays or rows.
+
+Over time containers get scattered across bays: many stacks are one or two
+tiers high and few bays are completely empty. The planner works on an
+in-memory YardSnapshot and proposes a short sequence of moves (executed as
+RELOCATION work orders via PlacementService.move_container) that empties
+the cheapest bays/rows first.
+
+Algorithm (greedy, cheapest unit first):
+1. Group containers by unit (bay or row), skipping units with pending
+   work orders or blocked slots
+2. Sort units by container count (fewest moves to free first)
+3. For each unit, lift containers top-down and restack them in other
+   occupied bays, choosing slots that pass every stacking rule and cause
+   the fewest expected rehandles
+4. Roll back a unit if any container cannot be restacked or the move cap
+   would be exceeded
+
+Each candidate check is a dict lookup, so a full multi-zone yard is planned
+in well under a second.
+"""
+
+import time
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from apps.accounts.models import CustomUser
+from apps.core.exceptions import BusinessLogicError
+from apps.core.services.base_service import BaseService
+from apps.terminal_operations.models import WorkOrder
+
+from .container_event_service import ContainerEventService
+from .placement_service import PREFERRED_STACK_HEIGHT, format_coordinate
+from .yard_rehandle_service import YardRehandleService
+from .yard_snapshot import Coordinate, YardSnapshot
+
+
+# Units the planner can free
+CONSOLIDATION_UNITS = ["bay", "row"]
+
+DEFAULT_MAX_MOVES = 20
+MAX_MOVES_LIMIT = 200
+
+
+@dataclass
+class PlannedMove:
+    """One relocation step in a consolidation plan."""
+
+    step: int
+    position_id: int
+    container_entry_id: int
+    container_number: str
+    source: Coordinate
+    target: Coordinate
+    expected_rehandles: int
+
+    def to_dict(self) -> dict:
+        return {
+            "step": self.step,
+            "position_id": self.position_id,
+            "container_entry_id": self.container_entry_id,
+            "container_number": self.container_number,
+            "from": format_coordinate(*self.source),
+            "to": format_coordinate(*self.target),
+            "target": {
+                "zone": self.target[0],
+                "row": self.target[1],
+                "bay": self.target[2],
+                "tier": self.target[3],
+                "sub_slot": self.target[4],
+            },
+            "expected_rehandles": self.expected_rehandles,
+        }
+
+
+def unit_key(coordinate: Coordinate, unit: str) -> tuple:
+    """Bay key (zone, row, bay) or row key (zone, row) for a coordinate."""
+    zone, row, bay = coordinate[0], coordinate[1], coordinate[2]
+    return (zone, row, bay) if unit == "bay" else (zone, row)
+
+
+def unit_label(key: tuple) -> str:
+    if len(key) == 3:
+        return f"{key[0]}-R{key[1]:02d}-B{key[2]:02d}"
+    return f"{key[0]}-R{key[1]:02d}"
+
+
+class YardConsolidationService(BaseService):
+    """
+    Proposes and creates minimal relocation sequences to free bays or rows.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rehandle_service = YardRehandleService()
+        self._event_service = None
+
+    @property
+    def event_service(self):
+        if self._event_service is None:
+            self._event_service = ContainerEventService()
+        return self._event_service
+
+    def plan(
+        self,
+        unit: str = "bay",
+        zone: str | None = None,
+        max_moves: int = DEFAULT_MAX_MOVES,
+        snapshot: YardSnapshot | None = None,
+    ) -> dict:
+        """
+        Build a consolidation plan.
+
+        Args:
+            unit: "bay" or "row" - what to free
+            zone: Optional zone filter for units to free (targets may be anywhere)
+            max_moves: Cap on the number of relocations
+            snapshot: Optional YardSnapshot (loaded with departures if omitted)
+
+        Returns:
+            dict with moves, freed units and expected rehandles before/after
+        """
+        if unit not in CONSOLIDATION_UNITS:
+            raise BusinessLogicError(
+                message=f"Недопустимый тип области: {unit}. Допустимые: {', '.join(CONSOLIDATION_UNITS)}",
+                error_code="INVALID_CONSOLIDATION_UNIT",
+            )
+        max_moves = max(0, min(max_moves, MAX_MOVES_LIMIT))
+
+        started = time.perf_counter()
+        if snapshot is None:
+            snapshot = self.rehandle_service.load_snapshot()
+        rehandles_before = self.rehandle_service.evaluate_snapshot(snapshot)[
+            "total_expected_rehandles"
+        ]
+
+        locked = self._get_locked_units(unit)
+        units: dict[tuple, list[Coordinate]] = {}
+        for coordinate, occupant in snapshot.occupants.items():
+            key = unit_key(coordinate, unit)
+            if occupant.entry_id is None:
+                locked.add(key)
+            units.setdefault(key, []).append(coordinate)
+
+        candidates = sorted(
+            (
+                (len(coordinates), key)
+                for key, coordinates in units.items()
+                if key not in locked and (zone is None or key[0] == zone)
+            ),
+        )
+
+        moves: list[PlannedMove] = []
+        freed: list[tuple] = []
+        # Units that must not receive containers (freed or being freed)
+        closed: set = set(locked)
+        # Units that received containers - no longer worth freeing
+        receiving: set = set()
+
+        for count, key in candidates:
+            if len(moves) + count > max_moves:
+                break
+            if key in receiving:
+                continue
+            unit_moves = self._free_unit(
+                snapshot, units[key], closed | {key}, unit, first_step=len(moves) + 1
+            )
+            if unit_moves is None:
+                continue
+            moves.extend(unit_moves)
+            freed.append(key)
+            closed.add(key)
+            receiving.update(unit_key(move.target, unit) for move in unit_moves)
+
+        rehandles_after = self.rehandle_service.evaluate_snapshot(snapshot)[
+            "total_expected_rehandles"
+        ]
+        return {
+            "unit": unit,
+            "zone": zone,
+            "max_moves": max_moves,
+            "move_count": len(moves),
+            "freed_units": [unit_label(key) for key in freed],
+            "moves": [move.to_dict() for move in moves],
+            "expected_rehandles_before": rehandles_before,
+            "expected_rehandles_after": rehandles_after,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _get_locked_units(self, unit: str) -> set:
+        """Units touched by pending work orders (source or target)."""
+        locked = set()
+        pending = WorkOrder.objects.filter(status="PENDING").values_list(
+            "target_zone",
+            "target_row",
+            "target_bay",
+            "container_entry__position__zone",
+            "container_entry__position__row",
+            "container_entry__position__bay",
+        )
+        for t_zone, t_row, t_bay, p_zone, p_row, p_bay in pending:
+            locked.add(unit_key((t_zone, t_row, t_bay), unit))
+            if p_zone:
+                locked.add(unit_key((p_zone, p_row, p_bay), unit))
+        return locked
+
+    def _free_unit(
+        self,
+        snapshot: YardSnapshot,
+        coordinates: list[Coordinate],
+        closed: set,
+        unit: str,
+        first_step: int,
+    ) -> list[PlannedMove] | None:
+        """
+        Relocate every container of one unit, top tiers first.
+
+        Modifies the snapshot in place; rolls back and returns None if any
+        container has no legal destination.
+        """
+        applied: list[tuple[Coordinate, Coordinate]] = []
+        moves: list[PlannedMove] = []
+
+        for source in sorted(coordinates, key=lambda c: (-c[3], c)):
+            occupant = snapshot.occupants[source]
+            found = self._find_destination(snapshot, source, closed, unit)
+            if found is None:
+                for moved_from, moved_to in reversed(applied):
+                    snapshot.place(moved_from, snapshot.remove(moved_to))
+                return None
+
+            target, rehandles = found
+            snapshot.place(target, snapshot.remove(source))
+            applied.append((source, target))
+            moves.append(
+                PlannedMove(
+                    step=first_step + len(moves),
+                    position_id=occupant.position_id,
+                    container_entry_id=occupant.entry_id,
+                    container_number=occupant.container_number,
+                    source=source,
+                    target=target,
+                    expected_rehandles=rehandles,
+                )
+            )
+        return moves
+
+    def _find_destination(
+        self,
+        snapshot: YardSnapshot,
+        source: Coordinate,
+        closed: set,
+        unit: str,
+    ) -> tuple[Coordinate, int] | None:
+        """Best legal slot in another occupied bay for the container at source."""
+        occupant = snapshot.occupants[source]
+        sub_slots = ["A"] if occupant.container_size in ("40ft", "45ft") else ["A", "B"]
+        occupied_bays = {(z, r, b) for (z, r, b, _t, _s) in snapshot.occupants}
+
+        best = None
+        for zone, row, bay in occupied_bays:
+            if unit_key((zone, row, bay), unit) in closed:
+                continue
+            for sub_slot in sub_slots:
+                stack = snapshot.stack(zone, row, bay, sub_slot)
+                tier = len(stack) + 1
+                if not snapshot.can_place(
+                    zone, row, bay, tier, sub_slot, occupant.container_size, occupant.status
+                ):
+                    continue
+                rehandles = 0
+                if occupant.expected_departure:
+                    rehandles = sum(
+                        1
+                        for below in stack
+                        if below.expected_departure
+                        and below.expected_departure < occupant.expected_departure
+                    )
+                rank = (
+                    rehandles,
+                    tier > PREFERRED_STACK_HEIGHT,
+                    tier,
+                    (zone, row, bay, sub_slot),
+                )
+                if best is None or rank < best[0]:
+                    best = (rank, (zone, row, bay, tier, sub_slot), rehandles)
+
+        if best is None:
+            return None
+        return best[1], best[2]
+
+    @transaction.atomic
+    def create_work_orders(
+        self,
+        plan: dict,
+        created_by: CustomUser | None = None,
+        priority: str = "LOW",
+    ) -> list[WorkOrder]:
+        """
+        Create RELOCATION work orders for a plan (one per move, in order).
+
+        Work orders must be completed in step order - later moves may stack
+        onto containers moved by earlier ones.
+        """
+        total = plan["move_count"]
+        work_orders = []
+        with self.event_service.batch():
+            for move in plan["moves"]:
+                target = move["target"]
+                work_order = WorkOrder(
+                    operation_type="RELOCATION",
+                    container_entry_id=move["container_entry_id"],
+                    status="PENDING",
+                    priority=priority,
+                    target_zone=target["zone"],
+                    target_row=target["row"],
+                    target_bay=target["bay"],
+                    target_tier=target["tier"],
+                    target_sub_slot=target["sub_slot"],
+                    created_by=created_by,
+                    notes=f"Консолидация терминала: шаг {move['step']}/{total}, из {move['from']}",
+                )
+                work_order.save()
+
+                self.event_service.create_work_order_created_event(
+                    container_entry=work_order.container_entry,
+                    order_number=work_order.order_number,
+                    target_coordinate=work_order.target_coordinate_string,
+                    priority=priority,
+                    work_order_id=work_order.id,
+                    performed_by=created_by,
+                    source="SYSTEM",
+                )
+                work_orders.append(work_order)
+
+        self.logger.info(
+            f"Created {len(work_orders)} relocation work orders "
+            f"(freed: {', '.join(plan['freed_units']) or '-'})"
+        )
+        return work_orders
@@ -0,0 +1,218 @@
+"""
+Yard Geometry - Terminal layout loaded from YardBlock configuration.
+
+Replaces the hard-coded zone/row/bay/tier constants. The geometry is
+expanded once into per-row lookup tables and precomputed capacities, then
+cached in process memory:
+- invalidated on YardBlock save/delete (see signals.py)
+- expired after GEOMETRY_CACHE_SECONDS so other worker processes pick up
+  configuration changes
+
+If no active blocks exist the historic default (Zone A, 40ft rows 1-5,
+20ft rows 6-10, 10 bays, 4 tiers) is used.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+GEOMETRY_CACHE_SECONDS = 300
+
+# (zone, row_from, row_to, bays, max_tiers, container_size, reefer_plugs)
+DEFAULT_BLOCKS = [
+    ("A", 1, 5, 10, 4, "40ft", 0),
+    ("A", 6, 10, 10, 4, "20ft", 0),
+]
+
+
+def size_class(container_size: str) -> str:
+    """Segregation class of a container size (45ft shares 40ft rows)."""
+    return "40ft" if container_size in ("40ft", "45ft") else "20ft"
+
+
+@dataclass(frozen=True)
+class RowConfig:
+    """Geometry of one yard row."""
+
+    zone: str
+    row: int
+    bays: int
+    max_tiers: int
+    container_size: str
+    reefer_plugs: int = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.bays * self.max_tiers
+
+
+class YardGeometry:
+    """
+    Immutable yard layout with precomputed lookup and capacity tables.
+
+    Capacity counts bay slots (bays x tiers), as the layout statistics always
+    have; two 20ft containers sharing a bay still occupy one bay slot each.
+    """
+
+    def __init__(self, rows: list[RowConfig]):
+        self._rows: dict[tuple[str, int], RowConfig] = {
+            (config.zone, config.row): config
+            for config in sorted(rows, key=lambda c: (c.zone, c.row))
+        }
+        self.zones: list[str] = sorted({config.zone for config in rows})
+
+        self._zone_rows: dict[str, list[int]] = {zone: [] for zone in self.zones}
+        self._size_rows: dict[tuple[str, str], list[int]] = {}
+        self.zone_capacity: dict[str, int] = dict.fromkeys(self.zones, 0)
+        self.zone_ground_slots: dict[str, int] = dict.fromkeys(self.zones, 0)
+        self.zone_reefer_plugs: dict[str, int] = dict.fromkeys(self.zones, 0)
+
+        for (zone, row), config in self._rows.items():
+            self._zone_rows[zone].append(row)
+            self._size_rows.setdefault((zone, config.container_size), []).append(row)
+            self.zone_capacity[zone] += config.capacity
+            self.zone_ground_slots[zone] += config.bays
+            self.zone_reefer_plugs[zone] += config.reefer_plugs
+
+        self.total_capacity = sum(self.zone_capacity.values())
+        self.max_rows = max((row for _zone, row in self._rows), default=0)
+        self.max_bays = max((c.bays for c in self._rows.values()), default=0)
+        self.max_tiers = max((c.max_tiers for c in self._rows.values()), default=0)
+
+    @classmethod
+    def from_blocks(cls, blocks) -> "YardGeometry":
+        """
+        Expand block tuples into rows.
+
+        Args:
+            blocks: Iterable of (zone, row_from, row_to, bays, max_tiers,
+                container_size, reefer_plugs)
+        """
+        rows = []
+        for zone, row_from, row_to, bays, max_tiers, container_size, reefer_plugs in blocks:
+            for row in range(row_from, row_to + 1):
+                rows.append(
+                    RowConfig(zone, row, bays, max_tiers, size_class(container_size), reefer_plugs)
+                )
+        return cls(rows)
+
+    @classmethod
+    def load(cls) -> "YardGeometry":
+        """Build geometry from active YardBlock rows (one query)."""
+        from apps.terminal_operations.models import YardBlock
+
+        blocks = list(
+            YardBlock.objects.filter(is_active=True).values_list(
+                "zone",
+                "row_from",
+                "row_to",
+                "bays",
+                "max_tiers",
+                "container_size",
+                "reefer_plugs",
+            )
+        )
+        return cls.from_blocks(blocks or DEFAULT_BLOCKS)
+
+    def row_config(self, zone: str, row: int) -> RowConfig | None:
+        return self._rows.get((zone, row))
+
+    def rows(self, zone: str) -> list[int]:
+        """Configured rows of a zone, ascending."""
+        return self._zone_rows.get(zone, [])
+
+    def rows_for_size(self, zone: str, container_size: str) -> list[int]:
+        """Rows of a zone that accept a container size (row segregation)."""
+        return self._size_rows.get((zone, size_class(container_size)), [])
+
+    def is_valid_slot(self, zone: str, row: int, bay: int, tier: int) -> bool:
+        config = self._rows.get((zone, row))
+        return (
+            config is not None
+            and 1 <= bay <= config.bays
+            and 1 <= tier <= config.max_tiers
+        )
+
+    def accepts(self, zone: str, row: int, container_size: str) -> bool:
+        config = self._rows.get((zone, row))
+        return config is not None and config.container_size == size_class(container_size)
+
+    def iter_bays(
+        self,
+        zone: str | None = None,
+        container_size: str | None = None,
+    ) -> Iterator[tuple[str, int, int]]:
+        """
+        Yield (zone, row, bay) in zone, row, bay order.
+
+        Args:
+            zone: Restrict to one zone (optional)
+            container_size: Restrict to rows accepting this size (optional)
+        """
+        zones = [zone] if zone else self.zones
+        for z in zones:
+            rows = self.rows_for_size(z, container_size) if container_size else self.rows(z)
+            for row in rows:
+                for bay in range(1, self._rows[(z, row)].bays + 1):
+                    yield z, row, bay
+
+    def to_dict(self) -> dict:
+        """Block-level description for API clients (consecutive equal rows merged)."""
+        blocks = []
+        for (zone, row), config in self._rows.items():
+            last = blocks[-1] if blocks else None
+            if (
+                last
+                and last["zone"] == zone
+                and last["row_to"] == row - 1
+                and (last["bays"], last["max_tiers"], last["container_size"], last["reefer_plugs"])
+                == (config.bays, config.max_tiers, config.container_size, config.reefer_plugs)
+            ):
+                last["row_to"] = row
+                continue
+            blocks.append(
+                {
+                    "zone": zone,
+                    "row_from": row,
+                    "row_to": row,
+                    "bays": config.bays,
+                    "max_tiers": config.max_tiers,
+                    "container_size": config.container_size,
+                    "reefer_plugs": config.reefer_plugs,
+                }
+            )
+        return {
+            "zones": self.zones,
+            "blocks": blocks,
+            "total_capacity": self.total_capacity,
+        }
+
+
+_cache_lock = threading.Lock()
+_cached_geometry: YardGeometry | None = None
+_cached_at = 0.0
+
+
+def get_yard_geometry() -> YardGeometry:
+    """Cached yard geometry for the current process."""
+    global _cached_geometry, _cached_at
+
+    now = time.monotonic()
+    geometry = _cached_geometry
+    if geometry is not None and now - _cached_at < GEOMETRY_CACHE_SECONDS:
+        return geometry
+
+    geometry = YardGeometry.load()
+    with _cache_lock:
+        _cached_geometry = geometry
+        _cached_at = now
+    return geometry
+
+
+def invalidate_yard_geometry() -> None:
+    """Drop the cached geometry (next call reloads from the database)."""
+    global _cached_geometry
+    with _cache_lock:
+        _cached_geometry = None
@@ -0,0 +1,201 @@
+"""
+Yard Rehandle Service - Rehandle-aware placement scoring.
+
+A rehandle (shuffle) happens when a container has to be lifted off the stack
+so that a container below it can leave. Placing a container that stays for
+weeks on top of one that leaves tomorrow costs an extra crane move at exit.
+
+This service scores every legal slot against an in-memory YardSnapshot:
+- each container below the newcomer that is expected to leave first
+  counts as one expected rehandle
+- among safe stacks, tighter departure fits are preferred so that stacks
+  with long-staying bottoms stay free for long-staying newcomers
+- low tiers and existing stacks (consolidation) are preferred as tie-breakers
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.utils import timezone
+
+from apps.core.services.base_service import BaseService
+from apps.terminal_operations.models import ContainerEntry
+
+from .departure_estimation_service import DepartureEstimationService
+from .placement_service import PREFERRED_STACK_HEIGHT, format_coordinate
+from .yard_snapshot import YardOccupant, YardSnapshot, container_size_from_iso
+
+
+# Scoring weights (lower score is better)
+REHANDLE_WEIGHT = 100.0
+ABOVE_PREFERRED_HEIGHT_WEIGHT = 40.0
+NEW_GROUND_SLOT_WEIGHT = 8.0
+TIER_WEIGHT = 2.0
+# Departure slack (days) beyond which a fit is no longer considered "tight"
+FIT_HORIZON_DAYS = 30.0
+FIT_WEIGHT = 5.0
+
+
+@dataclass
+class ScoredPosition:
+    """Candidate slot with its placement score."""
+
+    zone: str
+    row: int
+    bay: int
+    tier: int
+    sub_slot: str
+    score: float
+    expected_rehandles: int
+
+    @property
+    def coordinate(self) -> tuple:
+        return (self.zone, self.row, self.bay, self.tier, self.sub_slot)
+
+    def to_dict(self) -> dict:
+        return {
+            "zone": self.zone,
+            "row": self.row,
+            "bay": self.bay,
+            "tier": self.tier,
+            "sub_slot": self.sub_slot,
+            "coordinate": format_coordinate(
+                self.zone, self.row, self.bay, self.tier, self.sub_slot
+            ),
+            "score": round(self.score, 2),
+            "expected_rehandles": self.expected_rehandles,
+        }
+
+
+def count_stack_rehandles(departures: list) -> int:
+    """
+    Simulate departures for one stack (bottom to top) and count rehandles.
+
+    When a container leaves, every container still above it is lifted off
+    once. Occupants with unknown departure (None) never leave.
+    """
+    stack = list(departures)
+    rehandles = 0
+    for departure in sorted(d for d in stack if d is not None):
+        index = stack.index(departure)
+        rehandles += len(stack) - index - 1
+        stack.pop(index)
+    return rehandles
+
+
+class YardRehandleService(BaseService):
+    """
+    Scores placement candidates by expected rehandles and reports
+    expected rehandles for a whole yard configuration.
+    """
+
+    def __init__(self, estimator: DepartureEstimationService | None = None):
+        super().__init__()
+        self.estimator = estimator or DepartureEstimationService()
+
+    def load_snapshot(self) -> YardSnapshot:
+        """Load the current yard with expected departures."""
+        return YardSnapshot.load(estimator=self.estimator)
+
+    def score_positions(
+        self,
+        entry: ContainerEntry,
+        snapshot: YardSnapshot,
+        zone_preference: str | None = None,
+        limit: int = 4,
+    ) -> tuple[list[ScoredPosition], dict]:
+        """
+        Rank all legal slots for a container.
+
+        Returns:
+            Tuple of (best positions, departure estimate for the newcomer)
+        """
+        estimate = self.estimator.estimate_for_entry(entry)
+        departure = estimate["expected_departure"]
+        container_size = container_size_from_iso(entry.container.iso_type)
+        sub_slots = ["A"] if container_size in ("40ft", "45ft") else ["A", "B"]
+
+        candidates = []
+        for zone, row, bay in snapshot.geometry.iter_bays(zone_preference, container_size):
+            for sub_slot in sub_slots:
+                stack = snapshot.stack(zone, row, bay, sub_slot)
+                tier = len(stack) + 1
+                if not snapshot.can_place(
+                    zone, row, bay, tier, sub_slot, container_size, entry.status
+                ):
+                    continue
+                candidates.append(
+                    self._score(zone, row, bay, tier, sub_slot, stack, departure)
+                )
+
+        candidates.sort(key=lambda c: (c.score, c.coordinate))
+        return candidates[:limit], estimate
+
+    def _score(
+        self,
+        zone: str,
+        row: int,
+        bay: int,
+        tier: int,
+        sub_slot: str,
+        stack: list[YardOccupant],
+        departure: datetime,
+    ) -> ScoredPosition:
+        below_departures = [o.expected_departure for o in stack if o.expected_departure]
+        rehandles = sum(1 for d in below_departures if d < departure)
+
+        score = rehandles * REHANDLE_WEIGHT + (tier - 1) * TIER_WEIGHT
+        if tier > PREFERRED_STACK_HEIGHT:
+            score += ABOVE_PREFERRED_HEIGHT_WEIGHT
+        if tier == 1:
+            score += NEW_GROUND_SLOT_WEIGHT
+        elif rehandles == 0 and below_departures:
+            # Tighter fit -> smaller penalty; keeps long-stay stacks for long stays
+            slack_days = (min(below_departures) - departure).total_seconds() / 86400
+            score += min(slack_days, FIT_HORIZON_DAYS) / FIT_HORIZON_DAYS * FIT_WEIGHT
+
+        return ScoredPosition(zone, row, bay, tier, sub_slot, score, rehandles)
+
+    def evaluate_snapshot(self, snapshot: YardSnapshot) -> dict:
+        """
+        Expected rehandles for a yard configuration.
+
+        Args:
+            snapshot: YardSnapshot with expected departures filled in
+
+        Returns:
+            dict with total, per-zone counts and the worst stacks
+        """
+        total = 0
+        containers = 0
+        by_zone: dict = {}
+        stacks_report = []
+
+        for (zone, row, bay, sub_slot), stack in snapshot.stacks().items():
+            containers += sum(1 for o in stack if o.entry_id)
+            rehandles = count_stack_rehandles([o.expected_departure for o in stack])
+            by_zone[zone] = by_zone.get(zone, 0) + rehandles
+            total += rehandles
+            if rehandles:
+                stacks_report.append(
+                    {
+                        "stack": f"{zone}-R{row:02d}-B{bay:02d}-{sub_slot}",
+                        "height": len(stack),
+                        "expected_rehandles": rehandles,
+                    }
+                )
+
+        stacks_report.sort(key=lambda s: (-s["expected_rehandles"], s["stack"]))
+        return {
+            "total_expected_rehandles": total,
+            "containers": containers,
+            "stacks_with_rehandles": len(stacks_report),
+            "by_zone": by_zone,
+            "worst_stacks": stacks_report[:10],
+        }
+
+    def get_rehandle_report(self) -> dict:
+        """Expected rehandles for the current yard."""
+        report = self.evaluate_snapshot(self.load_snapshot())
+        report["generated_at"] = timezone.now().isoformat()
+        return report
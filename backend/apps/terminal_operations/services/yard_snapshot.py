@@ -0,0 +1,217 @@
+"""
+Yard Snapshot - In-memory view of the terminal yard for placement planning.
+
+Loads every ContainerPosition with a single query so that scoring and
+planning algorithms can evaluate thousands of candidate slots without a
+query per slot. Snapshots can be copied and modified to evaluate
+hypothetical yard configurations.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from apps.terminal_operations.models import ContainerPosition
+
+from .yard_geometry import YardGeometry, get_yard_geometry
+
+
+# (zone, row, bay, tier, sub_slot)
+Coordinate = tuple[str, int, int, int, str]
+
+# (zone, row, bay, sub_slot) - one physical stack
+StackKey = tuple[str, int, int, str]
+
+
+@dataclass
+class YardOccupant:
+    """A container (or blocked slot) at a yard coordinate."""
+
+    position_id: int | None
+    entry_id: int | None
+    container_size: str
+    status: str
+    entry_time: datetime | None = None
+    company_id: int | None = None
+    container_number: str = ""
+    expected_departure: datetime | None = None
+
+
+def container_size_from_iso(iso_type: str) -> str:
+    """Container size from ISO type (same rules as PlacementService)."""
+    first_char = iso_type[0] if iso_type else "2"
+    if first_char == "4":
+        return "40ft"
+    if first_char in ("L", "9"):
+        return "45ft"
+    return "20ft"
+
+
+class YardSnapshot:
+    """
+    Occupancy map keyed by coordinate tuple.
+
+    Slots imported without an occupant (container_entry is null) are kept as
+    blocked coordinates, matching PlacementService which treats any existing
+    ContainerPosition row as taken.
+    """
+
+    def __init__(
+        self,
+        occupants: dict | None = None,
+        geometry: YardGeometry | None = None,
+    ):
+        self.occupants: dict[Coordinate, YardOccupant] = occupants or {}
+        self._geometry = geometry
+
+    @property
+    def geometry(self) -> YardGeometry:
+        """Yard layout the rules are checked against (cached geometry by default)."""
+        if self._geometry is None:
+            self._geometry = get_yard_geometry()
+        return self._geometry
+
+    @classmethod
+    def load(cls, estimator=None, geometry: YardGeometry | None = None) -> "YardSnapshot":
+        """
+        Load the current yard.
+
+        Args:
+            estimator: Optional DepartureEstimationService - when given, every
+                occupant gets an expected_departure
+            geometry: Optional YardGeometry (cached geometry if omitted)
+        """
+        rows = ContainerPosition.objects.values_list(
+            "id",
+            "zone",
+            "row",
+            "bay",
+            "tier",
+            "sub_slot",
+            "container_entry_id",
+            "container_entry__status",
+            "container_entry__container__iso_type",
+            "container_entry__entry_time",
+            "container_entry__company_id",
+            "container_entry__container__container_number",
+        )
+        preorders = estimator.get_active_preorder_operations() if estimator else {}
+
+        occupants = {}
+        for (
+            position_id,
+            zone,
+            row,
+            bay,
+            tier,
+            sub_slot,
+            entry_id,
+            status,
+            iso_type,
+            entry_time,
+            company_id,
+            container_number,
+        ) in rows.iterator():
+            occupant = YardOccupant(
+                position_id=position_id,
+                entry_id=entry_id,
+                container_size=container_size_from_iso(iso_type or ""),
+                status=status or "",
+                entry_time=entry_time,
+                company_id=company_id,
+                container_number=container_number or "",
+            )
+            if estimator and entry_id:
+                occupant.expected_departure = estimator.estimate_departure(
+                    entry_time,
+                    company_id,
+                    occupant.status,
+                    iso_type or "",
+                    preorders.get(entry_id),
+                )
+            occupants[(zone, row, bay, tier, sub_slot)] = occupant
+
+        return cls(occupants, geometry)
+
+    def copy(self) -> "YardSnapshot":
+        return YardSnapshot(
+            {key: replace(value) for key, value in self.occupants.items()},
+            self._geometry,
+        )
+
+    def is_occupied(self, zone: str, row: int, bay: int, tier: int, sub_slot: str = "A") -> bool:
+        return (zone, row, bay, tier, sub_slot) in self.occupants
+
+    def occupant_below(
+        self, zone: str, row: int, bay: int, tier: int, sub_slot: str = "A"
+    ) -> YardOccupant | None:
+        """
+        Container directly below, as PlacementService._get_container_below
+        resolves it (first sub-slot in A, B order at tier - 1).
+        """
+        if tier == 1:
+            return None
+        for other_slot in ("A", "B"):
+            below = self.occupants.get((zone, row, bay, tier - 1, other_slot))
+            if below:
+                return below
+        return None
+
+    def stack(self, zone: str, row: int, bay: int, sub_slot: str = "A") -> list[YardOccupant]:
+        """Occupants of one stack from the ground up (stops at the first gap)."""
+        result = []
+        tier = 1
+        while (zone, row, bay, tier, sub_slot) in self.occupants:
+            result.append(self.occupants[(zone, row, bay, tier, sub_slot)])
+            tier += 1
+        return result
+
+    def stacks(self) -> dict[StackKey, list[YardOccupant]]:
+        """All non-empty stacks, keyed by (zone, row, bay, sub_slot)."""
+        keys = {(z, r, b, s) for (z, r, b, _t, s) in self.occupants}
+        return {key: self.stack(*key) for key in sorted(keys)}
+
+    def place(self, coordinate: Coordinate, occupant: YardOccupant) -> None:
+        self.occupants[coordinate] = occupant
+
+    def remove(self, coordinate: Coordinate) -> YardOccupant | None:
+        return self.occupants.pop(coordinate, None)
+
+    def can_place(
+        self,
+        zone: str,
+        row: int,
+        bay: int,
+        tier: int,
+        sub_slot: str,
+        container_size: str,
+        status: str,
+    ) -> bool:
+        """
+        Check placement rules in memory.
+
+        Mirrors the checks in PlacementService.assign_position: slot within
+        yard geometry, free slot, support below, row segregation, sub-slot by
+        size, size compatibility and weight distribution.
+        """
+        if not self.geometry.is_valid_slot(zone, row, bay, tier):
+            return False
+        if self.is_occupied(zone, row, bay, tier, sub_slot):
+            return False
+
+        is_long = container_size in ("40ft", "45ft")
+        if is_long and sub_slot != "A":
+            return False
+        if not self.geometry.accepts(zone, row, container_size):
+            return False
+
+        if tier == 1:
+            return True
+        if not self.is_occupied(zone, row, bay, tier - 1, sub_slot):
+            return False
+
+        below = self.occupant_below(zone, row, bay, tier, sub_slot)
+        if below is None or below.entry_id is None:
+            return True
+        if is_long and below.container_size == "20ft":
+            return False
+        return not (status == "LADEN" and below.status == "EMPTY")
@@ -1,17 +1,26 @@
 """
 Django signals for terminal_operations app.
-Handles automatic notifications when entries are created.
+Handles automatic notifications when entries are created, keeps the
+cached yard geometry in sync with YardBlock configuration, keeps entry
+search documents in sync with renamed containers, owners, companies and
+users and feeds the in-memory typeahead index.
 """
 
-import asyncio
 import logging
-import threading
 
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from apps.terminal_operations.models import ContainerEntry
+from apps.accounts.models import Company, CustomUser
+from apps.containers.models import Container
+from apps.terminal_operations.models import (
+    ContainerEntry,
+    ContainerOwner,
+    PreOrder,
+    YardBlock,
+)
+from apps.vehicles.models import VehicleEntry
 
 
 logger = logging.getLogger(__name__)
@@ -21,7 +30,7 @@ logger = logging.getLogger(__name__)
 def notify_telegram_groups_on_entry(sender, instance, created, **kwargs):
     """
     Send Telegram notification to appropriate group when a new entry is created.
-    Runs asynchronously in background thread to avoid blocking the save operation.
+    Runs on the shared Telegram client loop to avoid blocking the save operation.
 
     Uses transaction.on_commit() to ensure notifications are only sent after
     the database transaction successfully commits.
@@ -41,43 +50,162 @@ def notify_telegram_groups_on_entry(sender, instance, created, **kwargs):
         TelegramNotificationService,
     )
 
-    def send_notification_in_background():
-        """Run async notification in new event loop (background thread)."""
+    def schedule_notification():
+        """Queue the notification on the shared Telegram client loop."""
+        from apps.core.services.telegram_client import get_telegram_client
+
         try:
             # Re-fetch entry with all required relationships to avoid cache misses
             # This ensures container_owner, container, recorded_by, and company are pre-loaded
-            entry = ContainerEntry.objects.select_related("container_owner", "container", "recorded_by", "company").get(
-                pk=instance.pk
-            )
-
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-            try:
-                # Create service and send notification
-                service = TelegramNotificationService()
-                loop.run_until_complete(service.notify_group_about_entry(entry))
-            finally:
-                # Clean up event loop
-                loop.close()
+            entry = ContainerEntry.objects.select_related(
+                "container_owner", "container", "recorded_by", "company"
+            ).get(pk=instance.pk)
 
+            service = TelegramNotificationService()
+            get_telegram_client().schedule(service.notify_group_about_entry(entry))
+            logger.debug(f"Entry {instance.id}: Queued group notification")
         except Exception as e:
             logger.error(
-                f"Failed to send background notification for entry {getattr(instance, 'id', 'unknown')}: {e}",
+                f"Failed to queue notification for entry {getattr(instance, 'id', 'unknown')}: {e}",
                 exc_info=True,
             )
 
-    def schedule_notification():
-        """Schedule notification to run after transaction commits."""
-        # Launch background thread (daemon so it doesn't block shutdown)
-        thread = threading.Thread(
-            target=send_notification_in_background,
-            daemon=True,
-            name=f"telegram-notify-{instance.id}",
-        )
-        thread.start()
-        logger.debug(f"Entry {instance.id}: Launched background notification thread")
-
     # Only send notification after transaction commits successfully
     transaction.on_commit(schedule_notification)
+
+
+@receiver(post_save, sender=YardBlock)
+@receiver(post_delete, sender=YardBlock)
+def invalidate_yard_geometry_on_change(sender, instance, **kwargs):
+    """Drop cached yard geometry now and again once the change is committed."""
+    from apps.terminal_operations.services.yard_geometry import invalidate_yard_geometry
+
+    invalidate_yard_geometry()
+    transaction.on_commit(invalidate_yard_geometry)
+
+
+@receiver(post_delete, sender=ContainerEntry)
+def unindex_deleted_entry(sender, instance, using, **kwargs):
+    """Remove a deleted entry from the search index."""
+    from apps.terminal_operations.services.entry_search import unindex_entry
+
+    unindex_entry(instance.pk, using=using)
+
+
+# Related object -> (ContainerEntry lookup, attributes indexed in the document)
+SEARCH_RELATED_SOURCES = {
+    Container: ("container", ("container_number",)),
+    ContainerOwner: ("container_owner", ("name",)),
+    Company: ("company", ("name",)),
+    CustomUser: ("recorded_by", ("username", "email", "first_name", "last_name")),
+}
+
+
+def _search_source_values(sender, instance) -> tuple:
+    _lookup, attributes = SEARCH_RELATED_SOURCES[sender]
+    return tuple(getattr(instance, attribute) for attribute in attributes)
+
+
+@receiver(pre_save, sender=Container)
+@receiver(pre_save, sender=ContainerOwner)
+@receiver(pre_save, sender=Company)
+@receiver(pre_save, sender=CustomUser)
+def remember_indexed_names(sender, instance, raw, using, update_fields, **kwargs):
+    """Keep the stored indexed values so post_save can tell a rename."""
+    instance._indexed_values = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    _lookup, attributes = SEARCH_RELATED_SOURCES[sender]
+    if update_fields is not None and not set(attributes) & set(update_fields):
+        return
+    instance._indexed_values = (
+        sender._default_manager.using(using)
+        .filter(pk=instance.pk)
+        .values_list(*attributes)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Container)
+@receiver(post_save, sender=ContainerOwner)
+@receiver(post_save, sender=Company)
+@receiver(post_save, sender=CustomUser)
+def refresh_entry_search_on_rename(sender, instance, created, using, **kwargs):
+    """Rebuild search documents of the entries pointing at a renamed object."""
+    old_values = getattr(instance, "_indexed_values", None)
+    if created or old_values is None:
+        return
+    instance._indexed_values = None
+    if old_values == _search_source_values(sender, instance):
+        return
+
+    from apps.terminal_operations.services.entry_search import refresh_search_documents
+
+    lookup, _attributes = SEARCH_RELATED_SOURCES[sender]
+    refresh_search_documents(
+        ContainerEntry.objects.using(using).filter(**{lookup: instance})
+    )
+
+
+@receiver(post_save, sender=Container)
+def add_container_to_typeahead(sender, instance, created, **kwargs):
+    """Make new container numbers suggestible."""
+    if not created:
+        return
+
+    from apps.terminal_operations.services.typeahead_service import (
+        normalize_container_number,
+        schedule_index_update,
+    )
+
+    number = normalize_container_number(instance.container_number)
+    schedule_index_update(lambda index: index.containers.add(number))
+
+
+@receiver(post_save, sender=ContainerEntry)
+@receiver(post_delete, sender=ContainerEntry)
+def update_typeahead_container_status(sender, instance, signal, **kwargs):
+    """Track which container numbers have an active entry."""
+    from apps.terminal_operations.services.typeahead_service import (
+        schedule_index_update,
+    )
+
+    number, entry_id = instance.container.container_number, instance.pk
+    entry_status, entry_time = instance.status, instance.entry_time
+    active = signal is post_save and instance.exit_date is None
+    schedule_index_update(
+        lambda index: index.update_container_entry(
+            number, entry_id, entry_status, entry_time, active
+        )
+    )
+
+
+@receiver(post_save, sender=VehicleEntry)
+def update_typeahead_vehicle_status(sender, instance, **kwargs):
+    """Track plates and which vehicles are on terminal."""
+    from apps.terminal_operations.services.typeahead_service import (
+        schedule_index_update,
+    )
+
+    plate, entry_id = instance.license_plate, instance.pk
+    vehicle_type, entry_time = instance.vehicle_type, instance.entry_time
+    on_terminal = instance.status == "ON_TERMINAL"
+    schedule_index_update(
+        lambda index: index.update_vehicle_entry(
+            plate, entry_id, vehicle_type, entry_time, on_terminal
+        )
+    )
+
+
+@receiver(post_save, sender=PreOrder)
+def update_typeahead_preorder_status(sender, instance, **kwargs):
+    """Track plates with pending pre-orders."""
+    from apps.terminal_operations.services.typeahead_service import (
+        schedule_index_update,
+    )
+
+    plate, preorder_id = instance.plate_number, instance.pk
+    operation_type, pending = instance.operation_type, instance.status == "PENDING"
+    schedule_index_update(
+        lambda index: index.update_preorder(plate, preorder_id, operation_type, pending)
+    )
@@ -9,6 +9,7 @@ from .views import (
     PlateRecognizerAPIView,
     PreOrderViewSet,
     TerminalVehicleViewSet,
+    TypeaheadViewSet,
     WorkOrderViewSet,
     YardSlotViewSet,
 )
@@ -26,6 +27,7 @@ router.register(r"placement", PlacementViewSet, basename="placement")
 router.register(r"work-orders", WorkOrderViewSet, basename="work-order")
 router.register(r"terminal-vehicles", TerminalVehicleViewSet, basename="terminal-vehicle")
 router.register(r"yard", YardSlotViewSet, basename="yard-slot")
+router.register(r"typeahead", TypeaheadViewSet, basename="typeahead")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,7 +1,4 @@
-import io
-
 from django.db import models
-from django.http import FileResponse
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
@@ -14,10 +11,19 @@ from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
 
 from apps.core.exceptions import BusinessLogicError
-from apps.core.pagination import StandardResultsSetPagination
+from apps.core.pagination import (
+    CursorResultsSetPagination,
+    StandardOrCursorPagination,
+    StandardResultsSetPagination,
+)
+from apps.core.services.streaming_export import parse_export_format
 from apps.core.utils import safe_int_param
 
-from .filters import ContainerEntryFilter
+from .filters import (
+    ContainerEntryFilter,
+    ContainerEntrySearchFilter,
+    SearchRankOrderingFilter,
+)
 from .models import ContainerEntry, ContainerOwner, CraneOperation
 from .serializers import (
     ContainerEntryImportSerializer,
@@ -27,6 +33,7 @@ from .serializers import (
     ContainerPositionSerializer,
     CraneOperationSerializer,
     PlacementAssignRequestSerializer,
+    PlacementConsolidationRequestSerializer,
     PlacementMoveRequestSerializer,
     PlacementSuggestRequestSerializer,
     PlateRecognitionRequestSerializer,
@@ -36,11 +43,13 @@ from .serializers import (
     VehicleDetectionResponseSerializer,
 )
 from .services import (
-    ContainerEntryExportService,
-    ContainerEntryImportService,
     ContainerEntryService,
     CraneOperationService,
+    TypeaheadService,
+    typeahead_service,
 )
+from .services.entry_projection import with_list_projection
+from .services.typeahead_service import normalize_container_number, normalize_plate
 
 
 class ContainerOwnerViewSet(viewsets.ModelViewSet):
@@ -52,6 +61,8 @@ class ContainerOwnerViewSet(viewsets.ModelViewSet):
     serializer_class = ContainerOwnerSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    # Includes the JWT user lookup (see apps.core.query_budget)
+    query_budget = {"list": 3, "retrieve": 2}
     filter_backends = [SearchFilter, OrderingFilter]
     search_fields = ["name", "slug"]
     ordering_fields = ["name", "created_at"]
@@ -132,9 +143,18 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
     ).all()
     serializer_class = ContainerEntrySerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    # ?pagination=cursor switches to keyset pagination on entry_time_idx
+    pagination_class = StandardOrCursorPagination
+    # Constant per page thanks to with_list_projection (plus the JWT user lookup)
+    query_budget = {"list": 5, "retrieve": 4}
     parser_classes = [JSONParser, MultiPartParser, FormParser]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # ?search= and ?search_text= query the indexed entry search document
+    # (see services/entry_search.py) and rank matches unless ?ordering= is given
+    filter_backends = [
+        DjangoFilterBackend,
+        ContainerEntrySearchFilter,
+        SearchRankOrderingFilter,
+    ]
     filterset_class = ContainerEntryFilter
     # Allow all standard REST methods including PATCH for partial updates
     http_method_names = [
@@ -147,28 +167,6 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         "options",
         "trace",
     ]
-    search_fields = [
-        # Container information
-        "container__container_number",
-        # Transport information
-        "transport_number",
-        "entry_train_number",
-        "exit_train_number",
-        "exit_transport_number",
-        # Business information
-        "client_name",
-        "container_owner__name",  # ForeignKey - search by related name
-        "cargo_name",
-        "destination_station",
-        "location",
-        # Additional information
-        "note",
-        # User information
-        "recorded_by__username",
-        "recorded_by__email",
-        "recorded_by__first_name",
-        "recorded_by__last_name",
-    ]
     ordering_fields = [
         "entry_time",
         "exit_date",
@@ -192,6 +190,14 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         """
         return ContainerEntryService()
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ["list", "retrieve"]:
+            # Dwell, pending-invoice flag and attachments in a constant
+            # number of queries per page
+            queryset = with_list_projection(queryset)
+        return queryset
+
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return ContainerEntryWithImagesSerializer
@@ -394,8 +400,8 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         - 200: { "on_terminal": false }
         - 200: { "on_terminal": true, "entry": { id, container_number, entry_time, status } }
         """
-        container_number = (
-            request.query_params.get("container_number", "").strip().upper()
+        container_number = normalize_container_number(
+            request.query_params.get("container_number", "")
         )
 
         if not container_number or len(container_number) < 4:
@@ -612,6 +618,8 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         GET /api/terminal/entries/{id}/events/
 
         Returns chronological list of all events for this container entry.
+        With ?pagination=cursor the timeline is returned in keyset pages
+        (standard paginated envelope, newest first).
         """
         from .serializers import ContainerEventSerializer
         from .services import ContainerEventService
@@ -620,6 +628,14 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         event_service = ContainerEventService()
         events = event_service.get_container_timeline(entry)
 
+        if StandardOrCursorPagination().use_cursor(request):
+            paginator = CursorResultsSetPagination()
+            paginator.ordering = ("-event_time", "-id")
+            page = paginator.paginate_queryset(events, request, view=None)
+            return paginator.get_paginated_response(
+                ContainerEventSerializer(page, many=True).data
+            )
+
         return Response({
             "success": True,
             "data": {
@@ -663,7 +679,11 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
             # Get uploaded file
             uploaded_file = serializer.validated_data["file"]
 
-            # Create import service
+            # Create import service (pandas is only loaded for imports)
+            from .services.container_entry_import_service import (
+                ContainerEntryImportService,
+            )
+
             import_service = ContainerEntryImportService()
 
             # Perform import
@@ -692,7 +712,7 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="Export entries to Excel",
-        description="Export container entries to an Excel file (.xlsx). Respects all applied filters, search, and ordering parameters.",
+        description="Export container entries to an Excel file (.xlsx) or CSV. Respects all applied filters, search, and ordering parameters.",
         parameters=[
             {
                 "name": "container_owner_id",
@@ -743,6 +763,13 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
                 "required": False,
                 "schema": {"type": "string"},
             },
+            {
+                "name": "export_format",
+                "in": "query",
+                "description": "File format: xlsx (default) or csv (for very large ranges)",
+                "required": False,
+                "schema": {"type": "string", "enum": ["xlsx", "csv"]},
+            },
         ],
         responses={
             200: bytes,
@@ -778,6 +805,7 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         - entry_date_before: End date for date range filter (YYYY-MM-DD)
         - status: Filter by container status (EMPTY, LADEN or Russian names)
         - search_text: Full-text search across all fields
+        - export_format: xlsx (default) or csv for very large ranges
 
         Examples:
 
@@ -790,31 +818,28 @@ class ContainerEntryViewSet(viewsets.ModelViewSet):
         3. Export with multiple filters:
         GET /api/terminal/entries/export_excel/?status=EMPTY&entry_date_after=2025-01-01&container_owner_ids=5&client_name__icontains=Client
 
-        Returns: Excel file (.xlsx) with all container entry data in Russian columns.
+        Returns: Excel file (.xlsx) or CSV with all container entry data under
+        English and Russian headers.
         """
+        export_format = parse_export_format(request.query_params.get("export_format"))
+
         try:
             # Get filtered queryset (respects all filters, search, and ordering)
             queryset = self.filter_queryset(self.get_queryset())
 
-            # Create export service
-            export_service = ContainerEntryExportService()
+            # Create export service (openpyxl is only loaded for exports)
+            from .services.container_entry_export_service import (
+                ContainerEntryExportService,
+            )
 
-            # Generate Excel file
-            excel_bytes = export_service.export_to_excel(queryset)
+            export_service = ContainerEntryExportService()
 
             # Generate filename with timestamp
             timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"container_entries_{timestamp}.xlsx"
-
-            # Wrap bytes in BytesIO for FileResponse
-            buffer = io.BytesIO(excel_bytes)
 
-            # Return file response
-            response = FileResponse(
-                buffer,
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                as_attachment=True,
-                filename=filename,
+            # Rows are read in chunks and streamed to the client
+            response = export_service.export_response(
+                queryset, f"container_entries_{timestamp}", export_format
             )
 
             return response
@@ -981,6 +1006,7 @@ class PreOrderViewSet(viewsets.ReadOnlyModelViewSet):
 
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
+    query_budget = {"list": 3, "retrieve": 2}
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     search_fields = ["plate_number", "customer__first_name", "customer__phone_number"]
     ordering_fields = ["created_at", "status", "plate_number"]
@@ -1006,7 +1032,7 @@ class PreOrderViewSet(viewsets.ReadOnlyModelViewSet):
         # Filter by plate number (partial match)
         plate = self.request.query_params.get("plate_number")
         if plate:
-            queryset = queryset.filter(plate_number__icontains=plate.upper())
+            queryset = queryset.filter(plate_number__icontains=normalize_plate(plate))
 
         # Filter by operation type
         operation_type = self.request.query_params.get("operation_type")
@@ -1150,6 +1176,7 @@ class PlacementViewSet(viewsets.GenericViewSet):
     - Auto-suggesting optimal positions for containers
     - Assigning containers to positions
     - Moving containers between positions
+    - Planning yard consolidation (freeing bays or rows)
     - Listing available positions
     - Listing unplaced containers
     """
@@ -1216,10 +1243,82 @@ class PlacementViewSet(viewsets.GenericViewSet):
         result = service.suggest_position(
             container_entry_id=serializer.validated_data["container_entry_id"],
             zone_preference=serializer.validated_data.get("zone_preference"),
+            strategy=serializer.validated_data.get("strategy", "sequential"),
         )
 
         return Response({"success": True, "data": result})
 
+    @extend_schema(
+        summary="Expected rehandles for current yard",
+        description=(
+            "Estimates departure for every placed container (pre-orders, company "
+            "history, dwell statistics) and simulates exits stack by stack to count "
+            "expected rehandles (shuffle moves) for the current yard configuration."
+        ),
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "data": {"type": "object"},
+                },
+            }
+        },
+        tags=["Placement"],
+    )
+    @action(detail=False, methods=["get"], url_path="rehandle-report")
+    def rehandle_report(self, request):
+        """Get expected rehandles for the current yard configuration."""
+        from apps.terminal_operations.services.yard_rehandle_service import (
+            YardRehandleService,
+        )
+
+        data = YardRehandleService().get_rehandle_report()
+        return Response({"success": True, "data": data})
+
+    @extend_schema(
+        summary="Plan yard consolidation",
+        description=(
+            "Proposes a minimal sequence of container relocations that frees whole "
+            "bays or rows while respecting all stacking rules. Bays with pending work "
+            "orders are left untouched. With create_work_orders=true a RELOCATION "
+            "work order is created for every move (to be completed in step order)."
+        ),
+        request=PlacementConsolidationRequestSerializer,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "success": {"type": "boolean"},
+                    "data": {"type": "object"},
+                },
+            }
+        },
+        tags=["Placement"],
+    )
+    @action(detail=False, methods=["post"], url_path="consolidation-plan")
+    def consolidation_plan(self, request):
+        """Plan (and optionally schedule) relocations that free bays or rows."""
+        from apps.terminal_operations.services.yard_consolidation_service import (
+            YardConsolidationService,
+        )
+
+        serializer = PlacementConsolidationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        service = YardConsolidationService()
+        plan = service.plan(
+            unit=serializer.validated_data["unit"],
+            zone=serializer.validated_data.get("zone"),
+            max_moves=serializer.validated_data["max_moves"],
+        )
+
+        if serializer.validated_data["create_work_orders"] and plan["moves"]:
+            work_orders = service.create_work_orders(plan, created_by=request.user)
+            plan["work_order_ids"] = [order.id for order in work_orders]
+
+        return Response({"success": True, "data": plan})
+
     @extend_schema(
         summary="Assign container to position",
         description=(
@@ -2181,3 +2280,72 @@ class YardSlotViewSet(viewsets.GenericViewSet):
                 "count": len(serializer.data),
             }
         )
+
+
+class TypeaheadViewSet(viewsets.ViewSet):
+    """
+    Lightweight typeahead for container numbers and plates.
+    Served from an in-memory index - no database query per keystroke.
+    """
+
+    permission_classes = [IsAuthenticated]
+    # Index rebuild (5 queries) plus the JWT user lookup
+    query_budget = 6
+
+    @extend_schema(
+        summary="Container number / plate typeahead",
+        description=(
+            "Prefix and fuzzy (one wrong character) suggestions for container numbers "
+            "or plates, with ISO 6346 check digit validation and live status: active "
+            "container entry, vehicle on terminal, pending pre-order."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="q",
+                type=str,
+                required=True,
+                description="Partial container number or plate (spaces/dashes ignored)",
+            ),
+            OpenApiParameter(
+                name="kind",
+                type=str,
+                required=False,
+                enum=list(typeahead_service.KINDS),
+                description="What to suggest (default: container)",
+            ),
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                required=False,
+                description="Maximum suggestions (default 10, max 50)",
+            ),
+            OpenApiParameter(
+                name="fuzzy",
+                type=bool,
+                required=False,
+                description="Include one-substitution matches (default true)",
+            ),
+        ],
+        tags=["Typeahead"],
+    )
+    def list(self, request):
+        """GET /api/terminal/typeahead/?q=MSKU12&kind=container"""
+        kind = request.query_params.get("kind", "container")
+        if kind not in typeahead_service.KINDS:
+            raise BusinessLogicError(
+                message=f"Недопустимый тип подсказки: {kind}",
+                error_code="INVALID_TYPEAHEAD_KIND",
+            )
+
+        data = TypeaheadService().suggest(
+            request.query_params.get("q", ""),
+            kind=kind,
+            limit=safe_int_param(
+                request.query_params.get("limit"),
+                typeahead_service.DEFAULT_LIMIT,
+                min_val=1,
+                max_val=typeahead_service.MAX_LIMIT,
+            ),
+            fuzzy=request.query_params.get("fuzzy", "true").lower() != "false",
+        )
+        return Response({"success": True, "data": data})
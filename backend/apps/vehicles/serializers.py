@@ -2,7 +2,7 @@ from rest_framework import serializers
 
 from apps.accounts.models import CustomUser
 from apps.files.models import File
-from apps.files.serializers import FileSerializer
+from apps.files.serializers import FileSerializer, UploadedImageField
 
 from .models import Destination, VehicleEntry
 
@@ -63,13 +63,13 @@ class VehicleEntrySerializer(serializers.ModelSerializer):
     # Write-only fields for photo uploads (supports multiple files)
     # Required only on create, not on update
     entry_photo_files = serializers.ListField(
-        child=serializers.ImageField(),
+        child=UploadedImageField(),
         write_only=True,
         required=False,
         help_text="Список фото автомобиля при въезде (можно несколько)",
     )
     exit_photo_files = serializers.ListField(
-        child=serializers.ImageField(),
+        child=UploadedImageField(),
         write_only=True,
         required=False,
         help_text="Список фото автомобиля при выезде (можно несколько)",
@@ -428,7 +428,7 @@ class VehicleExitSerializer(serializers.Serializer):
         required=True, help_text="Государственный номер автомобиля"
     )
     exit_photo_files = serializers.ListField(
-        child=serializers.ImageField(),
+        child=UploadedImageField(),
         required=False,  # Optional - web interface may not have photos
         allow_empty=True,
         help_text="Список фото автомобиля при выезде (опционально)",
@@ -486,7 +486,7 @@ class VehicleCheckInSerializer(serializers.Serializer):
         required=True, help_text="Государственный номер автомобиля"
     )
     entry_photo_files = serializers.ListField(
-        child=serializers.ImageField(),
+        child=UploadedImageField(),
         required=True,
         help_text="Список фото автомобиля при въезде (обязательно)",
     )
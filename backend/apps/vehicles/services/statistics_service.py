@@ -5,6 +5,7 @@ from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from apps.core.services import BaseService
+from apps.core.services.dwell_analytics import DwellAnalyticsService, dwell_hours
 
 from ..models import VehicleEntry
 
@@ -77,40 +78,20 @@ class VehicleStatisticsService(BaseService):
         now = timezone.now()
         thirty_days_ago = now - timedelta(days=30)
 
-        # Average dwell time from exited vehicles in last 30 days
-        # Exclude entries with null entry_time (data integrity issue)
-        exited_vehicles = VehicleEntry.objects.filter(
-            exit_time__isnull=False,
-            entry_time__isnull=False,
-            exit_time__gte=thirty_days_ago,
-        )
-
-        # Calculate average dwell in Python (more reliable than DB-level timedelta)
-        total_dwell_seconds = 0
-        count = 0
-        dwell_by_type = {"LIGHT": [], "CARGO": []}
-
-        for entry in exited_vehicles:
-            # Skip entries where entry_time is None (data integrity issue)
-            if entry.entry_time is None:
-                continue
-            dwell = (entry.exit_time - entry.entry_time).total_seconds()
-            total_dwell_seconds += dwell
-            count += 1
-            if entry.vehicle_type in dwell_by_type:
-                dwell_by_type[entry.vehicle_type].append(dwell)
-
-        avg_dwell_hours = (
-            round(total_dwell_seconds / count / 3600, 1) if count > 0 else 0
+        # Average dwell time from exited vehicles in last 30 days (in the database)
+        # Entries with null entry_time (data integrity issue) are excluded
+        analytics = DwellAnalyticsService(
+            VehicleEntry.objects.filter(exit_time__gte=thirty_days_ago),
+            end_field="exit_time",
+            now=now,
         )
+        avg_dwell_hours = dwell_hours(analytics.summary()["average"]) or 0
 
         # Average by type
-        avg_dwell_by_type = {}
-        for vtype, dwells in dwell_by_type.items():
-            if dwells:
-                avg_dwell_by_type[vtype] = round(sum(dwells) / len(dwells) / 3600, 1)
-            else:
-                avg_dwell_by_type[vtype] = 0
+        averages = analytics.averages_by("vehicle_type")
+        avg_dwell_by_type = {
+            vtype: dwell_hours(averages.get(vtype)) or 0 for vtype in ("LIGHT", "CARGO")
+        }
 
         # Longest current stay - always return structure for frontend consistency
         longest_stay = {"license_plate": "", "hours": "", "vehicle_type": ""}
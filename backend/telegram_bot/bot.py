@@ -32,7 +32,11 @@ from telegram_bot.handlers import (
     manager_access,
 )
 from telegram_bot.handlers.common import fallback_router
-from telegram_bot.middleware import ManagerAccessMiddleware, UpdateDeduplicationMiddleware
+from telegram_bot.middleware import (
+    HandlerMetricsMiddleware,
+    ManagerAccessMiddleware,
+    UpdateDeduplicationMiddleware,
+)
 
 
 # Configure logging
@@ -84,6 +88,10 @@ async def main():
     dedup_middleware = UpdateDeduplicationMiddleware()
     dp.update.outer_middleware(dedup_middleware)
 
+    # Handler latency and DB time (served at /bot/metrics in webhook mode)
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
+
     # Manager access middleware to inject user into handlers
     dp.message.middleware(ManagerAccessMiddleware())
     dp.callback_query.middleware(ManagerAccessMiddleware())
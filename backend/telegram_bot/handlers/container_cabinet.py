@@ -8,9 +8,10 @@ import logging
 
 from aiogram import F, Router
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, FSInputFile, InputMediaPhoto, Message
+from aiogram.types import CallbackQuery, Message
 from asgiref.sync import sync_to_async
 
+from apps.files.telegram import send_photo_album
 from telegram_bot.keyboards.customer import (
     get_container_detail_keyboard,
     get_container_list_empty_keyboard,
@@ -388,12 +389,11 @@ async def send_container_photos(callback: CallbackQuery, state: FSMContext, user
     def get_photos_with_data(eid, ent):
         photos = cabinet_service.get_container_photos(eid)
         container_number = ent.container.container_number
-        photo_paths = [(att.file.file.path,) for att in photos]
-        return photo_paths, container_number
+        return [att.file for att in photos], container_number
 
-    photo_data, container_number = await sync_to_async(get_photos_with_data)(entry_id, entry)
+    photo_files, container_number = await sync_to_async(get_photos_with_data)(entry_id, entry)
 
-    if not photo_data:
+    if not photo_files:
         await callback.answer(get_text("photos_none", lang), show_alert=True)
         return
 
@@ -401,26 +401,17 @@ async def send_container_photos(callback: CallbackQuery, state: FSMContext, user
     await callback.answer(get_text("photos_sending", lang))
 
     try:
-        # Build media group
-        media_group = []
-        for idx, (file_path,) in enumerate(photo_data):
-            input_file = FSInputFile(file_path)
-
-            if idx == 0:
-                caption = f"📦 {container_number}"
-                media_group.append(InputMediaPhoto(media=input_file, caption=caption))
-            else:
-                media_group.append(InputMediaPhoto(media=input_file))
-
-        # Send album
-        await callback.bot.send_media_group(
-            chat_id=callback.from_user.id,
-            media=media_group,
+        # Send album (by stored Telegram file_id where known)
+        sent_messages = await send_photo_album(
+            callback.bot,
+            callback.from_user.id,
+            photo_files,
+            caption=f"📦 {container_number}",
         )
 
         # Confirmation message
         await callback.message.answer(
-            get_text("photos_sent", lang).format(count=len(media_group)),
+            get_text("photos_sent", lang).format(count=len(sent_messages)),
         )
 
     except Exception as e:
@@ -329,7 +329,8 @@ async def download_photos_from_telegram(
         photo_file_ids: List of Telegram file IDs
 
     Returns:
-        List of InMemoryUploadedFile objects ready for Django
+        List of InMemoryUploadedFile objects ready for Django, carrying
+        telegram_file_id / telegram_file_unique_id attributes
     """
     photos = []
     for file_id in photo_file_ids:
@@ -347,6 +348,10 @@ async def download_photos_from_telegram(
                 photo_io.getbuffer().nbytes,
                 None,
             )
+            # Stored on the File row, so notifications can send the photo
+            # by id instead of uploading it again
+            django_file.telegram_file_id = file_id
+            django_file.telegram_file_unique_id = file.file_unique_id
             photos.append(django_file)
         except Exception as e:
             logger.error(f"Failed to download photo {file_id}: {e}")
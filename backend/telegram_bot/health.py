@@ -1,7 +1,8 @@
 """
 Health check endpoints for Telegram Bot webhook server.
 
-Provides /bot/health and /bot/ready endpoints for monitoring and orchestration.
+Provides /bot/health, /bot/ready and /bot/metrics endpoints for monitoring
+and orchestration.
 """
 
 import logging
@@ -109,3 +110,21 @@ async def readiness_check(request: web.Request) -> web.Response:
         },
         status=status_code,
     )
+
+
+async def metrics_endpoint(request: web.Request) -> web.Response:
+    """
+    Prometheus metrics of the bot process (handler latency, DB time,
+    Telegram client queue). See apps.core.metrics.
+
+    Endpoint: GET /bot/metrics
+    """
+    from apps.core.metrics import CONTENT_TYPE, is_authorized, registry
+
+    if not is_authorized(request.headers.get("Authorization")):
+        return web.Response(status=401)
+
+    return web.Response(
+        body=registry.render().encode(),
+        headers={"Content-Type": CONTENT_TYPE},
+    )
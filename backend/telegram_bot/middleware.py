@@ -15,6 +15,7 @@ from aiogram.types import CallbackQuery, Message, TelegramObject, Update
 from asgiref.sync import sync_to_async
 
 from apps.accounts.services import ManagerService
+from apps.core.metrics import timed
 
 
 logger = logging.getLogger(__name__)
@@ -123,6 +124,32 @@ class UpdateDeduplicationMiddleware(BaseMiddleware):
             logger.debug(f"Cleaned up {len(old_keys)} old dedup entries")
 
 
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Time message and callback handlers (apps.core.metrics, kind "bot").
+
+    Registered as an inner middleware, so the matched handler is known and
+    names the operation (e.g. "telegram_bot.handlers.entry.start_entry").
+    DB time includes queries run through sync_to_async.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        callback = getattr(handler_object, "callback", None)
+        if callback is None:
+            operation = type(event).__name__
+        else:
+            operation = f"{callback.__module__}.{callback.__qualname__}"
+
+        with timed(operation, kind="bot"):
+            return await handler(event, data)
+
+
 def _get_user_bot_access_sync(user) -> bool:
     """
     Synchronous version - Get bot_access from profile first, fall back to legacy field.
@@ -1,16 +1,16 @@
 """
 Telegram notification service for sending messages to users from Django context.
-Bridges sync Django with async aiogram Bot API.
+Messages are queued on the process-wide Telegram client
+(apps.core.services.telegram_client), so sync Django code never blocks on
+the Bot API.
 """
 
 import logging
 import os
 
-from aiogram import Bot
-from aiogram.enums import ParseMode
-from asgiref.sync import async_to_sync
 from django.conf import settings
 
+from apps.core.services.telegram_client import get_telegram_client
 from telegram_bot.translations import get_text
 
 
@@ -30,47 +30,37 @@ class TelegramNotificationService:
         if not self.bot_token:
             logger.warning("TELEGRAM_BOT_TOKEN not configured - notifications disabled")
 
-    async def _send_message(self, chat_id: int, text: str) -> bool:
+    def send_message(self, chat_id: int, text: str) -> bool:
         """
-        Internal async method to send a Telegram message.
+        Queue a Telegram message on the shared client (does not block).
+
+        The message is sent from the client's event loop, so request
+        handlers and open transactions do not wait for the Telegram API.
+        Delivery failures are logged by the client.
 
         Args:
             chat_id: Telegram user ID
             text: Message text (HTML format supported)
 
         Returns:
-            True if sent successfully, False otherwise
+            True if the message was queued, False otherwise
         """
         if not self.bot_token:
             return False
 
-        bot = Bot(token=self.bot_token)
+        from aiogram.enums import ParseMode
+
         try:
-            await bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=ParseMode.HTML,
+            get_telegram_client().submit(
+                chat_id,
+                lambda bot: bot.send_message(
+                    chat_id=chat_id, text=text, parse_mode=ParseMode.HTML
+                ),
             )
             return True
         except Exception as e:
-            logger.error(f"Failed to send Telegram message to {chat_id}: {e}")
+            logger.error(f"Failed to queue Telegram message to {chat_id}: {e}")
             return False
-        finally:
-            await bot.session.close()
-
-    def send_message(self, chat_id: int, text: str) -> bool:
-        """
-        Send a Telegram message (sync wrapper).
-
-        Args:
-            chat_id: Telegram user ID
-            text: Message text (HTML format supported)
-
-        Returns:
-            True if sent successfully, False otherwise
-        """
-        # Use async_to_sync for proper event loop handling in any context
-        return async_to_sync(self._send_message)(chat_id, text)
 
     def _get_customer_language(self, customer) -> str:
         """Get customer's preferred language, defaulting to Russian."""
@@ -86,7 +76,7 @@ class TelegramNotificationService:
             entry_time: DateTime when vehicle entered
 
         Returns:
-            True if notification sent, False otherwise
+            True if notification queued, False otherwise
         """
         if not customer or not customer.telegram_user_id:
             logger.info(
@@ -111,12 +101,12 @@ class TelegramNotificationService:
 
         if success:
             logger.info(
-                f"Sent check-in notification to customer {customer.id} "
+                f"Queued check-in notification to customer {customer.id} "
                 f"for vehicle {license_plate} (lang={lang})"
             )
         else:
             logger.warning(
-                f"Failed to send check-in notification to customer {customer.id} "
+                f"Failed to queue check-in notification to customer {customer.id} "
                 f"for vehicle {license_plate}"
             )
 
@@ -132,7 +122,7 @@ class TelegramNotificationService:
             exit_time: DateTime when vehicle exited
 
         Returns:
-            True if notification sent, False otherwise
+            True if notification queued, False otherwise
         """
         if not customer or not customer.telegram_user_id:
             logger.info(
@@ -157,12 +147,12 @@ class TelegramNotificationService:
 
         if success:
             logger.info(
-                f"Sent exit notification to customer {customer.id} "
+                f"Queued exit notification to customer {customer.id} "
                 f"for vehicle {license_plate} (lang={lang})"
             )
         else:
             logger.warning(
-                f"Failed to send exit notification to customer {customer.id} "
+                f"Failed to queue exit notification to customer {customer.id} "
                 f"for vehicle {license_plate}"
             )
 
@@ -177,7 +167,7 @@ class TelegramNotificationService:
             license_plate: Vehicle license plate number
 
         Returns:
-            True if notification sent, False otherwise
+            True if notification queued, False otherwise
         """
         if not customer or not customer.telegram_user_id:
             logger.info(
@@ -198,12 +188,12 @@ class TelegramNotificationService:
 
         if success:
             logger.info(
-                f"Sent cancellation notification to customer {customer.id} "
+                f"Queued cancellation notification to customer {customer.id} "
                 f"for vehicle {license_plate} (lang={lang})"
             )
         else:
             logger.warning(
-                f"Failed to send cancellation notification to customer {customer.id} "
+                f"Failed to queue cancellation notification to customer {customer.id} "
                 f"for vehicle {license_plate}"
             )
 
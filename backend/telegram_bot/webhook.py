@@ -14,6 +14,7 @@ import asyncio
 import logging
 import os
 import sys
+import time
 
 import django
 
@@ -24,8 +25,6 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "terminal_app.settings")
 django.setup()
 
-import time
-
 from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
@@ -113,8 +112,12 @@ from telegram_bot.handlers import (
     manager_access,
 )
 from telegram_bot.handlers.common import fallback_router
-from telegram_bot.health import health_check, readiness_check
-from telegram_bot.middleware import ManagerAccessMiddleware, UpdateDeduplicationMiddleware
+from telegram_bot.health import health_check, metrics_endpoint, readiness_check
+from telegram_bot.middleware import (
+    HandlerMetricsMiddleware,
+    ManagerAccessMiddleware,
+    UpdateDeduplicationMiddleware,
+)
 
 
 # Configure logging
@@ -221,6 +224,8 @@ def create_dispatcher() -> Dispatcher:
     # Deduplication middleware at dispatcher level to catch ALL updates before any processing
     dedup_middleware = UpdateDeduplicationMiddleware()
     dp.update.outer_middleware(dedup_middleware)
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
     dp.message.middleware(ManagerAccessMiddleware())
     dp.callback_query.middleware(ManagerAccessMiddleware())
 
@@ -262,7 +267,10 @@ def create_app(bot: Bot, dp: Dispatcher, config: dict) -> web.Application:
     # Register health check endpoints
     app.router.add_get("/bot/health", health_check)
     app.router.add_get("/bot/ready", readiness_check)
-    logger.info("Health check endpoints registered: /bot/health, /bot/ready")
+    app.router.add_get("/bot/metrics", metrics_endpoint)
+    logger.info(
+        "Health check endpoints registered: /bot/health, /bot/ready, /bot/metrics"
+    )
 
     # Setup aiogram lifecycle (startup/shutdown hooks)
     setup_application(app, dp, bot=bot)
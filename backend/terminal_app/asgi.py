@@ -1,7 +1,8 @@
 """
 ASGI config for terminal_app project.
 
-Configures Django Channels for WebSocket support (gate camera real-time events).
+Configures Django Channels for WebSocket support (gate camera real-time events
+and yard layout diffs).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -24,10 +25,19 @@ from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E40
 
 from apps.gate.middleware import JWTAuthMiddleware  # noqa: E402
 from apps.gate.routing import websocket_urlpatterns as gate_websocket_urlpatterns  # noqa: E402
+from apps.terminal_operations.routing import (  # noqa: E402
+    websocket_urlpatterns as yard_websocket_urlpatterns,
+)
+from apps.terminal_operations.services.typeahead_service import (  # noqa: E402
+    warm_typeahead_index,
+)
+
 
+# Build the typeahead index in the background before the first query needs it
+warm_typeahead_index()
 
-# WebSocket URL patterns from gate app
-websocket_urlpatterns = gate_websocket_urlpatterns
+# WebSocket URL patterns from gate and terminal_operations apps
+websocket_urlpatterns = gate_websocket_urlpatterns + yard_websocket_urlpatterns
 
 application = ProtocolTypeRouter(
     {
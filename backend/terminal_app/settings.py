@@ -78,6 +78,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.metrics.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -86,8 +87,24 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "apps.core.query_budget.QueryBudgetMiddleware",
 ]
 
+# Query budgets (apps.core.query_budget): per-request SQL accounting.
+# Headers expose query count/time; strict mode turns over-budget views into errors.
+QUERY_BUDGET_HEADERS = os.getenv("QUERY_BUDGET_HEADERS", str(DEBUG)).lower() in ("true", "1", "yes")
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "False").lower() in ("true", "1", "yes")
+QUERY_BUDGET_DUPLICATE_THRESHOLD = int(os.getenv("QUERY_BUDGET_DUPLICATE_THRESHOLD", "3"))
+
+# Metrics (apps.core.metrics): latency histograms and DB time per request,
+# service call and bot handler, scraped at /metrics (Bearer METRICS_TOKEN; open without one only in DEBUG).
+# Operations slower than METRICS_SLOW_MS are logged; a METRICS_PROFILE_SAMPLE_RATE
+# share of requests runs under cProfile and slow ones are dumped to METRICS_PROFILE_DIR.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_SLOW_MS = int(os.getenv("METRICS_SLOW_MS", "1000"))
+METRICS_PROFILE_SAMPLE_RATE = float(os.getenv("METRICS_PROFILE_SAMPLE_RATE", "0"))
+METRICS_PROFILE_DIR = os.getenv("METRICS_PROFILE_DIR", str(BASE_DIR / "profiles"))
+
 ROOT_URLCONF = "terminal_app.urls"
 
 TEMPLATES = [
@@ -343,15 +360,38 @@ TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "")
 TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
 TELEGRAM_WEBHOOK_PORT = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8001"))
 
+# Server-side notification client (apps.core.services.telegram_client):
+# messages per second across all chats, per private chat and per group
+TELEGRAM_GLOBAL_RATE_LIMIT = float(os.getenv("TELEGRAM_GLOBAL_RATE_LIMIT", "25"))
+TELEGRAM_CHAT_RATE_LIMIT = float(os.getenv("TELEGRAM_CHAT_RATE_LIMIT", "1"))
+TELEGRAM_GROUP_RATE_LIMIT = float(os.getenv("TELEGRAM_GROUP_RATE_LIMIT", "0.33"))
+
 # Gate Camera (Hikvision ANPR) Configuration
 GATE_CAMERA_IP = os.getenv("GATE_CAMERA_IP", "192.168.1.7")
 GATE_CAMERA_PORT = int(os.getenv("GATE_CAMERA_PORT", "80"))
 GATE_CAMERA_USER = os.getenv("GATE_CAMERA_USER", "admin")
 GATE_CAMERA_PASS = os.getenv("GATE_CAMERA_PASS", "")
+# listen_anpr serves /metrics on this host and port (0 = off)
+ANPR_METRICS_HOST = os.getenv("ANPR_METRICS_HOST", "127.0.0.1")
+ANPR_METRICS_PORT = int(os.getenv("ANPR_METRICS_PORT", "0"))
 
 # PlateRecognizer API for ANPR plate reading
 PLATE_RECOGNIZER_API_KEY = os.getenv("PLATE_RECOGNIZER_API_KEY", "")
 
+# Exchange rates: "cbu" (cbu.uz API) or "file" (local JSON in the cbu.uz
+# archive format, for tests and offline deployments)
+EXCHANGE_RATE_SOURCE = os.getenv("EXCHANGE_RATE_SOURCE", "cbu")
+EXCHANGE_RATE_FILE = os.getenv("EXCHANGE_RATE_FILE", str(BASE_DIR / "exchange_rates.json"))
+
+# Log retention (apps.core.services.log_retention, `manage.py archive_logs`):
+# rows older than the retention period are moved to monthly gzip JSONL files
+LOG_ARCHIVE_DIR = os.getenv("LOG_ARCHIVE_DIR", str(BASE_DIR / "log_archive"))
+LOG_RETENTION_DAYS = {
+    "anpr": int(os.getenv("ANPR_LOG_RETENTION_DAYS", "90")),
+    "telegram_activity": int(os.getenv("TELEGRAM_ACTIVITY_LOG_RETENTION_DAYS", "180")),
+    "container_events": int(os.getenv("CONTAINER_EVENT_RETENTION_DAYS", "730")),
+}
+
 # Logging Configuration
 LOGGING = {
     "version": 1,
@@ -375,6 +415,16 @@ LOGGING = {
             "level": "DEBUG" if DEBUG else "INFO",
             "propagate": False,
         },
+        "apps.core.query_budget": {
+            "handlers": ["console"],
+            "level": "INFO" if DEBUG else "WARNING",
+            "propagate": False,
+        },
+        "apps.core.metrics": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "HikvisionANPRService": {
             "handlers": ["console"],
             "level": "DEBUG" if DEBUG else "INFO",
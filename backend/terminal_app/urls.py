@@ -26,12 +26,15 @@ from drf_spectacular.views import (
 )
 from rest_framework.permissions import AllowAny
 
+from apps.core.metrics import metrics_view
+
 
 # In development, make Swagger UI publicly accessible (no login required)
 schema_permission_classes = [AllowAny] if settings.DEBUG else None
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/auth/", include("apps.accounts.urls")),
     path("api/terminal/", include("apps.terminal_operations.urls")),
     path("api/files/", include("apps.files.urls")),
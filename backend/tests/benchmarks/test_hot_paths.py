@@ -0,0 +1,49 @@
+"""
+pytest-benchmark timings of hot paths on a seeded dataset.
+
+Opt-in, since seeding takes a while:
+
+    BENCHMARK_ENTRIES=10000 pytest tests/benchmarks --benchmark-json=out.json
+"""
+
+import os
+
+import pytest
+from django.db import transaction
+
+from apps.core.benchmarks import SCENARIOS, run_once, seed_dataset
+
+
+pytest.importorskip("pytest_benchmark")
+
+ENTRIES = int(os.environ.get("BENCHMARK_ENTRIES", "0"))
+
+pytestmark = pytest.mark.skipif(
+    not ENTRIES, reason="set BENCHMARK_ENTRIES to run benchmarks"
+)
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    """One seeded dataset for the module, rolled back afterwards."""
+    with django_db_blocker.unblock(), transaction.atomic():
+        try:
+            yield seed_dataset(ENTRIES)
+        finally:
+            transaction.set_rollback(True)
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_hot_path(benchmark, dataset, name):
+    scenario = SCENARIOS[name]
+    prepared = scenario.prepare(dataset) if scenario.prepare else None
+
+    timer = benchmark.pedantic(
+        run_once,
+        args=(scenario, dataset, prepared),
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+    benchmark.extra_info["queries"] = timer.db_queries
+    benchmark.extra_info["db_ms"] = round(timer.db_seconds * 1000, 2)
@@ -0,0 +1,77 @@
+"""
+Tests for the benchmark dataset, scenarios and baseline comparison.
+"""
+
+import pytest
+
+from apps.containers.models import Container
+from apps.core.benchmarks import (
+    SCENARIOS,
+    ScenarioResult,
+    compare_results,
+    load_baseline,
+    run_once,
+    run_scenario,
+    save_baseline,
+    seed_dataset,
+)
+from apps.terminal_operations.models import ContainerEntry
+
+
+def _result(name="api.entry_list", median_ms=10.0, queries=4):
+    return ScenarioResult(name, 3, median_ms, median_ms, median_ms, 1.0, queries)
+
+
+@pytest.mark.django_db
+class TestBenchmarkDataset:
+    def test_every_scenario_runs_and_rolls_back(self):
+        dataset = seed_dataset(300)
+        entries = ContainerEntry.objects.count()
+
+        for scenario in SCENARIOS.values():
+            prepared = scenario.prepare(dataset) if scenario.prepare else None
+            timer = run_once(scenario, dataset, prepared)
+            assert timer.db_queries > 0, scenario.name
+
+        assert ContainerEntry.objects.count() == entries == 300
+        assert dataset.unplaced_entry_ids
+
+    def test_seeded_dataset_reused(self):
+        first = seed_dataset(200, seed=7)
+
+        second = seed_dataset(200, seed=7)
+
+        assert Container.objects.count() == 200
+        assert second.unplaced_entry_ids == first.unplaced_entry_ids
+        with pytest.raises(ValueError, match="fresh database"):
+            seed_dataset(300)
+
+    def test_baseline_round_trip(self, tmp_path):
+        dataset = seed_dataset(100)
+        result = run_scenario(
+            SCENARIOS["placement.get_layout"], dataset, rounds=2, warmup=0
+        )
+        path = tmp_path / "baseline.json"
+
+        save_baseline(path, dataset, [result])
+
+        baseline = load_baseline(path)
+        assert baseline["meta"]["entries"] == 100
+        assert baseline["results"]["placement.get_layout"]["queries"] == result.queries
+
+
+class TestCompareResults:
+    baseline = {"results": {"api.entry_list": {"median_ms": 10.0, "queries": 4}}}
+
+    def test_within_tolerance(self):
+        assert compare_results([_result(median_ms=12.0)], self.baseline, 0.25) == []
+
+    def test_slowdown_and_extra_queries_flagged(self):
+        regressions = compare_results(
+            [_result(median_ms=13.0, queries=5), _result("new.scenario")],
+            self.baseline,
+            0.25,
+        )
+
+        assert [r.name for r in regressions] == ["api.entry_list"] * 2
+        assert "queries" in regressions[1].reason
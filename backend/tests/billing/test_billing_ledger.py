@@ -0,0 +1,223 @@
+"""
+Tests for the per-container billing ledger.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.accounts.models import Company, CustomUser
+from apps.billing.models import (
+    ContainerBillingLedger,
+    OnDemandInvoice,
+    OnDemandInvoiceItem,
+    Tariff,
+    TariffRate,
+)
+from apps.billing.services.billing_ledger import refresh_ledgers
+from apps.billing.services.on_demand_invoice_service import OnDemandInvoiceService
+from apps.billing.services.statement_service import MonthlyStatementService
+from apps.billing.views import get_billed_amounts, get_invoiced_entry_ids
+from apps.containers.models import Container
+from apps.terminal_operations.models import ContainerEntry
+
+
+@pytest.fixture
+def admin_user(db):
+    return CustomUser.objects.create_user(
+        username="admin", password="test123", user_type="admin"
+    )
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Ledger Company", billing_method="split")
+
+
+@pytest.fixture
+def general_tariff(db, admin_user):
+    tariff = Tariff.objects.create(
+        effective_from=date(2025, 1, 1),
+        created_by=admin_user,
+    )
+    TariffRate.objects.create(
+        tariff=tariff,
+        container_size="40ft",
+        container_status="laden",
+        daily_rate_usd=Decimal("15.00"),
+        daily_rate_uzs=Decimal("195000.00"),
+        free_days=3,
+    )
+    return tariff
+
+
+@pytest.fixture
+def entry(db, company, admin_user):
+    container = Container.objects.create(
+        container_number="HDMU7654321", iso_type="42G1"
+    )
+    return ContainerEntry.objects.create(
+        container=container,
+        company=company,
+        entry_time=timezone.make_aware(datetime(2026, 1, 5, 10, 0, 0)),
+        exit_date=timezone.make_aware(datetime(2026, 1, 20, 12, 0, 0)),
+        status="LADEN",
+        transport_type="TRUCK",
+        transport_number="01A123BC",
+        recorded_by=admin_user,
+    )
+
+
+def _ledger(entry):
+    return ContainerBillingLedger.objects.get(container_entry=entry)
+
+
+class TestStatementLifecycle:
+    def test_generate_finalize_and_pay(
+        self, company, entry, general_tariff, admin_user
+    ):
+        service = MonthlyStatementService()
+
+        statement = service.get_or_generate_statement(company, 2026, 1, user=admin_user)
+        ledger = _ledger(entry)
+        assert ledger.billed_usd == statement.total_storage_usd > 0
+        assert ledger.paid_usd == 0
+        assert ledger.billed_through == date(2026, 1, 20)
+        assert ledger.on_demand_invoiced is False
+        assert (ledger.last_document_type, ledger.last_document_id) == (
+            "statement",
+            statement.id,
+        )
+        assert ledger.last_document_number == f"DRAFT-{statement.id}"
+
+        service.finalize_statement(statement, admin_user)
+        assert _ledger(entry).last_document_number == statement.invoice_number
+
+        service.mark_paid(statement, admin_user)
+        assert _ledger(entry).paid_usd == statement.total_storage_usd
+
+        service.mark_paid(statement, admin_user)
+        assert _ledger(entry).paid_usd == 0
+
+    def test_delete_draft_drops_row(self, company, entry, general_tariff, admin_user):
+        service = MonthlyStatementService()
+        statement = service.get_or_generate_statement(company, 2026, 1, user=admin_user)
+
+        service.delete_statement(statement)
+
+        assert not ContainerBillingLedger.objects.filter(container_entry=entry).exists()
+
+
+class TestOnDemandLifecycle:
+    def test_create_and_cancel(self, company, entry, general_tariff, admin_user):
+        service = OnDemandInvoiceService()
+
+        invoice = service.create_invoice(company, [entry.id], admin_user)
+        ledger = _ledger(entry)
+        assert ledger.on_demand_invoiced is True
+        assert ledger.on_demand_through is None  # exited before invoicing
+        assert ledger.billed_usd == invoice.total_usd
+        assert get_invoiced_entry_ids([entry.id]) == {entry.id}
+
+        service.cancel_invoice(invoice, admin_user)
+
+        assert get_invoiced_entry_ids([entry.id]) == set()
+        assert get_billed_amounts([entry.id]) == {}
+
+
+def _on_demand_item(company, entry, total_days):
+    """Finalized on-demand invoice of an active entry covering total_days from entry."""
+    invoice = OnDemandInvoice.objects.create(company=company, status="finalized")
+    billable_days = total_days - 3
+    return OnDemandInvoiceItem.objects.create(
+        invoice=invoice,
+        container_entry=entry,
+        container_number="HDMU7654321",
+        container_size="40ft",
+        container_status="laden",
+        entry_date=date(2026, 1, 5),
+        total_days=total_days,
+        free_days=3,
+        billable_days=billable_days,
+        daily_rate_usd=Decimal("15.00"),
+        daily_rate_uzs=Decimal("195000.00"),
+        amount_usd=Decimal("15.00") * billable_days,
+        amount_uzs=Decimal("195000.00") * billable_days,
+    )
+
+
+class TestResidualBilling:
+    def test_residual_days_after_active_on_demand_invoice(
+        self, company, entry, general_tariff, admin_user
+    ):
+        # Invoiced on demand while on terminal, covering Jan 5-14
+        _on_demand_item(company, entry, total_days=10)
+        refresh_ledgers([entry.id])
+        assert _ledger(entry).on_demand_through == date(2026, 1, 14)
+
+        statement = MonthlyStatementService().get_or_generate_statement(
+            company, 2026, 1, user=admin_user
+        )
+
+        item = statement.line_items.get()
+        assert (item.period_start, item.period_end) == (
+            date(2026, 1, 15),
+            date(2026, 1, 20),
+        )
+        assert item.amount_usd == Decimal("90.00")
+        ledger = _ledger(entry)
+        assert ledger.billed_usd == Decimal("195.00")
+        assert ledger.billed_through == date(2026, 1, 20)
+
+    def test_one_residual_line_after_latest_of_two_invoices(
+        self, company, entry, general_tariff, admin_user
+    ):
+        # Two active on-demand invoices: Jan 5-10 and Jan 5-14
+        _on_demand_item(company, entry, total_days=6)
+        _on_demand_item(company, entry, total_days=10)
+        refresh_ledgers([entry.id])
+
+        statement = MonthlyStatementService().get_or_generate_statement(
+            company, 2026, 1, user=admin_user
+        )
+
+        # Only the days after the later invoice are billed, once
+        item = statement.line_items.get()
+        assert (item.period_start, item.period_end) == (
+            date(2026, 1, 15),
+            date(2026, 1, 20),
+        )
+        assert item.amount_usd == Decimal("90.00")
+
+
+class TestReads:
+    def test_billed_amounts_single_query(
+        self, company, entry, general_tariff, admin_user
+    ):
+        MonthlyStatementService().get_or_generate_statement(
+            company, 2026, 1, user=admin_user
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            amounts = get_billed_amounts([entry.id, entry.id + 1000])
+
+        assert len(queries) == 1
+        assert list(amounts) == [entry.id]
+        assert amounts[entry.id]["paid_usd"] == 0
+
+    def test_rebuild_command(self, company, entry, general_tariff, admin_user):
+        MonthlyStatementService().get_or_generate_statement(
+            company, 2026, 1, user=admin_user
+        )
+        expected = _ledger(entry).billed_usd
+        ContainerBillingLedger.objects.all().delete()
+
+        call_command("rebuild_billing_ledger", stdout=StringIO())
+
+        assert _ledger(entry).billed_usd == expected
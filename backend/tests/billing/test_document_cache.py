@@ -0,0 +1,120 @@
+"""
+Tests for the rendered billing document cache.
+"""
+
+from unittest import mock
+
+import pytest
+from django.core.files.storage import default_storage
+
+from apps.accounts.models import Company
+from apps.billing.models import MonthlyStatement, StatementStatus, TerminalSettings
+from apps.billing.services import document_cache
+from apps.billing.services.statement_service import MonthlyStatementService
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def renders():
+    """Replace WeasyPrint/template rendering with a counting fake."""
+    calls = []
+
+    def _fake(kind):
+        def _render(document, settings):
+            calls.append(kind)
+            return f"{kind}:{document.pk}".encode()
+
+        return _render
+
+    fake = {
+        kind: _fake(kind)
+        for kind in document_cache.STATEMENT_KINDS + document_cache.ON_DEMAND_KINDS
+    }
+    with mock.patch.object(document_cache, "_renderers", return_value=fake):
+        yield calls
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Docs Company", slug="docs-company")
+
+
+@pytest.fixture
+def statement(company):
+    return MonthlyStatement.objects.create(
+        company=company,
+        year=2026,
+        month=1,
+        billing_method="split",
+        status=StatementStatus.FINALIZED,
+        invoice_number="MTT-2026-0001",
+    )
+
+
+def _stored_files(document):
+    _, files = default_storage.listdir(document_cache.document_dir(document))
+    return files
+
+
+class TestGetRendered:
+    def test_issued_document_rendered_once(self, statement, renders):
+        first = document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
+        second = document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
+
+        assert first.read() == second.read() == f"statement.pdf:{statement.pk}".encode()
+        assert renders == [document_cache.STATEMENT_PDF]
+        assert len(_stored_files(statement)) == 1
+
+    def test_drafts_are_not_stored(self, statement, renders):
+        statement.status = StatementStatus.DRAFT
+
+        document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
+        document_cache.get_rendered(document_cache.STATEMENT_PDF, statement)
+
+        assert len(renders) == 2
+        assert not default_storage.exists(document_cache.document_dir(statement))
+
+    def test_settings_change_only_affects_acts(self, statement, renders):
+        document_cache.prerender(statement)
+        TerminalSettings.load().save()
+
+        document_cache.prerender(statement)
+
+        assert renders.count(document_cache.STATEMENT_PDF) == 1
+        assert renders.count(document_cache.ACT_PDF) == 2
+        assert renders.count(document_cache.ACT_HTML) == 2
+
+
+class TestInvalidation:
+    def test_credit_note_drops_rendered_files(self, statement, renders, admin_user):
+        document_cache.prerender(statement)
+        assert len(_stored_files(statement)) == 3
+
+        MonthlyStatementService().create_credit_note(statement, admin_user)
+
+        assert document_cache.invalidate(statement) == 0
+        assert _stored_files(statement) == []
+
+
+class TestDownload:
+    def test_admin_pdf_served_from_storage(
+        self, authenticated_client, statement, renders
+    ):
+        url = f"/api/auth/companies/{statement.company.slug}/billing/statements/2026/1/export/pdf/"
+
+        for _ in range(2):
+            response = authenticated_client.get(url)
+            assert response.status_code == 200
+            assert response.streaming
+            assert (
+                b"".join(response.streaming_content)
+                == f"statement.pdf:{statement.pk}".encode()
+            )
+
+        assert response["Content-Disposition"].startswith("attachment;")
+        assert renders == [document_cache.STATEMENT_PDF]
@@ -0,0 +1,117 @@
+"""
+Tests for exchange-rate lookups, caching and the pluggable rate source.
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.billing.models import ExchangeRate
+from apps.billing.services import cbu_service
+
+
+@pytest.fixture(autouse=True)
+def isolated_rates():
+    cbu_service.clear_rate_cache()
+    yield
+    cbu_service.clear_rate_cache()
+    cbu_service.set_rate_source(None)
+
+
+@pytest.fixture
+def file_source(tmp_path):
+    path = tmp_path / "rates.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"Ccy": "USD", "Date": "01.02.2026", "Rate": "12850.10"},
+                {"Ccy": "USD", "Date": "02.02.2026", "Rate": "12860.20"},
+                {"Ccy": "EUR", "Date": "01.02.2026", "Rate": "13900.00"},
+            ]
+        )
+    )
+    source = cbu_service.FileRateSource(str(path))
+    cbu_service.set_rate_source(source)
+    return source
+
+
+class TestGetRate:
+    def test_fetches_once_then_serves_from_memory(self, file_source):
+        assert cbu_service.get_rate(date(2026, 2, 1)) == Decimal("12850.10")
+        assert ExchangeRate.objects.get(date=date(2026, 2, 1)).rate == Decimal(
+            "12850.10"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            assert cbu_service.get_rate(date(2026, 2, 1)) == Decimal("12850.10")
+        assert len(queries) == 0
+
+    def test_no_fetch_raises_on_miss(self, file_source):
+        with pytest.raises(cbu_service.CBUServiceError):
+            cbu_service.get_rate(date(2026, 2, 1), fetch=False)
+        assert not ExchangeRate.objects.exists()
+
+    def test_prefetch_loads_range_in_one_query(self):
+        for day in range(1, 29):
+            ExchangeRate.objects.create(
+                currency="USD", date=date(2026, 2, day), rate=Decimal(12800 + day)
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            rates = cbu_service.prefetch_rates(date(2026, 2, 1), date(2026, 2, 28))
+            for day in range(1, 29):
+                cbu_service.get_rate(date(2026, 2, day), fetch=False)
+
+        assert len(rates) == 28
+        assert len(queries) == 1
+
+
+class TestCachedRate:
+    def test_falls_back_to_previous_stored_day(self):
+        ExchangeRate.objects.create(
+            currency="USD", date=date(2026, 1, 30), rate=Decimal("12800")
+        )
+
+        with mock.patch.object(cbu_service.CBUApiSource, "fetch") as fetch:
+            rate = cbu_service.get_last_day_of_month_rate(2026, 1)
+
+        assert rate == Decimal("12800")
+        fetch.assert_not_called()
+
+    def test_raises_beyond_fallback_window(self):
+        ExchangeRate.objects.create(
+            currency="USD", date=date(2026, 1, 1), rate=Decimal("12800")
+        )
+
+        with pytest.raises(cbu_service.CBUServiceError):
+            cbu_service.get_cached_rate(date(2026, 1, 31))
+
+
+class TestBackfillCommand:
+    def test_backfill_from_file_source(self, file_source):
+        ExchangeRate.objects.create(
+            currency="USD", date=date(2026, 2, 1), rate=Decimal("1")
+        )
+        out = StringIO()
+
+        call_command(
+            "backfill_exchange_rates",
+            "--start",
+            "2026-02-01",
+            "--end",
+            "2026-02-03",
+            stdout=out,
+        )
+
+        assert "Fetched 1, already stored 1, failed 1" in out.getvalue()
+        assert ExchangeRate.objects.get(date=date(2026, 2, 1)).rate == Decimal("1")
+        assert ExchangeRate.objects.get(date=date(2026, 2, 2)).rate == Decimal(
+            "12860.20"
+        )
@@ -690,3 +690,155 @@ class TestBulkCalculation:
 
         assert len(results) == 2
         assert all(r.total_usd >= Decimal("0") for r in results)
+
+
+# ============================================================================
+# Full-Set Summary Tests
+# ============================================================================
+
+
+@pytest.fixture
+def changing_tariffs(general_tariff, special_tariff, admin_user):
+    """Special tariff expiring mid-January and a new general tariff from February."""
+    special_tariff.effective_to = date(2025, 1, 15)
+    special_tariff.save()
+    general_tariff.effective_to = date(2025, 1, 31)
+    general_tariff.save()
+
+    february = Tariff.objects.create(
+        company=None, effective_from=date(2025, 2, 1), created_by=admin_user
+    )
+    for size in (ContainerSize.TWENTY_FT, ContainerSize.FORTY_FT):
+        for status in (ContainerBillingStatus.LADEN, ContainerBillingStatus.EMPTY):
+            TariffRate.objects.create(
+                tariff=february,
+                container_size=size,
+                container_status=status,
+                daily_rate_usd=Decimal("20.00"),
+                daily_rate_uzs=Decimal("250000.00"),
+                free_days=2,
+            )
+    return february
+
+
+@pytest.fixture
+def summary_entries(changing_tariffs, test_company, container_entry_factory):
+    """Entries with and without company, spanning the tariff changes."""
+
+    def _create(count):
+        entries = []
+        offset = ContainerEntry.objects.count()
+        for index in range(offset, offset + count):
+            container = Container.objects.create(
+                container_number=f"SUMU{index:07d}",
+                iso_type="22G1" if index % 2 else "42G1",
+            )
+            entries.append(
+                container_entry_factory(
+                    container=container,
+                    company=test_company if index % 3 else None,
+                    status="EMPTY" if index % 2 else "LADEN",
+                    entry_time=timezone.make_aware(
+                        timezone.datetime(2025, 1, 5 + index, 10, 0, 0)
+                    ),
+                    exit_date=timezone.make_aware(
+                        timezone.datetime(2025, 2, 10 + index, 10, 0, 0)
+                    ),
+                )
+            )
+        return entries
+
+    return _create
+
+
+class TestFullSetSummary:
+    """Summaries over every matching entry, served from a preloaded tariff timeline."""
+
+    def test_summary_matches_per_entry_calculation(self, service, summary_entries):
+        entries = summary_entries(6)
+        # Fresh service per entry: plain per-date tariff queries
+        expected = [StorageCostService().calculate_cost(entry) for entry in entries]
+
+        summary = service.summarize_costs(ContainerEntry.objects.all())
+        bulk = service.calculate_bulk_costs(ContainerEntry.objects.order_by("id"))
+
+        assert summary["total_containers"] == 6
+        assert summary["failed"] == 0
+        assert summary["total_usd"] == sum(r.total_usd for r in expected)
+        assert summary["total_uzs"] == sum(r.total_uzs for r in expected)
+        assert summary["total_billable_days"] == sum(r.billable_days for r in expected)
+        assert [r.periods for r in bulk] == [r.periods for r in expected]
+        assert any(len(r.periods) == 3 for r in expected)
+
+    def test_summary_query_count_constant(self, service, summary_entries):
+        from apps.core.query_budget import QueryRecorder
+
+        summary_entries(2)
+        with QueryRecorder() as small:
+            service.summarize_costs(ContainerEntry.objects.all())
+
+        summary_entries(8)
+        with QueryRecorder() as large:
+            service.summarize_costs(ContainerEntry.objects.all())
+
+        assert large.count == small.count
+
+    def test_summary_counts_failed_entries(
+        self, service, general_tariff, container_entry_factory
+    ):
+        # Entered before the first tariff took effect
+        container = Container.objects.create(container_number="BADU1234567", iso_type="22G1")
+        container_entry_factory(
+            container=container,
+            entry_time=timezone.make_aware(timezone.datetime(2024, 12, 1, 10, 0, 0)),
+        )
+
+        summary = service.summarize_costs(ContainerEntry.objects.all())
+
+        assert summary["total_containers"] == 1
+        assert summary["failed"] == 1
+        assert summary["total_usd"] == Decimal("0.00")
+
+    def test_summary_cached_until_tariff_changes(self, service, summary_entries):
+        from apps.core.query_budget import QueryRecorder
+
+        summary_entries(4)
+        first = service.summarize_costs(ContainerEntry.objects.all())
+        with QueryRecorder() as cached:
+            again = service.summarize_costs(ContainerEntry.objects.all())
+
+        # Only the cache key queries (entry and tariff state)
+        assert cached.count == 2
+        assert again == first
+
+        rate = TariffRate.objects.filter(
+            tariff__company__isnull=True,
+            container_size=ContainerSize.FORTY_FT,
+            container_status=ContainerBillingStatus.LADEN,
+        ).first()
+        rate.daily_rate_usd += Decimal("1.00")
+        rate.save()
+
+        assert service.summarize_costs(ContainerEntry.objects.all()) != first
+
+    def test_customer_endpoint_summary_covers_all_pages(
+        self, api_client, test_company, summary_entries
+    ):
+        from apps.accounts.models import CustomerProfile
+
+        summary_entries(5)
+        customer = CustomUser.objects.create(
+            username="summary_customer", user_type="customer", bot_access=True
+        )
+        CustomerProfile.objects.create(user=customer, company=test_company)
+        api_client.force_authenticate(user=customer)
+
+        first_page = api_client.get("/api/customer/storage-costs/?page_size=1").data
+        full = StorageCostService().summarize_costs(
+            ContainerEntry.objects.filter(company=test_company)
+        )
+
+        assert len(first_page["results"]) == 1
+        assert first_page["summary"]["is_page_summary"] is False
+        assert first_page["summary"]["total_containers"] == first_page["count"] == 3
+        assert first_page["summary"]["total_usd"] == str(full["total_usd"])
@@ -21,6 +21,9 @@ settings.DATABASES["default"] = {
     "NAME": ":memory:",
 }
 
+# Views running more queries than their declared query_budget fail the test
+settings.QUERY_BUDGET_STRICT = True
+
 import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
@@ -270,8 +273,15 @@ def preorder(customer_user):
 # ============================================================================
 
 @pytest.fixture
-def test_image():
-    """Create a test image file."""
+def media_root(settings, tmp_path):
+    """Store uploaded files under a temporary MEDIA_ROOT."""
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def test_image(media_root):
+    """Create a test image file (uploads go to a temporary MEDIA_ROOT)."""
     import tempfile
 
     from django.core.files.uploadedfile import SimpleUploadedFile
@@ -313,6 +323,44 @@ def test_excel_file():
     )
 
 
+# ============================================================================
+# Query Budget Fixtures
+# ============================================================================
+
+@pytest.fixture
+def assert_constant_queries():
+    """
+    Fail when an endpoint's query count grows with the number of listed rows.
+
+    Usage:
+        assert_constant_queries(authenticated_client, url, create_rows)
+
+    create_rows(n) must create n more rows listed by the endpoint; the
+    endpoint is requested with page_size equal to the row count.
+    """
+    from apps.core.query_budget import QueryRecorder
+
+    def _assert_constant_queries(client, url, create_rows, sizes=(2, 6)):
+        recorders = []
+        created = 0
+        for size in sizes:
+            create_rows(size - created)
+            created = size
+            separator = '&' if '?' in url else '?'
+            with QueryRecorder() as recorder:
+                response = client.get(f'{url}{separator}page_size={size}')
+            assert response.status_code == 200, response.content
+            recorders.append(recorder)
+
+        first, last = recorders[0], recorders[-1]
+        assert last.count == first.count, (
+            f'{url}: {first.count} queries for {sizes[0]} rows, '
+            f'{last.count} for {sizes[-1]} rows. Repeated: {last.duplicates()}'
+        )
+        return first.count
+    return _assert_constant_queries
+
+
 # ============================================================================
 # Django Settings Override
 # ============================================================================
@@ -2,7 +2,12 @@
 Tests for ContainerEventService.
 """
 
+import io
+
 import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from apps.terminal_operations.models import ContainerEvent
@@ -153,3 +158,102 @@ class TestContainerEventService:
         assert event.details["exit_transport_type"] == "WAGON"
         assert event.details["destination_station"] == "Tashkent"
         assert "dwell_time_days" in event.details
+
+
+@pytest.mark.django_db
+class TestContainerEventBatch:
+    """Tests for buffering events with ContainerEventService.batch()."""
+
+    @pytest.fixture
+    def event_service(self):
+        return ContainerEventService()
+
+    def _emit(self, event_service, entry):
+        event_service.create_entry_created_event(entry)
+        event_service.create_status_changed_event(entry, "EMPTY", "LADEN")
+        event_service.create_exit_recorded_event(entry)
+
+    def test_events_written_in_one_insert_on_exit(
+        self, event_service, container_entry_factory
+    ):
+        entries = [container_entry_factory() for _ in range(3)]
+
+        with (
+            CaptureQueriesContext(connection) as queries,
+            event_service.batch() as batch,
+        ):
+            for entry in entries:
+                self._emit(event_service, entry)
+            assert ContainerEvent.objects.count() == 0
+
+        inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+        assert len(inserts) == 1
+        assert batch.flushed == 9
+        assert ContainerEvent.objects.count() == 9
+
+    def test_yard_diffs_published_once_per_flush(
+        self, event_service, container_entry_factory, django_capture_on_commit_callbacks
+    ):
+        from django.core.cache import cache
+
+        from apps.terminal_operations.services.yard_broadcast import get_diffs_since
+
+        cache.clear()
+        entries = [container_entry_factory() for _ in range(3)]
+
+        with django_capture_on_commit_callbacks() as callbacks, event_service.batch():
+            for entry in entries:
+                self._emit(event_service, entry)
+
+        # Status change and exit of each entry, in one broadcast
+        assert len(callbacks) == 1
+        callbacks[0]()
+        assert [d["op"] for d in get_diffs_since(0)] == ["status_changed", "exited"] * 3
+
+    def test_per_container_order_is_kept(self, event_service, container_entry):
+        event_time = timezone.now()
+        event_types = ["ENTRY_CREATED", "STATUS_CHANGED", "POSITION_ASSIGNED"]
+
+        with event_service.batch():
+            for event_type in event_types:
+                event_service.create_event(
+                    container_entry, event_type, {}, event_time=event_time
+                )
+
+        timeline = event_service.get_container_timeline(container_entry)
+        assert [event.event_type for event in timeline] == event_types
+
+    def test_full_batch_is_flushed_early(self, event_service, container_entry):
+        with event_service.batch(batch_size=2):
+            self._emit(event_service, container_entry)
+            assert ContainerEvent.objects.count() == 2
+
+        assert ContainerEvent.objects.count() == 3
+
+    def test_nested_batch_joins_outer(self, event_service, container_entry):
+        with event_service.batch() as outer:
+            with ContainerEventService().batch() as inner:
+                self._emit(event_service, container_entry)
+            assert inner is outer
+            assert ContainerEvent.objects.count() == 0
+
+        assert ContainerEvent.objects.count() == 3
+
+    def test_events_discarded_when_block_raises(self, event_service, container_entry):
+        with pytest.raises(RuntimeError), event_service.batch():
+            self._emit(event_service, container_entry)
+            raise RuntimeError("import failed")
+
+        assert ContainerEvent.objects.count() == 0
+        event_service.create_entry_created_event(container_entry)
+        assert ContainerEvent.objects.count() == 1
+
+    def test_generate_initial_events_command(self, container_entry_factory):
+        for _ in range(3):
+            container_entry_factory()
+
+        call_command(
+            "generate_initial_container_events", batch_size=2, stdout=io.StringIO()
+        )
+
+        assert ContainerEvent.objects.filter(event_type="ENTRY_CREATED").count() == 3
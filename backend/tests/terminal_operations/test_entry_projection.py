@@ -0,0 +1,142 @@
+"""
+Tests for the batched container entry list projection.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models import Company, CustomerProfile
+from apps.billing.models import OnDemandInvoice, OnDemandInvoiceItem
+from apps.files.models import File, FileAttachment, FileCategory
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services.entry_projection import with_list_projection
+
+
+ENTRIES_URL = "/api/terminal/entries/"
+CUSTOMER_ENTRIES_URL = "/api/customer/containers/"
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Test Logistics", slug="test-logistics")
+
+
+@pytest.fixture
+def category(db):
+    category, _ = FileCategory.objects.get_or_create(
+        code="container_image",
+        defaults={"name": "Container Image", "max_file_size_mb": 5},
+    )
+    return category
+
+
+@pytest.fixture
+def invoice(company, admin_user):
+    return OnDemandInvoice.objects.create(company=company, created_by=admin_user)
+
+
+@pytest.fixture
+def make_entries(container_entry_factory, company, category, invoice, admin_user):
+    """Create entries with two attachments (one inactive) and an invoice item."""
+
+    def _make_entries(count):
+        entries = []
+        for _ in range(count):
+            entry = container_entry_factory(
+                entry_time=timezone.now() - timedelta(days=3, hours=5)
+            )
+            entry.company = company
+            entry.save(update_fields=["company"])
+            for order, is_active in ((1, True), (0, False)):
+                file = File.objects.create(
+                    file=f"files/{entry.id}-{order}.jpg",
+                    original_filename=f"{order}.jpg",
+                    file_category=category,
+                    mime_type="image/jpeg",
+                    size=100,
+                    uploaded_by=admin_user,
+                    is_active=is_active,
+                )
+                FileAttachment.objects.create(
+                    file=file,
+                    content_object=entry,
+                    attachment_type="container_photo",
+                    display_order=order,
+                )
+            OnDemandInvoiceItem.objects.create(
+                invoice=invoice,
+                container_entry=entry,
+                container_number=entry.container.container_number,
+                container_size="40ft",
+                container_status="laden",
+                entry_date=entry.entry_time.date(),
+                total_days=3,
+                free_days=0,
+                billable_days=3,
+                daily_rate_usd=Decimal("1.00"),
+                daily_rate_uzs=Decimal("12000.00"),
+                amount_usd=Decimal("3.00"),
+                amount_uzs=Decimal("36000.00"),
+            )
+            entries.append(entry)
+        return entries
+
+    return _make_entries
+
+
+class TestListProjection:
+    def test_matches_per_object_values(self, make_entries):
+        entry = make_entries(1)[0]
+
+        projected = with_list_projection(ContainerEntry.objects.all()).get()
+
+        assert projected.dwell.days == entry.dwell_time_days == 3
+        assert projected.has_pending_invoice is True
+        assert [a.display_order for a in projected.active_attachments] == [1]
+
+    def test_pending_invoice_ignores_exited_and_cancelled(self, make_entries, company):
+        first, second = make_entries(2)
+        ContainerEntry.objects.filter(id=first.id).update(exit_date=timezone.now())
+        cancelled = OnDemandInvoice.objects.create(company=company, status="cancelled")
+        second.on_demand_items.update(invoice=cancelled)
+
+        flags = dict(
+            with_list_projection(ContainerEntry.objects.all()).values_list(
+                "id", "has_pending_invoice"
+            )
+        )
+
+        assert flags == {first.id: False, second.id: False}
+
+
+class TestListQueries:
+    def test_entries_list_constant_queries(
+        self, authenticated_client, make_entries, assert_constant_queries
+    ):
+        assert_constant_queries(authenticated_client, ENTRIES_URL, make_entries)
+
+    def test_entries_list_payload(self, authenticated_client, make_entries):
+        entry = make_entries(1)[0]
+
+        item = authenticated_client.get(ENTRIES_URL).data["results"][0]
+
+        assert item["id"] == entry.id
+        assert item["dwell_time_days"] == 3
+        assert item["has_pending_invoice"] is True
+        assert item["file_count"] == 1
+        assert item["main_file"]["file"]["category_name"] == "Container Image"
+
+    def test_customer_list_constant_queries(
+        self, api_client, customer_user, company, make_entries, assert_constant_queries
+    ):
+        CustomerProfile.objects.create(user=customer_user, company=company)
+        api_client.force_authenticate(user=customer_user)
+
+        assert_constant_queries(api_client, CUSTOMER_ENTRIES_URL, make_entries)
+
+        response = api_client.get(CUSTOMER_ENTRIES_URL)
+        assert response.data["results"][0]["dwell_time_days"] == 3
+        assert response.data["results"][0]["image_count"] == 1
@@ -0,0 +1,177 @@
+"""
+Tests for the container entry search document and indexed search.
+"""
+
+import pytest
+from django.db import connection
+
+from apps.accounts.models import Company
+from apps.terminal_operations.models import ContainerEntry, ContainerOwner
+from apps.terminal_operations.services.entry_search import (
+    FTS_TABLE,
+    refresh_search_documents,
+    search_entries,
+)
+
+
+ENTRIES_URL = "/api/terminal/entries/"
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Шелковый Путь", slug="silk-road")
+
+
+@pytest.fixture
+def owner(db):
+    return ContainerOwner.objects.create(name="Evergreen Line", slug="evergreen")
+
+
+@pytest.fixture
+def entries(container_factory, admin_user, company, owner):
+    """Three entries: one with company/owner, a plate match and a note match."""
+    first = ContainerEntry.objects.create(
+        container=container_factory(number="MSCU1234567"),
+        status="LADEN",
+        transport_type="TRUCK",
+        transport_number="01A777BC",
+        recorded_by=admin_user,
+        company=company,
+        container_owner=owner,
+        cargo_name="Хлопок",
+    )
+    second = ContainerEntry.objects.create(
+        container=container_factory(number="TGHU7654321"),
+        status="EMPTY",
+        transport_type="TRUCK",
+        transport_number="40B123CD",
+        recorded_by=admin_user,
+    )
+    third = ContainerEntry.objects.create(
+        container=container_factory(number="CAIU5550001"),
+        status="EMPTY",
+        transport_type="TRAIN",
+        entry_train_number="MSCU-TRAIN",
+        note="Осмотр при выгрузке",
+    )
+    return first, second, third
+
+
+def fts_ids():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT rowid FROM {FTS_TABLE}")
+        return {row[0] for row in cursor.fetchall()}
+
+
+def result_ids(response):
+    return [item["id"] for item in response.data["results"]]
+
+
+class TestSearchDocument:
+    def test_document_built_on_save(self, entries, admin_user):
+        first = entries[0]
+        first.refresh_from_db()
+
+        lines = first.search_document.split("\n")
+        assert lines[0] == "mscu1234567"
+        assert "01a777bc" in lines
+        assert "шелковый путь" in lines
+        assert "evergreen line" in lines
+        assert admin_user.username.lower() in lines
+
+    def test_update_fields_rebuild(self, entries):
+        first = entries[0]
+        first.note = "Повреждение двери"
+        first.save(update_fields=["note"])
+
+        assert list(search_entries(ContainerEntry.objects.all(), "двери")) == [first]
+
+    def test_unrelated_update_fields_keep_document(self, entries):
+        first = entries[0]
+        ContainerEntry.objects.filter(id=first.id).update(search_document="stale")
+        first.refresh_from_db()
+        first.status = "EMPTY"
+        first.save(update_fields=["status"])
+
+        first.refresh_from_db()
+        assert first.search_document == "stale"
+
+    def test_delete_removes_from_index(self, entries):
+        third = entries[2]
+        assert third.id in fts_ids()
+
+        third.delete()
+
+        assert third.id not in fts_ids()
+
+    def test_company_rename_refreshes_entries(self, entries, company):
+        company.name = "Silk Way Logistics"
+        company.save()
+
+        assert list(search_entries(ContainerEntry.objects.all(), "silk way")) == [entries[0]]
+        assert not search_entries(ContainerEntry.objects.all(), "шелковый").exists()
+
+    def test_company_rename_to_prefix_refreshes_entries(self, entries, company):
+        company.name = "Шелковый"
+        company.save()
+
+        entries[0].refresh_from_db()
+        assert "шелковый" in entries[0].search_document.split("\n")
+        assert not search_entries(ContainerEntry.objects.all(), "путь").exists()
+
+    def test_unchanged_company_save_keeps_documents(self, entries, company):
+        ContainerEntry.objects.filter(id=entries[0].id).update(search_document="stale")
+        company.save()
+
+        entries[0].refresh_from_db()
+        assert entries[0].search_document == "stale"
+
+    def test_user_rename_refreshes_entries(self, entries, admin_user):
+        admin_user.first_name = "Dilshod"
+        admin_user.save()
+
+        result = search_entries(ContainerEntry.objects.all(), "dilshod")
+        assert set(result) == {entries[0], entries[1]}
+
+    def test_refresh_after_bulk_update(self, entries):
+        ContainerEntry.objects.filter(id=entries[1].id).update(cargo_name="Цемент")
+        assert not search_entries(ContainerEntry.objects.all(), "цемент").exists()
+
+        assert refresh_search_documents(ContainerEntry.objects.all()) == 1
+
+        assert list(search_entries(ContainerEntry.objects.all(), "цемент")) == [entries[1]]
+
+
+class TestSearchApi:
+    def test_search_text_substring(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search_text=777b")
+
+        assert result_ids(response) == [entries[0].id]
+
+    def test_search_text_phrase_and_cyrillic(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search_text=ОСМОТР ПРИ")
+
+        assert result_ids(response) == [entries[2].id]
+
+    def test_container_number_prefix_ranked_first(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search_text=mscu")
+
+        # Entry 3 (newer) only mentions MSCU in its train number
+        assert result_ids(response) == [entries[0].id, entries[2].id]
+
+    def test_explicit_ordering_wins(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search_text=mscu&ordering=-entry_time")
+
+        assert result_ids(response) == [entries[2].id, entries[0].id]
+
+    def test_search_terms_all_required(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search=tghu 40b")
+        assert result_ids(response) == [entries[1].id]
+
+        response = authenticated_client.get(f"{ENTRIES_URL}?search=tghu хлопок")
+        assert result_ids(response) == []
+
+    def test_short_terms_fall_back_to_contains(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?search=cd")
+
+        assert result_ids(response) == [entries[1].id]
@@ -0,0 +1,180 @@
+"""
+Tests for the container number / plate typeahead service.
+"""
+
+import pytest
+
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services import typeahead_service
+from apps.terminal_operations.services.typeahead_service import (
+    SortedKeyIndex,
+    TypeaheadIndex,
+    TypeaheadService,
+    _container_alphabet,
+    get_typeahead_index,
+    invalidate_typeahead_index,
+    is_valid_container_number,
+    iso6346_check_digit,
+    normalize_container_number,
+    update_typeahead_index,
+)
+
+
+TYPEAHEAD_URL = "/api/terminal/typeahead/"
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    invalidate_typeahead_index()
+    yield
+    invalidate_typeahead_index()
+
+
+@pytest.fixture
+def active_entry(container_factory, admin_user):
+    return ContainerEntry.objects.create(
+        container=container_factory(number="CSQU3054383"),
+        status="LADEN",
+        transport_type="TRUCK",
+        recorded_by=admin_user,
+    )
+
+
+class TestCheckDigit:
+    def test_known_valid_number(self):
+        assert iso6346_check_digit("CSQU305438") == 3
+        assert is_valid_container_number("csqu 305438-3")
+
+    def test_wrong_check_digit_or_format(self):
+        assert not is_valid_container_number("CSQU3054384")
+        assert not is_valid_container_number("CSQ13054383")
+        assert iso6346_check_digit("CSQU30") is None
+
+    def test_normalize(self):
+        assert normalize_container_number(" msku | 123-4567 ") == "MSKU1234567"
+
+
+class TestSortedKeyIndex:
+    def test_prefix_and_insert(self):
+        index = SortedKeyIndex(["MSKU1000001", "MSCU2000002", "TGHU3000003"])
+        index.add("MSKU1000000")
+        index.add("MSKU1000000")
+
+        assert len(index) == 4
+        assert index.prefix("MSKU", 10) == ["MSKU1000000", "MSKU1000001"]
+        assert index.prefix("MSKU", 1) == ["MSKU1000000"]
+        assert index.prefix("ZZZZ", 10) == []
+
+    def test_fuzzy_one_substitution(self):
+        index = SortedKeyIndex(["MSKU1000001", "TGHU3000003"])
+
+        # O typed instead of 0 is outside the digit alphabet; a wrong digit is found
+        assert index.fuzzy("MSKU19", 10, _container_alphabet) == ["MSKU1000001"]
+        assert index.fuzzy("MSKV1", 10, _container_alphabet) == ["MSKU1000001"]
+        assert index.fuzzy("MXXU1", 10, _container_alphabet) == []
+
+
+class TestTypeaheadService:
+    def test_prefix_with_active_status(self, active_entry, container_factory):
+        container_factory(number="CSQU3054390")
+
+        result = TypeaheadService().suggest("csqu 3054")
+
+        assert result["query"] == "CSQU3054"
+        values = [s["value"] for s in result["suggestions"]]
+        assert values == ["CSQU3054383", "CSQU3054390"]
+        first = result["suggestions"][0]
+        assert first["on_terminal"] is True
+        assert first["entry"]["id"] == active_entry.id
+        assert first["check_digit_valid"] is True
+        assert result["suggestions"][1]["on_terminal"] is False
+
+    def test_fuzzy_prefers_valid_check_digit(self, container_factory):
+        container_factory(number="CSQU3054380")
+        container_factory(number="CSQU3054383")
+
+        result = TypeaheadService().suggest("CSQU3054389")
+
+        assert result["check_digit_valid"] is False
+        assert [s["match"] for s in result["suggestions"]] == ["fuzzy", "fuzzy"]
+        assert result["suggestions"][0]["value"] == "CSQU3054383"
+
+    def test_plates_with_vehicle_and_preorder(self, preorder, vehicle_entry):
+        service = TypeaheadService()
+
+        vehicle = service.suggest("01a1", kind="plate")["suggestions"]
+        # 01A4.. is one substitution away and fills the remaining slots
+        assert [(s["value"], s["match"]) for s in vehicle] == [
+            ("01A123BC", "prefix"),
+            ("01A456BC", "fuzzy"),
+        ]
+        assert vehicle[0]["vehicle_entry"]["id"] == vehicle_entry.id
+
+        pending = service.suggest("01A456", kind="plate", fuzzy=False)["suggestions"]
+        assert pending[0]["pending_preorder"]["id"] == preorder.id
+        assert pending[0]["on_terminal"] is False
+
+    def test_signals_update_built_index(
+        self, active_entry, vehicle_entry, django_capture_on_commit_callbacks
+    ):
+        index = get_typeahead_index()
+        assert "CSQU3054383" in index.active_entries
+
+        with django_capture_on_commit_callbacks(execute=True):
+            active_entry.exit_date = active_entry.entry_time
+            active_entry.save()
+
+        assert get_typeahead_index() is index
+        assert "CSQU3054383" not in index.active_entries
+
+        with django_capture_on_commit_callbacks(execute=True):
+            vehicle_entry.license_plate = "95 Z 777 ZZ"
+            vehicle_entry.save()
+
+        assert index.plates.prefix("95Z", 10) == ["95Z777ZZ"]
+        assert index.vehicles_on_terminal["95Z777ZZ"]["id"] == vehicle_entry.id
+
+    def test_rebuild_replays_updates_and_serves_stale_index(
+        self, active_entry, monkeypatch
+    ):
+        stale = get_typeahead_index()
+        monkeypatch.setattr(typeahead_service, "_built_at", float("-inf"))
+        load = TypeaheadIndex.load
+        seen_during_build = []
+
+        def load_with_concurrent_update():
+            index = load()
+            update_typeahead_index(lambda i: i.containers.add("ZZZU0000000"))
+            # A concurrent request gets the previous index instead of rebuilding
+            seen_during_build.append(get_typeahead_index())
+            return index
+
+        monkeypatch.setattr(TypeaheadIndex, "load", load_with_concurrent_update)
+
+        fresh = get_typeahead_index()
+
+        assert fresh is not stale
+        assert seen_during_build == [stale]
+        assert fresh.containers.prefix("ZZZU", 10) == ["ZZZU0000000"]
+
+
+class TestTypeaheadApi:
+    def test_endpoint(self, authenticated_client, active_entry):
+        response = authenticated_client.get(f"{TYPEAHEAD_URL}?q=CSQU&limit=5")
+
+        assert response.status_code == 200
+        assert response.data["success"] is True
+        assert response.data["data"]["suggestions"][0]["value"] == "CSQU3054383"
+
+    def test_short_query_returns_nothing(self, authenticated_client, active_entry):
+        response = authenticated_client.get(f"{TYPEAHEAD_URL}?q=C")
+
+        assert response.data["data"]["suggestions"] == []
+
+    def test_invalid_kind(self, authenticated_client):
+        response = authenticated_client.get(f"{TYPEAHEAD_URL}?q=CSQU&kind=wagon")
+
+        assert response.status_code == 400
+
+    def test_requires_authentication(self, api_client):
+        assert api_client.get(f"{TYPEAHEAD_URL}?q=CSQU").status_code == 401
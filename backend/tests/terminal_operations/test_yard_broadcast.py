@@ -0,0 +1,149 @@
+"""
+Tests for yard layout diffs (yard_broadcast) and the yard WebSocket consumer.
+"""
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.core.cache import cache
+
+from apps.terminal_operations.consumers import YardConsumer
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services import yard_broadcast
+from apps.terminal_operations.services.placement_service import PlacementService
+from apps.terminal_operations.services.yard_broadcast import (
+    get_diffs_since,
+    get_yard_version,
+    publish_yard_diff,
+    publish_yard_diffs,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def entry(container_factory, admin_user):
+    return ContainerEntry.objects.create(
+        container=container_factory(iso_type="22G1"),
+        status="LADEN",
+        transport_type="TRUCK",
+        recorded_by=admin_user,
+    )
+
+
+def connect(user, path="/ws/yard/"):
+    communicator = WebsocketCommunicator(YardConsumer.as_asgi(), path)
+    communicator.scope["user"] = user
+    return communicator
+
+
+class TestRingBuffer:
+    def test_versions_and_replay(self):
+        publish_yard_diff({"op": "placed", "container_id": 1})
+        publish_yard_diff({"op": "removed", "container_id": 1})
+
+        assert get_yard_version() == 2
+        assert [d["op"] for d in get_diffs_since(0)] == ["placed", "removed"]
+        assert [d["version"] for d in get_diffs_since(1)] == [2]
+        assert get_diffs_since(2) == []
+
+    def test_overwritten_diffs_require_resync(self, monkeypatch):
+        monkeypatch.setattr(yard_broadcast, "RING_BUFFER_SIZE", 2)
+        for container_id in range(3):
+            publish_yard_diff({"op": "placed", "container_id": container_id})
+
+        assert get_diffs_since(0) is None
+        assert [d["container_id"] for d in get_diffs_since(1)] == [1, 2]
+
+    def test_bulk_publish_reserves_one_version_range(self):
+        publish_yard_diff({"op": "placed", "container_id": 1})
+        diffs = publish_yard_diffs(
+            [{"op": "exited", "container_id": 1}, {"op": "exited", "container_id": 2}]
+        )
+
+        assert [d["version"] for d in diffs] == [2, 3]
+        assert get_yard_version() == 3
+        assert get_diffs_since(1) == diffs
+
+    def test_version_from_the_future_requires_resync(self):
+        assert get_diffs_since(5) is None
+
+
+@pytest.mark.django_db
+class TestEventDiffs:
+    def test_move_publishes_removed_then_placed(self, entry, django_capture_on_commit_callbacks):
+        service = PlacementService()
+        with django_capture_on_commit_callbacks(execute=True):
+            position = service.assign_position(entry.id, zone="A", row=6, bay=1, tier=1)
+        with django_capture_on_commit_callbacks(execute=True):
+            service.move_container(position.id, "A", 6, 2, 1)
+
+        diffs = get_diffs_since(0)
+        assert [d["op"] for d in diffs] == ["placed", "removed", "placed"]
+        assert diffs[-1]["container_id"] == entry.id
+        assert diffs[-1]["coordinate"] == "A-R06-B02-T1-A"
+        assert diffs[-1]["state"] == "LADEN"
+        assert diffs[1]["coordinate"] == "A-R06-B01-T1-A"
+
+    def test_rolled_back_events_not_published(self, entry, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            PlacementService().assign_position(entry.id, zone="A", row=6, bay=1, tier=1)
+
+        assert len(callbacks) == 1
+        assert get_yard_version() == 0
+
+    def test_layout_carries_version(self, entry, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            PlacementService().assign_position(entry.id, zone="A", row=6, bay=1, tier=1)
+
+        assert PlacementService().get_layout()["version"] == 1
+
+
+class TestYardConsumer:
+    def test_rejects_anonymous(self):
+        async def scenario():
+            communicator = WebsocketCommunicator(YardConsumer.as_asgi(), "/ws/yard/")
+            connected, _ = await communicator.connect()
+            assert not connected
+
+        async_to_sync(scenario)()
+
+    def test_hello_replay_and_live_diff(self, admin_user):
+        publish_yard_diff({"op": "placed", "container_id": 7})
+
+        async def scenario():
+            communicator = connect(admin_user, "/ws/yard/?since=0")
+            connected, _ = await communicator.connect()
+            assert connected
+
+            hello = await communicator.receive_json_from()
+            assert hello == {"type": "hello", "version": 1, "buffer_size": 500}
+
+            replay = await communicator.receive_json_from()
+            assert replay["type"] == "replay"
+            assert [d["container_id"] for d in replay["diffs"]] == [7]
+
+            await sync_to_async(publish_yard_diff)({"op": "exited", "container_id": 7})
+            live = await communicator.receive_json_from()
+            assert live["type"] == "diff"
+            assert (live["op"], live["version"]) == ("exited", 2)
+
+            await sync_to_async(publish_yard_diffs)(
+                [{"op": "exited", "container_id": 8}, {"op": "exited", "container_id": 9}]
+            )
+            bulk = await communicator.receive_json_from()
+            assert bulk["type"] == "diffs"
+            assert bulk["version"] == 4
+            assert [d["container_id"] for d in bulk["diffs"]] == [8, 9]
+
+            await communicator.send_json_to({"action": "replay", "since": 5})
+            assert (await communicator.receive_json_from())["type"] == "resync_required"
+
+            await communicator.disconnect()
+
+        async_to_sync(scenario)()
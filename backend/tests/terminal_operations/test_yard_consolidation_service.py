@@ -0,0 +1,188 @@
+"""
+Tests for yard consolidation planning (YardConsolidationService) and
+RELOCATION work orders.
+"""
+
+import pytest
+
+from apps.core.exceptions import BusinessLogicError
+from apps.terminal_operations.models import ContainerEntry, ContainerPosition, WorkOrder
+from apps.terminal_operations.services.work_order_service import WorkOrderService
+from apps.terminal_operations.services.yard_consolidation_service import (
+    YardConsolidationService,
+)
+
+
+@pytest.fixture
+def entry_factory(container_factory, admin_user):
+    def _create(iso_type="22G1", status="LADEN"):
+        return ContainerEntry.objects.create(
+            container=container_factory(iso_type=iso_type),
+            status=status,
+            transport_type="TRUCK",
+            recorded_by=admin_user,
+        )
+
+    return _create
+
+
+@pytest.fixture
+def place(entry_factory):
+    def _place(row, bay, tier=1, sub_slot="A", status="LADEN", iso_type="42G1"):
+        return ContainerPosition.objects.create(
+            container_entry=entry_factory(iso_type=iso_type, status=status),
+            zone="A",
+            row=row,
+            bay=bay,
+            tier=tier,
+            sub_slot=sub_slot,
+        )
+
+    return _place
+
+
+@pytest.mark.django_db
+class TestConsolidationPlan:
+    def test_frees_sparsest_bay(self, place):
+        # 40ft stacks only use sub-slot A. Bay 1: two-high stack, bay 2: single container
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=1, tier=2)
+        lonely = place(row=1, bay=2)
+
+        plan = YardConsolidationService().plan(unit="bay")
+
+        assert plan["freed_units"] == ["A-R01-B02"]
+        assert plan["move_count"] == 1
+        move = plan["moves"][0]
+        assert move["position_id"] == lonely.id
+        assert move["to"] == "A-R01-B01-T3-A"
+
+    def test_top_containers_move_first(self, place):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=1, tier=2)
+        place(row=1, bay=1, tier=3)
+        bottom = place(row=1, bay=2, tier=1)
+        top = place(row=1, bay=2, tier=2)
+        place(row=2, bay=1, tier=1)
+        place(row=2, bay=1, tier=2)
+
+        plan = YardConsolidationService().plan(unit="bay", max_moves=2)
+
+        assert plan["freed_units"] == ["A-R01-B02"]
+        assert [m["position_id"] for m in plan["moves"]] == [top.id, bottom.id]
+
+    def test_respects_weight_rule(self, place):
+        # LADEN cannot go on top of the EMPTY stack
+        place(row=1, bay=1, status="EMPTY")
+        place(row=1, bay=2, status="LADEN")
+
+        plan = YardConsolidationService().plan(unit="bay")
+
+        # LADEN container stays; EMPTY container can go onto the LADEN one
+        assert plan["move_count"] == 1
+        assert plan["moves"][0]["from"] == "A-R01-B01-T1-A"
+        assert plan["moves"][0]["to"] == "A-R01-B02-T2-A"
+
+    def test_respects_row_segregation(self, place):
+        # 40ft in 40ft row, 20ft in 20ft row: neither can join the other
+        place(row=1, bay=1, iso_type="42G1")
+        place(row=6, bay=1, iso_type="22G1")
+
+        plan = YardConsolidationService().plan(unit="bay")
+
+        assert plan["moves"] == []
+        assert plan["freed_units"] == []
+
+    def test_move_cap(self, place):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=2, tier=1)
+        place(row=1, bay=2, tier=2)
+
+        plan = YardConsolidationService().plan(unit="bay", max_moves=0)
+
+        assert plan["moves"] == []
+
+    def test_skips_bays_with_pending_work_orders(self, place, entry_factory):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=1, tier=2)
+        place(row=1, bay=2)
+        WorkOrder.objects.create(
+            container_entry=entry_factory(),
+            target_zone="A",
+            target_row=1,
+            target_bay=2,
+            target_tier=2,
+        )
+
+        plan = YardConsolidationService().plan(unit="bay")
+
+        assert "A-R01-B02" not in plan["freed_units"]
+        assert all(not m["to"].startswith("A-R01-B02") for m in plan["moves"])
+
+    def test_frees_rows(self, place):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=2, tier=1)
+        place(row=2, bay=1, tier=1)
+
+        plan = YardConsolidationService().plan(unit="row")
+
+        assert plan["freed_units"] == ["A-R02"]
+        assert plan["moves"][0]["to"].startswith("A-R01")
+
+    def test_invalid_unit(self):
+        with pytest.raises(BusinessLogicError) as exc:
+            YardConsolidationService().plan(unit="zone")
+        assert exc.value.error_code == "INVALID_CONSOLIDATION_UNIT"
+
+
+@pytest.mark.django_db
+class TestRelocationWorkOrders:
+    def test_plan_executes_through_work_orders(self, place, admin_user):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=1, tier=2)
+        place(row=1, bay=2, tier=1)
+        place(row=1, bay=2, tier=2)
+        place(row=1, bay=3, tier=1)
+
+        service = YardConsolidationService()
+        plan = service.plan(unit="bay")
+        orders = service.create_work_orders(plan, created_by=admin_user)
+
+        assert len(orders) == plan["move_count"] == 1
+        assert orders[0].operation_type == "RELOCATION"
+
+        for order in orders:
+            WorkOrderService().complete_order(order.id, operator=admin_user)
+
+        assert not ContainerPosition.objects.filter(row=1, bay=3).exists()
+        assert ContainerPosition.objects.count() == 5
+
+    def test_relocation_requires_placed_container(self, entry_factory, admin_user):
+        order = WorkOrder.objects.create(
+            container_entry=entry_factory(),
+            operation_type="RELOCATION",
+            target_zone="A",
+            target_row=1,
+            target_bay=1,
+            target_tier=1,
+        )
+        with pytest.raises(BusinessLogicError) as exc:
+            WorkOrderService().complete_order(order.id, operator=admin_user)
+        assert exc.value.error_code == "CONTAINER_NOT_PLACED"
+
+    def test_consolidation_endpoint(self, authenticated_client, place):
+        place(row=1, bay=1, tier=1)
+        place(row=1, bay=1, tier=2)
+        place(row=1, bay=2)
+
+        response = authenticated_client.post(
+            "/api/terminal/placement/consolidation-plan/",
+            {"unit": "bay", "create_work_orders": True},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        data = response.data["data"]
+        assert data["freed_units"] == ["A-R01-B02"]
+        assert len(data["work_order_ids"]) == 1
+        assert WorkOrder.objects.get(id=data["work_order_ids"][0]).operation_type == "RELOCATION"
@@ -0,0 +1,138 @@
+"""
+Tests for configurable yard geometry (YardBlock, YardGeometry).
+"""
+
+import pytest
+
+from apps.core.exceptions import BusinessLogicError
+from apps.terminal_operations.models import ContainerEntry, YardBlock
+from apps.terminal_operations.services.placement_service import PlacementService
+from apps.terminal_operations.services.yard_geometry import (
+    DEFAULT_BLOCKS,
+    YardGeometry,
+    get_yard_geometry,
+    invalidate_yard_geometry,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_geometry():
+    """Block changes are rolled back after each test - drop the cache too."""
+    invalidate_yard_geometry()
+    yield
+    invalidate_yard_geometry()
+
+
+@pytest.fixture
+def zone_b(db):
+    """Zone B: 20ft rows 1-2 with 3 bays, 2 tiers and reefer plugs."""
+    return YardBlock.objects.create(
+        zone="B", row_from=1, row_to=2, bays=3, max_tiers=2, container_size="20ft", reefer_plugs=4
+    )
+
+
+@pytest.fixture
+def entry_factory(container_factory, admin_user):
+    def _create(iso_type="22G1", status="LADEN"):
+        return ContainerEntry.objects.create(
+            container=container_factory(iso_type=iso_type),
+            status=status,
+            transport_type="TRUCK",
+            recorded_by=admin_user,
+        )
+
+    return _create
+
+
+class TestYardGeometry:
+    def test_default_layout(self):
+        geometry = YardGeometry.from_blocks(DEFAULT_BLOCKS)
+
+        assert geometry.zones == ["A"]
+        assert geometry.rows_for_size("A", "40ft") == [1, 2, 3, 4, 5]
+        assert geometry.rows_for_size("A", "45ft") == [1, 2, 3, 4, 5]
+        assert geometry.rows_for_size("A", "20ft") == [6, 7, 8, 9, 10]
+        assert geometry.total_capacity == 10 * 10 * 4
+        assert (geometry.max_rows, geometry.max_bays, geometry.max_tiers) == (10, 10, 4)
+
+    def test_slot_bounds_per_row(self):
+        geometry = YardGeometry.from_blocks(
+            [*DEFAULT_BLOCKS, ("B", 1, 2, 3, 2, "20ft", 0)]
+        )
+
+        assert geometry.is_valid_slot("B", 2, 3, 2)
+        assert not geometry.is_valid_slot("B", 2, 4, 1)
+        assert not geometry.is_valid_slot("B", 2, 1, 3)
+        assert not geometry.is_valid_slot("B", 3, 1, 1)
+        assert geometry.zone_capacity == {"A": 400, "B": 12}
+
+    def test_to_dict_merges_rows_back_into_blocks(self):
+        geometry = YardGeometry.from_blocks(DEFAULT_BLOCKS)
+        blocks = geometry.to_dict()["blocks"]
+
+        assert [(b["row_from"], b["row_to"], b["container_size"]) for b in blocks] == [
+            (1, 5, "40ft"),
+            (6, 10, "20ft"),
+        ]
+
+
+@pytest.mark.django_db
+class TestConfiguredGeometry:
+    def test_seeded_blocks_match_default_layout(self):
+        geometry = get_yard_geometry()
+        assert geometry.zones == ["A"]
+        assert geometry.total_capacity == 400
+
+    def test_cache_invalidated_on_block_change(self, zone_b):
+        geometry = get_yard_geometry()
+        assert geometry.zones == ["A", "B"]
+        assert geometry is get_yard_geometry()
+
+        zone_b.is_active = False
+        zone_b.save()
+
+        assert get_yard_geometry().zones == ["A"]
+
+    def test_new_zone_accepts_placement(self, zone_b, entry_factory):
+        entry = entry_factory()
+
+        position = PlacementService().assign_position(entry.id, zone="B", row=1, bay=3, tier=1)
+
+        assert position.coordinate_string == "B-R01-B03-T1-A"
+
+    def test_new_zone_bounds_validated(self, zone_b, entry_factory):
+        entry = entry_factory()
+
+        with pytest.raises(BusinessLogicError) as exc:
+            PlacementService().assign_position(entry.id, zone="B", row=1, bay=4, tier=1)
+        assert exc.value.error_code == "INVALID_BAY"
+
+        with pytest.raises(BusinessLogicError) as exc:
+            PlacementService().assign_position(entry.id, zone="C", row=1, bay=1, tier=1)
+        assert exc.value.error_code == "INVALID_ZONE"
+
+    def test_row_segregation_from_blocks(self, zone_b, entry_factory):
+        entry = entry_factory(iso_type="42G1")
+
+        with pytest.raises(BusinessLogicError) as exc:
+            PlacementService().assign_position(entry.id, zone="B", row=1, bay=1, tier=1)
+        assert exc.value.error_code == "ROW_SEGREGATION_VIOLATION"
+
+    def test_suggest_uses_zone_preference(self, zone_b, entry_factory):
+        entry = entry_factory()
+
+        result = PlacementService().suggest_position(entry.id, zone_preference="B")
+
+        assert result["suggested_position"]["coordinate"] == "B-R01-B01-T1-A"
+
+    def test_layout_stats_from_capacity_tables(self, zone_b):
+        layout = PlacementService().get_layout()
+
+        assert layout["zones"] == ["A", "B"]
+        assert layout["stats"]["total_capacity"] == 412
+        assert layout["stats"]["by_zone"]["B"] == {
+            "capacity": 12,
+            "occupied": 0,
+            "available": 12,
+            "reefer_plugs": 8,
+        }
@@ -0,0 +1,186 @@
+"""
+Tests for rehandle-aware placement (YardRehandleService, DepartureEstimationService).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models import Company
+from apps.core.exceptions import BusinessLogicError
+from apps.terminal_operations.models import ContainerEntry, ContainerPosition, PreOrder
+from apps.terminal_operations.services.departure_estimation_service import (
+    DepartureEstimationService,
+)
+from apps.terminal_operations.services.placement_service import PlacementService
+from apps.terminal_operations.services.yard_rehandle_service import (
+    YardRehandleService,
+    count_stack_rehandles,
+)
+
+
+@pytest.fixture
+def short_stay_company(db):
+    return Company.objects.create(name="Fast Forwarding", slug="fast-forwarding")
+
+
+@pytest.fixture
+def long_stay_company(db):
+    return Company.objects.create(name="Slow Storage", slug="slow-storage")
+
+
+@pytest.fixture
+def entry_factory(container_factory, admin_user):
+    """Create a 20ft entry for a company with a given entry/exit time."""
+
+    def _create(company, entered_days_ago=0, dwell_days=None, status="LADEN"):
+        entry_time = timezone.now() - timedelta(days=entered_days_ago)
+        exit_date = entry_time + timedelta(days=dwell_days) if dwell_days else None
+        return ContainerEntry.objects.create(
+            container=container_factory(iso_type="22G1"),
+            status=status,
+            transport_type="TRUCK",
+            recorded_by=admin_user,
+            company=company,
+            entry_time=entry_time,
+            exit_date=exit_date,
+        )
+
+    return _create
+
+
+@pytest.fixture
+def dwell_history(entry_factory, short_stay_company, long_stay_company):
+    """Exited containers: short-stay company ~2 days, long-stay company ~40 days."""
+    for _ in range(5):
+        entry_factory(short_stay_company, entered_days_ago=10, dwell_days=2)
+        entry_factory(long_stay_company, entered_days_ago=50, dwell_days=40)
+
+
+def place(entry, row, bay, tier=1, sub_slot="A"):
+    return ContainerPosition.objects.create(
+        container_entry=entry, zone="A", row=row, bay=bay, tier=tier, sub_slot=sub_slot
+    )
+
+
+class TestCountStackRehandles:
+    def test_bottom_leaving_first_lifts_everything_above(self):
+        now = timezone.now()
+        departures = [now, now + timedelta(days=5), now + timedelta(days=10)]
+        # bottom leaves first (2 lifts), then middle (1 lift)
+        assert count_stack_rehandles(departures) == 3
+
+    def test_top_leaving_first_needs_no_rehandles(self):
+        now = timezone.now()
+        departures = [now + timedelta(days=10), now + timedelta(days=5), now]
+        assert count_stack_rehandles(departures) == 0
+
+    def test_unknown_departure_never_leaves(self):
+        now = timezone.now()
+        assert count_stack_rehandles([None, now]) == 0
+        assert count_stack_rehandles([now, None]) == 1
+
+
+@pytest.mark.django_db
+class TestDepartureEstimation:
+    def test_company_history_used(self, dwell_history, entry_factory, short_stay_company):
+        service = DepartureEstimationService()
+        entry = entry_factory(short_stay_company)
+
+        estimate = service.estimate_for_entry(entry)
+
+        assert estimate["source"] == "company"
+        assert estimate["expected_dwell_days"] == pytest.approx(2.0)
+
+    def test_preorder_takes_priority(
+        self, dwell_history, entry_factory, long_stay_company, customer_user
+    ):
+        entry = entry_factory(long_stay_company)
+        PreOrder.objects.create(
+            customer=customer_user,
+            plate_number="01A456BC",
+            operation_type="LOAD",
+            status="COMPLETED",
+            matched_entry=entry,
+        )
+
+        estimate = DepartureEstimationService().estimate_for_entry(entry)
+
+        assert estimate["source"] == "preorder"
+
+    def test_fallback_without_history(self, entry_factory, short_stay_company):
+        estimate = DepartureEstimationService().estimate_for_entry(
+            entry_factory(short_stay_company)
+        )
+        assert estimate["source"] == "overall"
+
+
+@pytest.mark.django_db
+class TestRehandlePlacement:
+    def test_short_stay_goes_on_long_stay_stack(
+        self, dwell_history, entry_factory, short_stay_company, long_stay_company
+    ):
+        # Row 6 bay 1: long-stay bottom. Bay 2: short-stay bottom leaving tomorrow.
+        place(entry_factory(long_stay_company), row=6, bay=1)
+        place(entry_factory(short_stay_company, entered_days_ago=1), row=6, bay=2)
+        newcomer = entry_factory(short_stay_company)
+
+        result = PlacementService().suggest_position(newcomer.id, strategy="rehandle")
+
+        suggested = result["suggested_position"]
+        assert (suggested["row"], suggested["bay"], suggested["tier"]) == (6, 1, 2)
+        assert suggested["expected_rehandles"] == 0
+        assert result["strategy"] == "rehandle"
+        assert result["departure_estimate"]["source"] == "company"
+
+    def test_long_stay_avoids_short_stay_stacks(
+        self, dwell_history, entry_factory, short_stay_company, long_stay_company
+    ):
+        place(entry_factory(short_stay_company), row=6, bay=1)
+        newcomer = entry_factory(long_stay_company)
+
+        result = PlacementService().suggest_position(newcomer.id, strategy="rehandle")
+
+        suggested = result["suggested_position"]
+        assert suggested["tier"] == 1
+        assert suggested["expected_rehandles"] == 0
+
+    def test_respects_weight_distribution(
+        self, dwell_history, entry_factory, short_stay_company, long_stay_company
+    ):
+        place(entry_factory(long_stay_company, status="EMPTY"), row=6, bay=1)
+        newcomer = entry_factory(short_stay_company, status="LADEN")
+
+        result = PlacementService().suggest_position(newcomer.id, strategy="rehandle")
+
+        suggested = result["suggested_position"]
+        assert (suggested["bay"], suggested["tier"]) != (1, 2)
+
+    def test_invalid_strategy(self, entry_factory, short_stay_company):
+        entry = entry_factory(short_stay_company)
+        with pytest.raises(BusinessLogicError) as exc:
+            PlacementService().suggest_position(entry.id, strategy="random")
+        assert exc.value.error_code == "INVALID_PLACEMENT_STRATEGY"
+
+    def test_rehandle_report(
+        self, dwell_history, entry_factory, short_stay_company, long_stay_company
+    ):
+        # Short-stay under long-stay -> one expected rehandle
+        place(entry_factory(short_stay_company), row=6, bay=1, tier=1)
+        place(entry_factory(long_stay_company), row=6, bay=1, tier=2)
+        # Long-stay under short-stay -> none
+        place(entry_factory(long_stay_company), row=6, bay=2, tier=1)
+        place(entry_factory(short_stay_company), row=6, bay=2, tier=2)
+
+        report = YardRehandleService().get_rehandle_report()
+
+        assert report["total_expected_rehandles"] == 1
+        assert report["containers"] == 4
+        assert report["by_zone"] == {"A": 1}
+        assert report["worst_stacks"][0]["stack"] == "A-R06-B01-A"
+
+    def test_rehandle_report_endpoint(self, authenticated_client):
+        response = authenticated_client.get("/api/terminal/placement/rehandle-report/")
+        assert response.status_code == 200
+        assert response.data["data"]["total_expected_rehandles"] == 0
@@ -0,0 +1,124 @@
+"""
+Tests for the bulk seeding engine and the synthetic terminal history.
+"""
+
+import pytest
+from django.db.models import Count, F, Q
+from django.db.models.signals import post_save
+
+from apps.accounts.models import Company
+from apps.containers.models import Container
+from apps.core.management.commands.generate_bulk_data import parse_count
+from apps.core.seeding import (
+    TerminalHistorySeeder,
+    dependency_order,
+    muted_signals,
+)
+from apps.terminal_operations.models import (
+    ContainerEntry,
+    ContainerEvent,
+    ContainerOwner,
+    ContainerPosition,
+    TerminalVehicle,
+    WorkOrder,
+)
+from apps.terminal_operations.services.entry_search import search_entries
+from apps.terminal_operations.services.typeahead_service import (
+    is_valid_container_number,
+)
+from apps.vehicles.models import VehicleEntry
+
+
+@pytest.fixture
+def foundation(admin_user):
+    Company.objects.create(name="Seed Company", slug="seed-company")
+    ContainerOwner.objects.create(name="Seed Owner", slug="seed-owner")
+    TerminalVehicle.objects.create(name="RS-01", vehicle_type="REACH_STACKER")
+    return admin_user
+
+
+class TestEngine:
+    def test_dependency_order(self):
+        ordered = dependency_order(
+            [ContainerEvent, WorkOrder, ContainerEntry, Container, TerminalVehicle]
+        )
+
+        assert ordered.index(Container) < ordered.index(ContainerEntry)
+        assert ordered.index(ContainerEntry) < ordered.index(WorkOrder)
+        assert ordered.index(TerminalVehicle) < ordered.index(WorkOrder)
+        assert ordered.index(ContainerEntry) < ordered.index(ContainerEvent)
+
+    def test_muted_signals_restores_receivers(self):
+        calls = []
+
+        def receiver(sender, **kwargs):
+            calls.append(sender)
+
+        post_save.connect(receiver, sender=TestEngine, weak=False)
+        try:
+            with muted_signals():
+                post_save.send(sender=TestEngine)
+            post_save.send(sender=TestEngine)
+        finally:
+            post_save.disconnect(receiver, sender=TestEngine)
+
+        assert calls == [TestEngine]
+
+    @pytest.mark.parametrize(
+        "value, expected", [("250", 250), ("250k", 250_000), ("1.5M", 1_500_000)]
+    )
+    def test_parse_count(self, value, expected):
+        assert parse_count(value) == expected
+
+
+@pytest.mark.django_db
+class TestTerminalHistorySeeder:
+    def test_consistent_history(self, foundation):
+        result = TerminalHistorySeeder(600, days=60, seed=3, chunk_size=250).run()
+
+        entries = ContainerEntry.objects.all()
+        assert result.counts["ContainerEntry"] == entries.count() == 600
+        assert result.counts["WorkOrder"] == 600
+        assert Container.objects.count() == 400
+        assert all(
+            is_valid_container_number(number)
+            for number in Container.objects.values_list("container_number", flat=True)
+        )
+        # A container is never on the terminal twice at once
+        assert not (
+            entries.filter(exit_date__isnull=True)
+            .values("container")
+            .annotate(n=Count("pk"))
+            .filter(n__gt=1)
+            .exists()
+        )
+        assert not entries.filter(exit_date__lte=F("entry_time")).exists()
+        assert not entries.exclude(created_at=F("entry_time")).exists()
+
+        placed = ContainerPosition.objects.count()
+        assert (
+            placed
+            == entries.filter(exit_date__isnull=True, position__isnull=False).count()
+        )
+        assert (
+            ContainerEvent.objects.filter(event_type="POSITION_ASSIGNED").count()
+            == placed
+        )
+        assert not WorkOrder.objects.filter(
+            Q(status="PENDING", container_entry__position__isnull=False)
+            | Q(status="PENDING", container_entry__exit_date__isnull=False)
+        ).exists()
+        assert (
+            VehicleEntry.objects.count()
+            == entries.filter(transport_type="TRUCK").count()
+        )
+
+    def test_entries_searchable(self, foundation):
+        TerminalHistorySeeder(50, days=30, seed=5).run()
+        number = Container.objects.first().container_number
+
+        assert search_entries(ContainerEntry.objects.all(), number[:8]).exists()
+
+    def test_requires_foundation(self, db):
+        with pytest.raises(ValueError, match="generate_foundation_data"):
+            TerminalHistorySeeder(10)
@@ -0,0 +1,140 @@
+"""
+Tests for database-side dwell analytics (DwellAnalyticsService) and its users.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.accounts.models import Company
+from apps.core.services.dwell_analytics import DwellAnalyticsService
+from apps.customer_portal.services.statistics_service import CustomerStatisticsService
+from apps.terminal_operations.models import ContainerEntry
+from apps.vehicles.models import VehicleEntry
+from apps.vehicles.services.statistics_service import VehicleStatisticsService
+
+
+@pytest.fixture
+def now():
+    return timezone.now()
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Dwell Co", slug="dwell-co")
+
+
+@pytest.fixture
+def entries(container_entry_factory, company, now):
+    """Active entries dwelling 1, 2, 5, 9 and 20 days, plus one that exited after 30."""
+    created = []
+    for days in (1, 2, 5, 9, 20):
+        entry = container_entry_factory(entry_time=now - timedelta(days=days, hours=1))
+        created.append(entry)
+    exited = container_entry_factory(entry_time=now - timedelta(days=40))
+    exited.exit_date = exited.entry_time + timedelta(days=30)
+    exited.save()
+    created.append(exited)
+    ContainerEntry.objects.filter(id__in=[e.id for e in created]).update(company=company)
+    return created
+
+
+@pytest.fixture
+def active_analytics(entries, now):
+    return DwellAnalyticsService(ContainerEntry.objects.filter(exit_date__isnull=True), now=now)
+
+
+class TestDwellAnalyticsService:
+    def test_summary(self, active_analytics):
+        summary = active_analytics.summary(min_dwell=timedelta(days=8))
+
+        assert summary["count"] == 5
+        assert summary["maximum"] == timedelta(days=20, hours=1)
+        assert summary["average"] == timedelta(days=37 / 5, hours=1)
+        assert summary["over_threshold"] == 2
+
+    def test_percentiles_interpolate(self, active_analytics):
+        result = active_analytics.percentiles((0.5, 0.75))
+
+        assert result[0.5] == timedelta(days=5, hours=1)
+        assert result[0.75] == timedelta(days=9, hours=1)
+
+    def test_percentiles_empty(self, db):
+        result = DwellAnalyticsService(ContainerEntry.objects.all()).percentiles((0.5,))
+
+        assert result == {0.5: None}
+
+    def test_histogram(self, active_analytics):
+        buckets = active_analytics.histogram([timedelta(days=3), timedelta(days=10)])
+
+        assert [b["count"] for b in buckets] == [2, 2, 1]
+        assert buckets[-1]["to"] is None
+
+    def test_top_longest_first(self, active_analytics, entries):
+        top = active_analytics.top(limit=2, fields=("id",))
+
+        assert [row["id"] for row in top] == [entries[4].id, entries[3].id]
+        assert top[0]["dwell"].days == 20
+
+    def test_exit_date_ends_dwell(self, entries, now):
+        analytics = DwellAnalyticsService(ContainerEntry.objects.all(), now=now)
+
+        assert analytics.summary()["maximum"] == timedelta(days=30)
+
+    def test_averages_by(self, active_analytics, entries):
+        ContainerEntry.objects.filter(id=entries[0].id).update(status="EMPTY")
+
+        averages = active_analytics.averages_by("status")
+
+        assert averages["EMPTY"] == timedelta(days=1, hours=1)
+        assert averages["LADEN"] == timedelta(days=9, hours=1)
+
+    def test_filter_days_matches_property(self, entries, now):
+        analytics = DwellAnalyticsService(ContainerEntry.objects.all(), now=now)
+
+        ids = set(analytics.filter_days(min_days=2, max_days=9).values_list("id", flat=True))
+
+        assert ids == {e.id for e in entries if 2 <= e.dwell_time_days <= 9}
+        assert analytics.filter_days(min_days=0, max_days=1).count() == 1
+
+
+class TestDwellConsumers:
+    def test_customer_dwell_metrics(self, entries, company):
+        metrics = CustomerStatisticsService(company).get_dwell_metrics(overstayer_days=7)
+
+        assert metrics["overstayer_count"] == 2
+        assert [o["dwell_time_days"] for o in metrics["overstayers"]] == [20, 9]
+        assert metrics["longest_stay"]["days"] == 20
+        assert metrics["percentiles_days"]["p50"] == 5
+        assert sum(b["count"] for b in metrics["histogram"]) == 5
+
+    def test_customer_dwell_metrics_empty(self, company):
+        metrics = CustomerStatisticsService(company).get_dwell_metrics()
+
+        assert metrics["average_dwell_days"] == 0
+        assert metrics["longest_stay"] is None
+        assert metrics["percentiles_days"]["p90"] is None
+
+    def test_dwell_range_filter(self, authenticated_client, entries):
+        response = authenticated_client.get("/api/terminal/entries/?dwell_time_range=2-9")
+
+        assert response.status_code == 200
+        assert response.data["count"] == 3
+
+    def test_vehicle_time_metrics(self, admin_user, destination, now):
+        for vehicle_type, hours in (("LIGHT", 2), ("CARGO", 4), ("CARGO", 6)):
+            VehicleEntry.objects.create(
+                license_plate=f"01A{hours}00BC",
+                vehicle_type=vehicle_type,
+                destination=destination,
+                entry_time=now - timedelta(hours=hours + 1),
+                exit_time=now - timedelta(hours=1),
+                status="EXITED",
+                recorded_by=admin_user,
+            )
+
+        metrics = VehicleStatisticsService().get_time_metrics()
+
+        assert metrics["avg_dwell_hours"] == 4.0
+        assert metrics["avg_dwell_by_type"] == {"LIGHT": 2.0, "CARGO": 5.0}
@@ -0,0 +1,101 @@
+"""
+Tests for content-addressed file storage and blob garbage collection.
+"""
+
+import io
+import os
+import time
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+
+from apps.files.models import File, FileCategory
+
+
+@pytest.fixture
+def category(db):
+    category, _ = FileCategory.objects.get_or_create(
+        code="container_image",
+        defaults={"name": "Container Image", "max_file_size_mb": 5},
+    )
+    return category
+
+
+def _photo(name="photo.jpg", color=(255, 0, 0)):
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 6), color).save(buffer, format="JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+def _upload(upload, user):
+    return File.objects.create_from_upload(upload, "container_image", user)
+
+
+@pytest.mark.django_db
+class TestContentAddressedUpload:
+    def test_identical_uploads_share_one_blob(self, media_root, category, admin_user):
+        first = _upload(_photo("truck.jpg"), admin_user)
+        second = _upload(_photo("same_truck.jpg"), admin_user)
+
+        assert first.pk != second.pk
+        assert first.sha256 == second.sha256
+        assert first.file.name == second.file.name
+        assert first.file.name.startswith(f"blobs/{first.sha256[:2]}/")
+        assert len(list(media_root.rglob("*.jpg"))) == 1
+        assert File.objects.blob_references(first.sha256) == 2
+        assert (second.width, second.height) == (8, 6)
+        assert second.original_filename == "same_truck.jpg"
+
+    def test_different_content_stored_separately(
+        self, media_root, category, admin_user
+    ):
+        red = _upload(_photo(color=(255, 0, 0)), admin_user)
+        blue = _upload(_photo(color=(0, 0, 255)), admin_user)
+
+        assert red.sha256 != blue.sha256
+        assert red.file.name != blue.file.name
+        assert red.file.read() != blue.file.read()
+
+
+@pytest.mark.django_db
+class TestCollectFileBlobs:
+    def _age(self, path):
+        old = time.time() - 3 * 24 * 3600
+        os.utime(path, (old, old))
+
+    def test_only_unreferenced_blobs_deleted(self, media_root, category, admin_user):
+        kept = _upload(_photo(color=(255, 0, 0)), admin_user)
+        dropped = _upload(_photo(color=(0, 255, 0)), admin_user)
+        for file in (kept, dropped):
+            self._age(file.file.path)
+        dropped_path = dropped.file.path
+        dropped.delete()
+
+        call_command("collect_file_blobs", "--dry-run", stdout=io.StringIO())
+        assert os.path.exists(dropped_path)
+
+        call_command("collect_file_blobs", stdout=io.StringIO())
+
+        assert not os.path.exists(dropped_path)
+        assert os.path.exists(kept.file.path)
+
+    def test_shared_blob_kept_while_referenced(self, media_root, category, admin_user):
+        first = _upload(_photo(), admin_user)
+        second = _upload(_photo(), admin_user)
+        self._age(first.file.path)
+        first.delete()
+
+        call_command("collect_file_blobs", stdout=io.StringIO())
+
+        assert os.path.exists(second.file.path)
+
+    def test_recent_blobs_skipped(self, media_root, category, admin_user):
+        file = _upload(_photo(), admin_user)
+        path = file.file.path
+        file.delete()
+
+        call_command("collect_file_blobs", stdout=io.StringIO())
+
+        assert os.path.exists(path)
@@ -0,0 +1,136 @@
+"""
+Tests for log retention: archiving old rows to monthly files and reading
+them back together with rows still in the database.
+"""
+
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.core.services import log_retention
+from apps.core.services.log_retention import (
+    LOG_TYPES,
+    LogRetentionService,
+    archive_dir,
+    iter_archived,
+    query_logs,
+)
+from apps.gate.models import ANPRDetection
+from apps.terminal_operations.models import ContainerEvent
+
+
+ANPR = LOG_TYPES["anpr"]
+
+
+@pytest.fixture(autouse=True)
+def archive_settings(settings, tmp_path):
+    settings.LOG_ARCHIVE_DIR = str(tmp_path)
+    settings.LOG_RETENTION_DAYS = {
+        "anpr": 30,
+        "telegram_activity": 30,
+        "container_events": 30,
+    }
+
+
+def _detection(plate, days_ago, gate_id="main"):
+    detection = ANPRDetection.objects.create(plate_number=plate, gate_id=gate_id)
+    ANPRDetection.objects.filter(pk=detection.pk).update(
+        created_at=timezone.now() - timedelta(days=days_ago)
+    )
+    return detection
+
+
+@pytest.mark.django_db
+class TestArchive:
+    def test_old_months_moved_to_files(self):
+        old = [_detection(f"OLD{i}", days_ago=120 + i) for i in range(3)]
+        recent = _detection("NEW", days_ago=1)
+
+        archived = LogRetentionService().archive(ANPR)
+
+        assert sum(archived.values()) == 3
+        assert list(ANPRDetection.objects.values_list("pk", flat=True)) == [recent.pk]
+        assert list(archive_dir(ANPR).glob("*.jsonl.gz"))
+        rows = list(iter_archived(ANPR))
+        assert {row["id"] for row in rows} == {d.pk for d in old}
+        assert rows[0]["created_at"].tzinfo is not None
+
+    def test_events_of_containers_on_terminal_stay(self, container_entry):
+        event = ContainerEvent.objects.create(
+            container_entry=container_entry,
+            event_type="ENTRY_CREATED",
+            event_time=timezone.now() - timedelta(days=200),
+        )
+
+        LogRetentionService().archive(LOG_TYPES["container_events"])
+
+        assert ContainerEvent.objects.filter(pk=event.pk).exists()
+
+    def test_command_dry_run_keeps_rows(self):
+        _detection("OLD", days_ago=120)
+        out = io.StringIO()
+
+        call_command("archive_logs", "--type", "anpr", "--dry-run", stdout=out)
+
+        assert "would archive" in out.getvalue()
+        assert ANPRDetection.objects.count() == 1
+
+        call_command("archive_logs", "--type", "anpr", stdout=io.StringIO())
+
+        assert ANPRDetection.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestQueryLogs:
+    def test_hot_and_archived_rows_in_one_range(self):
+        _detection("OLD", days_ago=120)
+        _detection("OLD", days_ago=100, gate_id="side")
+        _detection("NEW", days_ago=1)
+        LogRetentionService().archive(ANPR)
+        _detection("OLD", days_ago=2)
+
+        rows = query_logs(
+            "anpr",
+            start=timezone.now() - timedelta(days=365),
+            filters={"gate_id": "main"},
+        )
+
+        assert [row["plate_number"] for row in rows] == ["NEW", "OLD", "OLD"]
+        assert query_logs("anpr", filters={"plate_number": "OLD"}, limit=1)[0][
+            "created_at"
+        ] > timezone.now() - timedelta(days=3)
+
+    def test_limited_query_skips_older_months(self, monkeypatch):
+        _detection("OLDER", days_ago=200)
+        _detection("OLD", days_ago=120)
+        _detection("OLD", days_ago=120)
+        LogRetentionService().archive(ANPR)
+        read_months = []
+        read_month = log_retention._read_month
+
+        def recording_read_month(log_type, month, start, end):
+            read_months.append(month)
+            return read_month(log_type, month, start, end)
+
+        monkeypatch.setattr(log_retention, "_read_month", recording_read_month)
+
+        rows = query_logs("anpr", start=timezone.now() - timedelta(days=365), limit=2)
+
+        assert [row["plate_number"] for row in rows] == ["OLD", "OLD"]
+        # Only the month holding the two newest rows is decompressed
+        assert len(read_months) == 1
+
+    def test_anpr_endpoint_reads_archived_days(self, authenticated_client):
+        _detection("ARCHIVED", days_ago=120)
+        LogRetentionService().archive(ANPR)
+        day = (timezone.localtime() - timedelta(days=120)).date()
+
+        response = authenticated_client.get(
+            f"/api/gate/anpr-detections/?date_from={day}&date_to={day}"
+        )
+
+        assert response.status_code == 200
+        assert [row["plate_number"] for row in response.data["data"]] == ["ARCHIVED"]
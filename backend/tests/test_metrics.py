@@ -0,0 +1,165 @@
+"""
+Tests for operation metrics: timing, DB accounting, Prometheus rendering,
+the /metrics endpoints and slow-request profiling.
+"""
+
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+
+from apps.accounts.models import CustomUser
+from apps.core.metrics import registry, start_metrics_server, timed
+from telegram_bot.middleware import HandlerMetricsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def _series(kind, operation):
+    return registry.snapshot()[(kind, operation)]
+
+
+@pytest.mark.django_db
+class TestTimed:
+    def test_decorator_records_latency_and_queries(self):
+        @timed()
+        def count_users():
+            return CustomUser.objects.count() + CustomUser.objects.count()
+
+        count_users()
+        count_users()
+
+        series = _series("service", count_users.__qualname__)
+        assert series["count"] == 2
+        assert series["db_queries"] == 4
+        assert series["db_seconds"] > 0
+        assert series["errors"] == 0
+
+    def test_nested_operations_both_count_queries(self):
+        with timed("outer") as outer:
+            CustomUser.objects.count()
+            with timed("inner") as inner:
+                CustomUser.objects.count()
+
+        assert (outer.db_queries, inner.db_queries) == (2, 1)
+
+    def test_errors_recorded(self):
+        with pytest.raises(ValueError), timed("failing"):
+            raise ValueError("boom")
+
+        assert _series("service", "failing")["errors"] == 1
+
+    def test_async_queries_through_sync_to_async_counted(self):
+        @timed(kind="bot")
+        async def handler():
+            return await sync_to_async(CustomUser.objects.count)()
+
+        async_to_sync(handler)()
+
+        assert _series("bot", handler.__qualname__)["db_queries"] == 1
+
+
+class TestRender:
+    def test_prometheus_histogram(self):
+        registry.observe("http", 'GET "quoted"', 0.02, db_seconds=0.01, db_queries=3)
+        registry.observe("http", 'GET "quoted"', 3.0)
+
+        text = registry.render()
+
+        labels = 'kind="http",operation="GET \\"quoted\\""'
+        assert f'app_operation_duration_seconds_bucket{{{labels},le="0.01"}} 0' in text
+        assert f'app_operation_duration_seconds_bucket{{{labels},le="0.025"}} 1' in text
+        assert f'app_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"app_operation_duration_seconds_count{{{labels}}} 2" in text
+        assert f"app_operation_db_queries_total{{{labels}}} 3" in text
+
+    def test_collector_samples(self):
+        from apps.core.metrics import Sample
+
+        def collector():
+            return [Sample("queue_depth", 4, help="Queued items")]
+
+        registry.register_collector(collector)
+        try:
+            text = registry.render()
+        finally:
+            registry._collectors.remove(collector)
+
+        assert "# TYPE queue_depth gauge\nqueue_depth 4" in text
+
+
+@pytest.mark.django_db
+class TestEndpoints:
+    def test_web_metrics_include_requests(self, client, settings):
+        settings.METRICS_TOKEN = "secret"
+        client.get("/api/files/categories/")
+
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        assert 'kind="http",operation="GET filecategory-list"' in (
+            response.content.decode()
+        )
+
+    def test_token_required_when_configured(self, client, settings):
+        settings.METRICS_TOKEN = "secret"
+
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+
+    def test_closed_without_token_unless_debug(self, client, settings):
+        settings.METRICS_TOKEN = ""
+        settings.DEBUG = False
+        assert client.get("/metrics").status_code == 401
+
+        settings.DEBUG = True
+        assert client.get("/metrics").status_code == 200
+
+    def test_standalone_server(self, settings):
+        settings.METRICS_TOKEN = "secret"
+        registry.observe("service", "listener", 0.1)
+        server = start_metrics_server(0)
+        try:
+            request = urllib.request.Request(
+                f"http://127.0.0.1:{server.server_port}/metrics",
+                headers={"Authorization": "Bearer secret"},
+            )
+            with urllib.request.urlopen(request, timeout=5) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+
+        assert 'operation="listener"' in body
+
+    def test_slow_requests_profiled(self, client, settings, tmp_path):
+        settings.METRICS_PROFILE_SAMPLE_RATE = 1
+        settings.METRICS_SLOW_MS = 0
+        settings.METRICS_PROFILE_DIR = str(tmp_path)
+
+        client.get("/api/files/categories/")
+
+        assert list(tmp_path.glob("*.prof"))
+
+
+class TestHandlerMiddleware:
+    def test_handler_named_operation(self):
+        async def start_entry(event, data):
+            return "handled"
+
+        data = {"handler": SimpleNamespace(callback=start_entry)}
+
+        result = async_to_sync(HandlerMetricsMiddleware())(
+            start_entry, SimpleNamespace(), data
+        )
+
+        assert result == "handled"
+        operation = f"{__name__}.{start_entry.__qualname__}"
+        assert _series("bot", operation)["count"] == 1
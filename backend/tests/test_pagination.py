@@ -0,0 +1,125 @@
+"""
+Tests for keyset (cursor) pagination opt-in.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.pagination import CursorResultsSetPagination
+from apps.gate.models import ANPRDetection
+from apps.terminal_operations.models import ContainerEntry
+from apps.terminal_operations.services import ContainerEventService
+
+
+ENTRIES_URL = "/api/terminal/entries/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def entries(container_factory, admin_user):
+    now = timezone.now()
+    return [
+        ContainerEntry.objects.create(
+            container=container_factory(),
+            status="LADEN",
+            transport_type="TRUCK",
+            recorded_by=admin_user,
+            entry_time=now - timedelta(hours=i),
+        )
+        for i in range(5)
+    ]
+
+
+def follow_pages(client, url):
+    """Collect result ids following `next` links."""
+    ids = []
+    responses = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        responses.append(response.data)
+        ids.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+    return ids, responses
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+    def test_entries_keyset_pages_cover_all_rows(self, authenticated_client, entries):
+        ids, responses = follow_pages(
+            authenticated_client, f"{ENTRIES_URL}?pagination=cursor&page_size=2"
+        )
+
+        assert ids == [entry.id for entry in entries]  # newest first, no duplicates
+        assert len(responses) == 3
+        assert responses[0]["success"] is True
+        assert responses[0]["count"] is None
+        assert "?cursor=" in responses[0]["next"] or "&cursor=" in responses[0]["next"]
+
+    def test_exact_count_on_request(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?pagination=cursor&count=exact")
+
+        assert response.data["count"] == 5
+
+    def test_estimate_falls_back_to_exact_off_postgres(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?pagination=cursor&count=estimate")
+
+        assert response.data["count"] == 5
+
+    @pytest.mark.parametrize("mode", ["exact", "estimate"])
+    def test_count_of_empty_querysets(self, entries, mode):
+        paginator = CursorResultsSetPagination()
+
+        assert paginator.get_count(ContainerEntry.objects.none(), mode) == 0
+        assert paginator.get_count(ContainerEntry.objects.filter(pk__in=[]), mode) == 0
+
+    def test_page_number_pagination_unchanged(self, authenticated_client, entries):
+        response = authenticated_client.get(f"{ENTRIES_URL}?page=2&page_size=2")
+
+        assert response.data["count"] == 5
+        assert [item["id"] for item in response.data["results"]] == [
+            entries[2].id,
+            entries[3].id,
+        ]
+
+    def test_event_timeline_keyset(self, authenticated_client, entries):
+        entry = entries[0]
+        service = ContainerEventService()
+        now = timezone.now()
+        for hours in (3, 2, 1):
+            service.create_event(
+                container_entry=entry,
+                event_type="CRANE_OPERATION",
+                details={},
+                event_time=now - timedelta(hours=hours),
+            )
+
+        _ids, responses = follow_pages(
+            authenticated_client,
+            f"{ENTRIES_URL}{entry.id}/events/?pagination=cursor&page_size=2",
+        )
+
+        times = [event["event_time"] for page in responses for event in page["results"]]
+        assert len(times) == 3
+        assert times == sorted(times, reverse=True)
+
+    def test_anpr_detections_keyset(self, authenticated_client):
+        for i in range(3):
+            ANPRDetection.objects.create(plate_number=f"01A{i:03d}BC", gate_id="main")
+        ANPRDetection.objects.create(plate_number="99Z999ZZ", gate_id="back")
+
+        ids, responses = follow_pages(
+            authenticated_client, "/api/gate/anpr-detections/?pagination=cursor&page_size=2"
+        )
+
+        assert len(ids) == 3
+        assert len(responses) == 2
@@ -0,0 +1,163 @@
+"""
+Tests for per-request query accounting, view query budgets and the
+constant-queries fixture.
+"""
+
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from apps.core import query_budget
+from apps.core.query_budget import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+    fingerprint_sql,
+    resolve_budget,
+)
+from apps.terminal_operations.models import ContainerOwner, PreOrder
+from apps.terminal_operations.views import ContainerOwnerViewSet
+
+
+OWNERS_URL = "/api/terminal/owners/"
+
+
+class TestFingerprint:
+    def test_literals_and_in_lists_collapsed(self):
+        first = fingerprint_sql(
+            "SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'a''b' LIMIT 21"
+        )
+        second = fingerprint_sql(
+            "SELECT *  FROM t WHERE id IN (%s) AND name = 'x' LIMIT 5"
+        )
+
+        assert (
+            first == second == "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?"
+        )
+
+
+class TestQueryRecorder:
+    def test_counts_and_duplicates(self):
+        ContainerOwner.objects.create(name="Owner A")
+
+        with QueryRecorder() as recorder:
+            for _ in range(3):
+                list(ContainerOwner.objects.filter(name="Owner A"))
+            ContainerOwner.objects.count()
+
+        assert recorder.count == 4
+        assert recorder.total_time > 0
+        assert list(recorder.duplicates().values()) == [3]
+        assert recorder.duplicates(threshold=4) == {}
+
+    def test_stops_recording_on_exit(self):
+        with QueryRecorder() as recorder:
+            ContainerOwner.objects.count()
+        ContainerOwner.objects.count()
+
+        assert recorder.count == 1
+
+
+class TestResolveBudget:
+    def test_action_budgets(self):
+        list_view = ContainerOwnerViewSet.as_view({"get": "list"})
+        create_view = ContainerOwnerViewSet.as_view({"post": "create"})
+
+        assert resolve_budget(list_view, "GET") == 3
+        assert resolve_budget(create_view, "POST") is None
+
+    def test_int_and_default_budgets(self):
+        class View:
+            query_budget = {"get": 4, "default": 9}
+
+        def view():
+            pass
+
+        view.cls = View
+        assert resolve_budget(view, "GET") == 4
+        assert resolve_budget(view, "DELETE") == 9
+
+        View.query_budget = 2
+        assert resolve_budget(view, "DELETE") == 2
+
+
+class TestMiddleware:
+    @override_settings(QUERY_BUDGET_HEADERS=True)
+    def test_debug_headers(self, authenticated_client, container_owners):
+        response = authenticated_client.get(OWNERS_URL)
+
+        assert response.status_code == 200
+        assert int(response["X-Query-Count"]) >= 1
+        assert float(response["X-Query-Time-Ms"]) >= 0
+        assert response["X-Query-Duplicates"] == "0"
+        assert response["X-Query-Budget"] == "3"
+
+    @override_settings(QUERY_BUDGET_HEADERS=False)
+    def test_headers_off(self, authenticated_client):
+        response = authenticated_client.get(OWNERS_URL)
+
+        assert "X-Query-Count" not in response
+
+    def test_strict_mode_raises_over_budget(self, authenticated_client, monkeypatch):
+        monkeypatch.setattr(ContainerOwnerViewSet, "query_budget", {"list": 0})
+
+        with pytest.raises(QueryBudgetExceeded):
+            authenticated_client.get(OWNERS_URL)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_over_budget_logged_as_warning(self, authenticated_client, monkeypatch):
+        monkeypatch.setattr(ContainerOwnerViewSet, "query_budget", {"list": 0})
+
+        with mock.patch.object(query_budget.logger, "log") as log:
+            response = authenticated_client.get(OWNERS_URL)
+
+        assert response.status_code == 200
+        level, message = log.call_args.args
+        assert level == query_budget.logging.WARNING
+        assert "budget=0" in message
+        assert log.call_args.kwargs["extra"]["query_budget"]["over_budget"] is True
+
+
+class TestConstantQueries:
+    def test_owners_list(self, authenticated_client, assert_constant_queries):
+        def create_owners(count):
+            for _ in range(count):
+                ContainerOwner.objects.create(
+                    name=f"Owner {ContainerOwner.objects.count()}"
+                )
+
+        assert_constant_queries(authenticated_client, OWNERS_URL, create_owners)
+
+    def test_preorders_list(
+        self, authenticated_client, customer_user, assert_constant_queries
+    ):
+        def create_preorders(count):
+            for _ in range(count):
+                PreOrder.objects.create(
+                    customer=customer_user,
+                    plate_number=f"01A{PreOrder.objects.count():03d}BC",
+                    operation_type="LOAD",
+                    status="PENDING",
+                )
+
+        assert_constant_queries(
+            authenticated_client, "/api/terminal/preorders/", create_preorders
+        )
+
+    def test_detects_per_row_queries(self, assert_constant_queries):
+        class PerRowClient:
+            """Fake client issuing one query per owner, like an N+1 serializer."""
+
+            def get(self, url):
+                for owner in ContainerOwner.objects.all():
+                    ContainerOwner.objects.filter(pk=owner.pk).exists()
+                return mock.Mock(status_code=200)
+
+        def create_owners(count):
+            for _ in range(count):
+                ContainerOwner.objects.create(
+                    name=f"Owner {ContainerOwner.objects.count()}"
+                )
+
+        with pytest.raises(AssertionError, match="queries for 2 rows"):
+            assert_constant_queries(PerRowClient(), OWNERS_URL, create_owners)
@@ -0,0 +1,90 @@
+"""
+Startup imports of the web, bot and ANPR processes.
+
+Each case starts a fresh interpreter under `python -X importtime`, so
+heavy libraries imported at module level anywhere on a startup path
+(views, services packages, signal receivers) show up here.
+
+Wall-clock budgets depend on host load (parallel runs, slow CI), so they
+are opt-in:
+
+    STARTUP_IMPORT_BUDGET=1 pytest tests/test_startup_imports.py
+"""
+
+import os
+import sys
+
+import pytest
+
+from apps.core.import_audit import PROCESSES, measure, parse_importtime
+
+
+CHECK_BUDGET = bool(os.environ.get("STARTUP_IMPORT_BUDGET"))
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   zipimport
+import time:       300 |        420 | encodings
+import time:        50 |         50 |     openpyxl.cell
+import time:       200 |        250 |   openpyxl
+import time:      1000 |       1250 | apps.billing.services
+"""
+
+
+def test_parse_importtime():
+    modules, total = parse_importtime(IMPORTTIME_OUTPUT)
+
+    assert [m.name for m in modules] == [
+        "zipimport",
+        "encodings",
+        "openpyxl.cell",
+        "openpyxl",
+        "apps.billing.services",
+    ]
+    assert modules[-1].self_us == 1000
+    assert modules[-1].cumulative_us == 1250
+    # Only top-level imports count towards the total
+    assert total == 420 + 1250
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("name", list(PROCESSES))
+def test_startup_skips_heavy_imports(name):
+    report = measure(name)
+
+    assert report.modules, "no -X importtime output"
+    assert not report.forbidden_loaded, (
+        f"{name} imports {', '.join(report.forbidden_loaded)} on start; "
+        "import them where they are used"
+    )
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(
+    not CHECK_BUDGET, reason="set STARTUP_IMPORT_BUDGET to check import times"
+)
+@pytest.mark.parametrize("name", list(PROCESSES))
+def test_startup_imports_within_budget(name):
+    report = measure(name)
+
+    slowest = ", ".join(
+        f"{t.name} {t.cumulative_us // 1000} ms" for t in report.slowest(5)
+    )
+    assert not report.over_budget, (
+        f"{name} startup imports take {report.total_ms:.0f} ms "
+        f"(budget {report.process.budget_ms} ms): {slowest}"
+    )
+
+
+def test_lazy_service_exports():
+    from apps.billing import services as billing_services
+    from apps.terminal_operations import services as terminal_services
+    from apps.terminal_operations.services.container_entry_import_service import (
+        ContainerEntryImportService,
+    )
+
+    assert terminal_services.ContainerEntryImportService is ContainerEntryImportService
+    assert billing_services.StatementExportService.__name__ == "StatementExportService"
+    assert "pandas" in sys.modules
+    with pytest.raises(AttributeError):
+        terminal_services.NoSuchService  # noqa: B018
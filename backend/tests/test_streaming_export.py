@@ -0,0 +1,178 @@
+"""
+Tests for the streaming XLSX/CSV export engine and the endpoints using it.
+"""
+
+import csv
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from apps.accounts.models import Company
+from apps.billing.models import (
+    MonthlyStatement,
+    StatementLineItem,
+    Tariff,
+    TariffRate,
+)
+from apps.billing.services.export_service import StatementExportService
+from apps.core.services.streaming_export import (
+    STYLE_USD,
+    ExportColumn,
+    StreamingTableExport,
+)
+from apps.terminal_operations.models import CraneOperation
+
+
+EXPORT_URL = "/api/terminal/entries/export-excel/"
+
+
+def _table():
+    return StreamingTableExport(
+        sheet_title="Test",
+        columns=[
+            ExportColumn(("Container", "Контейнер"), 15),
+            ExportColumn(("Amount", "Сумма"), 12, STYLE_USD),
+        ],
+    )
+
+
+class TestStreamingTableExport:
+    def test_xlsx_rows_headers_and_named_styles(self):
+        buffer = io.BytesIO()
+
+        count = _table().write_xlsx(
+            ([f"MSKU{i:07d}", Decimal("10.50")] for i in range(3)), buffer
+        )
+
+        ws = load_workbook(buffer).active
+        assert count == 3
+        assert [c.value for c in ws[1]] == ["Container", "Amount"]
+        assert [c.value for c in ws[2]] == ["Контейнер", "Сумма"]
+        assert ws["A5"].value == "MSKU0000002"
+        assert ws["B3"].value == 10.5
+        assert ws["B3"].style == STYLE_USD
+        assert ws["B3"].number_format == "#,##0.00"
+        assert ws.freeze_panes == "A3"
+
+    def test_csv_streams_lines(self):
+        lines = list(_table().iter_csv([["MSKU0000001", Decimal("1.25")], ["X", None]]))
+
+        assert lines[0] == "\ufeff"
+        rows = list(csv.reader(io.StringIO("".join(lines[1:]))))
+        assert rows == [
+            ["Container", "Amount"],
+            ["Контейнер", "Сумма"],
+            ["MSKU0000001", "1.25"],
+            ["X", ""],
+        ]
+
+
+class TestContainerEntryExportEndpoint:
+    def _create_entries(self, container_entry_factory, count):
+        for _ in range(count):
+            entry = container_entry_factory()
+            CraneOperation.objects.create(
+                container_entry=entry,
+                operation_date=timezone.now() - timedelta(hours=1),
+            )
+
+    def test_query_count_does_not_grow_with_rows(
+        self,
+        authenticated_client,
+        container_entry_factory,
+        assert_constant_queries,
+    ):
+        assert_constant_queries(
+            authenticated_client,
+            EXPORT_URL,
+            lambda n: self._create_entries(container_entry_factory, n),
+        )
+
+    def test_csv_export(self, authenticated_client, container_entry_factory):
+        self._create_entries(container_entry_factory, 2)
+
+        response = authenticated_client.get(f"{EXPORT_URL}?export_format=csv")
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/csv")
+        assert ".csv" in response["Content-Disposition"]
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0][1] == "Container number"
+        assert rows[1][1] == "Номер контейнера"
+        assert len(rows) == 4
+        assert all(row[16] for row in rows[2:])  # crane operation dates
+
+    def test_unknown_format_rejected(self, authenticated_client):
+        response = authenticated_client.get(f"{EXPORT_URL}?export_format=pdf")
+
+        assert response.status_code == 400
+
+
+class TestStatementExcel:
+    def test_statement_table_below_summary(self):
+        company = Company.objects.create(name="Export Co", slug="export-co")
+        statement = MonthlyStatement.objects.create(
+            company=company, year=2026, month=1, billing_method="split"
+        )
+        StatementLineItem.objects.create(
+            statement=statement,
+            container_number="MSKU1234567",
+            container_size="40ft",
+            container_status="laden",
+            period_start=date(2026, 1, 1),
+            period_end=date(2026, 1, 10),
+            total_days=10,
+            free_days=3,
+            billable_days=7,
+            daily_rate_usd=Decimal("2.00"),
+            daily_rate_uzs=Decimal("25000"),
+            amount_usd=Decimal("14.00"),
+            amount_uzs=Decimal("180000"),
+        )
+
+        ws = load_workbook(StatementExportService().export_to_excel(statement)).active
+
+        assert ws["A1"].value.startswith("Выписка за")
+        assert "A1:K1" in ws.merged_cells
+        assert ws["A13"].value == "Контейнер"
+        assert ws["A14"].value == "MSKU1234567"
+        assert ws["J14"].value == 14
+
+
+class TestStorageCostExport:
+    def test_csv_export(
+        self, authenticated_client, container_entry_factory, admin_user
+    ):
+        tariff = Tariff.objects.create(
+            effective_from=date(2020, 1, 1), created_by=admin_user
+        )
+        for size in ("20ft", "40ft"):
+            TariffRate.objects.create(
+                tariff=tariff,
+                container_size=size,
+                container_status="laden",
+                daily_rate_usd=Decimal("10.00"),
+                daily_rate_uzs=Decimal("130000.00"),
+                free_days=3,
+            )
+        company = Company.objects.create(name="Storage Co", slug="storage-co")
+        entry = container_entry_factory(entry_time=timezone.now() - timedelta(days=12))
+        entry.company = company
+        entry.save(update_fields=["company"])
+
+        response = authenticated_client.get(
+            f"/api/auth/companies/{company.slug}/storage-costs/export/?export_format=csv"
+        )
+
+        assert response.status_code == 200
+        assert (
+            'filename="storage_costs_storage-co.csv"' in response["Content-Disposition"]
+        )
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(io.StringIO(content)))
+        assert rows[0][0] == "Контейнер"
+        assert rows[1][0] == entry.container.container_number
@@ -0,0 +1,143 @@
+"""
+Tests for the process-wide Telegram notification client.
+"""
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+from asgiref.sync import async_to_sync
+
+from apps.core.services.telegram_client import (
+    TelegramClient,
+    _RateLimiter,
+    set_telegram_client,
+)
+from telegram_bot.services.notification_service import TelegramNotificationService
+
+
+class FakeBot:
+    """Records messages; optionally answers the first one with RetryAfter."""
+
+    def __init__(self, retry_first=False):
+        self.messages = []
+        self.retry_first = retry_first
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.messages.append((chat_id, text))
+        if self.retry_first and len(self.messages) == 1:
+            raise TelegramRetryAfter(
+                method=SendMessage(chat_id=chat_id, text=text),
+                message="Too Many Requests",
+                retry_after=0,
+            )
+        return len(self.messages)
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def _make_client(bot, **rates):
+        rates = {"global_rate": 1000, "chat_rate": 1000, "group_rate": 1000, **rates}
+        client = TelegramClient(token=None, bot=bot, **rates)
+        clients.append(client)
+        return client
+
+    yield _make_client
+    for client in clients:
+        client.close()
+
+
+def _send_text(chat_id, text):
+    return lambda bot: bot.send_message(chat_id=chat_id, text=text)
+
+
+class TestRateLimiter:
+    def test_same_chat_is_spaced(self):
+        limiter = _RateLimiter(global_rate=100, chat_rate=1, group_rate=0.5)
+
+        assert limiter.reserve_chat(1, 1, now=0) == 0
+        assert limiter.reserve_chat(1, 1, now=0) == pytest.approx(1)
+        assert limiter.reserve_chat(2, 1, now=0) == 0
+
+    def test_groups_and_albums_wait_longer(self):
+        limiter = _RateLimiter(global_rate=100, chat_rate=1, group_rate=0.5)
+
+        assert limiter.reserve_chat(-100, 3, now=0) == 0
+        assert limiter.reserve_chat(-100, 1, now=0) == pytest.approx(6)
+        assert limiter.reserve_chat(None, 1, now=0) == 0
+
+    def test_global_rate_applies_across_chats(self):
+        limiter = _RateLimiter(global_rate=10, chat_rate=100, group_rate=100)
+
+        delays = [limiter.reserve_global(1, now=0) for _ in range(4)]
+        delays.append(limiter.reserve_global(1, now=1))
+
+        assert delays == pytest.approx([0, 0.1, 0.2, 0.3, 0])
+
+
+class TestTelegramClient:
+    def test_run_sends_on_shared_bot_and_tracks_stats(self, make_client):
+        bot = FakeBot()
+        client = make_client(bot)
+
+        assert client.run(1, _send_text(1, "a")) == 1
+        assert client.run(2, _send_text(2, "b")) == 2
+
+        assert bot.messages == [(1, "a"), (2, "b")]
+        stats = client.stats()
+        assert stats["sent"] == 2
+        assert stats["failed"] == 0
+        assert stats["queue_depth"] == 0
+        assert set(stats["latency_ms"]) == {"avg", "p95", "max"}
+
+    def test_retry_after_is_retried_once(self, make_client):
+        bot = FakeBot(retry_first=True)
+        client = make_client(bot)
+
+        assert client.run(1, _send_text(1, "a")) == 2
+        assert client.stats()["retried"] == 1
+
+    def test_failures_are_counted_and_raised(self, make_client):
+        async def fail(bot):
+            raise RuntimeError("boom")
+
+        client = make_client(FakeBot())
+
+        with pytest.raises(RuntimeError):
+            client.run(1, fail)
+        assert client.stats()["failed"] == 1
+
+    def test_call_from_another_event_loop(self, make_client):
+        bot = FakeBot()
+        client = make_client(bot)
+
+        result = async_to_sync(client.call)(1, _send_text(1, "a"))
+
+        assert result == 1
+
+    def test_schedule_runs_flow_on_client_loop(self, make_client):
+        bot = FakeBot()
+        client = make_client(bot)
+
+        async def flow():
+            return await client.call(5, _send_text(5, "flow"))
+
+        assert client.schedule(flow()).result(timeout=5) == 1
+        assert bot.messages == [(5, "flow")]
+
+
+class TestNotificationServiceQueuesOnClient:
+    def test_send_message_does_not_block(self, make_client, settings):
+        settings.TELEGRAM_BOT_TOKEN = "123:test"
+        bot = FakeBot()
+        client = make_client(bot)
+        set_telegram_client(client)
+        try:
+            queued = TelegramNotificationService().send_message(42, "<b>hi</b>")
+            client.run(None, lambda bot: bot.send_message(chat_id=0, text="sync"))
+        finally:
+            set_telegram_client(None)
+
+        assert queued is True
+        assert bot.messages[0] == (42, "<b>hi</b>")
@@ -0,0 +1,131 @@
+"""
+Tests for sending stored photos to Telegram by file_id.
+"""
+
+import io
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendMediaGroup
+from aiogram.types import FSInputFile
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from PIL import Image
+
+from apps.files.models import File, FileCategory
+from apps.files.telegram import send_photo_album
+
+
+@pytest.fixture
+def category(db):
+    category, _ = FileCategory.objects.get_or_create(
+        code="container_image",
+        defaults={"name": "Container Image", "max_file_size_mb": 5},
+    )
+    return category
+
+
+@pytest.fixture
+def make_file(category, admin_user, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+    def _make_file(name, telegram_file_id=""):
+        (tmp_path / name).write_bytes(b"jpeg")
+        return File.objects.create(
+            file=name,
+            original_filename=name,
+            file_category=category,
+            mime_type="image/jpeg",
+            size=4,
+            uploaded_by=admin_user,
+            telegram_file_id=telegram_file_id,
+        )
+
+    return _make_file
+
+
+class FakeBot:
+    """Records albums; optionally rejects the first one like a stale file_id."""
+
+    def __init__(self, reject_first=False):
+        self.albums = []
+        self.reject_first = reject_first
+
+    async def send_media_group(self, chat_id, media):
+        self.albums.append(media)
+        if self.reject_first and len(self.albums) == 1:
+            raise TelegramBadRequest(
+                method=SendMediaGroup(chat_id=chat_id, media=media),
+                message="Bad Request: wrong file identifier",
+            )
+        return [
+            SimpleNamespace(
+                message_id=idx,
+                photo=[
+                    SimpleNamespace(file_id="thumb", file_unique_id="t"),
+                    SimpleNamespace(file_id=f"new-{idx}", file_unique_id=f"u{idx}"),
+                ],
+            )
+            for idx, _ in enumerate(media)
+        ]
+
+
+def _send(bot, files):
+    return async_to_sync(send_photo_album)(bot, 100, files, "caption")
+
+
+class TestSendPhotoAlbum:
+    def test_known_ids_sent_by_reference(self, make_file):
+        photo = make_file("a.jpg", telegram_file_id="AgAC-known")
+        bot = FakeBot()
+
+        _send(bot, [photo])
+
+        (media,) = bot.albums[0]
+        assert media.media == "AgAC-known"
+        assert media.caption == "caption"
+        photo.refresh_from_db()
+        assert photo.telegram_file_id == "AgAC-known"
+
+    def test_uploaded_photo_id_is_remembered(self, make_file):
+        known = make_file("a.jpg", telegram_file_id="AgAC-known")
+        fresh = make_file("b.jpg")
+        bot = FakeBot()
+
+        _send(bot, [known, fresh])
+
+        assert bot.albums[0][0].media == "AgAC-known"
+        assert isinstance(bot.albums[0][1].media, FSInputFile)
+        fresh.refresh_from_db()
+        assert fresh.telegram_file_id == "new-1"
+        assert fresh.telegram_file_unique_id == "u1"
+
+    def test_stale_id_falls_back_to_upload(self, make_file):
+        photo = make_file("a.jpg", telegram_file_id="AgAC-stale")
+        bot = FakeBot(reject_first=True)
+
+        sent = _send(bot, [photo])
+
+        assert len(bot.albums) == 2
+        assert isinstance(bot.albums[1][0].media, FSInputFile)
+        assert len(sent) == 1
+        photo.refresh_from_db()
+        assert photo.telegram_file_id == "new-0"
+
+
+class TestCreateFromUpload:
+    def test_telegram_ids_captured_from_download(self, category, admin_user, media_root):
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, format="JPEG")
+        upload = InMemoryUploadedFile(
+            buffer, None, "AgAC-1.jpg", "image/jpeg", buffer.tell(), None
+        )
+        buffer.seek(0)
+        upload.telegram_file_id = "AgAC-1"
+        upload.telegram_file_unique_id = "AQAD-1"
+
+        file = File.objects.create_from_upload(upload, "container_image", admin_user)
+
+        assert file.telegram_file_id == "AgAC-1"
+        assert file.telegram_file_unique_id == "AQAD-1"
@@ -50,7 +50,7 @@ def container_entry(container, user):
 
 
 @pytest.fixture
-def test_image():
+def test_image(media_root):
     """Create a test image file"""
     image = Image.new("RGB", (100, 100), color="red")
     temp_file = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False)
@@ -0,0 +1,111 @@
+"""
+Tests for the single-pass upload pipeline.
+"""
+
+import io
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework import serializers
+
+from apps.files.models import File, FileCategory
+from apps.files.pipeline import INCOMING_DIR, process_upload
+from apps.files.serializers import FileUploadSerializer, UploadedImageField
+
+
+@pytest.fixture
+def category(db):
+    category, _ = FileCategory.objects.get_or_create(
+        code="container_image",
+        defaults={"name": "Container Image", "max_file_size_mb": 5},
+    )
+    category.allowed_mime_types = ["image/jpeg", "image/png"]
+    category.save()
+    return category
+
+
+@pytest.fixture
+def storage():
+    return File._meta.get_field("file").storage
+
+
+class CountingUpload(SimpleUploadedFile):
+    """Upload that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, *args):
+        data = super().read(*args)
+        self.bytes_read += len(data)
+        return data
+
+
+def _photo(name="photo.jpg", orientation=None, size=(8, 6)):
+    image = Image.new("RGB", size, (255, 0, 0))
+    exif = Image.Exif()
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif.tobytes())
+    return CountingUpload(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@pytest.mark.django_db
+class TestProcessUpload:
+    def test_one_read_yields_all_metadata(self, media_root, category, storage):
+        upload = _photo(orientation=6, size=(40, 30))
+
+        info = process_upload(upload, storage, category=category)
+
+        assert upload.bytes_read == upload.size
+        assert info.mime_type == "image/jpeg"
+        assert (info.width, info.height, info.orientation) == (40, 30, 6)
+        assert info.size == upload.size
+        assert storage.exists(info.stored_name)
+        assert upload.upload_info is info
+
+    def test_create_from_upload_reuses_processed_upload(
+        self, media_root, category, storage, admin_user
+    ):
+        upload = _photo(orientation=3)
+        process_upload(upload, storage)
+
+        file = File.objects.create_from_upload(upload, "container_image", admin_user)
+
+        assert upload.bytes_read == upload.size
+        assert file.exif_orientation == 3
+        assert (file.width, file.height) == (8, 6)
+
+    def test_rejected_upload_leaves_no_partial_file(
+        self, media_root, category, storage
+    ):
+        upload = SimpleUploadedFile("notes.txt", b"plain text " * 500)
+
+        with pytest.raises(ValidationError, match="not allowed"):
+            process_upload(upload, storage, category=category)
+
+        assert not hasattr(upload, "upload_info")
+        assert not list((media_root / INCOMING_DIR).iterdir())
+        assert not list(media_root.rglob("*.txt"))
+
+
+@pytest.mark.django_db
+class TestUploadSerializers:
+    def test_image_field_rejects_non_images(self, media_root):
+        upload = SimpleUploadedFile("fake.jpg", b"not an image" * 300)
+
+        with pytest.raises(serializers.ValidationError):
+            UploadedImageField().to_internal_value(upload)
+
+    def test_upload_serializer_reports_category_errors(self, media_root, category):
+        serializer = FileUploadSerializer(
+            data={
+                "file": SimpleUploadedFile("notes.pdf", b"%PDF-1.4 " * 300),
+                "category": "container_image",
+            }
+        )
+
+        assert not serializer.is_valid()
+        assert "file" in serializer.errors